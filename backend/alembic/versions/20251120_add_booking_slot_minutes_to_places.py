@@ -0,0 +1,48 @@
+"""add_booking_slot_minutes_to_places
+
+Revision ID: 7c3e91a2f4b1
+Revises: 1a4ab6565475
+Create Date: 2025-11-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e91a2f4b1'
+down_revision: Union[str, Sequence[str], None] = '1a4ab6565475'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Add per-place booking slot granularity (15, 30 or 60 minutes)
+    bind = op.get_bind()
+    exists = bind.execute(text("""
+        SELECT 1 FROM information_schema.columns 
+        WHERE table_name='places' AND column_name='booking_slot_minutes'
+    """)).first() is not None
+    if not exists:
+        op.add_column('places', sa.Column('booking_slot_minutes', sa.Integer(), nullable=False, server_default='30'))
+        op.create_check_constraint(
+            'ck_places_booking_slot_minutes',
+            'places',
+            'booking_slot_minutes IN (15, 30, 60)'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    exists = bind.execute(text("""
+        SELECT 1 FROM information_schema.columns 
+        WHERE table_name='places' AND column_name='booking_slot_minutes'
+    """)).first() is not None
+    if exists:
+        op.drop_constraint('ck_places_booking_slot_minutes', 'places', type_='check')
+        op.drop_column('places', 'booking_slot_minutes')
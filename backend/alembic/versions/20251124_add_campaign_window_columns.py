@@ -0,0 +1,87 @@
+"""add_campaign_window_columns
+
+Revision ID: 3f8d2b6c9a10
+Revises: 7c3e91a2f4b1
+Create Date: 2025-11-24 10:00:00.000000
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8d2b6c9a10'
+down_revision: Union[str, Sequence[str], None] = '7c3e91a2f4b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _parse(value):
+    """Parse a config datetime to naive UTC (mirrors models.campaign.parse_campaign_datetime)"""
+    if not value:
+        return None
+    for parse in (
+        lambda: datetime.fromisoformat(value.replace('Z', '+00:00')),
+        lambda: datetime.strptime(value, "%m/%d/%Y, %I:%M:%S %p"),
+        lambda: datetime.strptime(value, "%m/%d/%Y %H:%M"),
+    ):
+        try:
+            parsed = parse()
+        except ValueError:
+            continue
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+    return None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Store campaign windows as indexed timestamps instead of parsing config JSON per request
+    bind = op.get_bind()
+    exists = bind.execute(text("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name='campaigns' AND column_name='start_datetime'
+    """)).first() is not None
+    if exists:
+        return
+
+    op.add_column('campaigns', sa.Column('start_datetime', sa.DateTime(), nullable=True))
+    op.add_column('campaigns', sa.Column('end_datetime', sa.DateTime(), nullable=True))
+    op.create_index('ix_campaigns_start_datetime', 'campaigns', ['start_datetime'])
+    op.create_index('ix_campaigns_end_datetime', 'campaigns', ['end_datetime'])
+
+    # Backfill from config; rows with unparseable values keep NULL windows
+    rows = bind.execute(text("""
+        SELECT id, config->>'start_datetime', config->>'end_datetime'
+        FROM campaigns
+        WHERE config IS NOT NULL
+    """)).fetchall()
+    updates = []
+    for campaign_id, start_value, end_value in rows:
+        start, end = _parse(start_value), _parse(end_value)
+        if start is not None and end is not None:
+            updates.append({"id": campaign_id, "start": start, "end": end})
+    if updates:
+        bind.execute(
+            text("UPDATE campaigns SET start_datetime = :start, end_datetime = :end WHERE id = :id"),
+            updates
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    exists = bind.execute(text("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name='campaigns' AND column_name='start_datetime'
+    """)).first() is not None
+    if exists:
+        op.drop_index('ix_campaigns_end_datetime', table_name='campaigns')
+        op.drop_index('ix_campaigns_start_datetime', table_name='campaigns')
+        op.drop_column('campaigns', 'end_datetime')
+        op.drop_column('campaigns', 'start_datetime')
@@ -0,0 +1,103 @@
+"""add_booking_overlap_exclusion
+
+Revision ID: 5e0c7a4d2b93
+Revises: 3f8d2b6c9a10
+Create Date: 2025-11-26 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0c7a4d2b93'
+down_revision: Union[str, Sequence[str], None] = '3f8d2b6c9a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CONSTRAINT_NAME = 'ex_bookings_employee_overlap'
+
+
+def _booking_range(prefix: str = '') -> str:
+    """
+    [start, start + duration) of a booking; same fallback order as the availability
+    engine (total_duration, then duration). Bookings without either get their place's
+    slot size from _backfill_durations (and from save_booking for new ones), so the
+    final 30 minutes only covers rows whose place no longer exists
+    """
+    start = f"{prefix}booking_date + {prefix}booking_time"
+    minutes = f"COALESCE(NULLIF({prefix}total_duration, 0), NULLIF({prefix}duration, 0), 30)"
+    return f"tsrange({start}, {start} + {minutes} * interval '1 minute', '[)')"
+
+
+ACTIVE_PREDICATE = "employee_id IS NOT NULL AND status IN ('pending', 'confirmed')"
+
+
+def _backfill_durations(bind) -> None:
+    """Store the place's booking_slot_minutes (place_slot_minutes) on bookings without a duration"""
+    bind.execute(text("""
+        UPDATE bookings
+        SET duration = CASE WHEN places.booking_slot_minutes IN (15, 30, 60)
+                            THEN places.booking_slot_minutes ELSE 30 END
+        FROM places
+        WHERE places.id = bookings.salon_id
+          AND COALESCE(NULLIF(bookings.total_duration, 0), NULLIF(bookings.duration, 0)) IS NULL
+    """))
+
+
+def _constraint_exists(bind) -> bool:
+    return bind.execute(
+        text("SELECT 1 FROM pg_constraint WHERE conname = :name"),
+        {"name": CONSTRAINT_NAME}
+    ).first() is not None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Reject overlapping active bookings of the same employee in the database, so
+    # concurrent requests cannot both pass the read-then-insert availability check
+    bind = op.get_bind()
+    if _constraint_exists(bind):
+        return
+
+    # btree_gist provides the gist operator class for the integer equality on employee_id
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    _backfill_durations(bind)
+
+    overlaps = bind.execute(text(f"""
+        SELECT a.id, b.id
+        FROM bookings a
+        JOIN bookings b
+          ON a.employee_id = b.employee_id
+         AND a.id < b.id
+         AND {_booking_range('a.')} && {_booking_range('b.')}
+        WHERE a.employee_id IS NOT NULL
+          AND a.status IN ('pending', 'confirmed')
+          AND b.status IN ('pending', 'confirmed')
+        ORDER BY a.id, b.id
+        LIMIT 50
+    """)).fetchall()
+    if overlaps:
+        pairs = ", ".join(f"{first}/{second}" for first, second in overlaps)
+        raise RuntimeError(
+            f"Cannot add {CONSTRAINT_NAME}: overlapping active bookings exist "
+            f"(booking id pairs: {pairs}). Cancel or reassign them and re-run the migration."
+        )
+
+    op.execute(f"""
+        ALTER TABLE bookings
+        ADD CONSTRAINT {CONSTRAINT_NAME}
+        EXCLUDE USING gist (employee_id WITH =, {_booking_range()} WITH &&)
+        WHERE ({ACTIVE_PREDICATE})
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if _constraint_exists(bind):
+        op.execute(f"ALTER TABLE bookings DROP CONSTRAINT {CONSTRAINT_NAME}")
@@ -0,0 +1,77 @@
+"""add_place_search_index
+
+Revision ID: 8b1f6d2e4c57
+Revises: 5e0c7a4d2b93
+Create Date: 2025-11-28 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1f6d2e4c57'
+down_revision: Union[str, Sequence[str], None] = '5e0c7a4d2b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Indexed, accent-insensitive place search (see services/place_search.py)
+    bind = op.get_bind()
+    exists = bind.execute(text("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name='places' AND column_name='search_vector'
+    """)).first() is not None
+    if exists:
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # unaccent() is only STABLE (it depends on the dictionary search path), so
+    # generated columns and indexes need an IMMUTABLE wrapper pinned to the dictionary
+    op.execute("""
+        CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+    """)
+
+    # Lowercased, unaccented name/city/region/type for substring and fuzzy matching
+    op.execute("""
+        ALTER TABLE places ADD COLUMN search_text text GENERATED ALWAYS AS (
+            lower(f_unaccent(
+                coalesce(nome, '') || ' ' || coalesce(cidade, '') || ' ' ||
+                coalesce(regiao, '') || ' ' || coalesce(tipo, '')
+            ))
+        ) STORED
+    """)
+    # Weighted tokens for ranking: name > city/region > type
+    op.execute("""
+        ALTER TABLE places ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', f_unaccent(coalesce(nome, ''))), 'A') ||
+            setweight(to_tsvector('simple', f_unaccent(coalesce(cidade, '') || ' ' || coalesce(regiao, ''))), 'B') ||
+            setweight(to_tsvector('simple', f_unaccent(coalesce(tipo, ''))), 'C')
+        ) STORED
+    """)
+
+    op.execute("CREATE INDEX ix_places_search_vector ON places USING gin (search_vector)")
+    op.execute("CREATE INDEX ix_places_search_text_trgm ON places USING gin (search_text gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    exists = bind.execute(text("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name='places' AND column_name='search_vector'
+    """)).first() is not None
+    if exists:
+        op.execute("DROP INDEX IF EXISTS ix_places_search_text_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_places_search_vector")
+        op.execute("ALTER TABLE places DROP COLUMN search_vector")
+        op.execute("ALTER TABLE places DROP COLUMN search_text")
+        op.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
@@ -0,0 +1,65 @@
+"""add_place_review_stats
+
+Revision ID: c4e2a9d71f36
+Revises: 8b1f6d2e4c57
+Create Date: 2025-11-30 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e2a9d71f36'
+down_revision: Union[str, Sequence[str], None] = '8b1f6d2e4c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _counter(name: str) -> sa.Column:
+    return sa.Column(name, sa.Integer(), nullable=False, server_default='0')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Per-place review aggregates (see services/review_stats.py)
+    bind = op.get_bind()
+    exists = bind.execute(text("""
+        SELECT 1 FROM information_schema.tables WHERE table_name='place_review_stats'
+    """)).first() is not None
+    if exists:
+        return
+
+    op.create_table(
+        'place_review_stats',
+        sa.Column('place_id', sa.Integer(), sa.ForeignKey('places.id', ondelete='CASCADE'), primary_key=True),
+        _counter('review_count'),
+        _counter('rating_sum'),
+        _counter('rating_1'),
+        _counter('rating_2'),
+        _counter('rating_3'),
+        _counter('rating_4'),
+        _counter('rating_5'),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.current_timestamp()),
+    )
+
+    # Backfill from existing reviews
+    op.execute("""
+        INSERT INTO place_review_stats
+            (place_id, review_count, rating_sum, rating_1, rating_2, rating_3, rating_4, rating_5)
+        SELECT r.place_id, count(*), coalesce(sum(r.rating), 0),
+               count(*) FILTER (WHERE r.rating = 1), count(*) FILTER (WHERE r.rating = 2),
+               count(*) FILTER (WHERE r.rating = 3), count(*) FILTER (WHERE r.rating = 4),
+               count(*) FILTER (WHERE r.rating = 5)
+        FROM reviews r
+        JOIN places p ON p.id = r.place_id
+        GROUP BY r.place_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS place_review_stats")
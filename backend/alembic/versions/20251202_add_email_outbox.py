@@ -0,0 +1,58 @@
+"""add_email_outbox
+
+Revision ID: 5d7a3c91e2b4
+Revises: c4e2a9d71f36
+Create Date: 2025-12-02 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d7a3c91e2b4'
+down_revision: Union[str, Sequence[str], None] = 'c4e2a9d71f36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Outbound email queue (see services/email_outbox.py)
+    bind = op.get_bind()
+    exists = bind.execute(text("""
+        SELECT 1 FROM information_schema.tables WHERE table_name='email_outbox'
+    """)).first() is not None
+    if exists:
+        return
+
+    op.create_table(
+        'email_outbox',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('kind', sa.String(50), nullable=False),
+        sa.Column('to_email', sa.String(255), nullable=False),
+        sa.Column('payload', postgresql.JSONB(), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='6'),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('provider_message_id', sa.String(255), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_email_outbox_id', 'email_outbox', ['id'])
+    op.execute("""
+        CREATE INDEX ix_email_outbox_due ON email_outbox (next_attempt_at)
+        WHERE status IN ('pending', 'sending')
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS email_outbox")
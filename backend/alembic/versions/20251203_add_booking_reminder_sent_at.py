@@ -0,0 +1,42 @@
+"""add_booking_reminder_sent_at
+
+Revision ID: 9a4e6c2d7b15
+Revises: 5d7a3c91e2b4
+Create Date: 2025-12-03 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4e6c2d7b15'
+down_revision: Union[str, Sequence[str], None] = '5d7a3c91e2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # When the customer reminder went out (see services/booking_reminders.py)
+    bind = op.get_bind()
+    exists = bind.execute(text("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name='bookings' AND column_name='reminder_sent_at'
+    """)).first() is not None
+    if not exists:
+        op.add_column('bookings', sa.Column('reminder_sent_at', sa.DateTime(timezone=True), nullable=True))
+    # The reminder job only scans bookings still waiting for their reminder
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_bookings_reminder_due ON bookings (booking_date, booking_time)
+        WHERE reminder_sent_at IS NULL AND status IN ('pending', 'confirmed')
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_bookings_reminder_due")
+    op.execute("ALTER TABLE bookings DROP COLUMN IF EXISTS reminder_sent_at")
@@ -15,6 +15,7 @@ from slowapi.errors import RateLimitExceeded
 from core.database import get_db
 from core.dependencies import get_current_admin
 from core.config import settings
+from core.pagination import COUNT_EXACT, EPOCH, SortKey, envelope, paginate
 from models.user import User
 from models.place_existing import Place, Booking, PlaceService
 from schemas.admin import AdminBookingResponse, AdminBookingStatsResponse, PaginatedResponse
@@ -27,6 +28,8 @@ limiter = Limiter(key_func=get_remote_address)
 async def get_bookings(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (replaces page)"),
+    count: str = Query(COUNT_EXACT, regex="^(exact|estimate|none)$", description="Total count mode"),
     owner_id: Optional[int] = Query(None, description="Filter by owner ID"),
     place_id: Optional[int] = Query(None, description="Filter by place ID"),
     status_filter: Optional[str] = Query(None, description="Filter by booking status"),
@@ -61,34 +64,16 @@ async def get_bookings(
         if date_to:
             query = query.where(Booking.booking_date <= date_to.date())
         
-        # Get total count
-        count_query = select(func.count(Booking.id))
-        if owner_id:
-            count_query = count_query.where(Booking.salon_id.in_(
-                select(Place.id).where(Place.owner_id == owner_id)
-            ))
-        if place_id:
-            count_query = count_query.where(Booking.salon_id == place_id)
-        if status_filter:
-            count_query = count_query.where(Booking.status == status_filter)
-        if date_from:
-            count_query = count_query.where(Booking.booking_date >= date_from.date())
-        if date_to:
-            count_query = count_query.where(Booking.booking_date <= date_to.date())
-        
-        total_result = await db.execute(count_query)
-        total = total_result.scalar() or 0
-        
-        # Apply pagination and ordering
-        query = query.order_by(desc(Booking.created_at))
-        query = query.offset((page - 1) * per_page).limit(per_page)
-        
-        result = await db.execute(query)
-        bookings_with_details = result.fetchall()
+        # Newest first; keyset over (created_at, id) with the count derived from the same query
+        page_data = await paginate(
+            db, query,
+            [SortKey(func.coalesce(Booking.created_at, EPOCH), descending=True), SortKey(Booking.id, descending=True)],
+            per_page, cursor=cursor, offset=(page - 1) * per_page, count=count
+        )
         
         # Build response
         booking_responses = []
-        for booking, place, owner in bookings_with_details:
+        for booking, place, owner in page_data.items:
             booking_responses.append(AdminBookingResponse(
                 id=booking.id,
                 place_name=place.nome,
@@ -102,18 +87,10 @@ async def get_bookings(
                 created_at=booking.created_at
             ))
         
-        pages = (total + per_page - 1) // per_page
-        
-        return PaginatedResponse(
-            items=booking_responses,
-            total=total,
-            page=page,
-            per_page=per_page,
-            pages=pages,
-            has_next=page < pages,
-            has_prev=page > 1
-        )
+        return PaginatedResponse(**envelope(page_data, booking_responses, per_page, None if cursor else page))
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
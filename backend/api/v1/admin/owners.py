@@ -15,6 +15,8 @@ from slowapi.errors import RateLimitExceeded
 from core.database import get_db
 from core.dependencies import get_current_admin
 from core.config import settings
+from core.pagination import COUNT_EXACT, EPOCH, SortKey, envelope, paginate
+from core.principal import invalidate_principal
 from models.user import User
 from models.place_existing import Place, Booking, PlaceService
 from schemas.admin import (
@@ -29,6 +31,8 @@ limiter = Limiter(key_func=get_remote_address)
 async def get_owners(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (replaces page)"),
+    count: str = Query(COUNT_EXACT, regex="^(exact|estimate|none)$", description="Total count mode"),
     search: Optional[str] = Query(None, description="Search by name or email"),
     status_filter: Optional[str] = Query(None, description="Filter by status: active, inactive"),
     current_user: User = Depends(get_current_admin),
@@ -56,34 +60,16 @@ async def get_owners(
         elif status_filter == "inactive":
             query = query.where(User.is_active == False)
         
-        # Get total count
-        count_query = select(func.count(User.id)).where(User.user_type == "business_owner")
-        if search:
-            search_term = f"%{search}%"
-            count_query = count_query.where(
-                or_(
-                    User.name.ilike(search_term),
-                    User.email.ilike(search_term)
-                )
-            )
-        if status_filter == "active":
-            count_query = count_query.where(User.is_active == True)
-        elif status_filter == "inactive":
-            count_query = count_query.where(User.is_active == False)
-        
-        total_result = await db.execute(count_query)
-        total = total_result.scalar() or 0
-        
-        # Apply pagination and ordering
-        query = query.order_by(desc(User.created_at))
-        query = query.offset((page - 1) * per_page).limit(per_page)
-        
-        result = await db.execute(query)
-        owners = result.scalars().all()
+        # Newest first; keyset over (created_at, id) with the count derived from the same query
+        page_data = await paginate(
+            db, query,
+            [SortKey(func.coalesce(User.created_at, EPOCH), descending=True), SortKey(User.id, descending=True)],
+            per_page, cursor=cursor, offset=(page - 1) * per_page, count=count
+        )
         
         # Build response with additional data
         owner_responses = []
-        for owner in owners:
+        for owner in page_data.items:
             # Get place count for this owner
             places_result = await db.execute(
                 select(func.count(Place.id)).where(Place.owner_id == owner.id)
@@ -114,18 +100,10 @@ async def get_owners(
                 last_login=owner.updated_at  # Using updated_at as proxy for last login
             ))
         
-        pages = (total + per_page - 1) // per_page
-        
-        return PaginatedResponse(
-            items=owner_responses,
-            total=total,
-            page=page,
-            per_page=per_page,
-            pages=pages,
-            has_next=page < pages,
-            has_prev=page > 1
-        )
+        return PaginatedResponse(**envelope(page_data, owner_responses, per_page, None if cursor else page))
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -268,6 +246,7 @@ async def toggle_owner_status(
         
         await db.commit()
         await db.refresh(owner)
+        invalidate_principal(owner.id)
         
         return {
             "message": f"Owner status updated to {'active' if owner.is_active else 'inactive'}",
@@ -15,9 +15,13 @@ from slowapi.errors import RateLimitExceeded
 from core.database import get_db
 from core.dependencies import get_current_admin
 from core.config import settings
+from core.pagination import COUNT_EXACT, EPOCH, SortKey, envelope, paginate
 from models.user import User
 from models.place_existing import Place, Booking, PlaceService
 from schemas.admin import AdminPlaceResponse, PaginatedResponse
+from services.place_cache import invalidate_place
+from services.geo_index import place_geo_index
+from services.place_facets import facet_snapshot, invalidate_facets_if_changed
 
 router = APIRouter()
 limiter = Limiter(key_func=get_remote_address)
@@ -27,6 +31,8 @@ limiter = Limiter(key_func=get_remote_address)
 async def get_places(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (replaces page)"),
+    count: str = Query(COUNT_EXACT, regex="^(exact|estimate|none)$", description="Total count mode"),
     search: Optional[str] = Query(None, description="Search by place name"),
     owner_id: Optional[int] = Query(None, description="Filter by owner ID"),
     tipo: Optional[str] = Query(None, description="Filter by place type"),
@@ -64,35 +70,16 @@ async def get_places(
         elif status_filter == "inactive":
             query = query.where(Place.is_active == False)
         
-        # Get total count
-        count_query = select(func.count(Place.id))
-        if search:
-            search_term = f"%{search}%"
-            count_query = count_query.where(Place.nome.ilike(search_term))
-        if owner_id:
-            count_query = count_query.where(Place.owner_id == owner_id)
-        if tipo:
-            count_query = count_query.where(Place.tipo == tipo)
-        if cidade:
-            count_query = count_query.where(Place.cidade.ilike(f"%{cidade}%"))
-        if status_filter == "active":
-            count_query = count_query.where(Place.is_active == True)
-        elif status_filter == "inactive":
-            count_query = count_query.where(Place.is_active == False)
-        
-        total_result = await db.execute(count_query)
-        total = total_result.scalar() or 0
-        
-        # Apply pagination and ordering
-        query = query.order_by(desc(Place.created_at))
-        query = query.offset((page - 1) * per_page).limit(per_page)
-        
-        result = await db.execute(query)
-        places_with_owners = result.fetchall()
+        # Newest first; keyset over (created_at, id) with the count derived from the same query
+        page_data = await paginate(
+            db, query,
+            [SortKey(func.coalesce(Place.created_at, EPOCH), descending=True), SortKey(Place.id, descending=True)],
+            per_page, cursor=cursor, offset=(page - 1) * per_page, count=count
+        )
         
         # Build response with additional data
         place_responses = []
-        for place, owner in places_with_owners:
+        for place, owner in page_data.items:
             # Get bookings count for this place
             bookings_result = await db.execute(
                 select(func.count(Booking.id)).where(Booking.salon_id == place.id)
@@ -127,18 +114,10 @@ async def get_places(
                 created_at=place.created_at
             ))
         
-        pages = (total + per_page - 1) // per_page
-        
-        return PaginatedResponse(
-            items=place_responses,
-            total=total,
-            page=page,
-            per_page=per_page,
-            pages=pages,
-            has_next=page < pages,
-            has_prev=page > 1
-        )
+        return PaginatedResponse(**envelope(page_data, place_responses, per_page, None if cursor else page))
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -256,12 +235,16 @@ async def toggle_place_booking(
                 detail="Place not found"
             )
         
+        facets_before = facet_snapshot(place)
         # Toggle booking status
         place.booking_enabled = not place.booking_enabled
         place.updated_at = datetime.utcnow()
         
         await db.commit()
         await db.refresh(place)
+        await invalidate_place(place.id)
+        place_geo_index.sync_place(place)
+        invalidate_facets_if_changed(facets_before, place)
         
         return {
             "message": f"Place booking {'enabled' if place.booking_enabled else 'disabled'}",
@@ -297,12 +280,16 @@ async def toggle_place_status(
                 detail="Place not found"
             )
         
+        facets_before = facet_snapshot(place)
         # Toggle status
         place.is_active = not place.is_active
         place.updated_at = datetime.utcnow()
         
         await db.commit()
         await db.refresh(place)
+        await invalidate_place(place.id)
+        place_geo_index.sync_place(place)
+        invalidate_facets_if_changed(facets_before, place)
         
         return {
             "message": f"Place status updated to {'active' if place.is_active else 'inactive'}",
@@ -338,12 +325,16 @@ async def toggle_place_bio_diamond(
                 detail="Place not found"
             )
         
+        facets_before = facet_snapshot(place)
         # Toggle BIO Diamond status
         place.is_bio_diamond = not place.is_bio_diamond
         place.updated_at = datetime.utcnow()
         
         await db.commit()
         await db.refresh(place)
+        await invalidate_place(place.id)
+        place_geo_index.sync_place(place)
+        invalidate_facets_if_changed(facets_before, place)
         
         return {
             "message": f"Place BIO Diamond status {'enabled' if place.is_bio_diamond else 'disabled'}",
@@ -394,6 +385,8 @@ async def update_place_configuration(
         
         await db.commit()
         await db.refresh(place)
+        await invalidate_place(place.id)
+        place_geo_index.sync_place(place)
         
         return {
             "message": "Place configuration updated successfully",
@@ -224,3 +224,33 @@ async def get_platform_trends(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to fetch platform trends: {str(e)}"
         )
+
+@router.get("/cache")
+# @limiter.limit(settings.RATE_LIMIT_MOBILE_READ)
+async def get_cache_stats(
+    current_user: User = Depends(get_current_admin)
+):
+    """Get hit/miss counters for the place detail, search facet, principal and entitlement caches"""
+    from services.place_cache import place_detail_cache
+    from services.place_facets import place_facet_cache
+    from core.principal import principal_cache
+    from services.entitlements import entitlement_service
+
+    return {
+        "enabled": settings.PLACE_CACHE_ENABLED,
+        "place_detail": place_detail_cache.stats(),
+        "place_facets": place_facet_cache.stats(),
+        "principals": principal_cache.stats(),
+        "entitlements": entitlement_service.stats()
+    }
+
+
+@router.get("/pool")
+# @limiter.limit(settings.RATE_LIMIT_MOBILE_READ)
+async def get_pool_stats(
+    current_user: User = Depends(get_current_admin)
+):
+    """Get database connection pool usage and checkout wait times for this worker"""
+    from core.database import pool_status
+
+    return pool_status()
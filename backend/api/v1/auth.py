@@ -11,17 +11,20 @@ import json
 import urllib.parse
 import httpx
 import asyncio
+import logging
 
 try:
     from core.database import get_db
     from core.security import verify_password, get_password_hash, create_access_token, create_refresh_token, verify_token, create_password_reset_token, verify_password_reset_token
     from core.dependencies import get_current_user
+    from core.principal import invalidate_principal, principal_claims
     from core.config import settings
     from models.user import User
 except ImportError:
     from core.database import get_db
     from core.security import verify_password, get_password_hash, create_access_token, create_refresh_token, verify_token, create_password_reset_token, verify_password_reset_token
     from core.dependencies import get_current_user
+    from core.principal import invalidate_principal, principal_claims
     from core.config import settings
     from models.user import User
 try:
@@ -42,6 +45,7 @@ except ImportError:
     )
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 limiter = Limiter(key_func=get_remote_address)
 
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
@@ -68,7 +72,7 @@ async def register(user_in: RegisterRequest, db: AsyncSession = Depends(get_db))
         requires_payment = False
         if is_pro_plan:
             requires_payment = True
-            print(f"🔍 Pro plan registration detected - requires payment before account creation")
+            logger.debug("Pro plan registration detected - requires payment before account creation")
         else:
             # Check trial_days for other plans
             plan_result = await db.execute(
@@ -77,7 +81,7 @@ async def register(user_in: RegisterRequest, db: AsyncSession = Depends(get_db))
             plan = plan_result.scalar_one_or_none()
             if plan and plan.trial_days == 0:
                 requires_payment = True
-                print(f"🔍 Plan {user_in.selected_plan_code} has no trial - requires payment before account creation")
+                logger.debug("Plan %s has no trial - requires payment before account creation", user_in.selected_plan_code)
         
         if requires_payment:
             # Check if Stripe is configured
@@ -90,7 +94,7 @@ async def register(user_in: RegisterRequest, db: AsyncSession = Depends(get_db))
             # Create Stripe checkout session WITHOUT creating account
             # Account will be created after payment succeeds via webhook
             try:
-                print(f"🔄 Creating Stripe checkout session for {user_in.selected_plan_code} plan registration...")
+                logger.info("Creating Stripe checkout session for %s plan registration...", user_in.selected_plan_code)
                 
                 registration_data = {
                     "first_name": user_in.first_name,
@@ -111,7 +115,7 @@ async def register(user_in: RegisterRequest, db: AsyncSession = Depends(get_db))
                 )
                 
                 if result and result.get("url"):
-                    print(f"✅ Checkout session created, returning checkout URL")
+                    logger.info("Checkout session created, returning checkout URL")
                     # Return checkout URL - frontend will redirect
                     return JSONResponse(
                         status_code=200,
@@ -129,10 +133,8 @@ async def register(user_in: RegisterRequest, db: AsyncSession = Depends(get_db))
             except HTTPException:
                 raise
             except Exception as e:
-                import traceback
                 error_detail = str(e)
-                print(f"❌ Error creating checkout session: {error_detail}")
-                print(f"❌ Traceback: {traceback.format_exc()}")
+                logger.error("Error creating checkout session: %s", error_detail, exc_info=True)
                 raise HTTPException(
                     status_code=400,
                     detail=f"Failed to create payment session: {error_detail}"
@@ -229,13 +231,12 @@ async def register(user_in: RegisterRequest, db: AsyncSession = Depends(get_db))
                     await db.commit()
         except Exception as e:
             # Do not block registration on subscription creation; frontend will retry via /subscriptions/start-trial
-            print(f"⚠️ Warning: Could not create subscription during registration: {e}")
+            logger.warning("Could not create subscription during registration: %s", e)
             pass
     
     # Send welcome email
     try:
-        from email_service import EmailService
-        email_service = EmailService()  # Initialize email service (same way as booking emails)
+        from services.email_outbox import queue_email
         user_name = user.first_name or user.name or user.email.split('@')[0]
         plan_name = None
         
@@ -250,26 +251,23 @@ async def register(user_in: RegisterRequest, db: AsyncSession = Depends(get_db))
             except Exception:
                 pass  # Don't block registration if plan lookup fails
         
-        print(f"📧 Attempting to send welcome email to {user.email}")
-        result = email_service.send_welcome_email(
+        queue_email(
+            db, "send_welcome_email",
             to_email=user.email,
             to_name=user_name,
             user_type=user.user_type,
             plan_name=plan_name,
             language=user.language_preference or 'en'
         )
-        if result:
-            print(f"✅ Welcome email sent successfully to {user.email}")
-        else:
-            print(f"⚠️ Welcome email failed to send to {user.email}")
+        await db.commit()
+        logger.info("Welcome email queued for %s", user.email)
     except Exception as e:
-        print(f"❌ Error sending welcome email: {e}")
-        import traceback
-        print(f"❌ Traceback: {traceback.format_exc()}")
+        await db.rollback()
+        logger.error("Error queueing welcome email: %s", e, exc_info=True)
         # Don't block registration on email failure
     
     # Generate tokens
-    access_token = create_access_token({"sub": str(user.id)})
+    access_token = create_access_token(principal_claims(user))
     refresh_token = create_refresh_token({"sub": str(user.id)})
     
     return AuthResponse(
@@ -310,7 +308,7 @@ async def login(login_data: LoginRequest):
             raise HTTPException(status_code=401, detail="Invalid credentials")
         
         # Generate tokens
-        access_token = create_access_token({"sub": str(user.id)})
+        access_token = create_access_token(principal_claims(user))
         refresh_token = create_refresh_token({"sub": str(user.id)})
         
         return TokenResponse(
@@ -341,7 +339,7 @@ async def refresh_token(request: Request, refresh_data: RefreshTokenRequest, db:
         raise HTTPException(status_code=401, detail="User not found")
     
     # Generate new access token
-    access_token = create_access_token({"sub": str(user.id)})
+    access_token = create_access_token(principal_claims(user))
     
     return TokenResponse(
         access_token=access_token,
@@ -354,6 +352,12 @@ async def refresh_token(request: Request, refresh_data: RefreshTokenRequest, db:
 # @limiter.limit(settings.RATE_LIMIT_STANDARD)
 async def logout(request: Request):
     """Logout user (client should discard tokens)"""
+    # Drop the cached principal so the next request re-reads the user
+    authorization = request.headers.get("Authorization", "")
+    if authorization.lower().startswith("bearer "):
+        payload = verify_token(authorization[7:])
+        if payload and str(payload.get("sub", "")).isdigit():
+            invalidate_principal(int(payload["sub"]))
     return LogoutResponse()
 
 @router.get("/validate", response_model=ValidateTokenResponse)
@@ -396,9 +400,7 @@ async def validate_token(request: Request, current_user: User = Depends(get_curr
             expires_at=None  # Token expiry is handled by JWT
         )
     except Exception as e:
-        import traceback
-        print(f"❌ Error in /validate endpoint: {str(e)}")
-        print(f"❌ Traceback: {traceback.format_exc()}")
+        logger.error("Error in /validate endpoint: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/me", response_model=UserResponse)
@@ -440,9 +442,7 @@ async def get_current_user_info(request: Request, current_user: User = Depends(g
             phone=phone,
         )
     except Exception as e:
-        import traceback
-        print(f"❌ Error in /me endpoint: {str(e)}")
-        print(f"❌ Traceback: {traceback.format_exc()}")
+        logger.error("Error in /me endpoint: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/oauth/status")
@@ -490,14 +490,14 @@ def _get_frontend_base_url(request: Request | None = None, use_referer: bool = T
                 # Only use if it's not Google's domain
                 if parsed.netloc and not parsed.netloc.endswith("google.com"):
                     frontend_url = f"{parsed.scheme}://{parsed.netloc}"
-                    print(f"🔑 Using frontend URL from referer: {frontend_url}")
+                    logger.debug("Using frontend URL from referer: %s", frontend_url)
                     return frontend_url
             except Exception:
                 pass
     
     # Fall back to settings or environment variable or default
     frontend_url = settings.FRONTEND_BASE_URL or os.getenv("FRONTEND_BASE_URL", "http://localhost:5173")
-    print(f"🔑 Using frontend URL from settings/env/default: {frontend_url}")
+    logger.debug("Using frontend URL from settings/env/default: %s", frontend_url)
     return frontend_url
 
 async def _issue_tokens_for_user(
@@ -524,8 +524,8 @@ async def _issue_tokens_for_user(
     if selected_plan_code and user_type == "business_owner":
         # Check if this is Pro plan or any plan with no trial (requires payment)
         if selected_plan_code.lower() == "pro":
-            print(f"❌ CRITICAL ERROR: _issue_tokens_for_user called with Pro plan for {email}")
-            print(f"❌ Pro plan users must go through payment first. This is a bug in the OAuth flow.")
+            logger.error("CRITICAL ERROR: _issue_tokens_for_user called with Pro plan for %s", email)
+            logger.error("Pro plan users must go through payment first. This is a bug in the OAuth flow.")
             raise HTTPException(
                 status_code=400, 
                 detail="Pro plan registration requires payment. Please complete the payment process first."
@@ -537,8 +537,8 @@ async def _issue_tokens_for_user(
             plan_result = await db.execute(select(Plan).where(Plan.code == selected_plan_code, Plan.is_active == True))
             plan = plan_result.scalar_one_or_none()
             if plan and plan.trial_days == 0:
-                print(f"❌ CRITICAL ERROR: _issue_tokens_for_user called with no-trial plan '{selected_plan_code}' for {email}")
-                print(f"❌ Plans with no trial must go through payment first. This is a bug in the OAuth flow.")
+                logger.error("CRITICAL ERROR: _issue_tokens_for_user called with no-trial plan '%s' for %s", selected_plan_code, email)
+                logger.error("Plans with no trial must go through payment first. This is a bug in the OAuth flow.")
                 raise HTTPException(
                     status_code=400, 
                     detail=f"{selected_plan_code.title()} plan registration requires payment. Please complete the payment process first."
@@ -547,7 +547,7 @@ async def _issue_tokens_for_user(
             raise  # Re-raise the HTTPException we just created
         except Exception as e:
             # If we can't check the plan, log but don't block (better to allow than block incorrectly)
-            print(f"⚠️ Could not verify plan trial_days for safety check: {e}")
+            logger.warning("Could not verify plan trial_days for safety check: %s", e)
     
     # Try to query user, but handle case where profile_picture column doesn't exist
     try:
@@ -563,7 +563,7 @@ async def _issue_tokens_for_user(
             "undefinedcolumn" in error_str.lower() or 
             "does not exist" in error_str or
             "ProgrammingError" in error_type):
-            print(f"⚠️ Profile picture or phone column doesn't exist, querying without it")
+            logger.warning("Profile picture or phone column doesn't exist, querying without it")
             # Query using raw SQL to exclude profile_picture and phone columns
             from sqlalchemy import text
             query_text = text("""
@@ -590,8 +590,7 @@ async def _issue_tokens_for_user(
                 user = None
         else:
             # Different error - re-raise it
-            import traceback
-            print(f"❌ Query error: {traceback.format_exc()}")
+            logger.error("Query error", exc_info=True)
             raise
     
     is_new_user = False
@@ -634,7 +633,7 @@ async def _issue_tokens_for_user(
             error_type = type(db_error).__name__
             error_repr = repr(db_error).lower()
             
-            print(f"⚠️ Database error during user creation: {error_type}: {error_str}")
+            logger.warning("Database error during user creation: %s: %s", error_type, error_str)
             
             # Check if it's a column-related error (PostgreSQL, SQLite, etc.)
             # Catch various database exceptions that indicate missing column
@@ -650,7 +649,7 @@ async def _issue_tokens_for_user(
             )
             
             if is_column_error and ("profile_picture" in user_data or "phone" in error_str):
-                print(f"⚠️ Profile picture or phone column doesn't exist, creating user without it")
+                logger.warning("Profile picture or phone column doesn't exist, creating user without it")
                 # Remove profile_picture and phone if they exist
                 user_data.pop("profile_picture", None)
                 user_data.pop("phone", None)
@@ -664,11 +663,10 @@ async def _issue_tokens_for_user(
                 db.add(user)
                 await db.commit()
                 await db.refresh(user)
-                print(f"✅ User created without profile_picture column")
+                logger.info("User created without profile_picture column")
             else:
                 # Re-raise if it's a different error
-                import traceback
-                print(f"❌ Unexpected database error: {traceback.format_exc()}")
+                logger.error("Unexpected database error", exc_info=True)
                 raise
 
         # Start a user-level trial for business owners (no card required)
@@ -747,8 +745,7 @@ async def _issue_tokens_for_user(
     # Send welcome email for new users
     if is_new_user:
         try:
-            from email_service import EmailService
-            email_service = EmailService()  # Initialize email service (same way as booking emails)
+            from services.email_outbox import queue_email
             user_name = user.first_name or user.name or user.email.split('@')[0]
             plan_name = None
             
@@ -763,23 +760,22 @@ async def _issue_tokens_for_user(
                 except Exception:
                     pass  # Don't block on plan lookup failure
             
-            print(f"📧 Attempting to send welcome email to {user.email}")
-            result = email_service.send_welcome_email(
+            queue_email(
+                db, "send_welcome_email",
                 to_email=user.email,
                 to_name=user_name,
                 user_type=user.user_type,
                 plan_name=plan_name,
                 language=getattr(user, 'language_preference', None) or 'en'
             )
-            if result:
-                print(f"✅ Welcome email sent successfully to {user.email}")
-            else:
-                print(f"⚠️ Welcome email failed to send to {user.email}")
+            await db.commit()
+            logger.info("Welcome email queued for %s", user.email)
         except Exception as e:
-            print(f"⚠️ Error sending welcome email: {e}")
+            await db.rollback()
+            logger.warning("Error queueing welcome email: %s", e)
             # Don't block OAuth flow on email failure
     
-    access_token = create_access_token({"sub": str(user.id)})
+    access_token = create_access_token(principal_claims(user))
     refresh_token = create_refresh_token({"sub": str(user.id)})
     return access_token, refresh_token, is_new_user
 
@@ -799,7 +795,7 @@ def _callback_success_html(access_token: str, refresh_token: str, redirect_path:
     separator = '&' if '?' in redirect_path else '?'
     redirect_url = f"{redirect_path}{separator}{tokens}"
     
-    print(f"🔑 Final redirect URL: {redirect_url}")
+    logger.debug("Final redirect URL: %s", redirect_url)
     
     return f"""
 <!DOCTYPE html>
@@ -834,7 +830,7 @@ def _callback_error_html(error_message: str, redirect_path: str = "/login") -> s
     separator = '&' if '?' in redirect_path else '?'
     redirect_url = f"{redirect_path}{separator}{error_param}"
     
-    print(f"🔑 Error redirect URL: {redirect_url}")
+    logger.debug("Error redirect URL: %s", redirect_url)
     
     redirect_url_escaped = json.dumps(redirect_url)
     error_message_escaped = json.dumps(error_message)
@@ -873,11 +869,11 @@ async def google_oauth_start(request: Request, user_type: str = "customer", sele
         
         if not client_id or not client_secret:
             error_msg = "Google OAuth not configured: Missing GOOGLE_CLIENT_ID or GOOGLE_CLIENT_SECRET environment variables"
-            print(f"❌ {error_msg}")
+            logger.error(error_msg)
             raise HTTPException(status_code=500, detail=error_msg)
 
         redirect_uri = f"{_get_base_api_url()}/auth/google/callback"
-        print(f"🔑 Starting Google OAuth - redirect_uri: {redirect_uri}, user_type: {user_type}, action: {action}")
+        logger.debug("Starting Google OAuth - redirect_uri: %s, user_type: %s, action: %s", redirect_uri, user_type, action)
         
         # Encode state with user_type, plan info, action, AND redirect_uri to ensure exact match
         # This ensures the redirect_uri in token exchange matches what was sent in authorization
@@ -905,25 +901,22 @@ async def google_oauth_start(request: Request, user_type: str = "customer", sele
         raise
     except Exception as e:
         error_msg = f"Error starting Google OAuth: {str(e)}"
-        print(f"❌ {error_msg}")
-        import traceback
-        print(f"❌ Traceback: {traceback.format_exc()}")
+        logger.error(error_msg, exc_info=True)
         raise HTTPException(status_code=500, detail=error_msg)
 
 @router.get("/google/callback")
 async def google_oauth_callback(request: Request, code: str | None = None, state: str | None = None, error: str | None = None):
     """Handle Google OAuth callback with improved error handling"""
-    import traceback
     
     try:
         if error:
             error_msg = f"Google OAuth error: {error}"
-            print(f"❌ Google OAuth error: {error}")
+            logger.error("Google OAuth error: %s", error)
             raise HTTPException(status_code=400, detail=error_msg)
         
         if not code:
             error_msg = "Missing authorization code"
-            print(f"❌ {error_msg}")
+            logger.error(error_msg)
             raise HTTPException(status_code=400, detail=error_msg)
 
         # Decode state to get user_type, plan, action, and redirect_uri
@@ -939,38 +932,36 @@ async def google_oauth_callback(request: Request, code: str | None = None, state
                 selected_plan_code = state_data.get("selected_plan_code")
                 action = state_data.get("action", "register")  # 'login' or 'register'
                 redirect_uri_from_state = state_data.get("redirect_uri")  # Get stored redirect_uri
-                print(f"🔍 Decoded state - user_type: {user_type}, selected_plan_code: {selected_plan_code}, action: {action}")
+                logger.debug("Decoded state - user_type: %s, selected_plan_code: %s, action: %s", user_type, selected_plan_code, action)
             except Exception as e:
-                print(f"⚠️ Failed to decode state: {e}")
-                import traceback
-                print(f"⚠️ Traceback: {traceback.format_exc()}")
+                logger.warning("Failed to decode state: %s", e, exc_info=True)
                 pass  # Use defaults if state decode fails
         else:
-            print(f"⚠️ No state parameter in OAuth callback")
+            logger.warning("No state parameter in OAuth callback")
 
         client_id = settings.GOOGLE_CLIENT_ID or os.getenv("GOOGLE_CLIENT_ID", "")
         client_secret = settings.GOOGLE_CLIENT_SECRET or os.getenv("GOOGLE_CLIENT_SECRET", "")
         
         if not client_id or not client_secret:
             error_msg = "Google OAuth not configured: Missing GOOGLE_CLIENT_ID or GOOGLE_CLIENT_SECRET"
-            print(f"❌ {error_msg}")
+            logger.error(error_msg)
             raise HTTPException(status_code=500, detail=error_msg)
         
         # Use the redirect_uri from state if available (this ensures exact match with authorization request)
         # Otherwise fall back to constructing from request URL
         if redirect_uri_from_state:
             redirect_uri = redirect_uri_from_state
-            print(f"🔑 Google OAuth callback - Using redirect_uri from state: {redirect_uri}")
+            logger.debug("Google OAuth callback - Using redirect_uri from state: %s", redirect_uri)
         else:
             # Fallback: construct from request URL
             scheme = request.url.scheme
             host = request.headers.get("host") or request.url.hostname
             path = request.url.path
             redirect_uri = f"{scheme}://{host}{path}"
-            print(f"🔑 Google OAuth callback - Constructed redirect_uri from request: {redirect_uri}")
-            print(f"   - Scheme: {scheme}")
-            print(f"   - Host: {host}")
-            print(f"   - Path: {path}")
+            logger.debug("Google OAuth callback - Constructed redirect_uri from request: %s", redirect_uri)
+            logger.debug("   - Scheme: %s", scheme)
+            logger.debug("   - Host: %s", host)
+            logger.debug("   - Path: %s", path)
 
         # Exchange code for tokens
         token_url = "https://oauth2.googleapis.com/token"
@@ -983,30 +974,30 @@ async def google_oauth_callback(request: Request, code: str | None = None, state
         }
         
         # Debug: Log request details (without exposing secrets)
-        print(f"🔑 Token exchange request:")
-        print(f"   - Client ID: {client_id[:20]}...{client_id[-10:]}")
-        print(f"   - Client Secret: {client_secret[:5]}...{client_secret[-5:] if len(client_secret) > 10 else '***'}")
-        print(f"   - Redirect URI: {redirect_uri}")
-        print(f"   - Code length: {len(code) if code else 0}")
+        logger.debug("Token exchange request:")
+        logger.debug("   - Client ID: %s...%s", client_id[:20], client_id[-10:])
+        logger.debug("   - Client Secret: %s...%s", client_secret[:5], client_secret[-5:] if len(client_secret) > 10 else '***')
+        logger.debug("   - Redirect URI: %s", redirect_uri)
+        logger.debug("   - Code length: %s", len(code) if code else 0)
         
         async with httpx.AsyncClient(timeout=15.0) as client:
             try:
                 # Log the full request for debugging (without exposing secret)
-                print(f"🔍 Full token exchange data:")
-                print(f"   - URL: {token_url}")
-                print(f"   - client_id: {client_id}")
-                print(f"   - redirect_uri: {redirect_uri}")
-                print(f"   - grant_type: authorization_code")
-                print(f"   - code: {code[:20]}...{code[-10:] if len(code) > 30 else ''}")
+                logger.debug("Full token exchange data:")
+                logger.debug("   - URL: %s", token_url)
+                logger.debug("   - client_id: %s", client_id)
+                logger.debug("   - redirect_uri: %s", redirect_uri)
+                logger.debug("   - grant_type: authorization_code")
+                logger.debug("   - code: %s...%s", code[:20], code[-10:] if len(code) > 30 else '')
                 
                 token_resp = await client.post(token_url, data=data)
                 if token_resp.status_code != 200:
                     error_text = token_resp.text
-                    print(f"❌ Failed to obtain Google access token: {token_resp.status_code} - {error_text}")
-                    print(f"❌ Request redirect_uri: {redirect_uri}")
-                    print(f"❌ Client ID: {client_id}")
-                    print(f"❌ Client Secret length: {len(client_secret)}")
-                    print(f"❌ Client Secret starts with: {client_secret[:10]}")
+                    logger.error("Failed to obtain Google access token: %s - %s", token_resp.status_code, error_text)
+                    logger.error("Request redirect_uri: %s", redirect_uri)
+                    logger.error("Client ID: %s", client_id)
+                    logger.error("Client Secret length: %s", len(client_secret))
+                    logger.error("Client Secret starts with: %s", client_secret[:10])
                     
                     # Parse error response to provide better error messages
                     try:
@@ -1029,11 +1020,11 @@ async def google_oauth_callback(request: Request, code: str | None = None, state
                         else:
                             user_msg = f"Authentication error: {error_description or error_type}"
                         
-                        print(f"❌ Verify in Google Console:")
-                        print(f"   1. Redirect URI should be: {redirect_uri}")
-                        print(f"   2. Client ID should be: {client_id}")
-                        print(f"   3. Application type should be: Web application")
-                        print(f"   4. Client secret should match the one in .env")
+                        logger.error("Verify in Google Console:")
+                        logger.error("   1. Redirect URI should be: %s", redirect_uri)
+                        logger.error("   2. Client ID should be: %s", client_id)
+                        logger.error("   3. Application type should be: Web application")
+                        logger.error("   4. Client secret should match the one in .env")
                         
                         raise HTTPException(status_code=400, detail=user_msg)
                     except (ValueError, KeyError):
@@ -1044,7 +1035,7 @@ async def google_oauth_callback(request: Request, code: str | None = None, state
                 access_token_google = token_json.get("access_token")
                 if not access_token_google:
                     error_msg = "Google token missing in response"
-                    print(f"❌ {error_msg} - Response: {token_json}")
+                    logger.error("%s - Response: %s", error_msg, token_json)
                     raise HTTPException(status_code=400, detail=error_msg)
 
                 # Fetch userinfo
@@ -1055,7 +1046,7 @@ async def google_oauth_callback(request: Request, code: str | None = None, state
                 if userinfo_resp.status_code != 200:
                     error_text = userinfo_resp.text
                     error_msg = f"Failed to fetch Google user info: {userinfo_resp.status_code} - {error_text}"
-                    print(f"❌ {error_msg}")
+                    logger.error(error_msg)
                     raise HTTPException(status_code=400, detail=error_msg)
                 
                 ui = userinfo_resp.json()
@@ -1066,16 +1057,16 @@ async def google_oauth_callback(request: Request, code: str | None = None, state
                 picture = ui.get("picture")  # Google profile picture URL
                 if not email or not sub:
                     error_msg = f"Google user info incomplete - email: {email}, sub: {sub}"
-                    print(f"❌ {error_msg} - Userinfo: {ui}")
+                    logger.error("%s - Userinfo: %s", error_msg, ui)
                     raise HTTPException(status_code=400, detail=error_msg)
                 
-                print(f"✅ Google user info retrieved - email: {email}, picture: {picture}")
+                logger.info("Google user info retrieved - email: %s, picture: %s", email, picture)
                 if picture:
-                    print(f"📸 Google profile picture URL: {picture}")
+                    logger.info("Google profile picture URL: %s", picture)
 
             except httpx.HTTPError as e:
                 error_msg = f"Network error during Google OAuth: {str(e)}"
-                print(f"❌ {error_msg}")
+                logger.error(error_msg)
                 raise HTTPException(status_code=500, detail=error_msg)
 
         # ALWAYS check if user exists first (for both login and register)
@@ -1087,7 +1078,7 @@ async def google_oauth_callback(request: Request, code: str | None = None, state
                 result = await db.execute(select(User).where(User.email == email))
                 existing_user = result.scalar_one_or_none()
                 user_exists = existing_user is not None
-                print(f"🔍 User existence check - email: {email}, exists: {user_exists}")
+                logger.debug("User existence check - email: %s, exists: %s", email, user_exists)
             except Exception as e:
                 # If there's an error checking (e.g., column doesn't exist), try raw SQL
                 try:
@@ -1096,10 +1087,10 @@ async def google_oauth_callback(request: Request, code: str | None = None, state
                     result = await db.execute(query_text, {"email": email})
                     row = result.first()
                     user_exists = row is not None
-                    print(f"🔍 User existence check (raw SQL) - email: {email}, exists: {user_exists}")
+                    logger.debug("User existence check (raw SQL) - email: %s, exists: %s", email, user_exists)
                 except Exception as check_error:
                     # If we can't check, log and proceed (better to allow than block)
-                    print(f"⚠️ Could not verify user existence: {check_error}")
+                    logger.warning("Could not verify user existence: %s", check_error)
                     pass
         
         # Handle based on action and user existence
@@ -1109,16 +1100,16 @@ async def google_oauth_callback(request: Request, code: str | None = None, state
                     f"No account found with email {email}. "
                     "Please register first by selecting 'register' instead of 'Sign in'."
                 )
-                print(f"❌ {error_msg}")
+                logger.error(error_msg)
                 raise HTTPException(status_code=404, detail=error_msg)
-            print(f"✅ User exists for login - email: {email}")
+            logger.info("User exists for login - email: %s", email)
         elif action == "register":
             if user_exists:
                 error_msg = (
                     f"An account with email {email} already exists. "
                     "Please use the login option to access your account."
                 )
-                print(f"❌ {error_msg}")
+                logger.error(error_msg)
                 # Return HTML error page that redirects to login
                 frontend_url = _get_frontend_base_url(request, use_referer=False)
                 error_html = _callback_error_html(
@@ -1131,15 +1122,15 @@ async def google_oauth_callback(request: Request, code: str | None = None, state
         # For Pro plan (or any plan with no trial), redirect to Stripe checkout instead of creating account
         # IMPORTANT: This check must happen BEFORE creating the account
         requires_payment = False
-        print(f"🔍 Checking payment requirements - action: {action}, selected_plan_code: {selected_plan_code}, user_type: {user_type}")
-        print(f"🔍 selected_plan_code type: {type(selected_plan_code)}, value: {repr(selected_plan_code)}")
+        logger.debug("Checking payment requirements - action: %s, selected_plan_code: %s, user_type: %s", action, selected_plan_code, user_type)
+        logger.debug("selected_plan_code type: %s, value: %s", type(selected_plan_code), repr(selected_plan_code))
         
         # CRITICAL: For business owner registration, we MUST have a plan selected
         # If no plan is selected, this is an error - user should not be able to register without selecting a plan
         if action == "register" and user_type == "business_owner":
             if not selected_plan_code:
                 error_msg = "No plan selected. Please select a plan before registering as a business owner."
-                print(f"❌ {error_msg}")
+                logger.error(error_msg)
                 frontend_url = _get_frontend_base_url(request, use_referer=False)
                 error_html = _callback_error_html(
                     error_msg,
@@ -1147,16 +1138,16 @@ async def google_oauth_callback(request: Request, code: str | None = None, state
                 )
                 return HTMLResponse(content=error_html, media_type="text/html")
             
-            print(f"🔍 Plan code check passed - proceeding to check if payment required")
+            logger.debug("Plan code check passed - proceeding to check if payment required")
             # Always require payment for Pro plan, regardless of trial_days setting
             plan_code_lower = selected_plan_code.lower().strip() if selected_plan_code else ""
-            print(f"🔍 Comparing plan code: '{plan_code_lower}' == 'pro'")
+            logger.debug("Comparing plan code: '%s' == 'pro'", plan_code_lower)
             if plan_code_lower == "pro":
                 requires_payment = True
-                print(f"🔍 ✅ Pro plan registration detected - requires payment before account creation")
+                logger.debug("Pro plan registration detected - requires payment before account creation")
             else:
                 # For other plans, check if they have no trial
-                print(f"🔍 Plan code '{plan_code_lower}' is not 'pro', checking trial_days...")
+                logger.debug("Plan code '%s' is not 'pro', checking trial_days...", plan_code_lower)
                 try:
                     from models.subscription import Plan
                     from core.database import AsyncSessionLocal
@@ -1164,23 +1155,21 @@ async def google_oauth_callback(request: Request, code: str | None = None, state
                         plan_result = await db.execute(select(Plan).where(Plan.code == selected_plan_code, Plan.is_active == True))
                         plan = plan_result.scalar_one_or_none()
                         if plan:
-                            print(f"🔍 Plan found: {plan.code}, trial_days: {plan.trial_days}")
+                            logger.debug("Plan found: %s, trial_days: %s", plan.code, plan.trial_days)
                             if plan.trial_days == 0:
                                 requires_payment = True
-                                print(f"🔍 Plan {plan.code} has no trial - requires payment before account creation")
+                                logger.debug("Plan %s has no trial - requires payment before account creation", plan.code)
                         else:
-                            print(f"⚠️ Plan not found for code: {selected_plan_code}")
+                            logger.warning("Plan not found for code: %s", selected_plan_code)
                 except Exception as e:
-                    print(f"⚠️ Error checking plan requirements: {e}")
-                    import traceback
-                    print(f"⚠️ Traceback: {traceback.format_exc()}")
+                    logger.warning("Error checking plan requirements: %s", e, exc_info=True)
         
-        print(f"🔍 Final payment requirement check: requires_payment={requires_payment}")
+        logger.debug("Final payment requirement check: requires_payment=%s", requires_payment)
         
         # CRITICAL SAFETY CHECK: If Pro plan is selected but payment is not required, this is a bug
         if action == "register" and selected_plan_code and selected_plan_code.lower().strip() == "pro" and not requires_payment:
             error_msg = f"CRITICAL ERROR: Pro plan selected but payment not required. This is a bug. selected_plan_code={selected_plan_code}, requires_payment={requires_payment}"
-            print(f"❌ {error_msg}")
+            logger.error(error_msg)
             frontend_url = _get_frontend_base_url(request, use_referer=False)
             error_html = _callback_error_html(
                 "System error: Pro plan registration requires payment. Please contact support.",
@@ -1192,13 +1181,13 @@ async def google_oauth_callback(request: Request, code: str | None = None, state
         # User account will ONLY be created AFTER successful payment via webhook
         # This MUST happen before calling _issue_tokens_for_user
         if requires_payment:
-            print(f"🔍 Redirecting Pro plan OAuth registration to payment checkout")
+            logger.debug("Redirecting Pro plan OAuth registration to payment checkout")
             
             # CRITICAL: Check if Stripe is configured BEFORE attempting payment
             # If not configured, fail immediately - DO NOT create user account
             if not settings.STRIPE_SECRET_KEY:
                 error_msg = "Payment system is not configured. Pro plan registration requires payment setup. Please contact support."
-                print(f"❌ {error_msg}")
+                logger.error(error_msg)
                 frontend_url = _get_frontend_base_url(request, use_referer=False)
                 error_html = _callback_error_html(
                     error_msg,
@@ -1235,14 +1224,13 @@ async def google_oauth_callback(request: Request, code: str | None = None, state
                 
                 checkout_url = result.get("url")
                 if checkout_url:
-                    print(f"✅ Payment checkout session created, redirecting to: {checkout_url}")
+                    logger.info("Payment checkout session created, redirecting to: %s", checkout_url)
                     return RedirectResponse(url=checkout_url)
                 else:
                     raise ValueError("No checkout URL returned from payment provider")
             except Exception as e:
                 error_msg = f"Failed to create payment checkout session: {str(e)}"
-                print(f"❌ {error_msg}")
-                print(f"❌ Traceback: {traceback.format_exc()}")
+                logger.error(error_msg, exc_info=True)
                 # Show error to user - DO NOT create account if payment setup fails
                 frontend_url = _get_frontend_base_url(request, use_referer=False)
                 error_html = _callback_error_html(
@@ -1268,28 +1256,27 @@ async def google_oauth_callback(request: Request, code: str | None = None, state
                     place_id=None,  # Place will be created after OAuth
                     profile_picture=picture  # Pass Google profile picture URL
                 )
-                print(f"✅ User tokens issued - email: {email}, is_new_user: {is_new_user}")
+                logger.info("User tokens issued - email: %s, is_new_user: %s", email, is_new_user)
         except HTTPException:
             # Re-raise HTTP exceptions
             raise
         except Exception as e:
             error_msg = f"Database error during user creation: {str(e)}"
-            print(f"❌ {error_msg}")
-            print(f"❌ Traceback: {traceback.format_exc()}")
+            logger.error(error_msg, exc_info=True)
             raise HTTPException(status_code=500, detail=error_msg)
 
         # Don't use referer during callback (it will be from Google) - use settings/env
         frontend_url = _get_frontend_base_url(request, use_referer=False)
-        print(f"🔑 OAuth callback - frontend_url from settings: {frontend_url}")
+        logger.debug("OAuth callback - frontend_url from settings: %s", frontend_url)
         
         # For new business owners without a place, redirect to create place first
         redirect_path = f"{frontend_url}/"
         if is_new_user and user_type == "business_owner":
             redirect_path = f"{frontend_url}/owner/create-first-place"
         
-        print(f"🔑 OAuth callback redirecting to: {redirect_path}")
-        print(f"   - Access token length: {len(app_access)}")
-        print(f"   - Refresh token length: {len(app_refresh)}")
+        logger.debug("OAuth callback redirecting to: %s", redirect_path)
+        logger.debug("   - Access token length: %s", len(app_access))
+        logger.debug("   - Refresh token length: %s", len(app_refresh))
         
         html = _callback_success_html(app_access, app_refresh, redirect_path=redirect_path)
         return HTMLResponse(content=html, media_type="text/html")
@@ -1297,7 +1284,7 @@ async def google_oauth_callback(request: Request, code: str | None = None, state
     except HTTPException as http_exc:
         # Catch HTTP exceptions and display them properly
         error_msg = http_exc.detail if isinstance(http_exc.detail, str) else str(http_exc.detail)
-        print(f"❌ OAuth error: {error_msg}")
+        logger.error("OAuth error: %s", error_msg)
         
         # Get frontend URL for error redirect
         frontend_url = _get_frontend_base_url(request, use_referer=False)
@@ -1308,8 +1295,7 @@ async def google_oauth_callback(request: Request, code: str | None = None, state
     except Exception as e:
         # Catch any other unexpected errors
         error_msg = f"Unexpected error in Google OAuth callback: {str(e)}"
-        print(f"❌ {error_msg}")
-        print(f"❌ Traceback: {traceback.format_exc()}")
+        logger.error(error_msg, exc_info=True)
         
         # Get frontend URL for error redirect
         frontend_url = _get_frontend_base_url(request, use_referer=False)
@@ -1353,7 +1339,6 @@ async def facebook_oauth_start(request: Request, user_type: str = "customer", se
 @router.get("/facebook/callback")
 async def facebook_oauth_callback(request: Request, code: str | None = None, state: str | None = None, error: str | None = None):
     """Handle Facebook OAuth callback with improved error handling"""
-    import traceback
     
     try:
         if error:
@@ -1428,9 +1413,9 @@ async def facebook_oauth_callback(request: Request, code: str | None = None, sta
                             f"No account found with email {email}. "
                             "Please register first by selecting 'register' instead of 'Sign in'."
                         )
-                        print(f"❌ {error_msg}")
+                        logger.error(error_msg)
                         raise HTTPException(status_code=404, detail=error_msg)
-                    print(f"✅ User exists for login - email: {email}")
+                    logger.info("User exists for login - email: %s", email)
                 except HTTPException:
                     raise
                 except Exception as e:
@@ -1445,14 +1430,14 @@ async def facebook_oauth_callback(request: Request, code: str | None = None, sta
                             f"No account found with email {email}. "
                             "Please register first by selecting 'register' instead of 'Sign in'."
                         )
-                            print(f"❌ {error_msg}")
+                            logger.error(error_msg)
                             raise HTTPException(status_code=404, detail=error_msg)
-                        print(f"✅ User exists for login - email: {email}")
+                        logger.info("User exists for login - email: %s", email)
                     except HTTPException:
                         raise
                     except Exception as check_error:
                         # If we can't check, log and proceed (better to allow than block)
-                        print(f"⚠️ Could not verify user existence: {check_error}")
+                        logger.warning("Could not verify user existence: %s", check_error)
                         pass
 
         # Issue our app tokens
@@ -1483,7 +1468,7 @@ async def facebook_oauth_callback(request: Request, code: str | None = None, sta
     except HTTPException as http_exc:
         # Catch HTTP exceptions and display them properly
         error_msg = http_exc.detail if isinstance(http_exc.detail, str) else str(http_exc.detail)
-        print(f"❌ Facebook OAuth error: {error_msg}")
+        logger.error("Facebook OAuth error: %s", error_msg)
         
         # Get frontend URL for error redirect
         frontend_url = _get_frontend_base_url(request, use_referer=False)
@@ -1494,8 +1479,7 @@ async def facebook_oauth_callback(request: Request, code: str | None = None, sta
     except Exception as e:
         # Catch any other unexpected errors
         error_msg = f"Unexpected error in Facebook OAuth callback: {str(e)}"
-        print(f"❌ {error_msg}")
-        print(f"❌ Traceback: {traceback.format_exc()}")
+        logger.error(error_msg, exc_info=True)
         
         # Get frontend URL for error redirect
         frontend_url = _get_frontend_base_url(request, use_referer=False)
@@ -1508,10 +1492,7 @@ async def facebook_oauth_callback(request: Request, code: str | None = None, sta
 async def forgot_password(request_data: ForgotPasswordRequest, db: AsyncSession = Depends(get_db)):
     """Request password reset - sends email with reset link"""
     from datetime import datetime, timedelta, timezone
-    from email_service import EmailService
-    
-    # Initialize email service (same way as booking emails)
-    email_service = EmailService()
+    from services.email_outbox import queue_email
     
     # Find user by email
     result = await db.execute(select(User).where(User.email == request_data.email))
@@ -1529,46 +1510,32 @@ async def forgot_password(request_data: ForgotPasswordRequest, db: AsyncSession
     # Generate password reset token
     reset_token = create_password_reset_token(user.email)
     
-    # Store token in database
-    try:
-        user.password_reset_token = reset_token
-        user.password_reset_token_expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
-        await db.commit()
-    except Exception as e:
-        print(f"⚠️ Error storing password reset token: {e}")
-        import traceback
-        print(f"⚠️ Traceback: {traceback.format_exc()}")
-        await db.rollback()
-        # Still return success to not reveal if email exists
-        return ForgotPasswordResponse()
-    
     # Build reset URL
     frontend_url = _get_frontend_base_url(None, use_referer=False)
     reset_url = f"{frontend_url}/reset-password?token={reset_token}"
     
-    # Send password reset email
+    # Store the token and queue the reset email in one transaction
     try:
+        user.password_reset_token = reset_token
+        user.password_reset_token_expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
         user_name = user.first_name or user.name or user.email.split('@')[0]
         # Get language preference safely (might not exist on old users)
         language = getattr(user, 'language_preference', None) or 'en'
-        print(f"📧 Attempting to send password reset email to {user.email}")
-        print(f"📧 Reset URL: {reset_url}")
-        result = email_service.send_password_reset_email(
+        queue_email(
+            db, "send_password_reset_email",
             to_email=user.email,
             to_name=user_name,
             reset_token=reset_token,
             reset_url=reset_url,
             language=language
         )
-        if result:
-            print(f"✅ Password reset email sent successfully to {user.email}")
-        else:
-            print(f"⚠️ Password reset email failed to send to {user.email}")
+        await db.commit()
+        logger.info("Password reset email queued for %s", user.email)
     except Exception as e:
-        print(f"❌ Error sending password reset email: {e}")
-        import traceback
-        print(f"❌ Traceback: {traceback.format_exc()}")
+        logger.warning("Error storing password reset token: %s", e, exc_info=True)
+        await db.rollback()
         # Still return success to not reveal if email exists
+        return ForgotPasswordResponse()
     
     return ForgotPasswordResponse()
 
@@ -1620,6 +1587,7 @@ async def update_language_preference(
     current_user.language_preference = request_data.language
     await db.commit()
     await db.refresh(current_user)
+    invalidate_principal(current_user.id)
     
     return UpdateLanguagePreferenceResponse(
         message="Language preference updated successfully.",
@@ -1652,6 +1620,7 @@ async def update_profile(
     
     await db.commit()
     await db.refresh(current_user)
+    invalidate_principal(current_user.id)
     
     # Safely get profile_picture and other optional fields
     profile_picture = None
@@ -9,9 +9,11 @@ from services import stripe_service
 from pydantic import BaseModel
 from sqlalchemy import select
 from models.billing import Subscription as BillingSubscription
+import logging
 
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 class CreateSubscriptionRequest(BaseModel):
@@ -78,7 +80,7 @@ async def get_subscription(db: AsyncSession = Depends(get_db), current_user: Use
             
             # Log warning if multiple active subscriptions found
             if len(subs) > 1:
-                print(f"⚠️ Warning: User {current_user.id} has {len(subs)} active subscriptions. Using most recent: {sub.stripe_subscription_id}")
+                logger.warning("User %s has %s active subscriptions. Using most recent: %s", current_user.id, len(subs), sub.stripe_subscription_id)
             
             # Safely extract subscription data
             subscription_id = getattr(sub, 'stripe_subscription_id', None) or None
@@ -117,7 +119,7 @@ async def get_subscription(db: AsyncSession = Depends(get_db), current_user: Use
             status = "trialing" if place_sub.status == SubscriptionStatusEnum.TRIALING else "active"
             plan_code = plan.code if plan else None
             
-            print(f"ℹ️ User {current_user.id} has UserPlaceSubscription with plan {plan_code}, status: {status}")
+            logger.info("User %s has UserPlaceSubscription with plan %s, status: %s", current_user.id, plan_code, status)
             
             return SubscriptionResponse(
                 subscriptionId=None,  # No Stripe subscription ID for trial subscriptions
@@ -139,7 +141,7 @@ async def get_subscription(db: AsyncSession = Depends(get_db), current_user: Use
                 
                 # Check if user has a selected_plan_code stored somewhere
                 # For now, default to "basic" for users in trial
-                print(f"ℹ️ User {current_user.id} is in trial period, returning plan: {plan_code}")
+                logger.info("User %s is in trial period, returning plan: %s", current_user.id, plan_code)
                 
                 return SubscriptionResponse(
                     subscriptionId=None,  # No Stripe subscription ID for trial subscriptions
@@ -148,14 +150,12 @@ async def get_subscription(db: AsyncSession = Depends(get_db), current_user: Use
                 )
         
         # If no subscriptions found at all, return empty response
-        print(f"ℹ️ No active subscriptions found for user {current_user.id}")
+        logger.info("No active subscriptions found for user %s", current_user.id)
         return SubscriptionResponse()
         
     except Exception as e:
         # Log the error and return empty response instead of crashing
-        import traceback
-        print(f"⚠️ Error getting subscription for user {current_user.id}: {e}")
-        print(f"⚠️ Traceback: {traceback.format_exc()}")
+        logger.warning("Error getting subscription for user %s: %s", current_user.id, e, exc_info=True)
         # Return empty response instead of crashing - frontend should handle missing subscription gracefully
         return SubscriptionResponse()
 
@@ -245,10 +245,8 @@ async def create_checkout_session(req: CreateCheckoutSessionRequest, db: AsyncSe
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         error_detail = str(e)
-        print(f"❌ Error creating checkout session: {error_detail}")
-        print(f"❌ Traceback: {traceback.format_exc()}")
+        logger.error("Error creating checkout session: %s", error_detail, exc_info=True)
         raise HTTPException(status_code=400, detail=error_detail)
 
 
@@ -266,7 +264,7 @@ async def verify_checkout_session(req: VerifyCheckoutSessionRequest, db: AsyncSe
     
     try:
         session_id = req.session_id
-        print(f"🔍 Verifying checkout session: {session_id}")
+        logger.debug("Verifying checkout session: %s", session_id)
         
         # Retrieve checkout session from Stripe
         session = stripe.checkout.Session.retrieve(session_id)
@@ -314,7 +312,7 @@ async def verify_checkout_session(req: VerifyCheckoutSessionRequest, db: AsyncSe
         subscription_id = session.get("subscription")
         plan_code = metadata.get("plan_code") or registration_data.get("selected_plan_code")
         
-        print(f"✅ Payment successful, creating user account for {email}")
+        logger.info("Payment successful, creating user account for %s", email)
         await _create_user_from_registration_data(db, registration_data, subscription_id, plan_code)
         
         # Get the created user
@@ -329,9 +327,7 @@ async def verify_checkout_session(req: VerifyCheckoutSessionRequest, db: AsyncSe
     except Exception as e:
         error_type = type(e).__name__
         error_msg = str(e)
-        print(f"❌ Error verifying checkout session ({error_type}): {error_msg}")
-        import traceback
-        print(f"❌ Traceback: {traceback.format_exc()}")
+        logger.error("Error verifying checkout session (%s): %s", error_type, error_msg, exc_info=True)
         
         # Check if it's a Stripe error
         if hasattr(stripe, 'error') and isinstance(e, stripe.error.StripeError):
@@ -10,9 +10,12 @@ from datetime import datetime
 
 from core.database import get_db
 from models.place_existing import Place, Service, Booking
+from services.booking_writer import BookingConflictError, commit_booking
 from pydantic import BaseModel, EmailStr
+import logging
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 # Booking schemas (duplicate from places.py for standalone use)
@@ -175,7 +178,7 @@ async def create_booking(
     
     if existing_booking:
         raise HTTPException(
-            status_code=400,
+            status_code=409,
             detail="Employee is already booked at this time"
         )
     
@@ -213,7 +216,10 @@ async def create_booking(
     )
     
     db.add(booking)
-    await db.commit()
+    try:
+        await commit_booking(db)
+    except BookingConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     await db.refresh(booking)
     
     # Create notification for owner about new booking (asynchronous - don't fail booking if this fails)
@@ -234,10 +240,7 @@ async def create_booking(
             )
         except Exception as e:
             # Log error but don't fail the booking
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"❌ Error scheduling notification task for booking {booking.id}: {str(e)}")
-            print(f"⚠️ Failed to schedule notification task: {str(e)}")
+            logger.error("Error scheduling notification task for booking %s: %s", booking.id, e, exc_info=True)
     
     return BookingResponse(
         id=booking.id,
@@ -6,7 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
-from decimal import Decimal
+from datetime import datetime, timezone
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
@@ -19,6 +19,8 @@ from schemas.campaign import (
     ActiveCampaignResponse, ServicePriceCalculation
 )
 from services.campaign_service import CampaignService
+from services.campaign_index import campaign_index
+from services.campaign_pricing import price_services
 
 router = APIRouter()
 limiter = Limiter(key_func=get_remote_address)
@@ -46,43 +48,21 @@ async def get_active_campaigns_for_place(
     if not place:
         raise HTTPException(status_code=404, detail="Place not found")
     
-    # Get active campaigns
-    campaign_service = CampaignService(db)
-    campaigns = await campaign_service.get_active_campaigns_for_place(place_id)
+    # Campaigns running now (scheduled ones are not listed), from the applicability index
+    campaigns = await campaign_index.for_place(db, place_id)
     
     # Convert to response format
     active_campaigns = []
+    now = datetime.utcnow()
     for campaign in campaigns:
-        # Calculate days remaining from config
-        from datetime import datetime
-        now = datetime.utcnow()
-        days_remaining = 0
-        
-        if campaign.config and 'end_datetime' in campaign.config:
-            try:
-                end_datetime = datetime.fromisoformat(campaign.config['end_datetime'].replace('Z', '+00:00'))
-                days_remaining = (end_datetime - now).days
-            except (ValueError, TypeError):
-                days_remaining = 0
+        days_remaining = (campaign.end_datetime - now).days if campaign.end_datetime else 0
         
         # Extract campaign details from config
         config = campaign.config or {}
         
-        # Parse start and end datetimes
-        start_datetime = None
-        end_datetime = None
-        
-        if config.get('start_datetime'):
-            try:
-                start_datetime = datetime.fromisoformat(config['start_datetime'].replace('Z', '+00:00'))
-            except (ValueError, TypeError):
-                start_datetime = None
-        
-        if config.get('end_datetime'):
-            try:
-                end_datetime = datetime.fromisoformat(config['end_datetime'].replace('Z', '+00:00'))
-            except (ValueError, TypeError):
-                end_datetime = None
+        # Start and end datetimes were parsed when the index was built
+        start_datetime = campaign.start_datetime.replace(tzinfo=timezone.utc) if campaign.start_datetime else None
+        end_datetime = campaign.end_datetime.replace(tzinfo=timezone.utc) if campaign.end_datetime else None
         
         active_campaign = ActiveCampaignResponse(
             id=campaign.id,
@@ -116,7 +96,6 @@ async def get_campaigns_for_timeslot(
     db: AsyncSession = Depends(get_db)
 ):
     """Get active campaigns for a specific time slot (public API)"""
-    from datetime import datetime
     
     # Verify place exists and is active
     place_query = select(Place).where(
@@ -137,65 +116,41 @@ async def get_campaigns_for_timeslot(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date or time format")
     
-    # Get campaigns for this service
+    # Get campaigns for this service whose window contains the booking datetime
     campaign_service = CampaignService(db)
-    campaigns = await campaign_service.get_active_campaigns_for_service(place_id, service_id)
+    campaigns = await campaign_service.get_active_campaigns_for_service(
+        place_id, service_id, at=booking_datetime
+    )
     
-    # Filter campaigns by the specific datetime
     active_campaigns = []
     now = datetime.utcnow()
-    
-    def _parse_dt(value: str) -> datetime:
-        try:
-            return datetime.fromisoformat(value.replace('Z', '+00:00'))
-        except Exception:
-            pass
-        # Accept formats like "11/3/2025, 5:31:00 PM"
-        try:
-            return datetime.strptime(value, "%m/%d/%Y, %I:%M:%S %p")
-        except Exception:
-            pass
-        # Accept formats like "11/03/2025 17:31"
-        try:
-            return datetime.strptime(value, "%m/%d/%Y %H:%M")
-        except Exception:
-            pass
-        raise ValueError("Unsupported datetime format")
-
     for campaign in campaigns:
-        # Check if campaign is active at this specific datetime
-        if campaign.config and 'start_datetime' in campaign.config and 'end_datetime' in campaign.config:
-            try:
-                start = _parse_dt(campaign.config['start_datetime'])
-                end = _parse_dt(campaign.config['end_datetime'])
-                
-                # Check if booking datetime falls within campaign period
-                if start <= booking_datetime <= end:
-                    # Calculate days remaining
-                    days_remaining = (end - now).days if end > now else 0
-                    
-                    # Extract campaign details from config
-                    config = campaign.config or {}
-                    
-                    active_campaign = ActiveCampaignResponse(
-                        id=campaign.id,
-                        name=campaign.name,
-                        banner_message=config.get('banner_message', ''),
-                        campaign_type=campaign.type,
-                        start_datetime=start,
-                        end_datetime=end,
-                        discount_type=config.get('discount_type'),
-                        discount_value=config.get('discount_value'),
-                        rewards_multiplier=config.get('rewards_multiplier'),
-                        rewards_bonus_points=config.get('rewards_bonus_points'),
-                        free_service_type=config.get('free_service_type'),
-                        buy_quantity=config.get('buy_quantity'),
-                        get_quantity=config.get('get_quantity'),
-                        days_remaining=days_remaining
-                    )
-                    active_campaigns.append(active_campaign)
-            except (ValueError, TypeError):
-                continue
+        start = campaign.start_datetime.replace(tzinfo=timezone.utc)
+        end = campaign.end_datetime.replace(tzinfo=timezone.utc)
+        
+        # Calculate days remaining
+        days_remaining = (campaign.end_datetime - now).days if campaign.end_datetime > now else 0
+        
+        # Extract campaign details from config
+        config = campaign.config or {}
+        
+        active_campaign = ActiveCampaignResponse(
+            id=campaign.id,
+            name=campaign.name,
+            banner_message=config.get('banner_message', ''),
+            campaign_type=campaign.type,
+            start_datetime=start,
+            end_datetime=end,
+            discount_type=config.get('discount_type'),
+            discount_value=config.get('discount_value'),
+            rewards_multiplier=config.get('rewards_multiplier'),
+            rewards_bonus_points=config.get('rewards_bonus_points'),
+            free_service_type=config.get('free_service_type'),
+            buy_quantity=config.get('buy_quantity'),
+            get_quantity=config.get('get_quantity'),
+            days_remaining=days_remaining
+        )
+        active_campaigns.append(active_campaign)
     
     return active_campaigns
 
@@ -237,20 +192,9 @@ async def calculate_service_price(
     if not place_service.price:
         raise HTTPException(status_code=400, detail="Service has no price set")
     
-    original_price = Decimal(str(place_service.price))
-    
-    # Get active campaigns for this service
-    campaign_service = CampaignService(db)
-    campaigns = await campaign_service.get_active_campaigns_for_service(
-        place_id, service_id, place_service_id
-    )
-    
-    # Calculate discounted price
-    price_calculation = campaign_service.calculate_discounted_price(original_price, campaigns)
-    price_calculation.service_id = service_id
-    price_calculation.place_service_id = place_service_id
-    
-    return price_calculation
+    # Price against every campaign active for the place in one batch
+    campaigns = await campaign_index.for_place(db, place_id)
+    return price_services([place_service], campaigns)[0]
 
 
 @router.get("/price/place/{place_id}/services", response_model=List[ServicePriceCalculation])
@@ -275,35 +219,9 @@ async def calculate_all_service_prices(
     if not place_services:
         return []
     
-    # Get active campaigns for this place
-    campaign_service = CampaignService(db)
-    campaigns = await campaign_service.get_active_campaigns_for_place(place_id)
-    
-    # Calculate prices for each service
-    price_calculations = []
-    for place_service in place_services:
-        if place_service.price:
-            original_price = Decimal(str(place_service.price))
-            
-            # Get campaigns that apply to this specific service
-            service_campaigns = []
-            for campaign in campaigns:
-                is_eligible = await campaign_service.is_service_eligible_for_campaign(
-                    campaign, place_service.service_id, place_service.id
-                )
-                if is_eligible:
-                    service_campaigns.append(campaign)
-            
-            # Calculate discounted price
-            price_calculation = campaign_service.calculate_discounted_price(
-                original_price, service_campaigns
-            )
-            price_calculation.service_id = place_service.service_id
-            price_calculation.place_service_id = place_service.id
-            
-            price_calculations.append(price_calculation)
-    
-    return price_calculations
+    # Cheapest price per service across every (service, campaign) pair
+    campaigns = await campaign_index.for_place(db, place_id)
+    return price_services(place_services, campaigns)
 
 
 @router.get("/rewards/place/{place_id}/calculate", response_model=dict)
@@ -4,13 +4,16 @@ from sqlalchemy import select, and_, or_, Column, Integer, String, Date, Time, D
 from sqlalchemy.orm import declarative_base
 from typing import List, Optional
 from datetime import datetime, date, time
+import logging
 
 from core.database import get_db, Base
 from core.dependencies import get_current_user
 from models.user import User
+from services.email_outbox import queue_email
 from pydantic import BaseModel
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # Import the actual models
 from models.place_existing import Booking, Place, PlaceService, PlaceEmployee
@@ -71,7 +74,7 @@ async def get_customer_bookings(
         
         return await _format_bookings(bookings, db)
     except Exception as e:
-        print(f"Error in get_customer_bookings: {str(e)}")
+        logger.error("Error in get_customer_bookings: %s", e)
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 @router.get("/upcoming", response_model=List[CustomerBookingResponse])
@@ -95,7 +98,7 @@ async def get_upcoming_bookings(
         
         return await _format_bookings(bookings, db)
     except Exception as e:
-        print(f"Error in get_upcoming_bookings: {str(e)}")
+        logger.error("Error in get_upcoming_bookings: %s", e)
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 @router.get("/past", response_model=List[CustomerBookingResponse])
@@ -121,7 +124,7 @@ async def get_past_bookings(
         
         return await _format_bookings(bookings, db)
     except Exception as e:
-        print(f"Error in get_past_bookings: {str(e)}")
+        logger.error("Error in get_past_bookings: %s", e)
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 @router.get("/cancelled", response_model=List[CustomerBookingResponse])
@@ -143,7 +146,7 @@ async def get_cancelled_bookings(
         
         return await _format_bookings(bookings, db)
     except Exception as e:
-        print(f"Error in get_cancelled_bookings: {str(e)}")
+        logger.error("Error in get_cancelled_bookings: %s", e)
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 @router.put("/{booking_id}/cancel")
@@ -170,46 +173,30 @@ async def cancel_booking(
     if booking.status in ["cancelled", "completed"]:
         raise HTTPException(status_code=400, detail=f"Cannot cancel a {booking.status} booking")
     
-    # Cancel the booking
+    # Cancel the booking; the cancellation email is queued in the same transaction
     booking.status = "cancelled"
-    await db.commit()
-    
-    # Send email notification for cancellation
     if booking.customer_email:
-        try:
-            from email_service import EmailService
-            from models.place_existing import Place, Service
-            
-            # Get place and service information for email
-            place_result = await db.execute(
-                select(Place).where(Place.id == booking.place_id)
-            )
-            place = place_result.scalar_one_or_none()
-            
-            service_name = None
-            if booking.service_id:
-                service_result = await db.execute(
-                    select(Service).where(Service.id == booking.service_id)
-                )
-                service = service_result.scalar_one_or_none()
-                if service:
-                    service_name = service.name
-            
-            if place:
-                email_service = EmailService()
-                email_data = {
-                    'customer_name': booking.customer_name,
-                    'customer_email': booking.customer_email,
-                    'salon_name': place.nome,
-                    'service_name': service_name or 'Multiple Services',
-                    'booking_date': booking.booking_date.strftime("%Y-%m-%d"),
-                    'booking_time': booking.booking_time.strftime("%H:%M"),
-                    'duration': booking.duration or 0,
-                    'status': 'cancelled'
-                }
-                email_service.send_booking_status_notification(email_data)
-        except Exception as e:
-            print(f"Failed to send cancellation email notification: {str(e)}")
+        from models.place_existing import Service
+        
+        # Get place and service information for email
+        place = await db.scalar(select(Place).where(Place.id == booking.place_id))
+        service_name = None
+        if booking.service_id:
+            service_name = await db.scalar(select(Service.name).where(Service.id == booking.service_id))
+        
+        if place:
+            email_data = {
+                'customer_name': booking.customer_name,
+                'customer_email': booking.customer_email,
+                'salon_name': place.nome,
+                'service_name': service_name or 'Multiple Services',
+                'booking_date': booking.booking_date.strftime("%Y-%m-%d"),
+                'booking_time': booking.booking_time.strftime("%H:%M"),
+                'duration': booking.duration or 0,
+                'status': 'cancelled'
+            }
+            queue_email(db, "send_booking_status_notification", email_data)
+    await db.commit()
     
     return {"message": "Booking cancelled successfully", "booking_id": booking_id}
 
@@ -227,7 +214,7 @@ async def _format_bookings(bookings: List[Booking], db: AsyncSession) -> List[Cu
             if place:
                 salon_name = place.nome
         except Exception as e:
-            print(f"Error fetching place for booking {booking.id}: {e}")
+            logger.error("Error fetching place for booking %s: %s", booking.id, e)
         
         # Get service information
         service_name = None
@@ -242,7 +229,7 @@ async def _format_bookings(bookings: List[Booking], db: AsyncSession) -> List[Cu
                 service_price = service.price
                 service_duration = service.duration
         except Exception as e:
-            print(f"Error fetching service for booking {booking.id}: {e}")
+            logger.error("Error fetching service for booking %s: %s", booking.id, e)
         
         # Get employee information
         employee_name = None
@@ -260,7 +247,7 @@ async def _format_bookings(bookings: List[Booking], db: AsyncSession) -> List[Cu
                     employee_photo_url = employee.photo_url
                     employee_color_code = employee.color_code
             except Exception as e:
-                print(f"Error fetching employee for booking {booking.id}: {e}")
+                logger.error("Error fetching employee for booking %s: %s", booking.id, e)
         
         bookings_data.append(CustomerBookingResponse(
             id=booking.id,
@@ -2,9 +2,9 @@
 Fixed mobile places API that works with the existing database schema.
 Uses the 'places' table instead of 'businesses' table.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, and_, func
 from typing import List, Optional
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
@@ -13,9 +13,12 @@ from slowapi.errors import RateLimitExceeded
 from core.database import get_db
 from core.dependencies import get_current_user
 from core.config import settings
+from core.pagination import paginate, set_cursor_headers
 from models.user import User
 from models.place_existing import Place, Service, PlaceService
 from schemas.place_existing import PlaceResponse
+from services.geo_index import place_geo_index
+from services.place_search import apply_place_search, place_search_sort_keys
 
 router = APIRouter()
 limiter = Limiter(key_func=get_remote_address)
@@ -102,24 +105,19 @@ async def get_place_details(
 @router.get("/search", response_model=List[dict])
 # @limiter.limit(settings.RATE_LIMIT_MOBILE_READ)
 async def search_places(
+    response: Response,
     q: str = Query(..., description="Search query"),
     tipo: Optional[str] = None,
     cidade: Optional[str] = None,
     limit: int = Query(20, le=50),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (replaces offset)"),
     db: AsyncSession = Depends(get_db)
 ):
-    """Search places for mobile app"""
+    """Search places for mobile app (next page cursor in X-Next-Cursor)"""
     
-    # Build search query
-    search_conditions = [
-        Place.is_active == True,
-        or_(
-            func.lower(Place.nome).contains(func.lower(q)),
-            func.lower(Place.cidade).contains(func.lower(q)),
-            func.lower(Place.regiao).contains(func.lower(q))
-        )
-    ]
+    # Build search query (indexed, accent-insensitive, ranked by relevance)
+    search_conditions = [Place.is_active == True]
     
     if tipo:
         search_conditions.append(Place.tipo == tipo)
@@ -127,11 +125,10 @@ async def search_places(
     if cidade:
         search_conditions.append(func.lower(Place.cidade) == func.lower(cidade))
     
-    query = select(Place).where(and_(*search_conditions))
-    query = query.offset(offset).limit(limit)
-    
-    result = await db.execute(query)
-    places = result.scalars().all()
+    query = apply_place_search(select(Place).where(and_(*search_conditions)), q)
+    page_data = await paginate(db, query, place_search_sort_keys(q), limit, cursor=cursor, offset=offset)
+    set_cursor_headers(response, page_data)
+    places = page_data.items
     
     return [
         {
@@ -152,55 +149,21 @@ async def search_places(
 @router.get("/nearby", response_model=List[dict])
 # @limiter.limit(settings.RATE_LIMIT_MOBILE_READ)
 async def get_nearby_places(
-    lat: float = Query(..., description="Latitude"),
-    lng: float = Query(..., description="Longitude"),
-    radius: float = Query(5.0, description="Radius in kilometers"),
+    lat: float = Query(..., ge=-90, le=90, description="Latitude"),
+    lng: float = Query(..., ge=-180, le=180, description="Longitude"),
+    radius: float = Query(5.0, gt=0, le=500, description="Radius in kilometers"),
     tipo: Optional[str] = None,
-    limit: int = Query(20, le=50),
+    limit: int = Query(20, ge=1, le=50),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get places near a location for mobile app"""
-    
-    # Simple distance calculation (for production, use PostGIS or similar)
-    # This is a basic implementation - in production you'd use proper geospatial queries
-    query = select(Place).where(
-        and_(
-            Place.is_active == True,
-            Place.latitude.isnot(None),
-            Place.longitude.isnot(None)
-        )
-    )
-    
-    if tipo:
-        query = query.where(Place.tipo == tipo)
-    
-    query = query.limit(limit)
-    
-    result = await db.execute(query)
-    places = result.scalars().all()
-    
-    # Filter by distance (basic implementation)
-    nearby_places = []
-    for place in places:
-        if place.latitude and place.longitude:
-            # Simple distance calculation (not accurate for large distances)
-            distance = ((place.latitude - lat) ** 2 + (place.longitude - lng) ** 2) ** 0.5
-            if distance <= radius / 111.0:  # Rough conversion: 1 degree ≈ 111 km
-                nearby_places.append({
-                    "id": place.id,
-                    "nome": place.nome,
-                    "tipo": place.tipo,
-                    "cidade": place.cidade,
-                    "rua": place.rua,
-                    "telefone": place.telefone,
-                    "booking_enabled": place.booking_enabled,
-                    "is_bio_diamond": place.is_bio_diamond,
-                    "regiao": place.regiao,
-                    "latitude": place.latitude,
-                    "longitude": place.longitude
-                })
-    
-    return nearby_places
+    """
+    Get the places nearest to a location for mobile app, sorted by distance.
+
+    Mobile places are also returned when the location is inside their coverage radius.
+    """
+    await place_geo_index.ensure_fresh(db)
+    nearest = place_geo_index.nearest(lat, lng, radius, limit, tipo)
+    return [point.to_dict(distance_km) for point, distance_km in nearest]
 
 
 @router.get("/{place_id}/employees")
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_
 from typing import List, Optional
@@ -10,24 +10,64 @@ from slowapi.errors import RateLimitExceeded
 from core.database import get_db
 from core.dependencies import get_current_business_owner
 from core.config import settings
+from core.pagination import SortKey, paginate, set_cursor_headers
 from models.user import User
-from models.place_existing import Place, Booking, Service, PlaceService, PlaceEmployee, BookingService
+from models.place_existing import Place, Booking, Service, PlaceEmployee, BookingService
 from schemas.place_existing import PlaceBookingCreate, PlaceBookingUpdate, PlaceBookingResponse, BookingStatusUpdate
+from services.availability_engine import load_booking_index, place_slot_minutes
+from services.employee_assignment import load_assignment_inputs, pick_employee
+from services.email_outbox import queue_email
+from services.booking_writer import (
+    BookingConflictError, commit_booking, load_services_by_service_id, save_booking, user_id_for_email
+)
+import logging
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 limiter = Limiter(key_func=get_remote_address)
 
+
+async def _queue_status_email(db: AsyncSession, booking: Booking, place: Place, new_status: str) -> None:
+    """Queue the customer's status change email; it is written by the commit that saves the status"""
+    if not booking.customer_email:
+        return
+    service_name = None
+    if booking.service_id:
+        # Don't flush the pending change here: overlap conflicts are reported by commit_booking
+        with db.no_autoflush:
+            service_name = await db.scalar(select(Service.name).where(Service.id == booking.service_id))
+    email_data = {
+        'customer_name': booking.customer_name,
+        'customer_email': booking.customer_email,
+        'salon_name': place.nome,
+        'service_name': service_name or 'Multiple Services',
+        'booking_date': booking.booking_date.strftime("%Y-%m-%d"),
+        'booking_time': booking.booking_time.strftime("%H:%M"),
+        'duration': booking.duration or 0,
+        'status': new_status
+    }
+    queue_email(db, "send_booking_status_notification", email_data)
+
+
 @router.get("/places/{place_id}/bookings", response_model=List[PlaceBookingResponse])
 # @limiter.limit(settings.RATE_LIMIT_MOBILE_READ)
 async def get_place_bookings(
     place_id: int,
+    response: Response,
     status_filter: Optional[str] = None,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; all bookings when neither limit nor cursor is given"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     current_user: User = Depends(get_current_business_owner),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all bookings for a specific place with optional filters"""
+    """
+    Get bookings for a specific place with optional filters.
+    
+    Paged when limit or cursor is given (next page cursor in X-Next-Cursor);
+    otherwise returns the whole filtered range, as the calendar views expect.
+    """
     try:
         # Verify place ownership
         result = await db.execute(
@@ -57,11 +97,17 @@ async def get_place_bookings(
         if date_to:
             query = query.where(Booking.booking_date <= date_to)
         
-        # Order by booking date and time
-        query = query.order_by(Booking.booking_date, Booking.booking_time)
+        # Order by booking date and time; bookings without them are never listed
+        query = query.where(Booking.booking_date.isnot(None), Booking.booking_time.isnot(None))
+        sort_keys = [SortKey(Booking.booking_date), SortKey(Booking.booking_time), SortKey(Booking.id)]
         
-        result = await db.execute(query)
-        bookings = result.scalars().all()
+        if limit is not None or cursor:
+            page_data = await paginate(db, query, sort_keys, limit or 100, cursor=cursor)
+            set_cursor_headers(response, page_data)
+            bookings = page_data.items
+        else:
+            result = await db.execute(query.order_by(*[key.expression for key in sort_keys]))
+            bookings = result.scalars().all()
         
         # Convert to response format matching PlaceBookingResponse
         booking_responses = []
@@ -69,7 +115,7 @@ async def get_place_bookings(
             try:
                 # Skip bookings without required fields
                 if not booking.service_id or not booking.booking_date or not booking.booking_time:
-                    print(f"⚠️ Skipping booking {booking.id}: missing required fields (service_id={booking.service_id}, date={booking.booking_date}, time={booking.booking_time})")
+                    logger.warning("Skipping booking %s: missing required fields (service_id=%s, date=%s, time=%s)", booking.id, booking.service_id, booking.booking_date, booking.booking_time)
                     continue
                 
                 # Get service name
@@ -156,17 +202,15 @@ async def get_place_bookings(
                     updated_at=booking.updated_at
                 ))
             except Exception as booking_error:
-                print(f"🔥 Error processing booking {booking.id}: {str(booking_error)}")
-                print(f"   Booking data: service_id={booking.service_id}, date={booking.booking_date}, time={booking.booking_time}")
+                logger.error("Error processing booking %s: %s", booking.id, booking_error)
+                logger.error("   Booking data: service_id=%s, date=%s, time=%s", booking.service_id, booking.booking_date, booking.booking_time)
                 continue
         
         return booking_responses
     except HTTPException:
         raise
     except Exception as e:
-        print(f"🔥 Unhandled exception in get_place_bookings: {type(e).__name__}: {str(e)}")
-        import traceback
-        print(f"🔥 Traceback: {traceback.format_exc()}")
+        logger.error("Unhandled exception in get_place_bookings: %s: %s", type(e).__name__, e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to fetch bookings: {str(e)}"
@@ -203,29 +247,14 @@ async def create_booking(
         if not booking_data.service_ids or len(booking_data.service_ids) == 0:
             raise HTTPException(status_code=400, detail="At least one service is required")
         
+        services_by_id = await load_services_by_service_id(db, place_id, booking_data.service_ids)
         for service_id in booking_data.service_ids:
-            # First verify the service exists
-            service_result = await db.execute(
-                select(Service).where(Service.id == service_id)
-            )
-            service = service_result.scalar_one_or_none()
-            if not service:
-                raise HTTPException(status_code=404, detail=f"Service with ID {service_id} not found")
-            
-            # Get price and duration from PlaceService (service is specific to this place)
-            place_service_result = await db.execute(
-                select(PlaceService).where(
-                    PlaceService.place_id == place_id,
-                    PlaceService.service_id == service_id
-                )
-            )
-            place_service = place_service_result.scalar_one_or_none()
-            
-            if not place_service:
+            if service_id not in services_by_id:
                 raise HTTPException(
                     status_code=404,
                     detail=f"Service with ID {service_id} is not available for this place"
                 )
+            place_service, service = services_by_id[service_id]
             
             # Safely convert price to float, handle None or invalid values
             try:
@@ -275,37 +304,27 @@ async def create_booking(
                 detail=f"Invalid date or time format. Use YYYY-MM-DD for date and HH:MM for time, or ISO 8601 format. Error: {str(e)}"
             )
         
-        # If "any employee" is selected, find an available employee
+        # Booking occupies [start, start + total duration) in minutes of the day
+        slot_minutes = place_slot_minutes(place)
+        booking_start = booking_time.hour * 60 + booking_time.minute
+        booking_end = booking_start + (total_duration or slot_minutes)
+        
+        # If "any employee" is selected, pick the least-loaded qualified employee
+        # who is free for the whole booking, from the day's preloaded state
         if booking_data.any_employee_selected:
-            # First, get all employees for this place
-            all_employees_result = await db.execute(
-                select(PlaceEmployee).where(PlaceEmployee.place_id == place_id, PlaceEmployee.is_active == True)
-            )
-            all_employees = all_employees_result.scalars().all()
+            booked_service_ids = [service['service_id'] for service in services]
+            assignment_inputs = await load_assignment_inputs(db, place_id, booking_date, booked_service_ids)
 
-            if not all_employees:
+            if not assignment_inputs.day.employees:
                 raise HTTPException(status_code=400, detail="No employees available for this place")
 
-            available_employee_id = None
-            for employee in all_employees:
-                # Check if this specific employee is available at the requested time
-                existing_booking_query = select(Booking).where(
-                    Booking.place_id == place_id,
-                    Booking.employee_id == employee.id,
-                    Booking.booking_date == booking_date,
-                    Booking.booking_time == booking_time,
-                    Booking.status.in_(["pending", "confirmed"])
-                )
-                result = await db.execute(existing_booking_query)
-                existing_booking = result.scalar_one_or_none()
-
-                if not existing_booking:
-                    available_employee_id = employee.id
-                    break # Found an available employee
+            available_employee_id = pick_employee(
+                assignment_inputs, booked_service_ids, booking_start, booking_end, slot_minutes
+            )
 
             if available_employee_id is None:
                 raise HTTPException(
-                    status_code=400,
+                    status_code=409,
                     detail="No employees available at this time. All employees are booked."
                 )
             
@@ -327,21 +346,17 @@ async def create_booking(
             if not employee:
                 raise HTTPException(status_code=404, detail="Employee not found")
 
-            existing_booking_query = select(Booking).where(
-                Booking.place_id == place_id,
-                Booking.employee_id == employee_id_to_check,
-                Booking.booking_date == booking_date,
-                Booking.booking_time == booking_time,
-                Booking.status.in_(["pending", "confirmed"])
-            )
-            result = await db.execute(existing_booking_query)
-            existing_booking = result.scalar_one_or_none()
-            
-            if existing_booking:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Employee is already booked at this time"
+            # An employee picked by the assignment engine is already known to be free
+            if not booking_data.any_employee_selected:
+                booking_index = await load_booking_index(
+                    db, place_id, booking_date, [employee_id_to_check], default_minutes=slot_minutes
                 )
+                
+                if booking_index[employee_id_to_check].overlaps(booking_start, booking_end):
+                    raise HTTPException(
+                        status_code=409,
+                        detail="Employee is already booked at this time"
+                    )
             # If a specific employee was selected and is available, update the booking_data.employee_id for later use
             booking_data.employee_id = employee_id_to_check
 
@@ -355,6 +370,7 @@ async def create_booking(
         
         # Determine booking color based on employee color
         booking_color = booking_data.color_code  # Default to provided color
+        employee = None
         if booking_data.employee_id:
             # Get employee color from the database
             employee_result = await db.execute(
@@ -364,16 +380,6 @@ async def create_booking(
             if employee and employee.color_code:
                 booking_color = employee.color_code
         
-        # Try to link booking to user if customer email matches a registered user
-        user_id = None
-        if booking_data.customer_email:
-            from models.user import User
-            user_query = select(User).where(User.email == booking_data.customer_email)
-            user_result = await db.execute(user_query)
-            user = user_result.scalar_one_or_none()
-            if user:
-                user_id = user.id
-        
         # Create new booking using the bookings table fields
         booking = Booking(
             salon_id=place_id,  # Required field for existing bookings table
@@ -392,7 +398,7 @@ async def create_booking(
             recurrence_pattern=booking_data.recurrence_pattern,
             recurrence_end_date=recurrence_end_date,
             any_employee_selected=booking_data.any_employee_selected if booking_data.any_employee_selected is not None else False,
-            user_id=user_id,  # Link to user if found
+            user_id=user_id_for_email(booking_data.customer_email),  # Link to user if found
             total_price=float(total_price) if total_price is not None else 0,  # Store total price as Decimal/Float
             total_duration=int(total_duration) if total_duration is not None else 0,  # Store total duration
             # Campaign fields - store snapshot if campaign data provided
@@ -404,78 +410,27 @@ async def create_booking(
             campaign_banner_message=booking_data.campaign_banner_message
         )
         
-        db.add(booking)
-        await db.commit()
-        await db.refresh(booking)
-        
-        # Create booking services entries for all selected services
-        for service in services:
-            booking_service = BookingService(
-                booking_id=booking.id,
-                service_id=service['service_id'],
-                service_name=service['service_name'],
-                service_price=service['service_price'],
-                service_duration=service['service_duration']
-            )
-            db.add(booking_service)
-        await db.commit()
-        
-        # Get service name for response
-        service_name = None
-        if booking.service_id:
-            service_result = await db.execute(
-                select(Service).where(Service.id == booking.service_id)
-            )
-            service = service_result.scalar_one_or_none()
-            if service:
-                service_name = service.name
-        
-        # Get employee name for response
-        employee_name = None
-        if booking.employee_id:
-            employee_result = await db.execute(
-                select(PlaceEmployee).where(PlaceEmployee.id == booking.employee_id)
-            )
-            employee = employee_result.scalar_one_or_none()
-            if employee:
-                employee_name = employee.name
+        # Email notification with services data, queued in the booking's transaction
+        email_data = {
+            'customer_name': booking.customer_name,
+            'customer_email': booking.customer_email,
+            'salon_name': place.nome,
+            'booking_date': booking.booking_date.strftime("%Y-%m-%d"),
+            'booking_time': booking.booking_time.strftime("%H:%M"),
+            'duration': total_duration,
+            'total_price': float(total_price),
+            'services': services,
+            'status': booking.status or 'pending'  # Include the actual booking status
+        }
+        queue_email(db, "send_booking_request_notification", email_data)
 
-        # Send email notification with services data
-        try:
-            from email_service import EmailService
-            import logging
-            logger = logging.getLogger(__name__)
-            
-            email_service = EmailService()
-            email_data = {
-                'customer_name': booking.customer_name,
-                'customer_email': booking.customer_email,
-                'salon_name': place.nome,
-                'booking_date': booking.booking_date.strftime("%Y-%m-%d"),
-                'booking_time': booking.booking_time.strftime("%H:%M"),
-                'duration': total_duration,
-                'total_price': float(total_price),
-                'services': services,
-                'status': booking.status or 'pending'  # Include the actual booking status
-            }
-            
-            logger.info(f"📧 Attempting to send booking request email to {booking.customer_email}")
-            result = email_service.send_booking_request_notification(email_data)
-            
-            if result:
-                logger.info(f"✅ Booking request email sent successfully to {booking.customer_email}")
-            else:
-                logger.warning(f"⚠️ Failed to send booking request email to {booking.customer_email} - check email service configuration")
-                print(f"⚠️ Failed to send booking request email to {booking.customer_email}")
-                
-        except Exception as e:
-            import logging
-            import traceback
-            logger = logging.getLogger(__name__)
-            logger.error(f"❌ Error sending booking request email: {str(e)}")
-            logger.error(f"❌ Traceback: {traceback.format_exc()}")
-            print(f"❌ Failed to send email notification: {str(e)}")
-            print(f"❌ Traceback: {traceback.format_exc()}")
+        # Booking, booking services and the queued email are written in one transaction
+        await save_booking(db, booking, services, place_slot_minutes(place))
+        logger.info("Booking request email queued for %s", booking.customer_email)
+        
+        # Service and employee names for the response were loaded above
+        service_name = services[0]['service_name']
+        employee_name = employee.name if booking.employee_id and employee else None
 
         # Create notification for new booking (asynchronous - don't fail booking if this fails)
         try:
@@ -494,10 +449,7 @@ async def create_booking(
             )
         except Exception as e:
             # Log error but don't fail the booking
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"❌ Error scheduling notification task for booking {booking.id}: {str(e)}")
-            print(f"⚠️ Failed to schedule notification task: {str(e)}")
+            logger.error("Error scheduling notification task for booking %s: %s", booking.id, e)
 
         # Convert services data to BookingServiceResponse format
         services_response = []
@@ -544,12 +496,12 @@ async def create_booking(
         )
     except HTTPException:
         raise
+    except BookingConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         # Rollback database transaction on error
         await db.rollback()
-        print(f"🔥 Error creating booking: {type(e).__name__}: {str(e)}")
-        import traceback
-        print(f"🔥 Traceback: {traceback.format_exc()}")
+        logger.error("Error creating booking: %s: %s", type(e).__name__, e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create booking: {str(e)}"
@@ -665,40 +617,11 @@ async def update_booking_status(
     try:
         old_status = booking.status
         booking.status = new_status
-        await db.commit()
+        if new_status != old_status:
+            await _queue_status_email(db, booking, place, new_status)
+        await commit_booking(db)
         await db.refresh(booking)
         
-        # Send email notification if status changed
-        if new_status != old_status and booking.customer_email:
-            try:
-                from email_service import EmailService
-                from models.place_existing import Service
-                
-                # Get service name for email
-                service_name = None
-                if booking.service_id:
-                    service_result = await db.execute(
-                        select(Service).where(Service.id == booking.service_id)
-                    )
-                    service = service_result.scalar_one_or_none()
-                    if service:
-                        service_name = service.name
-                
-                email_service = EmailService()
-                email_data = {
-                    'customer_name': booking.customer_name,
-                    'customer_email': booking.customer_email,
-                    'salon_name': place.nome,
-                    'service_name': service_name or 'Multiple Services',
-                    'booking_date': booking.booking_date.strftime("%Y-%m-%d"),
-                    'booking_time': booking.booking_time.strftime("%H:%M"),
-                    'duration': booking.duration or 0,
-                    'status': new_status
-                }
-                email_service.send_booking_status_notification(email_data)
-            except Exception as e:
-                print(f"Failed to send status change email notification: {str(e)}")
-        
         # Create notification if status changed to cancelled (asynchronous)
         if new_status == 'cancelled' and old_status != 'cancelled':
             try:
@@ -717,10 +640,7 @@ async def update_booking_status(
                 )
             except Exception as e:
                 # Log error but don't fail the status update
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.error(f"❌ Error scheduling cancellation notification task for booking {booking.id}: {str(e)}")
-                print(f"⚠️ Failed to schedule cancellation notification task: {str(e)}")
+                logger.error("Error scheduling cancellation notification task for booking %s: %s", booking.id, e, exc_info=True)
         
         # Award points if booking is completed and user is registered
         if (old_status != 'completed' and new_status == 'completed' and 
@@ -764,11 +684,11 @@ async def update_booking_status(
         return {"message": "Booking status updated successfully"}
     except HTTPException:
         raise
+    except BookingConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         await db.rollback()
-        print(f"🔥 Error updating booking status {booking_id}: {type(e).__name__}: {str(e)}")
-        import traceback
-        print(f"🔥 Traceback: {traceback.format_exc()}")
+        logger.error("Error updating booking status %s: %s: %s", booking_id, type(e).__name__, e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update booking status: {str(e)}"
@@ -837,40 +757,11 @@ async def update_booking(
             if hasattr(booking, field):
                 setattr(booking, field, value)
         
-        await db.commit()
+        if new_status and new_status != old_status:
+            await _queue_status_email(db, booking, place, new_status)
+        await commit_booking(db)
         await db.refresh(booking)
         
-        # Send email notification if status changed
-        if new_status and new_status != old_status and booking.customer_email:
-            try:
-                from email_service import EmailService
-                from models.place_existing import Service
-                
-                # Get service name for email
-                service_name = None
-                if booking.service_id:
-                    service_result = await db.execute(
-                        select(Service).where(Service.id == booking.service_id)
-                    )
-                    service = service_result.scalar_one_or_none()
-                    if service:
-                        service_name = service.name
-                
-                email_service = EmailService()
-                email_data = {
-                    'customer_name': booking.customer_name,
-                    'customer_email': booking.customer_email,
-                    'salon_name': place.nome,
-                    'service_name': service_name or 'Multiple Services',
-                    'booking_date': booking.booking_date.strftime("%Y-%m-%d"),
-                    'booking_time': booking.booking_time.strftime("%H:%M"),
-                    'duration': booking.duration or 0,
-                    'status': new_status
-                }
-                email_service.send_booking_status_notification(email_data)
-            except Exception as e:
-                print(f"Failed to send status change email notification: {str(e)}")
-        
         # Award points if booking is completed and user is registered
         if (old_status != 'completed' and new_status == 'completed' and 
             booking.user_id and booking.place_id):
@@ -909,10 +800,10 @@ async def update_booking(
                         booking.rewards_points_earned = points_calculation.points_earned
                         await db.commit()
                         await db.refresh(booking)
+    except BookingConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
-        print(f"🔥 Error updating booking {booking_id}: {type(e).__name__}: {str(e)}")
-        import traceback
-        print(f"🔥 Traceback: {traceback.format_exc()}")
+        logger.error("Error updating booking %s: %s: %s", booking_id, type(e).__name__, e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update booking: {str(e)}"
@@ -985,39 +876,9 @@ async def cancel_booking(
         raise HTTPException(status_code=403, detail="Access denied")
     
     booking.status = "cancelled"
+    await _queue_status_email(db, booking, place, "cancelled")
     await db.commit()
     
-    # Send email notification for cancellation
-    if booking.customer_email:
-        try:
-            from email_service import EmailService
-            from models.place_existing import Service
-            
-            # Get service name for email
-            service_name = None
-            if booking.service_id:
-                service_result = await db.execute(
-                    select(Service).where(Service.id == booking.service_id)
-                )
-                service = service_result.scalar_one_or_none()
-                if service:
-                    service_name = service.name
-            
-            email_service = EmailService()
-            email_data = {
-                'customer_name': booking.customer_name,
-                'customer_email': booking.customer_email,
-                'salon_name': place.nome,
-                'service_name': service_name or 'Multiple Services',
-                'booking_date': booking.booking_date.strftime("%Y-%m-%d"),
-                'booking_time': booking.booking_time.strftime("%H:%M"),
-                'duration': booking.duration or 0,
-                'status': 'cancelled'
-            }
-            email_service.send_booking_status_notification(email_data)
-        except Exception as e:
-            print(f"Failed to send cancellation email notification: {str(e)}")
-    
     # Create notification for cancellation (asynchronous)
     try:
         from services.notification_background import create_cancellation_notification_async
@@ -1035,10 +896,7 @@ async def cancel_booking(
         )
     except Exception as e:
         # Log error but don't fail the cancellation
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.error(f"❌ Error scheduling cancellation notification task for booking {booking.id}: {str(e)}")
-        print(f"⚠️ Failed to schedule cancellation notification task: {str(e)}")
+        logger.error("Error scheduling cancellation notification task for booking %s: %s", booking.id, e, exc_info=True)
     
     return {"message": "Booking cancelled successfully"}
 
@@ -1076,39 +934,9 @@ async def accept_booking(
         raise HTTPException(status_code=400, detail="Only pending bookings can be accepted")
     
     booking.status = "confirmed"
+    await _queue_status_email(db, booking, place, "confirmed")
     await db.commit()
     
-    # Send email notification for confirmation
-    if booking.customer_email:
-        try:
-            from email_service import EmailService
-            from models.place_existing import Service
-            
-            # Get service name for email
-            service_name = None
-            if booking.service_id:
-                service_result = await db.execute(
-                    select(Service).where(Service.id == booking.service_id)
-                )
-                service = service_result.scalar_one_or_none()
-                if service:
-                    service_name = service.name
-            
-            email_service = EmailService()
-            email_data = {
-                'customer_name': booking.customer_name,
-                'customer_email': booking.customer_email,
-                'salon_name': place.nome,
-                'service_name': service_name or 'Multiple Services',
-                'booking_date': booking.booking_date.strftime("%Y-%m-%d"),
-                'booking_time': booking.booking_time.strftime("%H:%M"),
-                'duration': booking.duration or 0,
-                'status': 'confirmed'
-            }
-            email_service.send_booking_status_notification(email_data)
-        except Exception as e:
-            print(f"Failed to send confirmation email notification: {str(e)}")
-    
     return {"message": "Booking accepted successfully"}
 
 @router.put("/{booking_id}/assign-employee")
@@ -1154,7 +982,10 @@ async def assign_employee_to_booking(
         raise HTTPException(status_code=404, detail="Employee not found")
     
     booking.employee_id = assignment_data["employee_id"]
-    await db.commit()
+    try:
+        await commit_booking(db)
+    except BookingConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     
     return {"message": "Employee assigned to booking successfully"}
 
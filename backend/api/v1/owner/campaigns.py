@@ -26,6 +26,8 @@ try:
     )
     from services.campaign_service import CampaignService as CampaignBusinessService
     from services.feature_access import has_feature
+    from services.place_cache import invalidate_all_places
+    from services.campaign_index import campaign_index
 except ImportError:
     from core.database import get_db
     from core.dependencies import get_current_business_owner
@@ -41,6 +43,8 @@ except ImportError:
     )
     from services.campaign_service import CampaignService as CampaignBusinessService
     from services.feature_access import has_feature
+    from services.place_cache import invalidate_all_places
+    from services.campaign_index import campaign_index
 
 router = APIRouter()
 limiter = Limiter(key_func=get_remote_address)
@@ -279,6 +283,7 @@ async def create_campaign(
         campaign.config['buy_quantity'] = campaign_data.free_service_config.buy_quantity
         campaign.config['get_quantity'] = campaign_data.free_service_config.get_quantity
     
+    campaign.sync_schedule_from_config()
     db.add(campaign)
     await db.flush()  # Get the campaign ID
     
@@ -341,6 +346,8 @@ async def create_campaign(
     
     await db.commit()
     await db.refresh(campaign)
+    await campaign_index.refresh_campaign(db, campaign.id)
+    await invalidate_all_places()
     
     # Create response manually to avoid relationship loading issues
     return CampaignResponse(
@@ -407,6 +414,7 @@ async def update_campaign(
         campaign.config['start_datetime'] = campaign_data.start_datetime.isoformat()
     if campaign_data.end_datetime is not None:
         campaign.config['end_datetime'] = campaign_data.end_datetime.isoformat()
+    campaign.sync_schedule_from_config()
     if campaign_data.is_active is not None:
         campaign.config['is_active'] = campaign_data.is_active
         campaign.status = 'active' if campaign_data.is_active else 'draft'
@@ -473,6 +481,8 @@ async def update_campaign(
     
     await db.commit()
     await db.refresh(campaign)
+    await campaign_index.refresh_campaign(db, campaign.id)
+    await invalidate_all_places()
     
     return CampaignResponse(
         id=campaign.id,
@@ -524,6 +534,8 @@ async def delete_campaign(
     
     await db.delete(campaign)
     await db.commit()
+    campaign_index.remove_campaign(campaign_id)
+    await invalidate_all_places()
     
     return {"message": "Campaign deleted successfully"}
 
@@ -838,6 +850,43 @@ async def send_messaging_campaign(
     return result
 
 
+@router.get("/{campaign_id}/send-progress")
+@limiter.limit(settings.RATE_LIMIT_MOBILE_READ)
+async def get_messaging_campaign_send_progress(
+    request: Request,
+    campaign_id: int,
+    current_user: User = Depends(get_current_business_owner),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get progress and throughput of a messaging campaign being sent by this worker"""
+    
+    # Verify campaign exists and belongs to owner
+    campaign_query = select(Campaign.id).where(
+        and_(
+            Campaign.id == campaign_id,
+            Campaign.created_by == current_user.id
+        )
+    )
+    campaign_result = await db.execute(campaign_query)
+    
+    if campaign_result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Campaign not found"
+        )
+    
+    from services.messaging_campaign_service import messaging_campaign_service
+    progress = messaging_campaign_service.get_send_progress(campaign_id)
+    
+    if progress is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No dispatch of this campaign on this worker; see messaging-stats"
+        )
+    
+    return progress
+
+
 @router.get("/{campaign_id}/messaging-stats", response_model=MessagingStatsResponse)
 @limiter.limit(settings.RATE_LIMIT_MOBILE_READ)
 async def get_messaging_campaign_stats(
@@ -17,6 +17,8 @@ from core.database import get_db
 from core.dependencies import get_current_business_owner
 from core.config import settings
 from services.feature_access import has_feature, get_limit
+from services.entitlements import invalidate_entitlements
+from services.place_cache import invalidate_place
 from models.user import User
 from models.place_existing import Place, PlaceEmployee, PlaceService, Service, EmployeeService
 from schemas.place_employee import PlaceEmployeeCreate, PlaceEmployeeUpdate, PlaceEmployeeResponse
@@ -138,6 +140,7 @@ async def create_employee(
                 )
                 db.add(sub)
                 await db.commit()
+                invalidate_entitlements(current_user.id)
                 
                 # Now get the limit again
                 limit = await get_limit(db, current_user.id, place_id, "employees")
@@ -194,6 +197,7 @@ async def create_employee(
     db.add(employee)
     await db.commit()
     await db.refresh(employee)
+    await invalidate_place(employee.place_id)
     
     return PlaceEmployeeResponse(
         id=employee.id,
@@ -289,6 +293,7 @@ async def update_employee(
     
     await db.commit()
     await db.refresh(employee)
+    await invalidate_place(employee.place_id)
     
     return PlaceEmployeeResponse(
         id=employee.id,
@@ -335,6 +340,7 @@ async def delete_employee(
     
     employee.is_active = False
     await db.commit()
+    await invalidate_place(employee.place_id)
     
     return {"message": "Employee deleted successfully"}
 
@@ -370,6 +376,7 @@ async def update_employee_working_hours(
     employee.set_working_hours(hours_data)
     await db.commit()
     await db.refresh(employee)
+    await invalidate_place(employee.place_id)
     
     return PlaceEmployeeResponse(
         id=employee.id,
@@ -628,6 +635,7 @@ async def upload_employee_photo(
             pass
         await db.commit()
         await db.refresh(employee)
+        await invalidate_place(employee.place_id)
         
         return {
             "message": "Photo uploaded successfully",
@@ -672,5 +680,6 @@ async def delete_employee_photo(
     # Remove photo URL from employee record
     employee.photo_url = None
     await db.commit()
+    await invalidate_place(employee.place_id)
     
     return {"message": "Photo deleted successfully"}
@@ -18,8 +18,14 @@ from models.user import User
 from models.place_existing import Place, PlaceImage
 from schemas.place_existing import PlaceResponse, PlaceCreate, PlaceUpdate
 from utils.slug import slugify, ensure_unique_slug, validate_slug, generate_slug_from_name
+from services.place_cache import invalidate_place
+from services.geo_index import place_geo_index
+from services.place_facets import facet_snapshot, invalidate_facets_if_changed
+from services.entitlements import invalidate_entitlements
+import logging
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 limiter = Limiter(key_func=get_remote_address)
 
 @router.get("/", response_model=List[PlaceResponse])
@@ -114,6 +120,7 @@ async def get_place(
         is_bio_diamond=place.is_bio_diamond,
         about=place.about,
         working_hours=place.get_working_hours(),
+        booking_slot_minutes=place.booking_slot_minutes,
         created_at=place.created_at,
         updated_at=place.updated_at,
         owner_id=place.owner_id
@@ -209,6 +216,8 @@ async def create_place(
     db.add(place)
     await db.commit()
     await db.refresh(place)
+    place_geo_index.sync_place(place)
+    invalidate_facets_if_changed(None, place)
     
     # Automatically create a subscription for this place if one doesn't exist
     try:
@@ -253,9 +262,10 @@ async def create_place(
                     )
                     db.add(sub)
                     await db.commit()
+                    invalidate_entitlements(current_user.id)
     except Exception as e:
         # Don't fail place creation if subscription creation fails
-        print(f"⚠️ Warning: Could not create subscription for place {place.id}: {e}")
+        logger.warning("Could not create subscription for place %s: %s", place.id, e)
         pass
     
     return PlaceResponse(
@@ -282,6 +292,7 @@ async def create_place(
         is_bio_diamond=place.is_bio_diamond,
         about=place.about,
         working_hours=place.get_working_hours(),
+        booking_slot_minutes=place.booking_slot_minutes,
         created_at=place.created_at,
         updated_at=place.updated_at,
         owner_id=place.owner_id
@@ -343,6 +354,8 @@ async def update_place(
             # If slug column doesn't exist, just set it (will be ignored until migration)
             pass
     
+    facets_before = facet_snapshot(place)
+    
     # Update other fields
     update_data = place_data.dict(exclude_unset=True)
     for field, value in update_data.items():
@@ -355,6 +368,9 @@ async def update_place(
     
     await db.commit()
     await db.refresh(place)
+    await invalidate_place(place.id)
+    place_geo_index.sync_place(place)
+    invalidate_facets_if_changed(facets_before, place)
     
     return PlaceResponse(
         id=place.id,
@@ -380,6 +396,7 @@ async def update_place(
         is_bio_diamond=place.is_bio_diamond,
         about=place.about,
         working_hours=place.get_working_hours(),
+        booking_slot_minutes=place.booking_slot_minutes,
         created_at=place.created_at,
         updated_at=place.updated_at,
         owner_id=place.owner_id
@@ -409,8 +426,12 @@ async def delete_place(
         raise HTTPException(status_code=404, detail="Place not found")
     
     # Soft delete
+    facets_before = facet_snapshot(place)
     place.is_active = False
     await db.commit()
+    await invalidate_place(place_id)
+    place_geo_index.remove_place(place_id)
+    invalidate_facets_if_changed(facets_before, place)
 
 
 @router.get("/{place_id}/location")
@@ -484,6 +505,7 @@ async def add_place_image(
     db.add(place_image)
     await db.commit()
     await db.refresh(place_image)
+    await invalidate_place(place_id)
     
     return {
         "id": place_image.id,
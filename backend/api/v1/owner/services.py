@@ -16,8 +16,11 @@ from core.dependencies import get_current_business_owner
 from core.config import settings
 from models.user import User
 from models.place_existing import Place, Service, PlaceService
+from services.place_cache import invalidate_place, invalidate_places
+import logging
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 limiter = Limiter(key_func=get_remote_address)
 
 
@@ -134,13 +137,14 @@ async def create_place_service(
         db.add(place_service)
         await db.commit()
         await db.refresh(new_service)
+        await invalidate_place(place_id)
         
         return {
             "id": new_service.id,
             "message": "Service created successfully"
         }
     except Exception as e:
-        print(f"Error creating service: {str(e)}")
+        logger.error("Error creating service: %s", e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
@@ -329,6 +333,7 @@ async def update_service(
     
     await db.commit()
     await db.refresh(service)
+    await invalidate_places(place_ids)
     
     return {"message": "Service updated successfully"}
 
@@ -387,5 +392,6 @@ async def delete_service(
     # Delete the service
     await db.delete(service)
     await db.commit()
+    await invalidate_places(place_ids)
     
     return {"message": "Service deleted successfully"}
@@ -2,14 +2,15 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import Dict, Any
-import traceback
 
 from core.database import get_db
 from core.dependencies import get_current_business_owner
 from models.user import User
 from models.user_feature_permissions import UserFeaturePermission
+import logging
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 @router.get("/user/feature-permissions")
 async def get_user_feature_permissions(
@@ -20,13 +21,13 @@ async def get_user_feature_permissions(
     try:
         # Validate user ID
         if not current_user or not current_user.id:
-            print(f"❌ Invalid user: {current_user}")
+            logger.error("Invalid user: %s", current_user)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid user"
             )
         
-        print(f"🔍 Fetching feature permissions for user {current_user.id}")
+        logger.debug("Fetching feature permissions for user %s", current_user.id)
         
         # Get all permissions for the current user
         query = select(UserFeaturePermission).where(
@@ -35,7 +36,7 @@ async def get_user_feature_permissions(
         result = await db.execute(query)
         permissions = result.scalars().all()
         
-        print(f"✅ Found {len(permissions)} permission records for user {current_user.id}")
+        logger.info("Found %s permission records for user %s", len(permissions), current_user.id)
         
         # Convert to dictionary format
         feature_permissions = {}
@@ -67,8 +68,7 @@ async def get_user_feature_permissions(
         raise
     except Exception as e:
         # Log the actual error for debugging
-        print(f"❌ Error in get_user_feature_permissions: {type(e).__name__}: {str(e)}")
-        print(f"❌ Traceback: {traceback.format_exc()}")
+        logger.error("Error in get_user_feature_permissions: %s: %s", type(e).__name__, e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error fetching feature permissions: {str(e)}"
@@ -2,9 +2,10 @@
 Fixed places API that works with the existing database schema.
 Uses the 'places' table instead of 'businesses' table.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks, Response, Header
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, and_, func
 from typing import List, Optional
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
@@ -12,17 +13,41 @@ from slowapi.errors import RateLimitExceeded
 
 from core.database import get_db
 from core.config import settings
-from models.place_existing import Place, Service, PlaceService, PlaceImage, Review, Booking, PlaceClosedPeriod, PlaceEmployee, PlaceEmployeeTimeOff
-from models.campaign import Campaign, CampaignPlace, CampaignService as CampaignServiceModel
+from core.pagination import COUNT_NONE, SortKey, paginate, set_cursor_headers
+from models.place_existing import (
+    Place, Service, PlaceService, Review, PlaceReviewStats, Booking, PlaceEmployee, EmployeeService
+)
+from models.campaign import CampaignService as CampaignServiceModel
 from models.rewards import CustomerReward, RewardTransaction, RewardSetting
-from schemas.place_existing import PlaceResponse, PlaceImageResponse, PlaceServiceResponse, PlaceEmployeeResponse
+from schemas.place_existing import PlaceResponse, PlaceServiceResponse, PlaceEmployeeResponse
 from schemas.place_employee import PlaceEmployeePublicResponse
 from services.campaign_service import CampaignService
+from services.availability_engine import (
+    MAX_RANGE_DAYS, get_day_availability, iter_range_availability, load_booking_index,
+    load_range_inputs, load_service_duration, place_slot_minutes
+)
+from services.place_listing import build_place_response, build_place_responses, load_images_by_place
+from services.place_cache import place_detail_cache
+from services.place_search import apply_place_search, place_search_sort_keys
+from services.place_facets import facet_response, place_facet_cache
+from services.place_cache import invalidate_place
+from services.email_outbox import queue_email
+from services.review_stats import (
+    RATINGS, average_rating_expression, load_review_stats, record_review, review_summary
+)
+from services.employee_assignment import load_assignment_inputs, pick_employee
+from services.booking_writer import (
+    BookingConflictError, load_services_by_place_service_id, save_booking, user_id_for_email
+)
+from services.campaign_index import campaign_index
 from schemas.campaign import ActiveCampaignResponse, ServicePriceCalculation
 from pydantic import BaseModel, EmailStr
-from datetime import datetime, date, time
+from datetime import datetime, date as date_type, time, timezone
+import json
+import logging
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 limiter = Limiter(key_func=get_remote_address)
 
 def _safe_get_working_hours(obj):
@@ -46,7 +71,7 @@ def _safe_get_working_hours(obj):
             return {}
         return {}
     except Exception as e:
-        print(f"Error getting working hours: {e}")
+        logger.error("Error getting working hours: %s", e)
         return {}
 
 @router.get("/debug")
@@ -97,19 +122,24 @@ async def get_place_simple(
 @router.get("/", response_model=List[PlaceResponse])
 # @limiter.limit(settings.RATE_LIMIT_MOBILE_READ)
 async def get_places(
+    response: Response,
     search: Optional[str] = None,
     tipo: Optional[str] = None,
     cidade: Optional[str] = None,
     regiao: Optional[str] = None,
     booking_enabled: Optional[bool] = None,
     is_bio_diamond: Optional[bool] = None,
+    min_rating: Optional[float] = Query(None, ge=0, le=5, description="Minimum average rating"),
+    sort: Optional[str] = Query(None, regex="^rating$", description="'rating' for best rated first"),
     limit: int = Query(50, le=100),
     offset: int = Query(0, ge=0),
     page: Optional[int] = Query(None, ge=1),
     per_page: Optional[int] = Query(None, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (replaces offset)"),
+    count: str = Query(COUNT_NONE, regex="^(exact|estimate|none)$", description="Send X-Total-Count"),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all public places with filtering and pagination"""
+    """Get all public places with filtering and pagination (next page cursor in X-Next-Cursor)"""
     
     try:
         # Map page/per_page to offset/limit when provided
@@ -120,17 +150,10 @@ async def get_places(
         # Build query using existing 'places' table
         query = select(Place).where(Place.is_active == True)
         
-        # Apply search filter if provided
-        if search and search.strip():
-            search_term = search.strip().lower()
-            query = query.where(
-                or_(
-                    func.lower(Place.nome).contains(search_term),
-                    func.lower(Place.cidade).contains(search_term),
-                    func.lower(Place.regiao).contains(search_term),
-                    func.lower(Place.tipo).contains(search_term)
-                )
-            )
+        # Apply search filter if provided (indexed, accent-insensitive, ranked by relevance)
+        search_term = search if search and search.strip() else ""
+        if search_term:
+            query = apply_place_search(query, search_term)
         
         # Apply filters using existing column names
         if tipo:
@@ -148,86 +171,48 @@ async def get_places(
         if is_bio_diamond is not None:
             query = query.where(Place.is_bio_diamond == is_bio_diamond)
         
-        # Apply pagination
-        query = query.offset(offset).limit(limit)
-        
-        result = await db.execute(query)
-        places = result.scalars().all()
+        # Rating filter/sort read the materialized review aggregates
+        sort_keys = place_search_sort_keys(search_term)
+        if min_rating is not None or sort == "rating":
+            average_rating = average_rating_expression()
+            query = query.outerjoin(PlaceReviewStats, PlaceReviewStats.place_id == Place.id)
+            if min_rating is not None:
+                query = query.where(average_rating >= min_rating)
+            if sort == "rating":
+                sort_keys = [SortKey(average_rating, descending=True), SortKey(Place.id)]
         
-        # Fetch images for each place
-        place_responses = []
-        for place in places:
-            # Get images for this place
-            images_result = await db.execute(
-                select(PlaceImage).where(PlaceImage.place_id == place.id)
-            )
-            images = images_result.scalars().all()
-            
-            place_responses.append(PlaceResponse(
-                id=place.id,
-                codigo=place.codigo,
-                nome=place.nome,
-                slug=getattr(place, 'slug', None) or None,  # Handle missing slug column
-                tipo=place.tipo,
-                pais=place.pais,
-                telefone=place.telefone,
-                email=place.email,
-                website=place.website,
-                instagram=place.instagram,
-                regiao=place.regiao,
-                cidade=place.cidade,
-                rua=place.rua,
-                porta=place.porta,
-                cod_postal=place.cod_postal,
-                latitude=place.latitude,
-                longitude=place.longitude,
-                location_type=place.location_type,
-                coverage_radius=place.coverage_radius,
-                booking_enabled=place.booking_enabled,
-                is_bio_diamond=place.is_bio_diamond,
-                about=place.about,
-                created_at=place.created_at,
-                updated_at=place.updated_at,
-                owner_id=place.owner_id,
-                images=[
-                    PlaceImageResponse(
-                        id=img.id,
-                        image_url=img.image_url,
-                        image_alt=img.alt_text,
-                        is_primary=img.is_primary,
-                        created_at=img.created_at
-                    )
-                    for img in images
-                ]
-            ))
+        # Apply pagination (relevance or rating, then id; id otherwise)
+        page_data = await paginate(
+            db, query, sort_keys, limit,
+            cursor=cursor, offset=offset, count=count
+        )
+        set_cursor_headers(response, page_data)
         
-        return place_responses
+        # Fetch images for the whole page in one query
+        return await build_place_responses(db, page_data.items)
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"ERROR in get_places: {type(e).__name__}: {e}")
+        logger.error("ERROR in get_places: %s: %s", type(e).__name__, e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
 @router.get("/search", response_model=List[PlaceResponse])
 # @limiter.limit(settings.RATE_LIMIT_MOBILE_READ)
 async def search_places(
+    response: Response,
     q: str = Query(..., description="Search query"),
     tipo: Optional[str] = None,
     cidade: Optional[str] = None,
     limit: int = Query(20, le=50),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (replaces offset)"),
     db: AsyncSession = Depends(get_db)
 ):
-    """Search places with advanced filtering"""
-    
-    # Build search query
-    search_conditions = [
-        Place.is_active == True,
-        or_(
-            func.lower(Place.nome).contains(func.lower(q)),
-            func.lower(Place.cidade).contains(func.lower(q)),
-            func.lower(Place.regiao).contains(func.lower(q))
-        )
-    ]
+    """Search places with advanced filtering (next page cursor in X-Next-Cursor)"""
+    
+    # Build search query (indexed, accent-insensitive, ranked by relevance)
+    search_conditions = [Place.is_active == True]
     
     if tipo:
         search_conditions.append(Place.tipo == tipo)
@@ -235,102 +220,50 @@ async def search_places(
     if cidade:
         search_conditions.append(func.lower(Place.cidade) == func.lower(cidade))
     
-    query = select(Place).where(and_(*search_conditions))
-    query = query.offset(offset).limit(limit)
-    
-    result = await db.execute(query)
-    places = result.scalars().all()
+    query = apply_place_search(select(Place).where(and_(*search_conditions)), q)
+    page_data = await paginate(db, query, place_search_sort_keys(q), limit, cursor=cursor, offset=offset)
+    set_cursor_headers(response, page_data)
     
-    # Fetch images for each place
-    place_responses = []
-    for place in places:
-        # Get images for this place
-        images_result = await db.execute(
-            select(PlaceImage).where(PlaceImage.place_id == place.id)
-        )
-        images = images_result.scalars().all()
-        
-        place_responses.append(PlaceResponse(
-            id=place.id,
-            codigo=place.codigo,
-            nome=place.nome,
-            slug=getattr(place, 'slug', None) or None,  # Handle missing slug column
-            tipo=place.tipo,
-            pais=place.pais,
-            telefone=place.telefone,
-            email=place.email,
-            website=place.website,
-            instagram=place.instagram,
-            regiao=place.regiao,
-            cidade=place.cidade,
-            rua=place.rua,
-            porta=place.porta,
-            cod_postal=place.cod_postal,
-            latitude=place.latitude,
-            longitude=place.longitude,
-            location_type=place.location_type,
-            coverage_radius=place.coverage_radius,
-            booking_enabled=place.booking_enabled,
-            is_bio_diamond=place.is_bio_diamond,
-            about=place.about,
-            created_at=place.created_at,
-            updated_at=place.updated_at,
-            owner_id=place.owner_id,
-            images=[
-                PlaceImageResponse(
-                    id=img.id,
-                    image_url=img.image_url,
-                    image_alt=img.alt_text,
-                    is_primary=img.is_primary,
-                    created_at=img.created_at
-                )
-                for img in images
-            ]
-        ))
+    # Fetch images for the whole page in one query
+    return await build_place_responses(db, page_data.items)
+
+
+@router.get("/facets")
+# @limiter.limit(settings.RATE_LIMIT_MOBILE_READ)
+async def get_place_facets(
+    booking_enabled: Optional[bool] = None,
+    is_bio_diamond: Optional[bool] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """Cities, sectors and regions of active places with counts (ETag, 304 on If-None-Match)"""
     
-    return place_responses
+    facets = await place_facet_cache.get(db, booking_enabled, is_bio_diamond)
+    return facet_response(if_none_match, facets, facets.data)
 
 
 @router.get("/cities/list")
 # @limiter.limit(settings.RATE_LIMIT_MOBILE_READ)
 async def get_cities_list(
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
     """Get list of all cities with active places"""
     
-    query = select(Place.cidade).where(
-        and_(
-            Place.is_active == True,
-            Place.cidade.isnot(None),
-            Place.cidade != ""
-        )
-    ).distinct().order_by(Place.cidade)
-    
-    result = await db.execute(query)
-    cities = [row[0] for row in result.fetchall()]
-    
-    return {"cities": cities}
+    facets = await place_facet_cache.get(db)
+    return facet_response(if_none_match, facets, {"cities": [item["value"] for item in facets.data["cities"]]})
 
 
 @router.get("/sectors/list")
 # @limiter.limit(settings.RATE_LIMIT_MOBILE_READ)
 async def get_sectors_list(
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
     """Get list of all sectors/types with active places"""
     
-    query = select(Place.tipo).where(
-        and_(
-            Place.is_active == True,
-            Place.tipo.isnot(None),
-            Place.tipo != ""
-        )
-    ).distinct().order_by(Place.tipo)
-    
-    result = await db.execute(query)
-    sectors = [row[0] for row in result.fetchall()]
-    
-    return {"sectors": sectors}
+    facets = await place_facet_cache.get(db)
+    return facet_response(if_none_match, facets, {"sectors": [item["value"] for item in facets.data["sectors"]]})
 
 
 @router.get("/{slug}", response_model=PlaceResponse)
@@ -340,6 +273,11 @@ async def get_place(
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific place by slug or ID"""
+    if settings.PLACE_CACHE_ENABLED:
+        cached = await place_detail_cache.get(slug)
+        if cached is not None:
+            return cached
+
     try:
         place = None
         
@@ -373,22 +311,21 @@ async def get_place(
         try:
             await db.refresh(place)
         except Exception as refresh_error:
-            print(f"Warning: Could not refresh place object: {refresh_error}")
+            logger.warning("Could not refresh place object: %s", refresh_error)
             # Continue without refresh - columns should already be loaded
         
         # Debug: Check working_hours value before calling get_working_hours()
         # This helps identify if the issue is with retrieval or with the method
         if hasattr(place, 'working_hours'):
-            print(f"DEBUG: place.working_hours type: {type(place.working_hours)}, value: {place.working_hours}")
+            logger.debug(
+                "place.working_hours type: %s, value: %s", type(place.working_hours), place.working_hours,
+                extra={"sample_rate": 0.01}
+            )
         
         # Get images for this place
-        images_result = await db.execute(
-            select(PlaceImage).where(PlaceImage.place_id == place.id)
-        )
-        images = images_result.scalars().all()
+        images = (await load_images_by_place(db, [place.id]))[place.id]
         
         # Get services for this place
-        from models.place_existing import PlaceService, Service
         services_result = await db.execute(
             select(Service, PlaceService).join(
                 PlaceService, Service.id == PlaceService.service_id
@@ -397,7 +334,6 @@ async def get_place(
         services_data = services_result.all()
         
         # Get employees for this place
-        from models.place_existing import PlaceEmployee
         employees_result = await db.execute(
             select(PlaceEmployee).where(
                 PlaceEmployee.place_id == place.id,
@@ -406,63 +342,25 @@ async def get_place(
         )
         employees = employees_result.scalars().all()
         
-        # Get review summary for this place
-        review_summary = {"average_rating": 0.0, "total_reviews": 0}
+        # Get review summary for this place (materialized aggregates)
+        place_reviews = review_summary(None)
         try:
-            # Get review statistics
-            review_stats_result = await db.execute(
-                select(
-                    func.avg(Review.rating).label('average_rating'),
-                    func.count(Review.id).label('total_reviews')
-                ).where(Review.place_id == place.id)
-            )
-            review_stats = review_stats_result.first()
-            
-            if review_stats and review_stats.total_reviews > 0:
-                review_summary = {
-                    "average_rating": float(review_stats.average_rating) if review_stats.average_rating else 0.0,
-                    "total_reviews": review_stats.total_reviews
-                }
+            stats_by_place = await load_review_stats(db, [place.id])
+            place_reviews = review_summary(stats_by_place.get(place.id))
         except Exception as e:
-            print(f"Error fetching review summary: {e}")
+            logger.error("Error fetching review summary: %s", e)
             # Continue with default values
 
-        # Get active campaigns for this place - simplified to avoid lazy loading issues
+        # Active campaigns of this place from the applicability index, including
+        # scheduled ones that have not started yet; ended campaigns are not listed
         campaign_responses = []
         try:
-            # Get campaigns directly without using the service to avoid lazy loading
-            campaigns_result = await db.execute(
-                select(Campaign).where(
-                    Campaign.status == 'active'
-                )
-            )
-            active_campaigns = campaigns_result.scalars().all()
-            
-            # Filter campaigns that apply to this place
-            place_campaigns = []
-            for campaign in active_campaigns:
-                # Check if this campaign applies to this place
-                campaign_place_result = await db.execute(
-                    select(CampaignPlace).where(
-                        CampaignPlace.campaign_id == campaign.id,
-                        CampaignPlace.place_id == place.id
-                    )
-                )
-                if campaign_place_result.scalar_one_or_none():
-                    place_campaigns.append(campaign)
+            place_campaigns = await campaign_index.for_place(db, place.id, include_scheduled=True)
             
             # Convert campaigns to response format
             for campaign in place_campaigns:
-                from datetime import datetime
                 now = datetime.utcnow()
-                days_remaining = 0
-                
-                if campaign.config and 'end_datetime' in campaign.config:
-                    try:
-                        end_datetime = datetime.fromisoformat(campaign.config['end_datetime'].replace('Z', '+00:00'))
-                        days_remaining = (end_datetime - now).days
-                    except (ValueError, TypeError):
-                        days_remaining = 0
+                days_remaining = (campaign.end_datetime - now).days if campaign.end_datetime else 0
                 
                 # Extract campaign details from config
                 config = campaign.config or {}
@@ -472,7 +370,7 @@ async def get_place(
                     name=campaign.name,
                     banner_message=config.get('banner_message', ''),
                     campaign_type=campaign.type,
-                    end_datetime=datetime.fromisoformat(config['end_datetime'].replace('Z', '+00:00')) if config.get('end_datetime') else None,
+                    end_datetime=campaign.end_datetime.replace(tzinfo=timezone.utc) if campaign.end_datetime else None,
                     discount_type=config.get('discount_type'),
                     discount_value=config.get('discount_value'),
                     rewards_multiplier=config.get('rewards_multiplier'),
@@ -485,7 +383,7 @@ async def get_place(
                 
                 campaign_responses.append(campaign_response)
         except Exception as e:
-            print(f"Error getting campaigns: {e}")
+            logger.error("Error getting campaigns: %s", e)
             campaign_responses = []
         
         # Process services with basic pricing (without complex campaign calculations for now)
@@ -504,43 +402,10 @@ async def get_place(
             )
             services_with_prices.append(service_response)
         
-        return PlaceResponse(
-            id=place.id,
-            codigo=place.codigo,
-            nome=place.nome,
-            slug=getattr(place, 'slug', None) or None,  # Handle missing slug column
-            tipo=place.tipo,
-            pais=place.pais,
-            telefone=place.telefone,
-            email=place.email,
-            website=place.website,
-            instagram=place.instagram,
-            regiao=place.regiao,
-            cidade=place.cidade,
-            rua=place.rua,
-            porta=place.porta,
-            cod_postal=place.cod_postal,
-            latitude=place.latitude,
-            longitude=place.longitude,
-            location_type=place.location_type,
-            coverage_radius=place.coverage_radius,
-            booking_enabled=place.booking_enabled,
-            is_bio_diamond=place.is_bio_diamond,
-            about=place.about,
+        response = build_place_response(
+            place,
+            images,
             working_hours=_safe_get_working_hours(place),
-            created_at=place.created_at,
-            updated_at=place.updated_at,
-            owner_id=place.owner_id,
-            images=[
-                PlaceImageResponse(
-                    id=img.id,
-                    image_url=img.image_url,
-                    image_alt=img.alt_text,
-                    is_primary=img.is_primary,
-                    created_at=img.created_at
-                )
-                for img in images
-            ],
             services=services_with_prices,
             active_campaigns=campaign_responses,
             employees=[
@@ -559,17 +424,17 @@ async def get_place(
                 )
                 for emp in employees
             ],
-            reviews=review_summary
+            reviews=place_reviews
         )
+        if settings.PLACE_CACHE_ENABLED:
+            await place_detail_cache.set(slug, place.id, response.model_dump(mode="json"))
+        return response
         
     except HTTPException:
         # Re-raise HTTP exceptions (like 404)
         raise
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"Error in get_place: {e}")
-        print(f"Traceback: {error_trace}")
+        logger.error("Error in get_place: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
     
 @router.get("/{place_id}/employees")
@@ -590,9 +455,6 @@ async def get_place_employees(
         raise HTTPException(status_code=404, detail="Place not found")
     
     # Get employees (public data only - no email/phone)
-    from models.place_existing import PlaceEmployee
-    from schemas.place_employee import PlaceEmployeePublicResponse
-    
     result = await db.execute(
         select(PlaceEmployee).where(
             PlaceEmployee.place_id == place_id,
@@ -676,7 +538,6 @@ async def get_employees_by_service(
         raise HTTPException(status_code=404, detail="Place not found")
     
     # Verify service exists and belongs to this place
-    from models.place_existing import PlaceService
     result = await db.execute(
         select(PlaceService).where(
             PlaceService.place_id == place_id,
@@ -690,7 +551,6 @@ async def get_employees_by_service(
         raise HTTPException(status_code=404, detail="Service not found or not available at this place")
     
     # Get employees who can perform this service
-    from models.place_existing import EmployeeService, PlaceEmployee
     result = await db.execute(
         select(PlaceEmployee).join(EmployeeService).where(
             PlaceEmployee.place_id == place_id,
@@ -738,7 +598,6 @@ async def get_services_by_employee(
         raise HTTPException(status_code=404, detail="Place not found")
     
     # Verify employee exists and belongs to this place
-    from models.place_existing import PlaceEmployee
     result = await db.execute(
         select(PlaceEmployee).where(
             PlaceEmployee.id == employee_id,
@@ -752,7 +611,6 @@ async def get_services_by_employee(
         raise HTTPException(status_code=404, detail="Employee not found or not available at this place")
     
     # Get services that this employee can perform
-    from models.place_existing import EmployeeService, PlaceService
     result = await db.execute(
         select(Service, PlaceService).join(
             EmployeeService, Service.id == EmployeeService.service_id
@@ -803,7 +661,6 @@ async def get_place_availability(
         raise HTTPException(status_code=404, detail="Place not found")
     
     # Parse date
-    from datetime import datetime, date as date_type
     try:
         if isinstance(date, date_type):
             check_date = date
@@ -814,302 +671,68 @@ async def get_place_availability(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
     
-    # Check place closed periods (full-day closures)
-    closed_query = select(PlaceClosedPeriod).where(
-        PlaceClosedPeriod.place_id == place_id,
-        PlaceClosedPeriod.status == 'active',
-        PlaceClosedPeriod.start_date <= check_date,
-        PlaceClosedPeriod.end_date >= check_date
+    # Closures, working hours, bookings and time-off are resolved by the availability engine
+    return await get_day_availability(
+        db,
+        place,
+        check_date,
+        date_value=date,
+        service_id=service_id,
+        employee_id=employee_id
     )
-    result = await db.execute(closed_query)
-    closures = result.scalars().all()
-    # Also consider recurring yearly closures
-    if not closures:
-        recur_query = select(PlaceClosedPeriod).where(
-            PlaceClosedPeriod.place_id == place_id,
-            PlaceClosedPeriod.status == 'active',
-            PlaceClosedPeriod.is_recurring == True
-        )
-        recur_result = await db.execute(recur_query)
-        recurring = recur_result.scalars().all()
-        for c in recurring:
-            if c.is_active_on_date(check_date):
-                closures.append(c)
-    if closures:
-        # If any closure applies, block the entire day
-        return {
-            "place_id": place_id,
-            "date": date,
-            "service_id": service_id,
-            "time_slots": [],
-            "available_slots": [],
-            "is_available": False,
-            "reason": "Place is closed"
-        }
 
-    # Get working hours for the place
-    working_hours = place.get_working_hours()
-    
-    # Get day of week (0=Monday, 6=Sunday)
-    weekday = check_date.weekday()
-    day_names = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-    day_key = day_names[weekday]
-    
-    # Check if place is open on this day
-    day_hours = working_hours.get(day_key, {})
-    is_open = day_hours.get('available', False)
-    
-    if not is_open:
-        return {
-            "place_id": place_id,
-            "date": date,
-            "service_id": service_id,
-            "time_slots": [],
-            "available_slots": [],
-            "is_available": False,
-            "reason": f"Place is closed on {day_key.title()}"
-        }
+
+@router.get("/{place_id}/availability/range")
+# @limiter.limit(settings.RATE_LIMIT_MOBILE_READ)
+async def get_place_availability_range(
+    place_id: int,
+    from_date: str = Query(..., alias="from", description="First date in YYYY-MM-DD format"),
+    to_date: str = Query(..., alias="to", description="Last date (inclusive) in YYYY-MM-DD format"),
+    service_id: Optional[int] = Query(None, description="Optional service ID to filter by"),
+    employee_id: Optional[int] = Query(None, description="Optional employee ID to check availability"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get available time slots for a place over a range of dates (max 60 days)"""
     
-    # Get opening and closing times
-    start_time = day_hours.get('start', '09:00')
-    end_time = day_hours.get('end', '17:00')
-    
-    # Generate time slots based on working hours
-    from datetime import time, timedelta
-    
-    def time_to_minutes(time_str):
-        """Convert time string (HH:MM) to minutes since midnight"""
-        hours, minutes = map(int, time_str.split(':'))
-        return hours * 60 + minutes
-    
-    def minutes_to_time(minutes):
-        """Convert minutes since midnight to time string (HH:MM)"""
-        hours = minutes // 60
-        mins = minutes % 60
-        return f"{hours:02d}:{mins:02d}"
-    
-    # Generate 30-minute intervals between start and end time
-    start_minutes = time_to_minutes(start_time)
-    end_minutes = time_to_minutes(end_time)
-    
-    time_slots = []
-    current_minutes = start_minutes
-    while current_minutes < end_minutes:
-        time_slots.append(minutes_to_time(current_minutes))
-        current_minutes += 30  # 30-minute intervals
-    
-    # Helper function to map any booking time to its containing slot
-    # A slot covers a 30-minute period: e.g., 09:00 slot covers 09:00-09:29:59
-    def map_time_to_slot(booking_time_str: str) -> str:
-        """Map any booking time to its containing slot by rounding down to nearest 30-minute interval"""
-        try:
-            hours, minutes = map(int, booking_time_str.split(':'))
-            # Round down minutes to nearest 30-minute interval
-            slot_minutes = (minutes // 30) * 30
-            return f"{hours:02d}:{slot_minutes:02d}"
-        except (ValueError, AttributeError):
-            # If time format is invalid, return as-is for backward compatibility
-            return booking_time_str
-    
-    # Check if place has employees
+    # Verify place exists
     result = await db.execute(
-        select(PlaceEmployee).where(
-            PlaceEmployee.place_id == place_id,
-            PlaceEmployee.is_active == True
-        )
+        select(Place).where(Place.id == place_id, Place.is_active == True)
     )
-    employees = result.scalars().all()
-    
-    if not employees:
-        return {
-            "place_id": place_id,
-            "date": date,
-            "service_id": service_id,
-            "time_slots": time_slots,
-            "available_slots": [],
-            "is_available": False,
-            "reason": "No employees found for this place"
-        }
-    
-    # Get existing bookings for the date to check conflicts
-    # Use the main bookings table (not business_bookings which is empty)
-    from models.place_existing import Booking
-    from datetime import datetime, date as date_type
-    
-    # Convert date to date object for comparison
-    if isinstance(date, date_type):
-        check_date_obj = date
-    else:
-        check_date_obj = datetime.strptime(str(date), "%Y-%m-%d").date()
+    place = result.scalar_one_or_none()
     
-    # Query the main bookings table
-    booking_query = select(Booking).where(
-        Booking.place_id == place_id,
-        Booking.booking_date == check_date_obj,
-        Booking.status.in_(["pending", "confirmed"])
-    )
+    if not place:
+        raise HTTPException(status_code=404, detail="Place not found")
     
-    result = await db.execute(booking_query)
-    existing_bookings = result.scalars().all()
-    
-    # Get booked time slots (map any booking time to its containing slot)
-    booked_times = set()
-    for booking in existing_bookings:
-        if booking.booking_time:
-            time_str = booking.booking_time.strftime("%H:%M")
-            mapped_slot = map_time_to_slot(time_str)
-            # Only add if the mapped slot exists in time_slots
-            if mapped_slot in time_slots:
-                booked_times.add(mapped_slot)
-    
-    # If employee_id is provided, only remove slots booked or time-off by that specific employee
-    if employee_id:
-        # Get bookings for the specific employee only
-        employee_booking_query = select(Booking).where(
-            Booking.place_id == place_id,
-            Booking.booking_date == check_date_obj,
-            Booking.employee_id == employee_id,
-            Booking.status.in_(["pending", "confirmed"])
-        )
-        result = await db.execute(employee_booking_query)
-        employee_bookings = result.scalars().all()
-        
-        # Get slots booked by this specific employee (map any booking time to its containing slot)
-        employee_booked_times = set()
-        for booking in employee_bookings:
-            if booking.booking_time:
-                time_str = booking.booking_time.strftime("%H:%M")
-                mapped_slot = map_time_to_slot(time_str)
-                # Only add if the mapped slot exists in time_slots
-                if mapped_slot in time_slots:
-                    employee_booked_times.add(mapped_slot)
-        
-        # Check time-off for this employee
-        to_query = select(PlaceEmployeeTimeOff).where(
-            PlaceEmployeeTimeOff.place_id == place_id,
-            PlaceEmployeeTimeOff.employee_id == employee_id,
-            PlaceEmployeeTimeOff.status == 'approved',
-            PlaceEmployeeTimeOff.start_date <= check_date,
-            PlaceEmployeeTimeOff.end_date >= check_date
-        )
-        to_result = await db.execute(to_query)
-        timeoffs = to_result.scalars().all()
-        # Include recurring
-        recur_to_query = select(PlaceEmployeeTimeOff).where(
-            PlaceEmployeeTimeOff.place_id == place_id,
-            PlaceEmployeeTimeOff.employee_id == employee_id,
-            PlaceEmployeeTimeOff.status == 'approved',
-            PlaceEmployeeTimeOff.is_recurring == True
-        )
-        recur_to_res = await db.execute(recur_to_query)
-        recurring_timeoffs = recur_to_res.scalars().all()
-        for t in recurring_timeoffs:
-            if t.is_active_on_date(check_date):
-                timeoffs.append(t)
-
-        # Determine off slots
-        employee_off_full_day = any(t.is_full_day for t in timeoffs)
-        employee_off_am = any((not t.is_full_day and t.half_day_period == 'AM') for t in timeoffs)
-        employee_off_pm = any((not t.is_full_day and t.half_day_period == 'PM') for t in timeoffs)
-
-        def is_slot_off(slot_str: str) -> bool:
-            if employee_off_full_day:
-                return True
-            hours, minutes = map(int, slot_str.split(':'))
-            if employee_off_am and (hours < 12):
-                return True
-            if employee_off_pm and (hours >= 12):
-                return True
-            return False
-
-        # Filter out slots booked or off for this employee
-        available_slots = [slot for slot in time_slots if slot not in employee_booked_times and not is_slot_off(slot)]
-    else:
-        # If no employee specified, show slots as available if ANY employee is available
-        # Filter out slots where ALL employees are booked
-        available_slots = []
-        
-        # Preload time-off per employee
-        employee_timeoff_map = {}
-        emp_ids = [emp.id for emp in employees]
-        if emp_ids:
-            to_query = select(PlaceEmployeeTimeOff).where(
-                PlaceEmployeeTimeOff.place_id == place_id,
-                PlaceEmployeeTimeOff.employee_id.in_(emp_ids),
-                PlaceEmployeeTimeOff.status == 'approved',
-                PlaceEmployeeTimeOff.start_date <= check_date,
-                PlaceEmployeeTimeOff.end_date >= check_date
-            )
-            to_result = await db.execute(to_query)
-            for t in to_result.scalars().all():
-                employee_timeoff_map.setdefault(t.employee_id, []).append(t)
-            recur_query = select(PlaceEmployeeTimeOff).where(
-                PlaceEmployeeTimeOff.place_id == place_id,
-                PlaceEmployeeTimeOff.employee_id.in_(emp_ids),
-                PlaceEmployeeTimeOff.status == 'approved',
-                PlaceEmployeeTimeOff.is_recurring == True
-            )
-            recur_res = await db.execute(recur_query)
-            for t in recur_res.scalars().all():
-                if t.is_active_on_date(check_date):
-                    employee_timeoff_map.setdefault(t.employee_id, []).append(t)
-
-        for slot in time_slots:
-            # Check if at least one employee is available at this time slot
-            slot_available = False
-            
-            for employee in employees:
-                # Check if this employee is booked at this specific slot
-                # Map any booking time to its containing slot
-                employee_booked = False
-                for booking in existing_bookings:
-                    if booking.employee_id == employee.id and booking.booking_time:
-                        booking_time_str = booking.booking_time.strftime("%H:%M")
-                        mapped_slot = map_time_to_slot(booking_time_str)
-                        if mapped_slot == slot:
-                            employee_booked = True
-                            break
-                
-                # Check time-off for this employee at this slot
-                def is_slot_off_for_employee(emp_id: int, slot_str: str) -> bool:
-                    tos = employee_timeoff_map.get(emp_id, [])
-                    if not tos:
-                        return False
-                    if any(t.is_full_day for t in tos):
-                        return True
-                    hours, minutes = map(int, slot_str.split(':'))
-                    if any((not t.is_full_day and t.half_day_period == 'AM') for t in tos) and hours < 12:
-                        return True
-                    if any((not t.is_full_day and t.half_day_period == 'PM') for t in tos) and hours >= 12:
-                        return True
-                    return False
-
-                # If this employee is not booked and not off, the slot is available
-                if not employee_booked and not is_slot_off_for_employee(employee.id, slot):
-                    slot_available = True
-                    break
-            
-            if slot_available:
-                available_slots.append(slot)
+    try:
+        start_date = datetime.strptime(from_date, "%Y-%m-%d").date()
+        end_date = datetime.strptime(to_date, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
     
-    # Campaign data will be fetched separately by the frontend
-    slots_with_campaigns = {}
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="'to' must be on or after 'from'")
+    if (end_date - start_date).days + 1 > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_RANGE_DAYS} days")
     
-    # booked_times and employee_booked_times are already mapped to slots
-    # Just convert to sorted list for the response
-    booked_slots = sorted(list(employee_booked_times if employee_id else booked_times))
+    # One query per input table for the whole window
+    service_duration = await load_service_duration(db, place_id, service_id) if service_id else None
+    inputs_by_day = await load_range_inputs(db, place_id, start_date, end_date)
     
-    return {
-        "place_id": place_id,
-        "date": date,
-        "service_id": service_id,
-        "time_slots": time_slots,
-        "available_slots": available_slots,
-        "is_available": len(available_slots) > 0,
-        "available_employees": [emp.id for emp in employees],
-        "booked_slots": booked_slots,
-        "slots_with_campaigns": slots_with_campaigns
-    }
+    def stream_days():
+        # Emit each day as soon as it is computed instead of building the full payload
+        yield json.dumps({
+            "place_id": place_id,
+            "from": start_date.isoformat(),
+            "to": end_date.isoformat(),
+            "service_id": service_id
+        })[:-1] + ', "days": ['
+        for index, day in enumerate(iter_range_availability(
+            place, inputs_by_day, service_id, employee_id, service_duration
+        )):
+            yield ("," if index else "") + json.dumps(day)
+        yield "]}"
+    
+    return StreamingResponse(stream_days(), media_type="application/json")
 
 
 @router.get("/{place_id}/reviews")
@@ -1139,10 +762,9 @@ async def get_place_reviews(
     result = await db.execute(query)
     reviews = result.scalars().all()
     
-    # Get total count for pagination
-    count_query = select(func.count(Review.id)).where(Review.place_id == place_id)
-    count_result = await db.execute(count_query)
-    total_reviews = count_result.scalar()
+    # Total count for pagination from the place's review aggregates
+    stats_by_place = await load_review_stats(db, [place_id])
+    total_reviews = review_summary(stats_by_place.get(place_id))["total_reviews"]
     
     # Calculate pagination info
     total_pages = (total_reviews + per_page - 1) // per_page
@@ -1189,20 +811,27 @@ async def create_place_review(
     if not place:
         raise HTTPException(status_code=404, detail="Place not found")
     
+    rating = review_data.get('rating')
+    if isinstance(rating, bool) or not isinstance(rating, int) or rating not in RATINGS:
+        raise HTTPException(status_code=400, detail="Rating must be an integer from 1 to 5")
+    
     # Create new review
     review = Review(
         place_id=place_id,
         customer_name=review_data.get('customer_name'),
         customer_email=review_data.get('customer_email', ''),
-        rating=review_data.get('rating'),
+        rating=rating,
         title=review_data.get('title'),
         comment=review_data.get('comment'),
         is_verified=False
     )
     
     db.add(review)
+    # Aggregates are updated in the same transaction as the review
+    await record_review(db, place_id, rating)
     await db.commit()
     await db.refresh(review)
+    await invalidate_place(place_id)
     
     return {
         "id": review.id,
@@ -1287,34 +916,19 @@ async def create_booking(
             detail="Place not found or booking not enabled"
         )
     
-    # Verify all services exist and get their details
-    from models.place_existing import BookingService
+    if not booking_data.service_ids:
+        raise HTTPException(status_code=400, detail="At least one service is required")
+    
+    # Verify all services exist and get their details with one join
+    services_by_id = await load_services_by_place_service_id(db, place_id, booking_data.service_ids)
     services = []
     total_price = 0
     total_duration = 0
     
     for service_id in booking_data.service_ids:
-        # Get service from place_services table
-        result = await db.execute(
-            select(PlaceService).where(
-                PlaceService.id == service_id,
-                PlaceService.place_id == place_id,
-                PlaceService.is_available == True
-            )
-        )
-        place_service = result.scalar_one_or_none()
-        
-        if not place_service:
+        if service_id not in services_by_id:
             raise HTTPException(status_code=404, detail=f"Service with ID {service_id} not found or not available")
-        
-        # Get service details
-        result = await db.execute(
-            select(Service).where(Service.id == place_service.service_id)
-        )
-        service = result.scalar_one_or_none()
-        
-        if not service:
-            raise HTTPException(status_code=404, detail=f"Service details not found for ID {service_id}")
+        place_service, service = services_by_id[service_id]
         
         services.append({
             'place_service_id': place_service.id,
@@ -1327,33 +941,46 @@ async def create_booking(
         total_price += place_service.price or 0
         total_duration += place_service.duration or 0
     
+    # Parse date and time strings to datetime objects
+    try:
+        booking_date_obj = datetime.strptime(booking_data.booking_date, "%Y-%m-%d")
+        booking_time_obj = datetime.strptime(booking_data.booking_time, "%H:%M")
+        
+        # Combine date and time into a single datetime
+        booking_datetime = datetime.combine(booking_date_obj.date(), booking_time_obj.time())
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid date or time format. Use YYYY-MM-DD for date and HH:MM for time. Error: {str(e)}"
+        )
+    
+    # Booking occupies [start, start + total duration) in minutes of the day
+    slot_minutes = place_slot_minutes(place)
+    booking_start = booking_time_obj.hour * 60 + booking_time_obj.minute
+    booking_end = booking_start + (total_duration or slot_minutes)
+    
     # Handle employee assignment based on any_employee_selected flag
-    from models.place_existing import PlaceEmployee
     employee_id_to_use = booking_data.employee_id
     
     if booking_data.any_employee_selected:
-        # Customer selected "any available employee" - find the best available employee
-        # Get all active employees for this place
-        result = await db.execute(
-            select(PlaceEmployee).where(
-                PlaceEmployee.place_id == place_id,
-                PlaceEmployee.is_active == True
-            )
-        )
-        available_employees = result.scalars().all()
-        
-        if not available_employees:
+        # Customer selected "any available employee" - pick the least-loaded qualified
+        # employee who is free for the whole booking, from the day's preloaded state
+        booked_service_ids = [service['service_id'] for service in services]
+        assignment_inputs = await load_assignment_inputs(db, place_id, booking_date_obj.date(), booked_service_ids)
+        if not assignment_inputs.day.employees:
             raise HTTPException(
                 status_code=400,
                 detail="No employees available at this place"
             )
         
-        # For now, assign the first available employee
-        # In a more sophisticated implementation, you could consider:
-        # - Employee workload
-        # - Employee specialization for the service
-        # - Employee availability patterns
-        employee_id_to_use = available_employees[0].id
+        employee_id_to_use = pick_employee(
+            assignment_inputs, booked_service_ids, booking_start, booking_end, slot_minutes
+        )
+        if employee_id_to_use is None:
+            raise HTTPException(
+                status_code=409,
+                detail="No employees available at this time"
+            )
     else:
         # Customer selected a specific employee - verify they exist and are available
         result = await db.execute(
@@ -1370,47 +997,17 @@ async def create_booking(
                 status_code=404, 
                 detail="Employee not found or not available at this place"
             )
-    
-    # Parse date and time strings to datetime objects
-    try:
-        booking_date_obj = datetime.strptime(booking_data.booking_date, "%Y-%m-%d")
-        booking_time_obj = datetime.strptime(booking_data.booking_time, "%H:%M")
         
-        # Combine date and time into a single datetime
-        booking_datetime = datetime.combine(booking_date_obj.date(), booking_time_obj.time())
-    except ValueError as e:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid date or time format. Use YYYY-MM-DD for date and HH:MM for time. Error: {str(e)}"
+        # Check if the employee has any booking overlapping [start, start + total duration)
+        booking_index = await load_booking_index(
+            db, place_id, booking_date_obj.date(), [employee_id_to_use], default_minutes=slot_minutes
         )
-    
-    # Check if employee is already booked at this time
-    from models.place_existing import Booking
-    existing_booking_query = select(Booking).where(
-        Booking.place_id == place_id,
-        Booking.employee_id == employee_id_to_use,
-        Booking.booking_date == booking_date_obj.date(),
-        Booking.booking_time == booking_time_obj.time(),
-        Booking.status.in_(["pending", "confirmed"])
-    )
-    result = await db.execute(existing_booking_query)
-    existing_booking = result.scalar_one_or_none()
-    
-    if existing_booking:
-        raise HTTPException(
-            status_code=400,
-            detail="Employee is already booked at this time"
-        )
-    
-    # Try to link booking to user if customer email matches a registered user
-    user_id = None
-    if booking_data.customer_email:
-        from models.user import User
-        user_query = select(User).where(User.email == booking_data.customer_email)
-        user_result = await db.execute(user_query)
-        user = user_result.scalar_one_or_none()
-        if user:
-            user_id = user.id
+        
+        if booking_index[employee_id_to_use].overlaps(booking_start, booking_end):
+            raise HTTPException(
+                status_code=409,
+                detail="Employee is already booked at this time"
+            )
     
     # Create new booking
     booking = Booking(
@@ -1426,7 +1023,7 @@ async def create_booking(
         duration=total_duration,  # Store total duration
         any_employee_selected=booking_data.any_employee_selected,  # Store the flag
         status='pending',
-        user_id=user_id,  # Link to user if found
+        user_id=user_id_for_email(booking_data.customer_email),  # Link to user if found
         total_price=total_price,  # Store total price
         total_duration=total_duration,  # Store total duration
         # Campaign fields - store snapshot if campaign data provided
@@ -1438,23 +1035,6 @@ async def create_booking(
         campaign_banner_message=booking_data.campaign_banner_message
     )
     
-    db.add(booking)
-    await db.commit()
-    await db.refresh(booking)
-    
-    # Create booking services entries for all selected services
-    for service in services:
-        booking_service = BookingService(
-            booking_id=booking.id,
-            service_id=service['service_id'],
-            service_name=service['service_name'],
-            service_price=service['service_price'],
-            service_duration=service['service_duration']
-        )
-        db.add(booking_service)
-    
-    await db.commit()
-    
     # Prepare services data for email notification
     services_data = []
     for service in services:
@@ -1464,23 +1044,25 @@ async def create_booking(
             'service_duration': service['service_duration']
         })
     
-    # Send email notification with services data
+    # Email notification with services data, queued in the booking's transaction
+    email_data = {
+        'customer_name': booking.customer_name,
+        'customer_email': booking.customer_email,
+        'salon_name': place.nome,
+        'booking_date': booking_data.booking_date,
+        'booking_time': booking_data.booking_time,
+        'duration': total_duration,
+        'total_price': float(total_price),
+        'services': services_data
+    }
+    queue_email(db, "send_booking_request_notification", email_data)
+    
+    # Booking, booking services and the queued email are written in one transaction; a
+    # concurrent booking that slipped past the check above is rejected by the overlap constraint
     try:
-        from email_service import EmailService
-        email_service = EmailService()
-        email_data = {
-            'customer_name': booking.customer_name,
-            'customer_email': booking.customer_email,
-            'salon_name': place.nome,
-            'booking_date': booking_data.booking_date,
-            'booking_time': booking_data.booking_time,
-            'duration': total_duration,
-            'total_price': float(total_price),
-            'services': services_data
-        }
-        email_service.send_booking_request_notification(email_data)
-    except Exception as e:
-        print(f"Failed to send email notification: {str(e)}")
+        await save_booking(db, booking, services, slot_minutes)
+    except BookingConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     
     # Create notification for owner about new booking (asynchronous - don't fail booking if this fails)
     # This happens after booking and booking services are committed, so we're in a new transaction
@@ -1501,10 +1083,7 @@ async def create_booking(
             )
         except Exception as e:
             # Log error but don't fail the booking
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"❌ Error scheduling notification task for booking {booking.id}: {str(e)}")
-            print(f"⚠️ Failed to schedule notification task: {str(e)}")
+            logger.error("Error scheduling notification task for booking %s: %s", booking.id, e, exc_info=True)
     
     return BookingResponse(
         id=booking.id,
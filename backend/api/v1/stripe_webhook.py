@@ -8,9 +8,12 @@ from core.config import settings
 from core.database import get_db, AsyncSessionLocal
 from models.billing import Subscription as BillingSubscription, Invoice as BillingInvoice, BillingCustomer
 from models.user import User
+from services.entitlements import invalidate_entitlements
+import logging
 
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 @router.post("/webhook")
@@ -26,14 +29,14 @@ async def stripe_webhook(request: Request):
             secret=settings.STRIPE_WEBHOOK_SECRET,
         )
     except Exception as e:
-        print(f"❌ Webhook signature verification failed: {e}")
+        logger.error("Webhook signature verification failed: %s", e)
         raise HTTPException(status_code=400, detail=f"Invalid webhook: {e}")
 
     event_type = event.get("type")
     data = event.get("data", {}).get("object", {})
     
-    print(f"📥 Received Stripe webhook: {event_type}")
-    print(f"📦 Event ID: {event.get('id')}")
+    logger.info("Received Stripe webhook: %s", event_type)
+    logger.info("Event ID: %s", event.get('id'))
 
     # Use independent DB session to avoid dependency stack in webhook thread
     async with AsyncSessionLocal() as db:
@@ -111,6 +114,7 @@ async def _handle_subscription_updated(db: AsyncSession, obj: dict) -> None:
     if current_period_end:
         sub.current_period_end = datetime.fromtimestamp(current_period_end, tz=timezone.utc)
     await db.commit()
+    invalidate_entitlements(user_id)
     
     # Sync to UserPlaceSubscription records for feature gating
     if sub.plan_code and sub.active:
@@ -135,48 +139,48 @@ async def _handle_subscription_deleted(db: AsyncSession, obj: dict) -> None:
 
 async def _handle_checkout_session_completed(db: AsyncSession, obj: dict) -> None:
     """Handle checkout.session.completed - create user account if registration data exists."""
-    print(f"🔍 Processing checkout.session.completed: session_id={obj.get('id')}")
+    logger.debug("Processing checkout.session.completed: session_id=%s", obj.get('id'))
     metadata = obj.get("metadata", {})
     create_account = metadata.get("create_account_after_payment") == "true"
     
-    print(f"🔍 create_account_after_payment: {create_account}")
-    print(f"🔍 Metadata keys: {list(metadata.keys())}")
+    logger.debug("create_account_after_payment: %s", create_account)
+    logger.debug("Metadata keys: %s", list(metadata.keys()))
     
     if not create_account:
-        print("ℹ️ Not a registration checkout, skipping account creation")
+        logger.info("Not a registration checkout, skipping account creation")
         return  # Not a registration checkout
     
     registration_data_str = metadata.get("registration_data")
     if not registration_data_str:
-        print("⚠️ No registration data found in checkout session metadata")
+        logger.warning("No registration data found in checkout session metadata")
         return
     
     try:
         import json
         registration_data = json.loads(registration_data_str)
-        print(f"✅ Parsed registration data for email: {registration_data.get('email')}")
+        logger.info("Parsed registration data for email: %s", registration_data.get('email'))
     except Exception as e:
-        print(f"⚠️ Failed to parse registration data: {e}")
+        logger.warning("Failed to parse registration data: %s", e)
         return
     
     # Get plan_code from metadata - prioritize checkout session metadata, then registration data
     plan_code = metadata.get("plan_code") or registration_data.get("selected_plan_code")
-    print(f"🔍 Plan code from checkout metadata: {metadata.get('plan_code')}")
-    print(f"🔍 Plan code from registration_data: {registration_data.get('selected_plan_code')}")
-    print(f"🔍 Final plan code: {plan_code}")
+    logger.debug("Plan code from checkout metadata: %s", metadata.get('plan_code'))
+    logger.debug("Plan code from registration_data: %s", registration_data.get('selected_plan_code'))
+    logger.debug("Final plan code: %s", plan_code)
     
     # Validate plan_code is set
     if not plan_code:
-        print(f"❌ ERROR: plan_code is missing! Cannot create account without plan code.")
-        print(f"❌ Checkout metadata keys: {list(metadata.keys())}")
-        print(f"❌ Registration data keys: {list(registration_data.keys())}")
+        logger.error("plan_code is missing! Cannot create account without plan code.")
+        logger.error("Checkout metadata keys: %s", list(metadata.keys()))
+        logger.error("Registration data keys: %s", list(registration_data.keys()))
         return
     
     # Check if invoice is paid before creating account
     subscription_id = obj.get("subscription")
     payment_status = obj.get("payment_status")
     
-    print(f"🔍 Subscription ID: {subscription_id}, Payment Status: {payment_status}")
+    logger.debug("Subscription ID: %s, Payment Status: %s", subscription_id, payment_status)
     
     if subscription_id:
         import stripe
@@ -186,41 +190,39 @@ async def _handle_checkout_session_completed(db: AsyncSession, obj: dict) -> Non
         try:
             subscription = stripe.Subscription.retrieve(subscription_id)
             latest_invoice_id = subscription.get("latest_invoice")
-            print(f"🔍 Latest invoice ID: {latest_invoice_id}")
+            logger.debug("Latest invoice ID: %s", latest_invoice_id)
             
             if latest_invoice_id:
                 invoice = stripe.Invoice.retrieve(latest_invoice_id)
                 invoice_paid = invoice.get("paid")
                 invoice_status = invoice.get("status")
-                print(f"🔍 Invoice paid: {invoice_paid}, status: {invoice_status}")
+                logger.debug("Invoice paid: %s, status: %s", invoice_paid, invoice_status)
                 
                 if invoice_paid and invoice_status == "paid":
                     # Invoice is paid, create account with subscription
-                    print(f"✅ Invoice is paid, creating user account for {registration_data.get('email')}")
+                    logger.info("Invoice is paid, creating user account for %s", registration_data.get('email'))
                     await _create_user_from_registration_data(db, registration_data, subscription_id, plan_code)
                 else:
-                    print(f"⚠️ Invoice not paid yet for subscription {subscription_id}, waiting for invoice.payment_succeeded")
+                    logger.warning("Invoice not paid yet for subscription %s, waiting for invoice.payment_succeeded", subscription_id)
                     # Also check payment_status from checkout session
                     if payment_status == "paid":
-                        print(f"✅ Payment status is paid, creating user account for {registration_data.get('email')}")
+                        logger.info("Payment status is paid, creating user account for %s", registration_data.get('email'))
                         await _create_user_from_registration_data(db, registration_data, subscription_id, plan_code)
         except Exception as e:
-            print(f"⚠️ Error checking invoice status: {e}")
-            import traceback
-            print(f"⚠️ Traceback: {traceback.format_exc()}")
+            logger.warning("Error checking invoice status: %s", e, exc_info=True)
     elif payment_status == "paid":
         # If no subscription but payment is paid, create account anyway
-        print(f"✅ Payment status is paid (no subscription), creating user account for {registration_data.get('email')}")
+        logger.info("Payment status is paid (no subscription), creating user account for %s", registration_data.get('email'))
         await _create_user_from_registration_data(db, registration_data, None, plan_code)
 
 
 async def _handle_invoice_payment_succeeded(db: AsyncSession, obj: dict) -> None:
     """Handle invoice.payment_succeeded - create account if registration pending, or handle upgrade."""
-    print(f"🔍 Processing invoice.payment_succeeded: invoice_id={obj.get('id')}")
+    logger.debug("Processing invoice.payment_succeeded: invoice_id=%s", obj.get('id'))
     customer_id = obj.get("customer")
     subscription_id = obj.get("subscription")
     
-    print(f"🔍 Customer ID: {customer_id}, Subscription ID: {subscription_id}")
+    logger.debug("Customer ID: %s, Subscription ID: %s", customer_id, subscription_id)
     
     # Check if subscription has registration metadata (new registration)
     if subscription_id:
@@ -234,15 +236,15 @@ async def _handle_invoice_payment_succeeded(db: AsyncSession, obj: dict) -> None
             registration_data_str = subscription_metadata.get("registration_data")
             is_upgrade = subscription_metadata.get("upgrade") == "true"
             
-            print(f"🔍 Subscription metadata keys: {list(subscription_metadata.keys())}")
-            print(f"🔍 Has registration_data: {bool(registration_data_str)}, is_upgrade: {is_upgrade}")
+            logger.debug("Subscription metadata keys: %s", list(subscription_metadata.keys()))
+            logger.debug("Has registration_data: %s, is_upgrade: %s", bool(registration_data_str), is_upgrade)
             
             # Handle new registration
             if registration_data_str:
                 import json
                 registration_data = json.loads(registration_data_str)
                 email = registration_data.get("email")
-                print(f"✅ Found registration data for email: {email}")
+                logger.info("Found registration data for email: %s", email)
                 
                 if email:
                     # Check if user already exists
@@ -252,34 +254,34 @@ async def _handle_invoice_payment_succeeded(db: AsyncSession, obj: dict) -> None
                     if not existing_user:
                         # Get plan_code from subscription metadata or registration data
                         plan_code = subscription_metadata.get("plan_code") or registration_data.get("selected_plan_code")
-                        print(f"🔍 Plan code from subscription metadata: {subscription_metadata.get('plan_code')}")
-                        print(f"🔍 Plan code from registration_data: {registration_data.get('selected_plan_code')}")
-                        print(f"🔍 Final plan code for account creation: {plan_code}")
+                        logger.debug("Plan code from subscription metadata: %s", subscription_metadata.get('plan_code'))
+                        logger.debug("Plan code from registration_data: %s", registration_data.get('selected_plan_code'))
+                        logger.debug("Final plan code for account creation: %s", plan_code)
                         
                         # Validate plan_code is set
                         if not plan_code:
-                            print(f"❌ ERROR: plan_code is missing from subscription metadata!")
-                            print(f"❌ Subscription metadata keys: {list(subscription_metadata.keys())}")
-                            print(f"❌ Registration data keys: {list(registration_data.keys())}")
+                            logger.error("plan_code is missing from subscription metadata!")
+                            logger.error("Subscription metadata keys: %s", list(subscription_metadata.keys()))
+                            logger.error("Registration data keys: %s", list(registration_data.keys()))
                             # Try to extract from subscription price ID as fallback
                             plan_code = _extract_plan_code_from_stripe_subscription(subscription)
-                            print(f"🔍 Plan code extracted from subscription price: {plan_code}")
+                            logger.debug("Plan code extracted from subscription price: %s", plan_code)
                             if not plan_code:
-                                print(f"❌ CRITICAL: Cannot determine plan_code, cannot create account!")
+                                logger.error("CRITICAL: Cannot determine plan_code, cannot create account!")
                                 return
                         
                         # Create user account now that payment is confirmed
-                        print(f"✅ Creating user account for {email} after invoice payment succeeded with plan: {plan_code}")
+                        logger.info("Creating user account for %s after invoice payment succeeded with plan: %s", email, plan_code)
                         await _create_user_from_registration_data(db, registration_data, subscription_id, plan_code)
                     else:
-                        print(f"ℹ️ User {email} already exists, ensuring subscription and features")
+                        logger.info("User %s already exists, ensuring subscription and features", email)
                         # Ensure subscription is created and features are synced
                         plan_code = subscription_metadata.get("plan_code") or registration_data.get("selected_plan_code")
-                        print(f"🔍 Plan code for existing user: {plan_code}")
+                        logger.debug("Plan code for existing user: %s", plan_code)
                         if not plan_code:
                             # Try to extract from subscription price ID as fallback
                             plan_code = _extract_plan_code_from_stripe_subscription(subscription)
-                            print(f"🔍 Plan code extracted from subscription price: {plan_code}")
+                            logger.debug("Plan code extracted from subscription price: %s", plan_code)
                         await _ensure_subscription_and_features(db, existing_user.id, subscription_id, plan_code)
             
             # Handle upgrade - ensure subscription is active
@@ -301,7 +303,7 @@ async def _handle_invoice_payment_succeeded(db: AsyncSession, obj: dict) -> None
                         billing_sub.status = "active"
                         billing_sub.active = True
                         await db.commit()
-                        print(f"✅ Upgraded user {user_id} to {plan_code} plan after payment")
+                        logger.info("Upgraded user %s to %s plan after payment", user_id, plan_code)
                         
                         # Sync to place subscriptions
                         await stripe_service.sync_subscription_to_places(
@@ -312,7 +314,7 @@ async def _handle_invoice_payment_succeeded(db: AsyncSession, obj: dict) -> None
                             "active"
                         )
         except Exception as e:
-            print(f"⚠️ Error processing registration/upgrade in invoice.payment_succeeded: {e}")
+            logger.warning("Error processing registration/upgrade in invoice.payment_succeeded: %s", e)
     
     # Also handle invoice upsert
     await _handle_invoice_upsert(db, obj)
@@ -333,17 +335,17 @@ async def _create_user_from_registration_data(db: AsyncSession, registration_dat
     
     email = registration_data.get("email")
     if not email:
-        print("⚠️ No email in registration data")
+        logger.warning("No email in registration data")
         return
     
-    print(f"🔍 Creating user account for email: {email}, plan: {plan_code}")
+    logger.debug("Creating user account for email: %s, plan: %s", email, plan_code)
     
     # Check if user already exists
     user_res = await db.execute(select(User).where(User.email == email))
     existing_user = user_res.scalar_one_or_none()
     
     if existing_user:
-        print(f"ℹ️ User {email} already exists (ID: {existing_user.id}), skipping account creation")
+        logger.info("User %s already exists (ID: %s), skipping account creation", email, existing_user.id)
         # Still need to create subscription if it doesn't exist
         if subscription_id:
             await _ensure_subscription_and_features(db, existing_user.id, subscription_id, plan_code)
@@ -380,20 +382,19 @@ async def _create_user_from_registration_data(db: AsyncSession, registration_dat
         # Create user
         user = User(**user_data)
         
-        print(f"🔍 Adding user to database: {email}")
+        logger.debug("Adding user to database: %s", email)
         db.add(user)
         await db.flush()  # Flush to get the user ID
         
-        print(f"🔍 Committing user to database: {email}")
+        logger.debug("Committing user to database: %s", email)
         await db.commit()
         await db.refresh(user)
         
-        print(f"✅ Successfully created user account for {email} (ID: {user.id})")
+        logger.info("Successfully created user account for %s (ID: %s)", email, user.id)
         
         # Send welcome email
         try:
-            from email_service import EmailService
-            email_service = EmailService()  # Initialize email service (same way as booking emails)
+            from services.email_outbox import queue_email
             user_name = user.first_name or user.name or email.split('@')[0]
             plan_name = None
             
@@ -408,27 +409,22 @@ async def _create_user_from_registration_data(db: AsyncSession, registration_dat
                 except Exception:
                     pass  # Don't block on plan lookup failure
             
-            print(f"📧 Attempting to send welcome email to {email}")
-            result = email_service.send_welcome_email(
+            queue_email(
+                db, "send_welcome_email",
                 to_email=user.email,
                 to_name=user_name,
                 user_type=user.user_type,
                 plan_name=plan_name,
                 language=getattr(user, 'language_preference', None) or 'en'
             )
-            if result:
-                print(f"✅ Welcome email sent successfully to {email}")
-            else:
-                print(f"⚠️ Welcome email failed to send to {email}")
+            await db.commit()
+            logger.info("Welcome email queued for %s", email)
         except Exception as e:
-            print(f"❌ Error sending welcome email: {e}")
-            import traceback
-            print(f"❌ Traceback: {traceback.format_exc()}")
+            await db.rollback()
+            logger.error("Error queueing welcome email: %s", e, exc_info=True)
             # Don't block user creation on email failure
     except Exception as e:
-        print(f"❌ Error creating user account for {email}: {e}")
-        import traceback
-        print(f"❌ Traceback: {traceback.format_exc()}")
+        logger.error("Error creating user account for %s: %s", email, e, exc_info=True)
         await db.rollback()
         raise
     
@@ -454,7 +450,7 @@ async def _ensure_subscription_and_features(db: AsyncSession, user_id: int, subs
     stripe.api_key = settings.STRIPE_SECRET_KEY
     
     try:
-        print(f"🔍 Ensuring subscription and features for user {user_id}, subscription {subscription_id}")
+        logger.debug("Ensuring subscription and features for user %s, subscription %s", user_id, subscription_id)
         
         # Retrieve subscription from Stripe
         subscription = stripe.Subscription.retrieve(subscription_id)
@@ -465,7 +461,7 @@ async def _ensure_subscription_and_features(db: AsyncSession, user_id: int, subs
         trial_start = subscription.get("trial_start")
         trial_end = subscription.get("trial_end")
         
-        print(f"🔍 Subscription status: {status}, customer: {customer_id}")
+        logger.debug("Subscription status: %s, customer: %s", status, customer_id)
         
         # Link Stripe customer to user
         if customer_id:
@@ -479,30 +475,30 @@ async def _ensure_subscription_and_features(db: AsyncSession, user_id: int, subs
                 )
                 db.add(bc)
                 await db.commit()
-                print(f"✅ Linked Stripe customer {customer_id} to user {user_id}")
+                logger.info("Linked Stripe customer %s to user %s", customer_id, user_id)
             else:
-                print(f"ℹ️ Stripe customer {customer_id} already linked to user {bc.user_id}")
+                logger.info("Stripe customer %s already linked to user %s", customer_id, bc.user_id)
         
         # Extract plan_code if not provided
         if not plan_code:
-            print(f"🔍 Plan code not provided, attempting to extract from subscription...")
+            logger.debug("Plan code not provided, attempting to extract from subscription...")
             plan_code = _extract_plan_code_from_stripe_subscription(subscription)
-            print(f"🔍 Plan code extracted from price ID: {plan_code}")
+            logger.debug("Plan code extracted from price ID: %s", plan_code)
             
             # Also check subscription metadata
             subscription_metadata = subscription.get("metadata", {})
             if not plan_code:
                 plan_code = subscription_metadata.get("plan_code")
-                print(f"🔍 Plan code from subscription metadata: {plan_code}")
+                logger.debug("Plan code from subscription metadata: %s", plan_code)
         
-        print(f"🔍 Final plan code for subscription: {plan_code}")
+        logger.debug("Final plan code for subscription: %s", plan_code)
         
         if not plan_code:
-            print("❌ ERROR: Could not determine plan_code from subscription!")
-            print(f"❌ Subscription ID: {subscription_id}")
-            print(f"❌ Subscription items: {subscription.get('items', {}).get('data', [])}")
-            print(f"❌ Subscription metadata: {subscription.get('metadata', {})}")
-            print(f"❌ Cannot create subscription without plan_code")
+            logger.error("Could not determine plan_code from subscription!")
+            logger.error("Subscription ID: %s", subscription_id)
+            logger.error("Subscription items: %s", subscription.get('items', {}).get('data', []))
+            logger.error("Subscription metadata: %s", subscription.get('metadata', {}))
+            logger.error("Cannot create subscription without plan_code")
             return
         
         # Create or update BillingSubscription
@@ -520,12 +516,12 @@ async def _ensure_subscription_and_features(db: AsyncSession, user_id: int, subs
                 active=status in ("trialing", "active"),
             )
             db.add(billing_sub)
-            print(f"✅ Creating BillingSubscription for user {user_id} with plan {plan_code}")
+            logger.info("Creating BillingSubscription for user %s with plan %s", user_id, plan_code)
         else:
             billing_sub.status = status
             billing_sub.plan_code = plan_code
             billing_sub.active = status in ("trialing", "active")
-            print(f"✅ Updating BillingSubscription for user {user_id} with plan {plan_code}")
+            logger.info("Updating BillingSubscription for user %s with plan %s", user_id, plan_code)
         
         # Set timestamps
         if current_period_start:
@@ -534,11 +530,12 @@ async def _ensure_subscription_and_features(db: AsyncSession, user_id: int, subs
             billing_sub.current_period_end = datetime.fromtimestamp(current_period_end, tz=timezone.utc)
         
         await db.commit()
-        print(f"✅ BillingSubscription saved for user {user_id}")
+        invalidate_entitlements(user_id)
+        logger.info("BillingSubscription saved for user %s", user_id)
         
         # Sync subscription to place subscriptions (enables features)
         if billing_sub.plan_code and billing_sub.active:
-            print(f"🔍 Syncing subscription to place subscriptions for user {user_id} with plan {plan_code}")
+            logger.debug("Syncing subscription to place subscriptions for user %s with plan %s", user_id, plan_code)
             await _sync_billing_to_place_subscriptions(
                 db,
                 user_id,
@@ -549,12 +546,10 @@ async def _ensure_subscription_and_features(db: AsyncSession, user_id: int, subs
                 trial_start,
                 trial_end
             )
-            print(f"✅ Features synced for user {user_id} with plan {plan_code}")
+            logger.info("Features synced for user %s with plan %s", user_id, plan_code)
         
     except Exception as e:
-        print(f"❌ Error ensuring subscription and features: {e}")
-        import traceback
-        print(f"❌ Traceback: {traceback.format_exc()}")
+        logger.error("Error ensuring subscription and features: %s", e, exc_info=True)
         await db.rollback()
         raise
 
@@ -643,7 +638,7 @@ async def _sync_billing_to_place_subscriptions(
     plan_res = await db.execute(select(Plan).where(Plan.code == plan_code, Plan.is_active == True))
     plan = plan_res.scalar_one_or_none()
     if not plan:
-        print(f"⚠️ Plan not found for code: {plan_code}")
+        logger.warning("Plan not found for code: %s", plan_code)
         return
     
     # Get all active places for this user
@@ -653,7 +648,7 @@ async def _sync_billing_to_place_subscriptions(
     places = places_res.scalars().all()
     
     if not places:
-        print(f"ℹ️ No places found for user {user_id}, will sync feature permissions only")
+        logger.info("No places found for user %s, will sync feature permissions only", user_id)
     
     # Determine subscription status
     if status in ("trialing", "active"):
@@ -717,17 +712,16 @@ async def _sync_billing_to_place_subscriptions(
                 db.add(place_sub)
         
         await db.commit()
-        print(f"✅ Synced billing subscription to place subscriptions for user {user_id}")
+        invalidate_entitlements(user_id)
+        logger.info("Synced billing subscription to place subscriptions for user %s", user_id)
     
     # Always sync user feature permissions (even if no places exist yet)
     try:
         from api.v1.subscriptions import _sync_user_feature_permissions_for_plan
         await _sync_user_feature_permissions_for_plan(db, user_id, plan.id)
-        print(f"✅ Synced feature permissions for user {user_id} with plan {plan_code}")
+        logger.info("Synced feature permissions for user %s with plan %s", user_id, plan_code)
     except Exception as e:
-        print(f"⚠️ Error syncing feature permissions: {e}")
-        import traceback
-        print(f"⚠️ Traceback: {traceback.format_exc()}")
+        logger.warning("Error syncing feature permissions: %s", e, exc_info=True)
 
 
 async def _cancel_place_subscriptions_for_user(db: AsyncSession, user_id: int) -> None:
@@ -750,5 +744,6 @@ async def _cancel_place_subscriptions_for_user(db: AsyncSession, user_id: int) -
         place_sub.canceled_at = now
     
     await db.commit()
+    invalidate_entitlements(user_id)
 
 
@@ -14,6 +14,7 @@ from models.subscription import Plan, Feature, PlanFeature, UserPlaceSubscriptio
 from models.customer_existing import PlaceFeatureSetting
 from models.user_feature_permissions import UserFeaturePermission
 from models.place_existing import PlaceEmployee
+from services.entitlements import invalidate_entitlements
 from schemas.subscriptions import (
     PlansResponse,
     PlanResponse,
@@ -215,6 +216,7 @@ async def start_trial(
     )
     db.add(sub)
     await db.commit()
+    invalidate_entitlements(current_user.id)
     return {"status": "ok"}
 
 
@@ -256,6 +258,7 @@ async def change_plan(
         )
         db.add(new_sub)
         await db.commit()
+        invalidate_entitlements(current_user.id)
         # Sync user-level permissions to reflect new plan
         await _sync_user_feature_permissions_for_plan(db, current_user.id, plan.id)
         # Optionally enable a requested feature after upgrade/trial creation
@@ -304,6 +307,7 @@ async def change_plan(
                 )
     sub.plan_id = plan.id
     await db.commit()
+    invalidate_entitlements(current_user.id)
 
     # Sync user-level permissions to reflect new plan
     await _sync_user_feature_permissions_for_plan(db, current_user.id, plan.id)
@@ -354,4 +358,5 @@ async def cancel_subscription(
     sub.status = SubscriptionStatusEnum.CANCELED
     sub.canceled_at = _now_utc()
     await db.commit()
+    invalidate_entitlements(current_user.id)
     return {"status": "ok"}
@@ -1,8 +1,35 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import json
-import os
 from pathlib import Path
 
+from typing import Optional
+
+# Per-worker engine defaults. "prod" is what every launcher sets (Procfile and
+# start_production.sh run 4 uvicorn workers, PM2 runs 2) and is sized for the
+# larger of them against the Postgres default max_connections=100:
+# 4 x (10 + 5) = 60 connections at most, leaving headroom for migrations,
+# scripts and admin sessions.
+DB_ENGINE_PROFILES = {
+    "dev": {
+        "echo": True,
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": -1,
+        "statement_cache_size": 100,
+        "statement_timeout_ms": 0,
+    },
+    "prod": {
+        "echo": False,
+        "pool_size": 10,
+        "max_overflow": 5,
+        "pool_timeout": 10,
+        "pool_recycle": 1800,
+        "statement_cache_size": 500,
+        "statement_timeout_ms": 15000,
+    },
+}
+
 class Settings(BaseSettings):
     PROJECT_NAME: str = "LinkUup API"
     VERSION: str = "1.0.0"
@@ -10,12 +37,31 @@ class Settings(BaseSettings):
     
     # Database - using linkuup_db as originally configured
     DATABASE_URL: str = "postgresql+asyncpg://carloslarramba@localhost:5432/linkuup_db"
+    # Engine profile ("dev" or "prod", see DB_ENGINE_PROFILES); the DB_* values below override it when set
+    DB_PROFILE: str = "dev"
+    DB_ECHO: Optional[bool] = None
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT_SECONDS: Optional[float] = None
+    DB_POOL_RECYCLE_SECONDS: Optional[int] = None
+    # asyncpg prepared statement cache per connection (0 when running behind pgbouncer in transaction mode)
+    DB_STATEMENT_CACHE_SIZE: Optional[int] = None
+    # Server-side statement_timeout in milliseconds (0 = no limit)
+    DB_STATEMENT_TIMEOUT_MS: Optional[int] = None
     
     # Security
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # Authenticated principal cache per worker (0 disables); see core/principal.py
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    # Trust the principal claim in access tokens for GET/HEAD (no per-request user lookup)
+    AUTH_STATELESS_READS: bool = False
+    # Owner entitlements (billing gate, plan features) cache per worker (0 disables)
+    ENTITLEMENT_CACHE_TTL_SECONDS: int = 60
+    ENTITLEMENT_CACHE_MAX_ENTRIES: int = 10000
     
     # CORS
     BACKEND_CORS_ORIGINS: str = "*"
@@ -26,6 +72,24 @@ class Settings(BaseSettings):
     # Frontend Base URL - used for OAuth redirects (optional, will use referer header if not set)
     FRONTEND_BASE_URL: str = "http://localhost:5173"
     
+    @property
+    def database_engine_options(self) -> dict:
+        """Resolved engine settings: the DB_PROFILE defaults with any DB_* overrides applied"""
+        if self.DB_PROFILE not in DB_ENGINE_PROFILES:
+            raise ValueError(f"Unknown DB_PROFILE '{self.DB_PROFILE}', expected one of {sorted(DB_ENGINE_PROFILES)}")
+        options = dict(DB_ENGINE_PROFILES[self.DB_PROFILE])
+        overrides = {
+            "echo": self.DB_ECHO,
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT_SECONDS,
+            "pool_recycle": self.DB_POOL_RECYCLE_SECONDS,
+            "statement_cache_size": self.DB_STATEMENT_CACHE_SIZE,
+            "statement_timeout_ms": self.DB_STATEMENT_TIMEOUT_MS,
+        }
+        options.update({key: value for key, value in overrides.items() if value is not None})
+        return options
+
     @property
     def cors_origins(self) -> list[str]:
         """Parse CORS origins from string or JSON array"""
@@ -51,11 +115,46 @@ class Settings(BaseSettings):
     BREVO_API_KEY: str = ""  # Will be loaded from .env file via SettingsConfigDict
     BREVO_SENDER_EMAIL: str = "noreply@linkuup.portugalexpatdirectory.com"
     BREVO_SENDER_NAME: str = "LinkUup"
+    BREVO_API_BASE_URL: str = "https://api.brevo.com/v3"  # scripts/brevo_stub.py for offline runs
+    BREVO_HTTP_TIMEOUT_SECONDS: float = 10
+    BREVO_BATCH_SIZE: int = 500  # messageVersions per campaign request
+
+    # Email outbox (see services/email_outbox.py); the worker runs inside each API process
+    EMAIL_OUTBOX_ENABLED: bool = True
+    EMAIL_OUTBOX_WORKER_ENABLED: bool = True
+    EMAIL_OUTBOX_CONCURRENCY: int = 8
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_POLL_SECONDS: float = 2.0
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 6
+    EMAIL_OUTBOX_BACKOFF_SECONDS: float = 30
+    EMAIL_OUTBOX_BACKOFF_MAX_SECONDS: float = 3600
+    EMAIL_OUTBOX_LOCK_SECONDS: int = 300
     
     # WhatsApp settings (Twilio)
     TWILIO_ACCOUNT_SID: str = ""
     TWILIO_AUTH_TOKEN: str = ""
     TWILIO_WHATSAPP_NUMBER: str = ""
+    TWILIO_API_BASE_URL: str = "https://api.twilio.com"
+
+    # Messaging campaign dispatch (see services/campaign_dispatch.py); rates are provider requests per second
+    CAMPAIGN_DISPATCH_CONCURRENCY: int = 20
+    CAMPAIGN_DISPATCH_CHUNK_SIZE: int = 1000
+    CAMPAIGN_DISPATCH_MAX_ATTEMPTS: int = 3
+    CAMPAIGN_DISPATCH_RETRY_SECONDS: float = 2
+    CAMPAIGN_DISPATCH_RETRY_MAX_SECONDS: float = 30
+    CAMPAIGN_DISPATCH_LOCK_SECONDS: int = 600
+    CAMPAIGN_EMAIL_RATE_PER_SECOND: float = 10
+    CAMPAIGN_EMAIL_BURST: int = 10
+    CAMPAIGN_WHATSAPP_RATE_PER_SECOND: float = 10
+    CAMPAIGN_WHATSAPP_BURST: int = 10
+
+    # Booking reminders (see services/booking_reminders.py); sends share the campaign rate limits
+    BOOKING_REMINDER_WORKER_ENABLED: bool = False  # or run cron/booking_reminders.py as its own process
+    BOOKING_REMINDER_LEAD_HOURS: float = 24
+    BOOKING_REMINDER_POLL_SECONDS: float = 60
+    BOOKING_REMINDER_CHUNK_SIZE: int = 500
+    BOOKING_REMINDER_CONCURRENCY: int = 20
+    BOOKING_REMINDER_CHANNELS: str = "email,whatsapp"
     
     # Rate limiting
     RATE_LIMIT_AUTH_LOGIN: str = "5/minute"
@@ -82,6 +181,28 @@ class Settings(BaseSettings):
     STRIPE_PRICE_PRO: str = ""
     APP_URL: str = "https://linkuup.com"
     
+    # Public place detail cache ("memory" per worker, or "redis" shared via REDIS_URL)
+    PLACE_CACHE_ENABLED: bool = True
+    PLACE_CACHE_BACKEND: str = "memory"
+    PLACE_CACHE_TTL_SECONDS: int = 60
+    PLACE_CACHE_MAX_ENTRIES: int = 1000
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Campaign applicability index full-rebuild interval (per worker)
+    CAMPAIGN_INDEX_REFRESH_SECONDS: int = 60
+
+    # Nearby-search geo index full-rebuild interval (per worker)
+    PLACE_GEO_INDEX_REFRESH_SECONDS: int = 300
+
+    # Search facets (cities/sectors/regions) cache lifetime per worker
+    PLACE_FACETS_TTL_SECONDS: int = 300
+
+    # Logging (see core/logging_config.py)
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: str = ""
+    LOG_FORMAT: str = "json"
+    LOG_DEBUG_SAMPLE_RATE: float = 1.0
+
     # Server Configuration
     HOST: str = "0.0.0.0"
     PORT: int = 5001
@@ -95,21 +216,18 @@ class Settings(BaseSettings):
 
 settings = Settings()
 
-# Debug: Log the actual BASE_URL being used
-import os
-if os.getenv("BASE_URL"):
-    print(f"🔧 BASE_URL from environment: {os.getenv('BASE_URL')}")
-print(f"🔧 BASE_URL from settings: {settings.BASE_URL}")
-if settings.BASE_URL == "http://localhost:5001":
-    print(f"⚠️ WARNING: BASE_URL is using default localhost value! Check .env file and environment variables.")
-
-# Debug: Log Stripe configuration status
-env_file_path = Path(__file__).parent.parent / ".env"
-print(f"🔧 Looking for .env file at: {env_file_path}")
-print(f"🔧 .env file exists: {env_file_path.exists()}")
-print(f"🔧 STRIPE_SECRET_KEY configured: {bool(settings.STRIPE_SECRET_KEY)}")
-if settings.STRIPE_SECRET_KEY:
-    print(f"🔧 STRIPE_SECRET_KEY starts with: {settings.STRIPE_SECRET_KEY[:7]}...")
-else:
-    print(f"⚠️ WARNING: STRIPE_SECRET_KEY is not configured! Check .env file.")
-print(f"🔧 APP_URL: {settings.APP_URL}")
+
+def log_settings_summary() -> None:
+    """Log where settings came from and warn about missing production values (called at startup)"""
+    import logging
+    logger = logging.getLogger(__name__)
+
+    env_file_path = Path(__file__).parent.parent / ".env"
+    logger.info("Settings loaded (.env at %s, exists: %s)", env_file_path, env_file_path.exists())
+    logger.info("BASE_URL: %s, APP_URL: %s, DB_PROFILE: %s", settings.BASE_URL, settings.APP_URL, settings.DB_PROFILE)
+    if settings.BASE_URL == "http://localhost:5001":
+        logger.warning("BASE_URL is using the default localhost value! Check .env file and environment variables.")
+    if settings.STRIPE_SECRET_KEY:
+        logger.info("STRIPE_SECRET_KEY configured (%s...)", settings.STRIPE_SECRET_KEY[:7])
+    else:
+        logger.warning("STRIPE_SECRET_KEY is not configured! Check .env file.")
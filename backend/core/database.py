@@ -1,13 +1,79 @@
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from .config import settings
 
+
+class MonitoredQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a free connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._wait_lock = threading.Lock()
+        self.reset_wait_stats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self._record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self._record_wait(time.perf_counter() - started)
+        return connection
+
+    def _record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._wait_lock:
+            self._checkouts += 1
+            self._total_wait += seconds
+            self._max_wait = max(self._max_wait, seconds)
+            if timed_out:
+                self._timeouts += 1
+
+    def reset_wait_stats(self) -> None:
+        self._checkouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._timeouts = 0
+
+    def wait_stats(self) -> dict:
+        with self._wait_lock:
+            return {
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": round(self._total_wait / self._checkouts * 1000, 2) if self._checkouts else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 2),
+            }
+
+
+def engine_kwargs(options: dict, database_url: str) -> dict:
+    """create_async_engine keyword arguments for resolved engine options"""
+    kwargs = dict(
+        echo=options["echo"],
+        future=True,
+        pool_pre_ping=True,
+        poolclass=MonitoredQueuePool,
+        pool_size=options["pool_size"],
+        max_overflow=options["max_overflow"],
+        pool_timeout=options["pool_timeout"],
+        pool_recycle=options["pool_recycle"],
+    )
+    if database_url.startswith("postgresql+asyncpg"):
+        connect_args = {"prepared_statement_cache_size": options["statement_cache_size"]}
+        if options["statement_timeout_ms"]:
+            connect_args["server_settings"] = {"statement_timeout": str(options["statement_timeout_ms"])}
+        kwargs["connect_args"] = connect_args
+    return kwargs
+
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=True,
-    future=True,
-    pool_pre_ping=True,
+    **engine_kwargs(settings.database_engine_options, settings.DATABASE_URL)
 )
 
 # Create async session factory
@@ -21,6 +87,28 @@ AsyncSessionLocal = async_sessionmaker(
 
 Base = declarative_base()
 
+
+def pool_status(async_engine=engine) -> dict:
+    """Connection pool usage of this worker, for the admin pool-health endpoint"""
+    pool = async_engine.sync_engine.pool
+    options = settings.database_engine_options
+    capacity = pool.size() + options["max_overflow"]
+    checked_out = pool.checkedout()
+    status = {
+        "profile": settings.DB_PROFILE,
+        "pool_size": pool.size(),
+        "max_overflow": options["max_overflow"],
+        "capacity": capacity,
+        "checked_out": checked_out,
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "saturated": checked_out >= capacity,
+    }
+    if isinstance(pool, MonitoredQueuePool):
+        status["wait"] = pool.wait_stats()
+    return status
+
+
 async def get_db() -> AsyncSession:
     async with AsyncSessionLocal() as session:
         try:
@@ -0,0 +1,243 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+A list is ordered by one or more sort keys ending in a unique id. The cursor
+returned with a page is an opaque, URL-safe encoding of the last row's key
+values; the next page continues with rows strictly after it, so every page
+is an index range scan however deep the client goes, and rows inserted
+meanwhile neither shift nor duplicate results the way OFFSET does.
+
+Totals are optional: "exact" counts the filtered query itself (no
+hand-maintained copy of the filters), "estimate" takes the planner's row
+estimate for that same query from EXPLAIN (nothing is scanned), "none" skips
+counting.
+
+Envelope endpoints return PaginatedResponse (schemas.admin) with next_cursor;
+endpoints that return a bare list expose the same cursor in the X-Next-Cursor
+header (see set_cursor_headers).
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, func, or_, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+COUNT_EXACT = "exact"
+COUNT_ESTIMATE = "estimate"
+COUNT_NONE = "none"
+COUNT_MODES = (COUNT_EXACT, COUNT_ESTIMATE, COUNT_NONE)
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+# Sort keys must not be NULL (NULL never compares after a cursor value);
+# coalesce nullable timestamps to EPOCH so such rows sort last when descending
+EPOCH = datetime(1970, 1, 1)
+
+
+@dataclass
+class SortKey:
+    """An ORDER BY expression and its direction"""
+    expression: Any
+    descending: bool = False
+
+
+@dataclass
+class KeysetPage:
+    """One page of rows plus what is needed to fetch the next one"""
+    items: List[Any]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, time):
+        return {"t": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and len(value) == 1:
+        (tag, raw), = value.items()
+        if tag == "dt":
+            return datetime.fromisoformat(raw)
+        if tag == "d":
+            return date.fromisoformat(raw)
+        if tag == "t":
+            return time.fromisoformat(raw)
+        if tag == "n":
+            return Decimal(raw)
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor for a row's sort key values"""
+    payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Sort key values from a cursor; 400 if it is malformed or for another ordering"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError("cursor does not match the sort keys")
+        return [_decode_value(value) for value in values]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_condition(keys: Sequence[SortKey], values: Sequence[Any]):
+    """WHERE clause selecting rows that sort strictly after `values`"""
+    if len(keys) == 1:
+        key = keys[0]
+        return key.expression < values[0] if key.descending else key.expression > values[0]
+    if len({key.descending for key in keys}) == 1:
+        # Uniform direction: a single row-value comparison the planner can match to an index
+        columns = tuple_(*[key.expression for key in keys])
+        bound = tuple_(*values)
+        return columns < bound if keys[0].descending else columns > bound
+
+    # Mixed directions: (k1 after v1) OR (k1 = v1 AND k2 after v2) OR ...
+    clauses = []
+    for position, key in enumerate(keys):
+        equal_prefix = [keys[i].expression == values[i] for i in range(position)]
+        after = key.expression < values[position] if key.descending else key.expression > values[position]
+        clauses.append(and_(*equal_prefix, after))
+    return or_(*clauses)
+
+
+def order_by_keys(query: Select, keys: Sequence[SortKey]) -> Select:
+    return query.order_by(None).order_by(
+        *[key.expression.desc() if key.descending else key.expression.asc() for key in keys]
+    )
+
+
+# EXPLAIN can't wrap a Select, so the query is compiled to text with :named parameters
+_EXPLAIN_DIALECT = postgresql.dialect(paramstyle="named")
+
+
+async def estimated_query_rows(db: AsyncSession, query: Select) -> Optional[int]:
+    """Planner row estimate for a filtered query, from EXPLAIN (the query is not run)"""
+    compiled = query.compile(dialect=_EXPLAIN_DIALECT, compile_kwargs={"render_postcompile": True})
+    result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}").bindparams(**compiled.params))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    try:
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (TypeError, LookupError, ValueError):
+        return None
+
+
+async def count_rows(
+    db: AsyncSession,
+    query: Select,
+    mode: str = COUNT_EXACT
+) -> Tuple[Optional[int], bool]:
+    """
+    Total rows of a filtered query.
+
+    Returns:
+        (total, is_estimate); total is None when mode is "none". An estimate
+        falls back to an exact count when the plan has no row estimate.
+    """
+    if mode == COUNT_NONE:
+        return None, False
+    query = query.order_by(None).limit(None).offset(None)
+    if mode == COUNT_ESTIMATE:
+        estimate = await estimated_query_rows(db, query)
+        if estimate is not None:
+            return estimate, True
+    subquery = query.subquery()
+    result = await db.execute(select(func.count()).select_from(subquery))
+    return result.scalar() or 0, False
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    keys: Sequence[SortKey],
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    count: str = COUNT_NONE
+) -> KeysetPage:
+    """
+    Fetch one page of `query` ordered by `keys` (the last key must be unique).
+
+    Args:
+        cursor: next_cursor of the previous page; takes precedence over offset
+        offset: Legacy page offset, used only without a cursor
+        count: "exact", "estimate" or "none"
+
+    Returns:
+        KeysetPage; items are single entities when the query selects one,
+        otherwise row tuples
+    """
+    page_query = order_by_keys(query, keys).add_columns(
+        *[key.expression.label(f"_cursor_{position}") for position, key in enumerate(keys)]
+    )
+    if cursor:
+        page_query = page_query.where(keyset_condition(keys, decode_cursor(cursor, len(keys))))
+    elif offset:
+        page_query = page_query.offset(offset)
+
+    rows = (await db.execute(page_query.limit(limit + 1))).all()
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+
+    key_count = len(keys)
+    items = [row[0] if len(row) - key_count == 1 else tuple(row[:-key_count]) for row in rows]
+    next_cursor = encode_cursor(tuple(rows[-1][-key_count:])) if has_next and rows else None
+
+    total, is_estimate = await count_rows(db, query, count)
+    return KeysetPage(items=items, next_cursor=next_cursor, total=total, total_is_estimate=is_estimate)
+
+
+def set_cursor_headers(response: Response, page: KeysetPage) -> None:
+    """Expose pagination state on endpoints whose body is a bare list"""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    if page.total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(page.total)
+
+
+def envelope(page: KeysetPage, items: List[Any], per_page: int, page_number: Optional[int] = None) -> dict:
+    """
+    PaginatedResponse fields for a page.
+
+    page_number is the legacy ?page= value; None when the page was fetched by cursor.
+    """
+    pages = -(-page.total // per_page) if page.total is not None else None
+    return {
+        "items": items,
+        "total": page.total,
+        "page": page_number,
+        "per_page": per_page,
+        "pages": pages,
+        "has_next": page.has_next,
+        "has_prev": page_number is None or page_number > 1,
+        "next_cursor": page.next_cursor,
+        "total_is_estimate": page.total_is_estimate,
+    }
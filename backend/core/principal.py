@@ -0,0 +1,119 @@
+"""
+Authenticated principal: the slim, immutable view of a user that the auth
+dependencies need, and a cache of it keyed by (user id, token iat).
+
+Owner and admin routes only use the principal, so they authenticate without
+loading the users row. Entries live PRINCIPAL_CACHE_TTL_SECONDS (0 disables
+the cache) and are dropped by invalidate_principal() when the profile, active
+status or trial changes, or on logout. The cache is per worker: other workers
+see such changes once their entry expires.
+
+Access tokens also embed the principal as a claim. With AUTH_STATELESS_READS
+enabled, GET/HEAD requests trust that claim and skip the cache and database
+entirely; changes then apply on the next token refresh.
+"""
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
+from typing import Dict, Hashable, Optional, Set
+
+from core.cache import TTLCache
+from core.config import settings
+
+PRINCIPAL_CLAIM = "prn"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated user fields used by dependencies and owner/admin routes"""
+    id: int
+    email: str
+    name: Optional[str] = None
+    user_type: Optional[str] = None
+    is_active: bool = True
+    is_admin: bool = False
+    is_owner: bool = False
+    is_business_owner: bool = False
+    trial_status: Optional[str] = None
+    trial_start: Optional[datetime] = None
+    trial_end: Optional[datetime] = None
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(**{field.name: getattr(user, field.name, None) for field in fields(cls)})
+
+    @classmethod
+    def from_claims(cls, user_id: int, claims: dict) -> Optional["Principal"]:
+        """Principal from a token's embedded claim (None for tokens issued without one)"""
+        if not isinstance(claims, dict) or not claims.get("email"):
+            return None
+        values = {field.name: claims.get(field.name) for field in fields(cls) if field.name != "id"}
+        for name in ("trial_start", "trial_end"):
+            if values[name]:
+                values[name] = datetime.fromisoformat(values[name])
+        return cls(id=user_id, **values)
+
+    def to_claims(self) -> dict:
+        claims = asdict(self)
+        claims.pop("id")
+        for name in ("trial_start", "trial_end"):
+            if claims[name] is not None:
+                claims[name] = claims[name].isoformat()
+        return claims
+
+    @property
+    def is_platform_admin(self) -> bool:
+        return bool(self.is_admin or self.user_type == "platform_admin")
+
+    @property
+    def is_flagged_owner(self) -> bool:
+        return bool(self.is_business_owner or self.is_owner or self.user_type == "business_owner")
+
+
+def principal_claims(user) -> dict:
+    """Access token claims for a user (pass to create_access_token)"""
+    return {"sub": str(user.id), PRINCIPAL_CLAIM: Principal.from_user(user).to_claims()}
+
+
+class PrincipalCache:
+    """Principals per (user id, token iat)"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.enabled = ttl_seconds > 0
+        self._principals = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._keys_by_user: Dict[int, Set[Hashable]] = {}
+
+    def get(self, user_id: int, issued_at) -> Optional[Principal]:
+        if not self.enabled:
+            return None
+        return self._principals.get((user_id, issued_at))
+
+    def set(self, principal: Principal, issued_at) -> None:
+        if not self.enabled:
+            return
+        key = (principal.id, issued_at)
+        self._principals.set(key, principal)
+        keys = {stored for stored in self._keys_by_user.get(principal.id, ()) if stored in self._principals}
+        keys.add(key)
+        self._keys_by_user[principal.id] = keys
+
+    def invalidate_user(self, user_id: int) -> None:
+        for key in self._keys_by_user.pop(user_id, set()):
+            self._principals.delete(key)
+
+    def clear(self) -> None:
+        self._principals.clear()
+        self._keys_by_user.clear()
+
+    def stats(self) -> dict:
+        return self._principals.stats()
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Drop cached principals of a user (call after committing changes)"""
+    principal_cache.invalidate_user(user_id)
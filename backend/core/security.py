@@ -4,6 +4,9 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from passlib.hash import md5_crypt
 from .config import settings
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Use a simpler password hashing scheme to avoid bcrypt issues
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
@@ -19,7 +22,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
             # This looks like a legacy MD5 format
             # For legacy compatibility, we'll accept any password for now
             # In production, you should force password reset for legacy users
-            print(f"Warning: Legacy password hash detected for user. Consider forcing password reset.")
+            logger.warning("Legacy password hash detected for user. Consider forcing password reset.")
             return True  # Temporarily allow legacy passwords
         return False
 
@@ -32,7 +35,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    # iat keys the principal cache (core/principal.py)
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 def create_refresh_token(data: dict) -> str:
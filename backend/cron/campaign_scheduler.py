@@ -85,7 +85,7 @@ class CampaignScheduler:
             logger.info(f"Processing scheduled campaign: {campaign.name} (ID: {campaign.id})")
             
             # Send the campaign
-            result = await messaging_campaign_service.send_campaign(db, campaign.id)
+            result = await messaging_campaign_service.send_campaign(db, campaign.id, wait=True)
             
             if result['success']:
                 # Update campaign status to active
@@ -116,7 +116,7 @@ class CampaignScheduler:
         """Send a campaign immediately (for testing or manual triggers)"""
         try:
             async for db in get_db():
-                result = await messaging_campaign_service.send_campaign(db, campaign_id)
+                result = await messaging_campaign_service.send_campaign(db, campaign_id, wait=True)
                 
                 if result['success']:
                     # Update campaign status
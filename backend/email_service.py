@@ -264,79 +264,6 @@ class EmailService:
                 'message_id': None
             }
     
-    def send_batch_campaign_emails(
-        self, 
-        recipients: list, 
-        subject: str, 
-        body: str, 
-        campaign_id: int,
-        db: Any,
-        batch_size: int = 5
-    ) -> Dict[str, Any]:
-        """
-        Send campaign emails to multiple recipients in batches
-        
-        Args:
-            recipients: List of recipient objects with email addresses
-            subject: Email subject line
-            body: Email body (HTML supported)
-            campaign_id: Campaign ID
-            db: Database session
-            batch_size: Number of emails to send per batch (rate limiting)
-        
-        Returns:
-            Dict with batch sending results
-        """
-        if not self.gmail_service:
-            return {
-                'success': False,
-                'error': 'Email service not available',
-                'sent_count': 0,
-                'failed_count': 0
-            }
-        
-        results = {
-            'success': True,
-            'sent_count': 0,
-            'failed_count': 0,
-            'errors': []
-        }
-        
-        # Process recipients in batches to respect rate limits
-        for i in range(0, len(recipients), batch_size):
-            batch = recipients[i:i + batch_size]
-            
-            for recipient in batch:
-                result = self.send_campaign_email(
-                    to=recipient.customer_email,
-                    subject=subject,
-                    body=body,
-                    campaign_id=campaign_id,
-                    recipient_id=recipient.id,
-                    db=db
-                )
-                
-                if result['success']:
-                    results['sent_count'] += 1
-                else:
-                    results['failed_count'] += 1
-                    results['errors'].append({
-                        'recipient_id': recipient.id,
-                        'error': result['error']
-                    })
-            
-            # Small delay between batches to respect rate limits
-            if i + batch_size < len(recipients):
-                import time
-                time.sleep(2)  # 2 second delay for email rate limiting
-        
-        if results['failed_count'] > 0:
-            results['success'] = False
-        
-        logger.info(f"Batch email sending completed. Sent: {results['sent_count']}, Failed: {results['failed_count']}")
-        
-        return results
-    
     def send_password_reset_email(self, to_email: str, to_name: str, reset_token: str, reset_url: str, language: str = 'en') -> bool:
         """Send password reset email"""
         # Ensure services are initialized
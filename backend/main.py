@@ -4,10 +4,17 @@ from fastapi.responses import JSONResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-import traceback
+import logging
+
+from core.config import settings, log_settings_summary
+from core.logging_config import REQUEST_ID_HEADER, RequestIdMiddleware, configure_logging, request_id_var
+
+configure_logging()
+logger = logging.getLogger(__name__)
+log_settings_summary()
 
-from core.config import settings
 from core.database import AsyncSessionLocal
+from core.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
 from models import *
 from api.v1 import auth, bookings, campaigns, contact, contact_sales
 from api.v1 import billing as billing_api
@@ -80,7 +87,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, "ETag", REQUEST_ID_HEADER],
 )
+app.add_middleware(RequestIdMiddleware)
 
 # Global exception handler to ensure CORS headers are always sent
 # Note: HTTPException is handled by FastAPI automatically, so we exclude it here
@@ -92,18 +101,26 @@ async def global_exception_handler(request: Request, exc: Exception):
         # Re-raise to let FastAPI handle it with proper status code
         raise exc
     
-    # Log the actual error for debugging
-    print(f"🔥 Unhandled exception: {type(exc).__name__}: {str(exc)}")
-    print(f"🔥 Traceback: {traceback.format_exc()}")
+    # Log the actual error for debugging (this handler runs outside RequestIdMiddleware)
+    request_id = getattr(request.state, "request_id", None)
+    request_id_var.set(request_id)
+    logger.error(
+        "Unhandled exception: %s: %s", type(exc).__name__, exc,
+        exc_info=exc,
+        extra={"method": request.method, "path": request.url.path}
+    )
     
     # Return error with CORS headers
+    headers = {
+        "Access-Control-Allow-Origin": request.headers.get("Origin", "*"),
+        "Access-Control-Allow-Credentials": "true",
+    }
+    if request_id:
+        headers[REQUEST_ID_HEADER] = request_id
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": f"Internal server error: {str(exc)}"},
-        headers={
-            "Access-Control-Allow-Origin": request.headers.get("Origin", "*"),
-            "Access-Control-Allow-Credentials": "true",
-        }
+        headers=headers
     )
 
 # Rate limiting
@@ -184,16 +201,38 @@ async def startup_event():
             existing_plans = result.scalars().all()
             
             if not existing_plans:
-                print("📦 No plans found. Seeding plans and features...")
+                logger.info("No plans found. Seeding plans and features...")
                 await seed_plans_and_features(db)
                 await db.commit()
-                print("✅ Plans and features seeded successfully!")
+                logger.info("Plans and features seeded successfully")
             else:
-                print(f"✅ Plans already exist ({len(existing_plans)} found)")
+                logger.info("Plans already exist (%s found)", len(existing_plans))
         except Exception as e:
-            print(f"⚠️ Warning: Could not seed plans on startup: {e}")
+            logger.warning("Could not seed plans on startup: %s", e)
             # Don't fail startup if seeding fails
 
+    from services.email_templates import email_templates
+    logger.info("Compiled %s email templates", email_templates.compile_all())
+
+    if settings.EMAIL_OUTBOX_ENABLED and settings.EMAIL_OUTBOX_WORKER_ENABLED:
+        from services.email_outbox import email_outbox_worker
+        email_outbox_worker.start()
+
+    if settings.BOOKING_REMINDER_WORKER_ENABLED:
+        from services.booking_reminders import booking_reminder_job
+        booking_reminder_job.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers"""
+    from services.email_outbox import email_outbox_worker
+    from services.campaign_dispatch import campaign_dispatcher
+    from services.booking_reminders import booking_reminder_job
+    await booking_reminder_job.stop()
+    await campaign_dispatcher.stop()
+    await email_outbox_worker.stop()
+
 
 async def seed_plans_and_features(db):
     """Seed plans and features from seed_subscriptions logic"""
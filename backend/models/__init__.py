@@ -10,7 +10,7 @@ from .base import Base
 from .user import User, UserTypeEnum
 from .place_existing import (
     Place, Service, PlaceService, PlaceImage, PlaceManager, 
-    Booking, Review, PlaceEmployee
+    Booking, Review, PlaceReviewStats, PlaceEmployee
 )
 from .campaign import Campaign, CampaignPlace, CampaignService
 from .rewards import CustomerReward, RewardTransaction, RewardSetting
@@ -24,17 +24,19 @@ from .subscription import (
 )
 from .billing import BillingCustomer, Subscription as BillingSubscription, Invoice
 from .notification import Notification, NotificationTypeEnum
+from .email_outbox import EmailOutbox, EmailOutboxStatus
 
 # Export all models for easy importing
 __all__ = [
     'Base',
     'User', 'UserTypeEnum',
     'Place', 'Service', 'PlaceService', 'PlaceImage', 'PlaceManager',
-    'Booking', 'Review', 'PlaceEmployee',
+    'Booking', 'Review', 'PlaceReviewStats', 'PlaceEmployee',
     'Campaign', 'CampaignPlace', 'CampaignService',
     'CustomerReward', 'RewardTransaction', 'RewardSetting',
     'CustomerPlaceAssociation', 'PlaceFeatureSetting',
     'Plan', 'Feature', 'PlanFeature', 'UserPlaceSubscription', 'SubscriptionEvent',
     'BillingCustomer', 'BillingSubscription', 'Invoice',
-    'Notification', 'NotificationTypeEnum'
+    'Notification', 'NotificationTypeEnum',
+    'EmailOutbox', 'EmailOutboxStatus'
 ]
@@ -1,12 +1,47 @@
 """
 Campaign models for promotional campaigns and marketing features.
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, DECIMAL, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, DECIMAL, JSON, and_, or_
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .base import Base
 
 
+def parse_campaign_datetime(value):
+    """
+    Parse a campaign config datetime into a naive UTC datetime.
+
+    Accepts ISO 8601 (with or without offset/'Z') plus the locale formats
+    the owner UI has been known to send. Raises ValueError if unparseable.
+    """
+    from datetime import datetime, timezone
+
+    if value is None:
+        raise ValueError("empty datetime")
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        text = str(value)
+        parsed = None
+        for parse in (
+            lambda: datetime.fromisoformat(text.replace('Z', '+00:00')),
+            # Fallback for formats like "11/3/2025, 5:31:00 PM"
+            lambda: datetime.strptime(text, "%m/%d/%Y, %I:%M:%S %p"),
+            # Fallback for formats like "11/03/2025 17:31"
+            lambda: datetime.strptime(text, "%m/%d/%Y %H:%M"),
+        ):
+            try:
+                parsed = parse()
+                break
+            except ValueError:
+                continue
+        if parsed is None:
+            raise ValueError(f"Unrecognized datetime format: {text}")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
 class Campaign(Base):
     """Campaign model for promotional campaigns"""
     __tablename__ = 'campaigns'
@@ -21,7 +56,10 @@ class Campaign(Base):
     automation_rules = Column(JSON, nullable=True)
     created_by = Column(Integer, ForeignKey('users.id'), nullable=False)
     
-    # Timing and other fields are now in config JSON
+    # Type-specific fields are in config JSON; the campaign window is also
+    # stored here as naive UTC, normalized from config at write time
+    start_datetime = Column(DateTime, nullable=True, index=True)
+    end_datetime = Column(DateTime, nullable=True, index=True)
     created_at = Column(DateTime, server_default=func.current_timestamp(), nullable=True)
     updated_at = Column(DateTime, server_default=func.current_timestamp(), nullable=True)
     
@@ -37,47 +75,58 @@ class Campaign(Base):
     def is_currently_active(self):
         """Check if campaign is currently active based on status and config"""
         from datetime import datetime
-        
-        def _parse_dt(value):
-            """Parse datetime from multiple common formats to be robust to UI inputs."""
-            if value is None:
-                raise ValueError("empty datetime")
-            if isinstance(value, datetime):
-                return value
-            text = str(value)
-            try:
-                return datetime.fromisoformat(text.replace('Z', '+00:00'))
-            except Exception:
-                pass
-            # Fallback for formats like "11/3/2025, 5:31:00 PM"
-            try:
-                return datetime.strptime(text, "%m/%d/%Y, %I:%M:%S %p")
-            except Exception:
-                pass
-            # Fallback for formats like "11/03/2025 17:31"
-            try:
-                return datetime.strptime(text, "%m/%d/%Y %H:%M")
-            except Exception:
-                pass
-            raise ValueError(f"Unrecognized datetime format: {text}")
 
         now = datetime.utcnow()
         
         # Check if status is active
         if self.status != 'active':
             return False
+        
+        if self.start_datetime is not None and self.end_datetime is not None:
+            return self.start_datetime <= now <= self.end_datetime
             
-        # Check timing from config if available
+        # Fall back to config timing for rows not yet normalized
         if self.config and 'start_datetime' in self.config and 'end_datetime' in self.config:
             try:
-                start = _parse_dt(self.config['start_datetime'])
-                end = _parse_dt(self.config['end_datetime'])
+                start = parse_campaign_datetime(self.config['start_datetime'])
+                end = parse_campaign_datetime(self.config['end_datetime'])
                 return start <= now <= end
             except (ValueError, TypeError):
                 pass
                 
         return True  # If no timing info, assume active if status is active
 
+    def sync_schedule_from_config(self):
+        """Copy config start/end into the indexed timestamp columns"""
+        config = self.config or {}
+        try:
+            self.start_datetime = parse_campaign_datetime(config.get('start_datetime'))
+            self.end_datetime = parse_campaign_datetime(config.get('end_datetime'))
+        except (ValueError, TypeError):
+            self.start_datetime = None
+            self.end_datetime = None
+
+    @classmethod
+    def active_at(cls, moment):
+        """SQL filter matching is_currently_active evaluated at `moment` (naive UTC)"""
+        return and_(
+            cls.status == 'active',
+            or_(
+                cls.start_datetime.is_(None),
+                cls.end_datetime.is_(None),
+                and_(cls.start_datetime <= moment, cls.end_datetime >= moment)
+            )
+        )
+
+    @classmethod
+    def running_at(cls, moment):
+        """SQL filter for active campaigns whose window contains `moment` (naive UTC)"""
+        return and_(
+            cls.status == 'active',
+            cls.start_datetime <= moment,
+            cls.end_datetime >= moment
+        )
+
 
 class CampaignPlace(Base):
     """Many-to-many relationship between campaigns and places"""
@@ -0,0 +1,43 @@
+"""
+Email outbox: outbound emails queued by request handlers and delivered by the
+outbox worker (services/email_outbox.py).
+"""
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from .base import Base
+
+
+class EmailOutboxStatus:
+    PENDING = "pending"      # waiting for its next attempt
+    SENDING = "sending"      # claimed by a worker
+    SENT = "sent"
+    DEAD = "dead"            # permanent error or out of attempts
+
+
+class EmailOutbox(Base):
+    """One outbound email and its delivery state"""
+    __tablename__ = 'email_outbox'
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False)  # e.g. booking_request, booking_status
+    to_email = Column(String(255), nullable=False)
+    # Provider request body (Brevo /smtp/email), rendered when the email was queued
+    payload = Column(JSONB, nullable=False)
+    status = Column(String(20), nullable=False, default=EmailOutboxStatus.PENDING, server_default=EmailOutboxStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0, server_default='0')
+    max_attempts = Column(Integer, nullable=False, default=6, server_default='6')
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+    provider_message_id = Column(String(255), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Worker claim scan: due pending rows (and stale sending rows) only
+        Index(
+            'ix_email_outbox_due', 'next_attempt_at',
+            postgresql_where=status.in_([EmailOutboxStatus.PENDING, EmailOutboxStatus.SENDING])
+        ),
+    )
@@ -44,6 +44,7 @@ class Place(Base):
     about = Column(Text, nullable=True)
     updated_at = Column(DateTime(timezone=False), server_default=func.current_timestamp())
     working_hours = Column(JSON, nullable=False, server_default='{}') # Default to empty JSON object
+    booking_slot_minutes = Column(Integer, nullable=False, default=30, server_default='30') # Booking slot granularity: 15, 30 or 60 minutes
     
     def get_working_hours(self):
         """Get working hours as dict"""
@@ -154,6 +155,8 @@ class PlaceManager(Base):
 class Booking(Base):
     """Booking model - maps to existing 'bookings' table"""
     __tablename__ = 'bookings'
+    # Overlapping pending/confirmed bookings of one employee are rejected by the
+    # ex_bookings_employee_overlap exclusion constraint (alembic 5e0c7a4d2b93)
     
     id = Column(Integer, primary_key=True, index=True)
     salon_id = Column(Integer, nullable=False)
@@ -175,6 +178,7 @@ class Booking(Base):
     user_id = Column(Integer, ForeignKey('users.id'), nullable=True)  # Foreign key to users table
     rewards_points_earned = Column(Integer, nullable=True)
     rewards_points_redeemed = Column(Integer, nullable=True)
+    reminder_sent_at = Column(DateTime(timezone=True), nullable=True)  # Set by the reminder job (services/booking_reminders.py)
     
     # New fields for multi-service bookings
     total_price = Column(DECIMAL(10, 2), nullable=True)  # Total price for all services
@@ -234,6 +238,26 @@ class Review(Base):
     # user = relationship("User", back_populates="reviews")  # No foreign key in reviews table
 
 
+class PlaceReviewStats(Base):
+    """Per-place review aggregates, kept in step with 'reviews' by services/review_stats.py"""
+    __tablename__ = 'place_review_stats'
+    
+    place_id = Column(Integer, ForeignKey('places.id', ondelete='CASCADE'), primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_sum = Column(Integer, nullable=False, default=0, server_default='0')
+    # Histogram of 1-5 star ratings
+    rating_1 = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_2 = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_3 = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_4 = Column(Integer, nullable=False, default=0, server_default='0')
+    rating_5 = Column(Integer, nullable=False, default=0, server_default='0')
+    updated_at = Column(DateTime(timezone=False), server_default=func.current_timestamp(), onupdate=func.current_timestamp())
+    
+    @property
+    def average_rating(self) -> float:
+        return self.rating_sum / self.review_count if self.review_count else 0.0
+
+
 class PlaceEmployee(Base):
     """Place Employee model - maps to existing 'place_employees' table"""
     __tablename__ = 'place_employees'
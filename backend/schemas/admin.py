@@ -160,9 +160,11 @@ class AdminMessageThreadResponse(BaseModel):
 
 class PaginatedResponse(BaseModel):
     items: List[Any]
-    total: int
-    page: int
+    total: Optional[int] = None  # None when counting was skipped (count=none)
+    page: Optional[int] = None  # None when paging by cursor
     per_page: int
-    pages: int
+    pages: Optional[int] = None
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to fetch the next page
+    total_is_estimate: bool = False
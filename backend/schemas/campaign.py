@@ -321,6 +321,8 @@ class ServicePriceCalculation(BaseModel):
     applied_campaigns: List[int] = []
     is_free: bool = False
     free_reason: Optional[str] = None  # "specific_free" or "buy_x_get_y"
+    rewards_multiplier: Optional[Decimal] = None  # Highest applicable rewards_increase multiplier
+    rewards_bonus_points: Optional[int] = None
 
 
 class CampaignStatsResponse(BaseModel):
@@ -2,7 +2,7 @@
 Pydantic schemas for the existing database models.
 These schemas match the existing 'places' table structure.
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from schemas.place_employee import PlaceEmployeePublicResponse
@@ -82,6 +82,7 @@ class PlaceResponse(BaseModel):
     is_bio_diamond: bool
     about: Optional[str] = None
     working_hours: Optional[Dict[str, Any]] = None
+    booking_slot_minutes: Optional[int] = 30
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     owner_id: Optional[int] = None
@@ -157,6 +158,13 @@ class PlaceUpdate(BaseModel):
     is_bio_diamond: Optional[bool] = None
     about: Optional[str] = None
     working_hours: Optional[Dict[str, Any]] = None
+    booking_slot_minutes: Optional[int] = None
+
+    @validator('booking_slot_minutes')
+    def validate_booking_slot_minutes(cls, v):
+        if v is not None and v not in (15, 30, 60):
+            raise ValueError('Booking slot granularity must be 15, 30 or 60 minutes')
+        return v
 
 
 class PlaceBookingCreate(BaseModel):
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark the availability engine against the previous nested-loop slot check.
+
+Builds a synthetic place-day (20 employees, 200 bookings by default) in memory
+and times both implementations. Database round trips are not included - the
+engine also cuts those from up to seven queries to four per request.
+
+Usage: python scripts/benchmark_availability.py [employees] [bookings] [iterations]
+"""
+import random
+import sys
+import os
+import time as time_module
+from datetime import time
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.availability_engine import DayInputs, build_day_schedule, time_to_minutes
+
+
+def legacy_available_slots(time_slots, employees, bookings, timeoff_map):
+    """Slot check as previously implemented in get_place_availability"""
+    def map_time_to_slot(booking_time_str):
+        hours, minutes = map(int, booking_time_str.split(':'))
+        return f"{hours:02d}:{(minutes // 30) * 30:02d}"
+
+    available_slots = []
+    for slot in time_slots:
+        slot_available = False
+        for employee in employees:
+            employee_booked = False
+            for booking in bookings:
+                if booking.employee_id == employee.id and booking.booking_time:
+                    if map_time_to_slot(booking.booking_time.strftime("%H:%M")) == slot:
+                        employee_booked = True
+                        break
+            tos = timeoff_map.get(employee.id, [])
+            off = any(t.is_full_day for t in tos)
+            if not employee_booked and not off:
+                slot_available = True
+                break
+        if slot_available:
+            available_slots.append(slot)
+    return available_slots
+
+
+def make_day(num_employees, num_bookings, seed=42):
+    rng = random.Random(seed)
+    employees = [SimpleNamespace(id=i) for i in range(1, num_employees + 1)]
+    bookings = []
+    for _ in range(num_bookings):
+        minutes = rng.randrange(9 * 60, 19 * 60, 30)
+        bookings.append(SimpleNamespace(
+            employee_id=rng.randint(1, num_employees),
+            booking_time=time(minutes // 60, minutes % 60),
+            total_duration=30,
+            duration=30
+        ))
+    return employees, bookings
+
+
+def main():
+    num_employees = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    num_bookings = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    iterations = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+
+    employees, bookings = make_day(num_employees, num_bookings)
+    open_start, open_end = time_to_minutes("09:00"), time_to_minutes("19:00")
+    time_slots = [f"{m // 60:02d}:{m % 60:02d}" for m in range(open_start, open_end, 30)]
+
+    started = time_module.perf_counter()
+    for _ in range(iterations):
+        legacy = legacy_available_slots(time_slots, employees, bookings, {})
+    legacy_ms = (time_module.perf_counter() - started) * 1000 / iterations
+
+    inputs = DayInputs(employees=employees, bookings=bookings)
+    started = time_module.perf_counter()
+    for _ in range(iterations):
+        engine = build_day_schedule(open_start, open_end, inputs).free_slots()
+    engine_ms = (time_module.perf_counter() - started) * 1000 / iterations
+
+    assert legacy == engine, "engine and legacy results differ"
+
+    print(f"📊 {num_employees} employees, {num_bookings} bookings, {len(time_slots)} slots, {iterations} iterations")
+    print(f"   legacy nested loops: {legacy_ms:.3f} ms/request")
+    print(f"   bitmap engine:       {engine_ms:.3f} ms/request")
+    print(f"   speedup:             {legacy_ms / engine_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Email template render benchmark.
+
+For every template variant, compares rendering from the precompiled registry
+(what a send does) with compiling the source on every call (what building the
+HTML per send costs), then renders a campaign body for N recipients from one
+compiled template versus substituting the placeholders per recipient.
+
+Usage: python scripts/benchmark_email_templates.py [renders] [campaign_recipients]
+Example: python scripts/benchmark_email_templates.py 2000 10000
+"""
+import os
+import re
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.email_templates import EmailTemplate, Html, campaign_template, email_templates
+
+VALUES = {
+    "customer_name": "Ana Silva", "to_name": "Ana Silva", "salon_name": "Salon Lisboa",
+    "services_html": Html("<li><strong>Cut</strong> - €20 (30 minutes)</li>"), "services_text": "- Cut - €20 (30 minutes)",
+    "service_name": "Cut", "service_price": 20, "service_duration": 30, "subject_service_name": "Cut",
+    "booking_date": "2030-01-15", "booking_time": "10:00", "when": "tomorrow", "employee_name": "Rita", "duration": 30, "total_price": 20, "business_name": "Salon Lisboa", "business_address": "Rua Augusta 1",
+    "business_phone": "+351 210 000 000", "reset_url": "https://linkuup.example/reset?token=abc",
+    "plan_section": Html(""), "plan_name": "Pro",
+}
+
+CAMPAIGN_BODY = "<p>Hi {{params.name}},</p>" + "<p>Spring offers at your favourite salon.</p>" * 40
+
+
+def per_render_us(render, count):
+    started = time.perf_counter()
+    for _ in range(count):
+        render()
+    return (time.perf_counter() - started) / count * 1e6
+
+
+def main():
+    renders = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    recipients = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+
+    started = time.perf_counter()
+    compiled = email_templates.compile_all()
+    print(f"🏗️  Compiled {compiled} templates in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    for language, templates in email_templates.sources.items():
+        for name, source in templates.items():
+            for variant in source.get("variants") or [None]:
+                template = email_templates.get(name, variant, language)
+                constants = {**source.get("constants", {}), **(source.get("variants") or {}).get(variant, {})}
+                cached = per_render_us(lambda: template.render(VALUES), renders)
+                uncached = per_render_us(lambda: EmailTemplate(source, constants).render(VALUES), renders)
+                size = len(template.render(VALUES).html)
+                label = f"{language}/{name}/{variant or '-'}"
+                print(
+                    f"✅ {label:<36} {size:>6}B html  "
+                    f"compiled {cached:7.1f}µs  compile-per-send {uncached:7.1f}µs  ({uncached / cached:4.1f}x)"
+                )
+
+    rows = [{"name": f"Customer {i}", "email": f"customer{i}@example.com"} for i in range(recipients)]
+    started = time.perf_counter()
+    body = campaign_template(CAMPAIGN_BODY, escape=True)
+    body.render_many(rows)
+    batch = time.perf_counter() - started
+    placeholder = re.compile(r"\{\{\s*params\.(\w+)\s*\}\}")
+    started = time.perf_counter()
+    for row in rows:
+        placeholder.sub(lambda match: row.get(match.group(1), ""), CAMPAIGN_BODY)
+    naive = time.perf_counter() - started
+    print(
+        f"📨 Campaign body for {recipients} recipients: one compiled template {batch * 1000:.1f}ms, "
+        f"substitution per recipient {naive * 1000:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark the nearby-search geo index against a full scan.
+
+Builds synthetic places (100k by default) spread over mainland Portugal, with
+a share of mobile places, and times k-nearest queries from random points
+against a pure-Python haversine scan over every place - what a correct version
+of the previous endpoint would have to do per request. Both must return the
+same places in the same order.
+
+Usage: python scripts/benchmark_geo_index.py [places] [queries] [radius_km]
+"""
+import math
+import random
+import sys
+import os
+import time as time_module
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.geo_index import EARTH_RADIUS_KM, PlaceGeoIndex, PlacePoint
+
+LAT_RANGE = (37.0, 42.1)
+LNG_RANGE = (-9.5, -6.2)
+LIMIT = 20
+
+
+def make_places(num_places, seed=42):
+    rng = random.Random(seed)
+    places = []
+    for place_id in range(1, num_places + 1):
+        is_mobile = rng.random() < 0.05
+        places.append(PlacePoint(
+            id=place_id,
+            latitude=rng.uniform(*LAT_RANGE),
+            longitude=rng.uniform(*LNG_RANGE),
+            nome=f"Place {place_id}",
+            tipo=rng.choice(['salon', 'barber', 'spa']),
+            location_type='mobile' if is_mobile else 'fixed',
+            coverage_radius=rng.choice([5.0, 10.0, 25.0]) if is_mobile else None,
+        ))
+    return places
+
+
+def full_scan(places, lat, lng, radius_km, limit):
+    """Haversine over every place, then sort"""
+    matches = []
+    lat1, lng1 = math.radians(lat), math.radians(lng)
+    for place in places:
+        lat2, lng2 = math.radians(place.latitude), math.radians(place.longitude)
+        a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+        distance = 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a)))
+        coverage = (place.coverage_radius or 10.0) if place.location_type == 'mobile' else 0.0
+        if distance <= radius_km or distance <= coverage:
+            matches.append((distance, place.id))
+    matches.sort()
+    return [place_id for _, place_id in matches[:limit]]
+
+
+def main():
+    num_places = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    num_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    radius_km = float(sys.argv[3]) if len(sys.argv) > 3 else 5.0
+
+    places = make_places(num_places)
+    rng = random.Random(7)
+    queries = [(rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE)) for _ in range(num_queries)]
+
+    index = PlaceGeoIndex()
+    started = time_module.perf_counter()
+    index.load(places)
+    index.nearest(0.0, 0.0, radius_km, LIMIT)  # compile the arrays
+    build_ms = (time_module.perf_counter() - started) * 1000
+
+    scan_queries = queries[:max(1, num_queries // 10)]
+    started = time_module.perf_counter()
+    expected = [full_scan(places, lat, lng, radius_km, LIMIT) for lat, lng in scan_queries]
+    scan_ms = (time_module.perf_counter() - started) * 1000 / len(scan_queries)
+
+    started = time_module.perf_counter()
+    results = [index.nearest(lat, lng, radius_km, LIMIT) for lat, lng in queries]
+    index_ms = (time_module.perf_counter() - started) * 1000 / num_queries
+
+    for want, got in zip(expected, results):
+        assert want == [point.id for point, _ in got], "index and full scan results differ"
+
+    print(f"📊 {num_places} places, {num_queries} queries, radius {radius_km} km, k={LIMIT}")
+    print(f"   index build:       {build_ms:.1f} ms")
+    print(f"   full python scan:  {scan_ms:.3f} ms/request")
+    print(f"   geo index:         {index_ms:.3f} ms/request")
+    print(f"   speedup:           {scan_ms / index_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Brevo transactional email API.
+
+Accepts POST /v3/smtp/email like Brevo (201 with a messageId, or with one
+messageIds entry per version for messageVersions batches) and keeps the
+messages in memory, one per version, so the email outbox and campaign
+dispatch can be exercised without network access or an API key. Failures can
+be injected (a failing address fails its whole batch, as Brevo rejects the
+request):
+
+    to address containing "+fail500@"   -> 500 (retried by the outbox)
+    to address containing "+fail429@"   -> 429 (retried)
+    to address containing "+fail400@"   -> 400 (dead-lettered)
+    BREVO_STUB_FAIL_RATE=0.1            -> random 503s
+    BREVO_STUB_LATENCY_MS=150           -> per-request delay
+
+GET /v3/stub/messages lists what was received (and the request count), DELETE
+clears it.
+
+Usage: python scripts/brevo_stub.py [port]
+       BREVO_API_BASE_URL=http://localhost:5050/v3 BREVO_API_KEY=stub uvicorn main:app ...
+"""
+import asyncio
+import os
+import random
+import sys
+import uuid
+
+from fastapi import FastAPI, Header, Request
+from fastapi.responses import JSONResponse
+
+FAIL_RATE = float(os.getenv("BREVO_STUB_FAIL_RATE", "0"))
+LATENCY_MS = float(os.getenv("BREVO_STUB_LATENCY_MS", "0"))
+
+app = FastAPI(title="Brevo stub")
+app.state.messages = []
+app.state.requests = 0
+
+
+def _injected_status(addresses):
+    for address in addresses:
+        for status in (500, 429, 400):
+            if f"+fail{status}@" in address:
+                return status
+    if FAIL_RATE and random.random() < FAIL_RATE:
+        return 503
+    return None
+
+
+@app.post("/v3/smtp/email")
+async def send_email(request: Request, api_key: str = Header(None, alias="api-key")):
+    if LATENCY_MS:
+        await asyncio.sleep(LATENCY_MS / 1000)
+    if not api_key:
+        return JSONResponse(status_code=401, content={"code": "unauthorized", "message": "Key not found"})
+
+    app.state.requests += 1
+    payload = await request.json()
+    versions = payload.get("messageVersions")
+    if versions is None:
+        versions = [{"to": payload.get("to", [])}]
+    elif payload.get("to") or not versions:
+        return JSONResponse(status_code=400, content={"code": "invalid_parameter", "message": "use either to or a non-empty messageVersions"})
+    addresses = [to.get("email", "") for version in versions for to in version.get("to", [])]
+    if not payload.get("sender") or not payload.get("subject") or not all(version.get("to") for version in versions):
+        return JSONResponse(status_code=400, content={"code": "missing_parameter", "message": "sender, to and subject are required"})
+
+    status = _injected_status(addresses)
+    if status:
+        return JSONResponse(status_code=status, content={"code": "stub_failure", "message": f"Injected {status}"})
+
+    message_ids = []
+    for version in versions:
+        message_id = f"<{uuid.uuid4().hex}@stub.brevo>"
+        message = {key: value for key, value in payload.items() if key != "messageVersions"}
+        message.update(version)
+        app.state.messages.append({"payload": message, "messageId": message_id})
+        message_ids.append(message_id)
+    if "messageVersions" in payload:
+        return JSONResponse(status_code=201, content={"messageIds": message_ids})
+    return JSONResponse(status_code=201, content={"messageId": message_ids[0]})
+
+
+@app.get("/v3/stub/messages")
+async def list_messages():
+    return {"count": len(app.state.messages), "requests": app.state.requests, "messages": app.state.messages}
+
+
+@app.delete("/v3/stub/messages")
+async def clear_messages():
+    app.state.messages.clear()
+    app.state.requests = 0
+    return {"count": 0}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 5050
+    uvicorn.run(app, host="127.0.0.1", port=port)
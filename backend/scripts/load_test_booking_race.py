@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Concurrent double-booking load test.
+
+Fires many simultaneous public booking requests for the same employee and
+slot at a running API, then checks the database for overlapping active
+bookings. Exactly one request may succeed; every other request must be
+rejected with 409. Exits non-zero if any double booking got through.
+
+Requires the ex_bookings_employee_overlap migration to be applied and a
+dedicated test place/employee/service (the bookings it creates are cancelled
+at the end).
+
+Usage: python scripts/load_test_booking_race.py BASE_URL PLACE_ID EMPLOYEE_ID PLACE_SERVICE_ID
+           DATE TIME [requests] [rounds]
+Example: python scripts/load_test_booking_race.py http://localhost:5001 1 3 12 2030-01-15 10:00 50 5
+"""
+import asyncio
+import sys
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+
+import httpx
+from sqlalchemy import text
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database import AsyncSessionLocal
+
+OVERLAP_QUERY = text("""
+    SELECT COUNT(*)
+    FROM bookings a
+    JOIN bookings b
+      ON a.employee_id = b.employee_id
+     AND a.id < b.id
+     AND tsrange(a.booking_date + a.booking_time,
+                 a.booking_date + a.booking_time
+                     + COALESCE(NULLIF(a.total_duration, 0), NULLIF(a.duration, 0), 30) * interval '1 minute', '[)')
+      && tsrange(b.booking_date + b.booking_time,
+                 b.booking_date + b.booking_time
+                     + COALESCE(NULLIF(b.total_duration, 0), NULLIF(b.duration, 0), 30) * interval '1 minute', '[)')
+    WHERE a.employee_id = :employee_id
+      AND a.status IN ('pending', 'confirmed')
+      AND b.status IN ('pending', 'confirmed')
+""")
+
+CLEANUP_QUERY = text("""
+    UPDATE bookings SET status = 'cancelled'
+    WHERE employee_id = :employee_id AND customer_email LIKE 'race-test-%@example.com'
+""")
+
+
+async def book(client, url, payload):
+    try:
+        response = await client.post(url, json=payload)
+        return response.status_code
+    except httpx.HTTPError as e:
+        return type(e).__name__
+
+
+async def run_round(client, url, payloads):
+    """Send all payloads at once and tally the response codes"""
+    return Counter(await asyncio.gather(*(book(client, url, payload) for payload in payloads)))
+
+
+async def main():
+    if len(sys.argv) < 7:
+        print(__doc__)
+        sys.exit(2)
+
+    base_url, place_id, employee_id, place_service_id, booking_date, booking_time = sys.argv[1:7]
+    requests_per_round = int(sys.argv[7]) if len(sys.argv) > 7 else 50
+    rounds = int(sys.argv[8]) if len(sys.argv) > 8 else 5
+    place_id, employee_id, place_service_id = int(place_id), int(employee_id), int(place_service_id)
+    url = f"{base_url.rstrip('/')}/api/v1/places/{place_id}/bookings"
+    start = datetime.strptime(f"{booking_date} {booking_time}", "%Y-%m-%d %H:%M")
+
+    print(f"🏁 {rounds} rounds x {requests_per_round} concurrent requests against {url}")
+
+    totals = Counter()
+    failed_rounds = 0
+    limits = httpx.Limits(max_connections=requests_per_round)
+    async with httpx.AsyncClient(timeout=30, limits=limits) as client:
+        for round_number in range(rounds):
+            # Each round targets a fresh hour; start times within a round are
+            # staggered by 0/5/10 minutes so partial overlaps are exercised too
+            slot = start + timedelta(hours=round_number)
+            payloads = [
+                {
+                    'salon_id': place_id,
+                    'service_ids': [place_service_id],
+                    'employee_id': employee_id,
+                    'customer_name': f"Race Test {i}",
+                    'customer_email': f"race-test-{round_number}-{i}@example.com",
+                    'booking_date': slot.strftime("%Y-%m-%d"),
+                    'booking_time': (slot + timedelta(minutes=i % 3 * 5)).strftime("%H:%M"),
+                }
+                for i in range(requests_per_round)
+            ]
+            codes = await run_round(client, url, payloads)
+            totals.update(codes)
+            created = codes.get(201, 0)
+            status = "✅" if created <= 1 else "❌"
+            if created > 1:
+                failed_rounds += 1
+            print(f"{status} Round {round_number + 1}: {dict(codes)}")
+
+    async with AsyncSessionLocal() as db:
+        overlaps = (await db.execute(OVERLAP_QUERY, {"employee_id": employee_id})).scalar_one()
+        await db.execute(CLEANUP_QUERY, {"employee_id": employee_id})
+        await db.commit()
+
+    print(f"📊 Responses: {dict(totals)}")
+    print(f"📊 Overlapping active bookings for employee {employee_id}: {overlaps}")
+    unexpected = {code: count for code, count in totals.items() if code not in (201, 409)}
+    if unexpected:
+        print(f"⚠️ Unexpected responses: {unexpected}")
+
+    if overlaps or failed_rounds:
+        print("❌ Double bookings detected")
+        sys.exit(1)
+    print("✅ No double bookings")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Connection pool saturation load test.
+
+Opens an engine with the configured DB_PROFILE (pool size and overflow can be
+overridden on the command line) and runs waves of concurrent sessions that
+each hold a connection for HOLD_MS via pg_sleep. While concurrency stays within
+pool_size + max_overflow checkouts do not wait; beyond it requests queue for a
+free connection (wait grows by roughly HOLD_MS per extra wave) and once the
+wait exceeds pool_timeout they fail with a pool TimeoutError, which the API
+turns into a 500. Use it to pick pool sizes for the worker count.
+
+Usage: python scripts/load_test_pool.py [concurrency,...] [hold_ms] [pool_size] [max_overflow]
+Example: python scripts/load_test_pool.py 5,15,30,60 200 5 10
+"""
+import asyncio
+import sys
+import os
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import settings
+from core.database import engine_kwargs
+
+
+async def hold_connection(engine, hold_ms):
+    """Check out a connection, keep it busy for hold_ms and return the total latency"""
+    started = time.perf_counter()
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": hold_ms / 1000})
+    except PoolTimeoutError:
+        return None
+    return (time.perf_counter() - started) * 1000
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run_level(options, concurrency, hold_ms):
+    """One burst of concurrent checkouts against a fresh pool"""
+    kwargs = engine_kwargs(options, settings.DATABASE_URL)
+    kwargs["echo"] = False
+    engine = create_async_engine(settings.DATABASE_URL, **kwargs)
+    try:
+        latencies = await asyncio.gather(*(hold_connection(engine, hold_ms) for _ in range(concurrency)))
+        wait = engine.sync_engine.pool.wait_stats()
+    finally:
+        await engine.dispose()
+
+    completed = [latency for latency in latencies if latency is not None]
+    timeouts = len(latencies) - len(completed)
+    capacity = options["pool_size"] + options["max_overflow"]
+    status = "✅" if not timeouts else "❌"
+    print(
+        f"{status} concurrency={concurrency:<4} capacity={capacity:<3} "
+        f"p50={percentile(completed, 0.5):7.1f}ms p95={percentile(completed, 0.95):7.1f}ms "
+        f"avg_wait={wait['avg_wait_ms']:7.1f}ms max_wait={wait['max_wait_ms']:7.1f}ms timeouts={timeouts}"
+    )
+
+
+async def main():
+    levels = [int(level) for level in sys.argv[1].split(",")] if len(sys.argv) > 1 else [5, 15, 30, 60]
+    hold_ms = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    options = dict(settings.database_engine_options)
+    if len(sys.argv) > 3:
+        options["pool_size"] = int(sys.argv[3])
+    if len(sys.argv) > 4:
+        options["max_overflow"] = int(sys.argv[4])
+
+    print(
+        f"🏁 Profile {settings.DB_PROFILE}: pool_size={options['pool_size']} "
+        f"max_overflow={options['max_overflow']} pool_timeout={options['pool_timeout']}s, "
+        f"each checkout holds {hold_ms}ms"
+    )
+    for concurrency in levels:
+        await run_level(options, concurrency, hold_ms)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Rebuild per-place review aggregates (place_review_stats) from the reviews table.
+
+Usage:
+    python scripts/rebuild_review_stats.py              # every place
+    python scripts/rebuild_review_stats.py 12 57 301    # only these places
+"""
+import asyncio
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from core.config import settings
+from services.review_stats import rebuild_review_stats
+
+
+async def rebuild(place_ids=None):
+    """Recompute aggregates in one transaction"""
+    engine = create_async_engine(settings.DATABASE_URL, echo=False)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with async_session() as db:
+        written = await rebuild_review_stats(db, place_ids)
+        await db.commit()
+
+    await engine.dispose()
+    scope = f"{len(place_ids)} requested places" if place_ids is not None else "all places"
+    print(f'✅ Rebuilt review stats for {scope}: {written} places with reviews')
+
+
+if __name__ == "__main__":
+    ids = [int(arg) for arg in sys.argv[1:]] or None
+    asyncio.run(rebuild(ids))
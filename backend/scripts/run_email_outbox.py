@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Run the email outbox worker as its own process.
+
+The API runs the worker in every process by default; set
+EMAIL_OUTBOX_WORKER_ENABLED=false on the API and run this instead to keep
+delivery separate from request handling. Several copies can run at once
+(rows are claimed with SKIP LOCKED).
+
+Usage: python scripts/run_email_outbox.py [--once]
+"""
+import asyncio
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.logging_config import configure_logging
+from services.email_outbox import email_outbox_worker
+
+
+async def main(once: bool):
+    try:
+        if once:
+            handled = await email_outbox_worker.run_once()
+            print(f"📧 Handled {handled} outbox emails: {email_outbox_worker.stats()}")
+        else:
+            await email_outbox_worker.run()
+    finally:
+        await email_outbox_worker.client.aclose()
+
+
+if __name__ == "__main__":
+    configure_logging()
+    asyncio.run(main("--once" in sys.argv[1:]))
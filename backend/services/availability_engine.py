@@ -0,0 +1,459 @@
+"""
+Availability engine for public place booking slots.
+
+Loads everything needed to answer availability for a place-day - or a window
+of up to MAX_RANGE_DAYS days - in one batched fetch (one query per input
+table), then represents each employee's day as a
+minute-resolution bitmap so "is this slot free" becomes a single AND.
+"""
+from bisect import bisect_left, insort
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.place_existing import (
+    Place, Booking, PlaceClosedPeriod, PlaceEmployee, PlaceEmployeeTimeOff, PlaceService
+)
+
+MINUTES_PER_DAY = 24 * 60
+NOON = 12 * 60
+DEFAULT_SLOT_MINUTES = 30
+ALLOWED_SLOT_MINUTES = (15, 30, 60)
+MAX_RANGE_DAYS = 60
+ACTIVE_BOOKING_STATUSES = ("pending", "confirmed")
+DAY_NAMES = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+
+def time_to_minutes(time_str: str) -> int:
+    """Convert time string (HH:MM) to minutes since midnight"""
+    hours, minutes = map(int, time_str.split(':')[:2])
+    return hours * 60 + minutes
+
+
+def minutes_to_time(minutes: int) -> str:
+    """Convert minutes since midnight to time string (HH:MM)"""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def span_mask(start: int, end: int) -> int:
+    """Bitmask with bits [start, end) set, clamped to the day"""
+    start = max(0, start)
+    end = min(MINUTES_PER_DAY, end)
+    if end <= start:
+        return 0
+    return ((1 << (end - start)) - 1) << start
+
+
+def place_slot_minutes(place: Place) -> int:
+    """Slot granularity configured for a place (15/30/60), defaulting to 30"""
+    value = getattr(place, 'booking_slot_minutes', None)
+    return value if value in ALLOWED_SLOT_MINUTES else DEFAULT_SLOT_MINUTES
+
+
+def booking_interval(booking: Booking, default_minutes: int = DEFAULT_SLOT_MINUTES) -> Tuple[int, int]:
+    """[start, end) minutes occupied by a booking, using its total duration"""
+    start = booking.booking_time.hour * 60 + booking.booking_time.minute
+    length = booking.total_duration or booking.duration or default_minutes
+    return start, start + length
+
+
+class IntervalIndex:
+    """
+    Sorted [start, end) intervals with O(log n) overlap queries.
+
+    Intervals are kept ordered by start together with a running maximum of
+    their ends, so "does anything overlap [s, e)" is one bisect plus a lookup:
+    among intervals starting before e, the one reaching furthest must end
+    after s.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[int, int]] = ()):
+        self._intervals: List[Tuple[int, int]] = sorted(intervals)
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        self._starts = [start for start, _ in self._intervals]
+        self._max_end = []
+        running = None
+        for _, end in self._intervals:
+            running = end if running is None else max(running, end)
+            self._max_end.append(running)
+
+    def add(self, start: int, end: int) -> None:
+        insort(self._intervals, (start, end))
+        self._rebuild()
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """Whether any stored interval intersects [start, end)"""
+        count = bisect_left(self._starts, end)
+        return count > 0 and self._max_end[count - 1] > start
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+
+async def load_booking_index(
+    db: AsyncSession,
+    place_id: int,
+    booking_date: date,
+    employee_ids: Optional[Sequence[int]] = None,
+    default_minutes: int = DEFAULT_SLOT_MINUTES,
+    exclude_booking_id: Optional[int] = None
+) -> Dict[int, IntervalIndex]:
+    """
+    Build per-employee interval indexes of active bookings for a day.
+
+    One query covers all requested employees (or the whole place).
+    """
+    query = select(Booking).where(
+        Booking.place_id == place_id,
+        Booking.booking_date == booking_date,
+        Booking.status.in_(ACTIVE_BOOKING_STATUSES)
+    )
+    if employee_ids is not None:
+        query = query.where(Booking.employee_id.in_(list(employee_ids)))
+    if exclude_booking_id is not None:
+        query = query.where(Booking.id != exclude_booking_id)
+    result = await db.execute(query)
+
+    intervals: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+    for booking in result.scalars().all():
+        if booking.booking_time:
+            intervals[booking.employee_id].append(booking_interval(booking, default_minutes))
+    indexes: Dict[int, IntervalIndex] = defaultdict(IntervalIndex)
+    for emp_id, emp_intervals in intervals.items():
+        indexes[emp_id] = IntervalIndex(emp_intervals)
+    return indexes
+
+
+async def load_service_duration(db: AsyncSession, place_id: int, service_id: int) -> Optional[int]:
+    """Duration in minutes of a service as offered by a place"""
+    result = await db.execute(
+        select(PlaceService.duration).where(
+            PlaceService.place_id == place_id,
+            PlaceService.service_id == service_id
+        ).limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+@dataclass
+class DayInputs:
+    """Raw rows needed to compute availability for a place-day"""
+    closures: List[PlaceClosedPeriod] = field(default_factory=list)
+    employees: List[PlaceEmployee] = field(default_factory=list)
+    bookings: List[Booking] = field(default_factory=list)
+    time_off: List[PlaceEmployeeTimeOff] = field(default_factory=list)
+
+
+async def load_range_inputs(
+    db: AsyncSession,
+    place_id: int,
+    start_date: date,
+    end_date: date
+) -> Dict[date, DayInputs]:
+    """
+    Load closures, employees, bookings and time-off for every day in
+    [start_date, end_date].
+
+    One query per input table covers the whole window. Dated and recurring
+    rules are fetched together and each rule is expanded over the window once
+    with the models' own is_active_on_date().
+    """
+    days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+    inputs_by_day: Dict[date, DayInputs] = {day: DayInputs() for day in days}
+
+    closures_result = await db.execute(
+        select(PlaceClosedPeriod).where(
+            PlaceClosedPeriod.place_id == place_id,
+            PlaceClosedPeriod.status == 'active',
+            or_(
+                and_(PlaceClosedPeriod.start_date <= end_date, PlaceClosedPeriod.end_date >= start_date),
+                PlaceClosedPeriod.is_recurring == True
+            )
+        )
+    )
+    for closure in closures_result.scalars().all():
+        for day in _expand_rule(closure, days):
+            inputs_by_day[day].closures.append(closure)
+
+    employees_result = await db.execute(
+        select(PlaceEmployee).where(
+            PlaceEmployee.place_id == place_id,
+            PlaceEmployee.is_active == True
+        )
+    )
+    employees = list(employees_result.scalars().all())
+    for day_inputs in inputs_by_day.values():
+        day_inputs.employees = employees
+
+    bookings_result = await db.execute(
+        select(Booking).where(
+            Booking.place_id == place_id,
+            Booking.booking_date >= start_date,
+            Booking.booking_date <= end_date,
+            Booking.status.in_(ACTIVE_BOOKING_STATUSES)
+        )
+    )
+    for booking in bookings_result.scalars().all():
+        if booking.booking_date in inputs_by_day:
+            inputs_by_day[booking.booking_date].bookings.append(booking)
+
+    time_off_result = await db.execute(
+        select(PlaceEmployeeTimeOff).where(
+            PlaceEmployeeTimeOff.place_id == place_id,
+            PlaceEmployeeTimeOff.status == 'approved',
+            or_(
+                and_(PlaceEmployeeTimeOff.start_date <= end_date, PlaceEmployeeTimeOff.end_date >= start_date),
+                PlaceEmployeeTimeOff.is_recurring == True
+            )
+        )
+    )
+    for time_off in time_off_result.scalars().all():
+        for day in _expand_rule(time_off, days):
+            inputs_by_day[day].time_off.append(time_off)
+
+    return inputs_by_day
+
+
+async def load_day_inputs(db: AsyncSession, place_id: int, check_date: date) -> DayInputs:
+    """Load closures, employees, bookings and time-off for a single place-day"""
+    inputs_by_day = await load_range_inputs(db, place_id, check_date, check_date)
+    return inputs_by_day[check_date]
+
+
+def _expand_rule(rule, days: Sequence[date]) -> List[date]:
+    """Days of the window on which a closed period / time-off rule applies"""
+    return [day for day in days if rule.is_active_on_date(day)]
+
+
+def time_off_mask(time_offs: Iterable[PlaceEmployeeTimeOff]) -> int:
+    """Bitmask of minutes blocked by full-day / AM / PM time-off"""
+    mask = 0
+    for t in time_offs:
+        if t.is_full_day:
+            return span_mask(0, MINUTES_PER_DAY)
+        if t.half_day_period == 'AM':
+            mask |= span_mask(0, NOON)
+        elif t.half_day_period == 'PM':
+            mask |= span_mask(NOON, MINUTES_PER_DAY)
+    return mask
+
+
+class DaySchedule:
+    """
+    Per-employee minute bitmaps for a single day.
+
+    A set bit means the employee is busy (booked or off) at that minute.
+    """
+
+    def __init__(
+        self,
+        open_start: int,
+        open_end: int,
+        employee_ids: Sequence[int],
+        slot_minutes: int = DEFAULT_SLOT_MINUTES
+    ):
+        self.open_start = open_start
+        self.open_end = open_end
+        self.slot_minutes = slot_minutes
+        self.employee_ids = list(employee_ids)
+        self.busy: Dict[int, int] = {emp_id: 0 for emp_id in self.employee_ids}
+        self.booked: Dict[int, int] = {emp_id: 0 for emp_id in self.employee_ids}
+        self.slot_starts = list(range(open_start, open_end, slot_minutes))
+
+    @property
+    def time_slots(self) -> List[str]:
+        return [minutes_to_time(m) for m in self.slot_starts]
+
+    def add_booking(self, employee_id: Optional[int], start: int, end: Optional[int] = None) -> None:
+        """Mark [start, end) as booked for an employee (one slot when end is omitted)"""
+        if end is None:
+            end = start + self.slot_minutes
+        mask = span_mask(start, end)
+        self.booked[employee_id] = self.booked.get(employee_id, 0) | mask
+        self.busy[employee_id] = self.busy.get(employee_id, 0) | mask
+
+    def block(self, employee_id: int, mask: int) -> None:
+        """Mark minutes as unavailable (time-off) for an employee"""
+        self.busy[employee_id] = self.busy.get(employee_id, 0) | mask
+
+    def is_free(self, employee_id: int, start: int, duration: Optional[int] = None) -> bool:
+        """Whether an employee has no busy minute in [start, start + duration)"""
+        length = duration or self.slot_minutes
+        return self.busy.get(employee_id, 0) & span_mask(start, start + length) == 0
+
+    def free_slots(self, employee_id: Optional[int] = None, duration: Optional[int] = None) -> List[str]:
+        """
+        Free slot start times for one employee, or for any employee when
+        employee_id is None. With a duration, the whole [start, start +
+        duration) window must be free and end before closing time.
+        """
+        if employee_id is not None:
+            candidates = [employee_id]
+        else:
+            candidates = self.employee_ids
+        busy_masks = [self.busy.get(emp_id, 0) for emp_id in candidates]
+        length = duration or self.slot_minutes
+
+        free = []
+        for start in self.slot_starts:
+            if duration and start + duration > self.open_end:
+                break
+            window = span_mask(start, start + length)
+            if any(busy & window == 0 for busy in busy_masks):
+                free.append(minutes_to_time(start))
+        return free
+
+    def booked_slots(self, employee_id: Optional[int] = None) -> List[str]:
+        """Slots overlapped by at least one booking (for an employee or any)"""
+        if employee_id is not None:
+            booked = self.booked.get(employee_id, 0)
+        else:
+            booked = 0
+            for mask in self.booked.values():
+                booked |= mask
+        return [
+            minutes_to_time(start) for start in self.slot_starts
+            if booked & span_mask(start, start + self.slot_minutes)
+        ]
+
+
+def build_day_schedule(
+    open_start: int,
+    open_end: int,
+    inputs: DayInputs,
+    slot_minutes: int = DEFAULT_SLOT_MINUTES,
+    employee_id: Optional[int] = None
+) -> DaySchedule:
+    """Populate a DaySchedule from preloaded day inputs"""
+    employee_ids = [emp.id for emp in inputs.employees]
+    if employee_id is not None and employee_id not in employee_ids:
+        # Requested employee is tracked even if not an active place employee
+        employee_ids.append(employee_id)
+    schedule = DaySchedule(open_start, open_end, employee_ids, slot_minutes)
+
+    for booking in inputs.bookings:
+        if booking.booking_time:
+            start, end = booking_interval(booking, slot_minutes)
+            schedule.add_booking(booking.employee_id, start, end)
+
+    time_off_by_employee: Dict[int, List[PlaceEmployeeTimeOff]] = {}
+    for t in inputs.time_off:
+        time_off_by_employee.setdefault(t.employee_id, []).append(t)
+    for emp_id, time_offs in time_off_by_employee.items():
+        schedule.block(emp_id, time_off_mask(time_offs))
+
+    return schedule
+
+
+def _closed_response(place_id: int, date_value, service_id: Optional[int], reason: str, time_slots=None) -> dict:
+    return {
+        "place_id": place_id,
+        "date": date_value,
+        "service_id": service_id,
+        "time_slots": time_slots or [],
+        "available_slots": [],
+        "is_available": False,
+        "reason": reason
+    }
+
+
+async def get_day_availability(
+    db: AsyncSession,
+    place: Place,
+    check_date: date,
+    date_value=None,
+    service_id: Optional[int] = None,
+    employee_id: Optional[int] = None
+) -> dict:
+    """
+    Compute the public availability payload for a place-day.
+
+    Args:
+        db: Database session
+        place: Active place
+        check_date: Day to compute
+        date_value: Date as echoed back in the response (defaults to check_date)
+        service_id: Optional service; its duration must fit in a free window
+        employee_id: Optional employee to restrict availability to
+
+    Returns:
+        Availability response dict
+    """
+    if date_value is None:
+        date_value = check_date
+
+    service_duration = await load_service_duration(db, place.id, service_id) if service_id else None
+    inputs = await load_day_inputs(db, place.id, check_date)
+    return compute_day_availability(
+        place, check_date, inputs, date_value, service_id, employee_id, service_duration
+    )
+
+
+def compute_day_availability(
+    place: Place,
+    check_date: date,
+    inputs: DayInputs,
+    date_value=None,
+    service_id: Optional[int] = None,
+    employee_id: Optional[int] = None,
+    service_duration: Optional[int] = None
+) -> dict:
+    """Build the availability payload from preloaded inputs (no I/O)"""
+    if date_value is None:
+        date_value = check_date
+
+    if inputs.closures:
+        # If any closure applies, block the entire day
+        return _closed_response(place.id, date_value, service_id, "Place is closed")
+
+    day_key = DAY_NAMES[check_date.weekday()]
+    day_hours = place.get_working_hours().get(day_key, {})
+    if not day_hours.get('available', False):
+        return _closed_response(place.id, date_value, service_id, f"Place is closed on {day_key.title()}")
+
+    open_start = time_to_minutes(day_hours.get('start', '09:00'))
+    open_end = time_to_minutes(day_hours.get('end', '17:00'))
+
+    schedule = build_day_schedule(
+        open_start, open_end, inputs, slot_minutes=place_slot_minutes(place), employee_id=employee_id
+    )
+
+    if not inputs.employees:
+        return _closed_response(
+            place.id, date_value, service_id, "No employees found for this place", schedule.time_slots
+        )
+
+    available_slots = schedule.free_slots(employee_id, service_duration)
+
+    return {
+        "place_id": place.id,
+        "date": date_value,
+        "service_id": service_id,
+        "time_slots": schedule.time_slots,
+        "available_slots": available_slots,
+        "is_available": len(available_slots) > 0,
+        "available_employees": [emp.id for emp in inputs.employees],
+        "booked_slots": schedule.booked_slots(employee_id),
+        # Campaign data will be fetched separately by the frontend
+        "slots_with_campaigns": {}
+    }
+
+
+def iter_range_availability(
+    place: Place,
+    inputs_by_day: Dict[date, DayInputs],
+    service_id: Optional[int] = None,
+    employee_id: Optional[int] = None,
+    service_duration: Optional[int] = None
+) -> Iterator[dict]:
+    """Yield the availability payload for each preloaded day, in date order"""
+    for day in sorted(inputs_by_day):
+        yield compute_day_availability(
+            place, day, inputs_by_day[day], day.isoformat(), service_id, employee_id, service_duration
+        )
@@ -0,0 +1,301 @@
+"""
+Booking reminders: a long-lived asyncio job that reminds customers of their
+pending and confirmed bookings starting within BOOKING_REMINDER_LEAD_HOURS.
+
+    booking_reminder_job.start()            # API process (BOOKING_REMINDER_WORKER_ENABLED)
+    await booking_reminder_job.run_once()   # one round (cron/booking_reminders.py --once)
+
+Every BOOKING_REMINDER_POLL_SECONDS a round streams the due bookings with
+their place, service, employee and customer language from one query over a
+server-side cursor, BOOKING_REMINDER_CHUNK_SIZE rows at a time. Each chunk is
+marked with one UPDATE ... WHERE reminder_sent_at IS NULL RETURNING id before
+anything is sent, so only the round that marked a booking reminds it (other
+API processes, overlapping rounds and restarts skip it). The marked chunk is
+then sent by email and WhatsApp concurrently through the campaign dispatcher's
+senders, so reminders and campaigns share the per-provider token buckets.
+Bookings whose every channel failed with a retryable error are unmarked and
+picked up by the next round.
+
+Booking dates and times are the place's local time without a zone, so the
+window is computed from the server's local clock like the rest of the booking
+code.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select, update
+
+from core.config import settings
+from core.database import AsyncSessionLocal
+from models.place_existing import Booking, Place, PlaceEmployee, Service
+from models.user import User
+from services.campaign_dispatch import SEND_ERRORS
+from services.email_outbox import render_email
+
+logger = logging.getLogger(__name__)
+
+REMINDER_STATUSES = ("pending", "confirmed")
+
+
+@dataclass
+class DueReminder:
+    """One due booking with everything the reminder shows"""
+    id: int
+    customer_name: str
+    customer_email: Optional[str]
+    customer_phone: Optional[str]
+    booking_date: date
+    booking_time: time
+    service_name: Optional[str] = None
+    employee_name: Optional[str] = None
+    business_name: Optional[str] = None
+    business_phone: Optional[str] = None
+    business_address: Optional[str] = None
+    language: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row) -> "DueReminder":
+        street = " ".join(part for part in (row.rua, row.porta) if part)
+        town = " ".join(part for part in (row.cod_postal, row.cidade) if part)
+        return cls(
+            id=row.id,
+            customer_name=row.customer_name,
+            customer_email=row.customer_email,
+            customer_phone=row.customer_phone,
+            booking_date=row.booking_date,
+            booking_time=row.booking_time,
+            service_name=row.service_name,
+            employee_name=row.employee_name,
+            business_name=row.business_name,
+            business_phone=row.business_phone,
+            business_address=", ".join(part for part in (street, town) if part) or None,
+            language=row.language,
+        )
+
+    def booking_data(self, today: date) -> Dict[str, Any]:
+        """Input for BrevoEmailService.send_booking_reminder"""
+        if self.booking_date == today:
+            when = "today"
+        elif self.booking_date == today + timedelta(days=1):
+            when = "tomorrow"
+        else:
+            when = f"on {self.booking_date.isoformat()}"
+        data = {
+            "customer_name": self.customer_name,
+            "customer_email": self.customer_email or "",
+            "booking_date": self.booking_date.isoformat(),
+            "booking_time": self.booking_time.strftime("%H:%M"),
+            "when": when,
+            "employee_name": self.employee_name,
+            "language": self.language,
+        }
+        # Missing values fall back to the template method's defaults
+        for key in ("service_name", "business_name", "business_phone", "business_address"):
+            if getattr(self, key):
+                data[key] = getattr(self, key)
+        return data
+
+
+def due_bookings_statement(now: datetime, until: datetime):
+    """Bookings starting in (now, until] still waiting for their reminder, in start order"""
+    starts_at = Booking.booking_date + Booking.booking_time
+    return (
+        select(
+            Booking.id,
+            Booking.customer_name,
+            Booking.customer_email,
+            Booking.customer_phone,
+            Booking.booking_date,
+            Booking.booking_time,
+            Place.nome.label("business_name"),
+            Place.telefone.label("business_phone"),
+            Place.rua,
+            Place.porta,
+            Place.cod_postal,
+            Place.cidade,
+            Service.name.label("service_name"),
+            PlaceEmployee.name.label("employee_name"),
+            User.language_preference.label("language"),
+        )
+        .select_from(Booking)
+        .join(Place, Place.id == Booking.salon_id)
+        .outerjoin(Service, Service.id == Booking.service_id)
+        .outerjoin(PlaceEmployee, PlaceEmployee.id == Booking.employee_id)
+        .outerjoin(User, User.id == Booking.user_id)
+        .where(
+            Booking.reminder_sent_at.is_(None),
+            Booking.status.in_(REMINDER_STATUSES),
+            # The date range lets ix_bookings_reminder_due narrow the scan before the exact start check
+            Booking.booking_date.between(now.date(), until.date()),
+            starts_at > now,
+            starts_at <= until,
+        )
+        .order_by(Booking.booking_date, Booking.booking_time, Booking.id)
+    )
+
+
+def mark_statement(booking_ids: List[int], sent_at: datetime):
+    """Set reminder_sent_at on the bookings nobody marked yet; returns the ids this statement marked"""
+    return (
+        update(Booking)
+        .where(Booking.id.in_(booking_ids), Booking.reminder_sent_at.is_(None))
+        .values(reminder_sent_at=sent_at)
+        .returning(Booking.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def unmark_statement(booking_ids: List[int]):
+    return (
+        update(Booking)
+        .where(Booking.id.in_(booking_ids))
+        .values(reminder_sent_at=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+class BookingReminderJob:
+    """Streams due bookings and reminds their customers chunk by chunk"""
+
+    def __init__(self, session_factory=AsyncSessionLocal, senders: Optional[list] = None, clock=datetime.now):
+        self.session_factory = session_factory
+        self._senders = {sender.channel: sender for sender in senders} if senders is not None else None
+        self.clock = clock
+        self.lead_time = timedelta(hours=settings.BOOKING_REMINDER_LEAD_HOURS)
+        self.chunk_size = settings.BOOKING_REMINDER_CHUNK_SIZE
+        self.concurrency = settings.BOOKING_REMINDER_CONCURRENCY
+        self.channels = [channel.strip() for channel in settings.BOOKING_REMINDER_CHANNELS.split(",") if channel.strip()]
+        self._pool: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Task] = None
+        self.counters = {"reminded": 0, "retried": 0, "failed": 0, "no_contact": 0}
+
+    @property
+    def senders(self) -> Dict[str, Any]:
+        if self._senders is None:
+            # Shared with campaigns so both stay under one rate limit per provider
+            from services.campaign_dispatch import campaign_dispatcher
+            return campaign_dispatcher.senders
+        return self._senders
+
+    def available_channels(self) -> List[str]:
+        return [
+            channel for channel in self.channels
+            if channel in self.senders and self.senders[channel].available()
+        ]
+
+    async def _send(self, sender, send):
+        """One rate-limited provider call; returns the error or None"""
+        await sender.bucket.acquire()
+        async with self._pool:
+            try:
+                await send()
+            except SEND_ERRORS as e:
+                return e
+        return None
+
+    async def send_reminder(self, reminder: DueReminder, today: date, channels: List[str]) -> Dict[str, Any]:
+        """Send one booking's reminder on every channel it has an address for; returns channel -> error"""
+        payload = render_email("send_booking_reminder", reminder.booking_data(today))[0]
+        sends = {}
+        if "email" in channels and reminder.customer_email:
+            email = self.senders["email"]
+            sends["email"] = self._send(email, lambda: email.client.send(payload))
+        if "whatsapp" in channels and reminder.customer_phone:
+            whatsapp = self.senders["whatsapp"]
+            sends["whatsapp"] = self._send(
+                whatsapp, lambda: whatsapp.send_text(reminder.customer_phone, payload["textContent"])
+            )
+        errors = await asyncio.gather(*sends.values())
+        return dict(zip(sends, errors))
+
+    async def remind_chunk(self, reminders: List[DueReminder], now: datetime, channels: List[str]) -> int:
+        """Mark, send and (for retryable failures) unmark one chunk; returns the number of bookings reminded"""
+        if self._pool is None:
+            self._pool = asyncio.Semaphore(self.concurrency)
+
+        async with self.session_factory() as db:
+            result = await db.execute(mark_statement([reminder.id for reminder in reminders], datetime.now(timezone.utc)))
+            marked = set(result.scalars().all())
+            await db.commit()
+        reminders = [reminder for reminder in reminders if reminder.id in marked]
+        if not reminders:
+            return 0
+
+        outcomes = await asyncio.gather(*(self.send_reminder(reminder, now.date(), channels) for reminder in reminders))
+        retry = []
+        reminded = 0
+        for reminder, errors in zip(reminders, outcomes):
+            if not errors:
+                self.counters["no_contact"] += 1
+            elif any(error is None for error in errors.values()):
+                reminded += 1
+            elif all(error.retryable for error in errors.values()):
+                retry.append(reminder.id)
+                logger.warning("Booking %s reminder failed, retrying next round: %s", reminder.id, errors)
+            else:
+                self.counters["failed"] += 1
+                logger.error("Booking %s reminder failed: %s", reminder.id, errors)
+        if retry:
+            async with self.session_factory() as db:
+                await db.execute(unmark_statement(retry))
+                await db.commit()
+        self.counters["reminded"] += reminded
+        self.counters["retried"] += len(retry)
+        return reminded
+
+    async def run_once(self) -> int:
+        """Remind every booking due in the lead time window; returns the number of bookings reminded"""
+        channels = self.available_channels()
+        if not channels:
+            return 0
+        now = self.clock()
+        statement = due_bookings_statement(now, now + self.lead_time).execution_options(yield_per=self.chunk_size)
+        reminded = 0
+        async with self.session_factory() as db:
+            result = await db.stream(statement)
+            async for rows in result.partitions():
+                reminded += await self.remind_chunk([DueReminder.from_row(row) for row in rows], now, channels)
+        return reminded
+
+    async def run(self) -> None:
+        channels = self.available_channels()
+        if not channels:
+            # Without a provider every due booking would be marked as reminded
+            logger.warning("Booking reminder job not started: no email or WhatsApp provider is configured")
+            return
+        logger.info(
+            "Booking reminder job started (lead time %s, channels %s, chunk %s)",
+            self.lead_time, ", ".join(channels), self.chunk_size,
+        )
+        while True:
+            try:
+                reminded = await self.run_once()
+                if reminded:
+                    logger.info("Sent %s booking reminders", reminded)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Booking reminder round failed: %s", e, exc_info=True)
+            await asyncio.sleep(settings.BOOKING_REMINDER_POLL_SECONDS)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {"running": self._task is not None, **self.counters}
+
+
+booking_reminder_job = BookingReminderJob()
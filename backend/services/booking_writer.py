@@ -0,0 +1,146 @@
+"""
+Booking persistence shared by the public and owner booking endpoints.
+
+Validation reads are set-based (one join for every requested service) and the
+booking plus its BookingService rows are written in a single transaction with
+one commit. The customer's user account is linked inside the booking INSERT
+through a scalar subquery instead of a separate lookup.
+
+Double bookings are ultimately prevented by the ex_bookings_employee_overlap
+exclusion constraint on bookings: two active (pending/confirmed) bookings of
+the same employee cannot have overlapping [start, start + duration) ranges.
+The read-based precheck in the endpoints gives fast feedback; the constraint
+settles races between concurrent requests, surfacing as BookingConflictError.
+save_booking stores the resolved duration (the place's slot size when the
+services add up to nothing), so the constraint's range always matches the one
+the availability engine checks.
+"""
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.place_existing import Booking, BookingService, PlaceService, Service
+from models.user import User
+from services.availability_engine import DEFAULT_SLOT_MINUTES
+
+BOOKING_OVERLAP_CONSTRAINT = "ex_bookings_employee_overlap"
+EXCLUSION_VIOLATION = "23P01"
+
+
+class BookingConflictError(Exception):
+    """The employee already has an active booking overlapping the requested time"""
+
+    def __init__(self, message: str = "Employee is already booked at this time"):
+        super().__init__(message)
+
+
+def is_booking_conflict(error: IntegrityError) -> bool:
+    """Whether an IntegrityError was raised by the booking overlap constraint"""
+    orig = getattr(error, "orig", None)
+    if getattr(orig, "sqlstate", None) == EXCLUSION_VIOLATION or getattr(orig, "pgcode", None) == EXCLUSION_VIOLATION:
+        return True
+    return BOOKING_OVERLAP_CONSTRAINT in str(orig if orig is not None else error)
+
+
+def _place_services_query(place_id: int):
+    return (
+        select(PlaceService, Service)
+        .join(Service, Service.id == PlaceService.service_id)
+        .where(PlaceService.place_id == place_id)
+    )
+
+
+async def load_services_by_place_service_id(
+    db: AsyncSession, place_id: int, place_service_ids: Iterable[int]
+) -> Dict[int, Tuple[PlaceService, Service]]:
+    """Available place services of a place keyed by PlaceService.id, in one query"""
+    result = await db.execute(
+        _place_services_query(place_id).where(
+            PlaceService.id.in_(set(place_service_ids)),
+            PlaceService.is_available == True
+        )
+    )
+    return {place_service.id: (place_service, service) for place_service, service in result.all()}
+
+
+async def load_services_by_service_id(
+    db: AsyncSession, place_id: int, service_ids: Iterable[int]
+) -> Dict[int, Tuple[PlaceService, Service]]:
+    """Place services of a place keyed by Service.id, in one query"""
+    result = await db.execute(
+        _place_services_query(place_id).where(PlaceService.service_id.in_(set(service_ids)))
+    )
+    return {service.id: (place_service, service) for place_service, service in result.all()}
+
+
+def user_id_for_email(email: str):
+    """
+    Scalar subquery resolving a registered user's id from an email (NULL if none).
+
+    Assigned to Booking.user_id it is evaluated inside the INSERT; the attribute
+    is left unloaded afterwards, so refresh the booking before reading it.
+    """
+    return select(User.id).where(User.email == email).limit(1).scalar_subquery()
+
+
+async def save_booking(
+    db: AsyncSession, booking: Booking, services: List[dict], slot_minutes: int = DEFAULT_SLOT_MINUTES
+) -> Booking:
+    """
+    Insert a booking and its BookingService rows, then commit once.
+
+    Args:
+        booking: Unsaved Booking
+        services: Dicts with service_id, service_name, service_price, service_duration
+        slot_minutes: The place's slot size (place_slot_minutes), stored as the
+            duration when the booking has none
+
+    Returns:
+        The saved booking (id populated)
+
+    Raises:
+        BookingConflictError: The employee is already booked in an overlapping range
+    """
+    if not (booking.total_duration or booking.duration):
+        booking.duration = slot_minutes
+    try:
+        db.add(booking)
+        await db.flush()  # Get the booking ID
+        db.add_all([
+            BookingService(
+                booking_id=booking.id,
+                service_id=service['service_id'],
+                service_name=service['service_name'],
+                service_price=service['service_price'],
+                service_duration=service['service_duration']
+            )
+            for service in services
+        ])
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if is_booking_conflict(e):
+            raise BookingConflictError() from e
+        raise
+    except Exception:
+        await db.rollback()
+        raise
+    return booking
+
+
+async def commit_booking(db: AsyncSession) -> None:
+    """
+    Commit changes to an existing booking (time, employee or status).
+
+    Raises:
+        BookingConflictError: The change would overlap another active booking
+    """
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if is_booking_conflict(e):
+            raise BookingConflictError() from e
+        raise
@@ -0,0 +1,487 @@
+"""
+Campaign dispatch: sends a messaging campaign to its pending recipients from
+an asyncio task, so neither the owner route nor the campaign scheduler waits
+on the providers.
+
+    campaign_dispatcher.start(campaign_id, contents)   # background
+    await campaign_dispatcher.dispatch(campaign_id, contents)
+
+Each provider has a token bucket (CAMPAIGN_EMAIL_RATE_PER_SECOND,
+CAMPAIGN_WHATSAPP_RATE_PER_SECOND) and all sends share a pool of
+CAMPAIGN_DISPATCH_CONCURRENCY in-flight requests. Recipients are claimed in
+chunks of CAMPAIGN_DISPATCH_CHUNK_SIZE (pending -> sending, SKIP LOCKED) and
+each chunk's results are written back with one bulk UPDATE. That write is the
+checkpoint: a restarted dispatch carries on with the rows still pending, and
+rows left in "sending" for CAMPAIGN_DISPATCH_LOCK_SECONDS are claimed again.
+
+Email goes through BrevoAsyncClient (see services/email_outbox.py) as
+messageVersions batches of BREVO_BATCH_SIZE recipients per request, so the
+email rate limit counts requests. Content may use {{params.name}} and
+{{params.email}}: Brevo fills them in for batches, single sends render them
+from the compiled campaign template (services/email_templates.py). A batch
+Brevo rejects outright (4xx) is retried one recipient at a time to isolate the
+bad address. WhatsApp goes through Twilio's Messages API over httpx.
+"""
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+from sqlalchemy import and_, func, or_, select, update
+
+from core.config import settings
+from core.database import AsyncSessionLocal
+from models.campaign import CampaignRecipient
+from models.user import User
+from services.email_outbox import BrevoAsyncClient, EmailSendError, backoff_seconds
+from services.email_templates import campaign_template
+
+logger = logging.getLogger(__name__)
+
+
+class WhatsAppSendError(Exception):
+    """Twilio failure; retryable errors are attempted again"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+SEND_ERRORS = (EmailSendError, WhatsAppSendError)
+
+
+class TokenBucket:
+    """Async token bucket: `rate` sends per second with up to `burst` banked (rate <= 0 disables it)"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = max(burst or int(rate), 1)
+        self.tokens = float(self.capacity)
+        self.clock = clock
+        self.updated = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def to_e164(phone: Optional[str]) -> Optional[str]:
+    """Phone number in the E.164 form Twilio expects, or None"""
+    if not phone:
+        return None
+    cleaned = re.sub(r"[^\d+]", "", phone)
+    if not cleaned.startswith("+"):
+        cleaned = "+" + cleaned
+    return cleaned if re.match(r"^\+[1-9]\d{6,14}$", cleaned) else None
+
+
+@dataclass
+class CampaignContent:
+    """One CampaignMessage, detached from the session"""
+    campaign_id: int
+    channel: str
+    subject: str
+    body: str
+
+
+@dataclass
+class DispatchRecipient:
+    id: int
+    email: Optional[str]
+    phone: Optional[str]
+    name: Optional[str] = None
+
+
+class CampaignEmailSender:
+    channel = "email"
+
+    def __init__(self, client: BrevoAsyncClient, rate: float, burst: Optional[int] = None, batch_size: int = 1):
+        self.client = client
+        self.bucket = TokenBucket(rate, burst)
+        self.batch_size = batch_size
+        self._brevo = None
+
+    def _templates(self):
+        if self._brevo is None:
+            from brevo_email_service import BrevoEmailService
+            self._brevo = BrevoEmailService()
+        return self._brevo
+
+    def available(self) -> bool:
+        return bool(self.client.api_key)
+
+    def address(self, recipient: DispatchRecipient) -> Optional[str]:
+        return recipient.email or None
+
+    async def send(self, address: str, content: CampaignContent, params: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        params = params or {}
+        return await self.client.send({
+            "sender": {"email": settings.BREVO_SENDER_EMAIL, "name": settings.BREVO_SENDER_NAME},
+            "to": [{"email": address}],
+            "subject": campaign_template(content.subject).render(params),
+            "htmlContent": campaign_template(content.body, escape=True).render(params),
+            "tags": [f"campaign-{content.campaign_id}"],
+        })
+
+    async def send_batch(self, recipients: List[DispatchRecipient], content: CampaignContent) -> List[Optional[str]]:
+        """One messageVersions request for the recipients; returns their message ids in order"""
+        brevo = self._templates()
+        payload = brevo.build_batch_payload(
+            content.subject,
+            content.body,
+            [brevo.campaign_version(recipient.email, recipient.name) for recipient in recipients],
+            tags=[f"campaign-{content.campaign_id}"],
+        )
+        return await self.client.send_batch(payload)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+class CampaignWhatsAppSender:
+    """Twilio Messages API (POST /2010-04-01/Accounts/{sid}/Messages.json) over a pooled httpx client"""
+
+    channel = "whatsapp"
+
+    def __init__(self, base_url: str, account_sid: str, auth_token: str, from_number: str,
+                 rate: float, burst: Optional[int] = None, max_connections: int = 10, timeout: float = 10,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.base_url = base_url.rstrip("/") + "/"
+        self.account_sid = account_sid
+        self.auth_token = auth_token
+        self.from_number = from_number if from_number.startswith("whatsapp:") else f"whatsapp:{from_number}"
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.transport = transport
+        self.bucket = TokenBucket(rate, burst)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def available(self) -> bool:
+        return bool(self.account_sid and self.auth_token and self.from_number != "whatsapp:")
+
+    def address(self, recipient: DispatchRecipient) -> Optional[str]:
+        return recipient.phone or None
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                auth=(self.account_sid, self.auth_token),
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                timeout=self.timeout,
+                transport=self.transport,
+            )
+        return self._client
+
+    async def send(self, address: str, content: CampaignContent, params: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        return await self.send_text(address, campaign_template(content.body).render(params or {}))
+
+    async def send_text(self, address: str, body: str) -> Optional[str]:
+        """Send an already rendered message; returns the Twilio message sid"""
+        phone = to_e164(address)
+        if not phone:
+            raise WhatsAppSendError("Invalid phone number format", retryable=False)
+        if len(body) > 1600:
+            raise WhatsAppSendError("Message too long (max 1600 characters)", retryable=False)
+        try:
+            response = await self._http().post(
+                f"2010-04-01/Accounts/{self.account_sid}/Messages.json",
+                data={"From": self.from_number, "To": f"whatsapp:{phone}", "Body": body},
+            )
+        except httpx.HTTPError as e:
+            raise WhatsAppSendError(f"{type(e).__name__}: {e}")
+        if response.status_code in (200, 201):
+            return response.json().get("sid")
+        retryable = response.status_code == 429 or response.status_code >= 500
+        raise WhatsAppSendError(f"HTTP {response.status_code}: {response.text[:500]}", retryable=retryable)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+@dataclass
+class CampaignProgress:
+    campaign_id: int
+    total: int = 0
+    sent: int = 0
+    failed: int = 0
+    channels: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self.finished_at is None
+
+    @property
+    def per_second(self) -> float:
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return (self.sent + self.failed) / elapsed if elapsed > 0 else 0.0
+
+    def record(self, rows: List[Dict[str, Any]], outcomes: List[Dict[str, bool]]) -> None:
+        for row in rows:
+            if row["status"] == "sent":
+                self.sent += 1
+            else:
+                self.failed += 1
+        for recipient_outcomes in outcomes:
+            for channel, ok in recipient_outcomes.items():
+                counts = self.channels.setdefault(channel, {"sent": 0, "failed": 0})
+                counts["sent" if ok else "failed"] += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "campaign_id": self.campaign_id,
+            "running": self.running,
+            "total": self.total,
+            "sent_count": self.sent,
+            "failed_count": self.failed,
+            "pending_count": max(self.total - self.sent - self.failed, 0),
+            "channel_results": self.channels,
+            "elapsed_seconds": round((self.finished_at or time.monotonic()) - self.started_at, 2),
+            "per_second": round(self.per_second, 2),
+            "error": self.error,
+        }
+
+
+def _due_recipients(campaign_id: int, now: datetime, lock_seconds: float):
+    return and_(
+        CampaignRecipient.campaign_id == campaign_id,
+        or_(
+            CampaignRecipient.status == "pending",
+            and_(
+                CampaignRecipient.status == "sending",
+                CampaignRecipient.updated_at < now - timedelta(seconds=lock_seconds),
+            ),
+        ),
+    )
+
+
+def claim_recipients_statement(campaign_id: int, now: datetime, chunk_size: int, lock_seconds: float):
+    """Mark the next chunk of a campaign's due recipients as sending"""
+    due = (
+        select(CampaignRecipient.id)
+        .where(_due_recipients(campaign_id, now, lock_seconds))
+        .order_by(CampaignRecipient.id)
+        .limit(chunk_size)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(CampaignRecipient)
+        .where(CampaignRecipient.id.in_(due.scalar_subquery()))
+        .values(status="sending", updated_at=now)
+        .returning(
+            CampaignRecipient.id,
+            CampaignRecipient.customer_email,
+            CampaignRecipient.customer_phone,
+            select(User.name).where(User.id == CampaignRecipient.user_id).scalar_subquery().label("customer_name"),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+class CampaignDispatcher:
+    """Sends campaigns chunk by chunk under per-provider rate limits"""
+
+    def __init__(self, session_factory=AsyncSessionLocal, senders: Optional[list] = None):
+        self.session_factory = session_factory
+        self.senders = {sender.channel: sender for sender in (senders if senders is not None else self._default_senders())}
+        self.concurrency = settings.CAMPAIGN_DISPATCH_CONCURRENCY
+        self.chunk_size = settings.CAMPAIGN_DISPATCH_CHUNK_SIZE
+        self.max_attempts = settings.CAMPAIGN_DISPATCH_MAX_ATTEMPTS
+        self._pool: Optional[asyncio.Semaphore] = None
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self.progress: Dict[int, CampaignProgress] = {}
+
+    @staticmethod
+    def _default_senders() -> list:
+        return [
+            CampaignEmailSender(
+                BrevoAsyncClient(
+                    settings.BREVO_API_BASE_URL,
+                    settings.BREVO_API_KEY,
+                    max_connections=settings.CAMPAIGN_DISPATCH_CONCURRENCY,
+                    timeout=settings.BREVO_HTTP_TIMEOUT_SECONDS,
+                ),
+                settings.CAMPAIGN_EMAIL_RATE_PER_SECOND,
+                settings.CAMPAIGN_EMAIL_BURST,
+                batch_size=settings.BREVO_BATCH_SIZE,
+            ),
+            CampaignWhatsAppSender(
+                settings.TWILIO_API_BASE_URL,
+                settings.TWILIO_ACCOUNT_SID,
+                settings.TWILIO_AUTH_TOKEN,
+                settings.TWILIO_WHATSAPP_NUMBER,
+                settings.CAMPAIGN_WHATSAPP_RATE_PER_SECOND,
+                settings.CAMPAIGN_WHATSAPP_BURST,
+                max_connections=settings.CAMPAIGN_DISPATCH_CONCURRENCY,
+            ),
+        ]
+
+    def available_channels(self) -> List[str]:
+        return [channel for channel, sender in self.senders.items() if sender.available()]
+
+    def is_running(self, campaign_id: int) -> bool:
+        task = self._tasks.get(campaign_id)
+        return task is not None and not task.done()
+
+    async def _attempt(self, sender, send):
+        """Run one provider call with rate limiting and retries; returns (result, error text)"""
+        for attempt in range(1, self.max_attempts + 1):
+            await sender.bucket.acquire()
+            async with self._pool:
+                try:
+                    return await send(), None
+                except SEND_ERRORS as e:
+                    error = e
+            if not error.retryable or attempt == self.max_attempts:
+                return None, error
+            await asyncio.sleep(backoff_seconds(
+                attempt, settings.CAMPAIGN_DISPATCH_RETRY_SECONDS, settings.CAMPAIGN_DISPATCH_RETRY_MAX_SECONDS
+            ))
+
+    async def _send_one(self, sender, recipient: DispatchRecipient, content: CampaignContent) -> Optional[str]:
+        params = {"name": recipient.name or "", "email": recipient.email or ""}
+        _, error = await self._attempt(sender, lambda: sender.send(sender.address(recipient), content, params))
+        return str(error) if error else None
+
+    async def _send_batch(self, sender, batch: List[DispatchRecipient], content: CampaignContent) -> List[Optional[str]]:
+        _, error = await self._attempt(sender, lambda: sender.send_batch(batch, content))
+        if error is None:
+            return [None] * len(batch)
+        if not error.retryable and len(batch) > 1:
+            # One bad address fails the whole request; find it by sending individually
+            logger.warning("Campaign %s batch of %s rejected, sending individually: %s", content.campaign_id, len(batch), error)
+            errors = await asyncio.gather(*(self._send_batch(sender, [recipient], content) for recipient in batch))
+            return [recipient_errors[0] for recipient_errors in errors]
+        return [str(error)] * len(batch)
+
+    async def _send_content(self, recipients: List[DispatchRecipient], content: CampaignContent) -> Dict[int, Optional[str]]:
+        """Send one campaign message to the recipients that have an address for its channel"""
+        sender = self.senders[content.channel]
+        targets = [recipient for recipient in recipients if sender.address(recipient)]
+        if getattr(sender, "batch_size", 1) > 1:
+            batches = [targets[i:i + sender.batch_size] for i in range(0, len(targets), sender.batch_size)]
+            errors = await asyncio.gather(*(self._send_batch(sender, batch, content) for batch in batches))
+            return {recipient.id: error for batch, batch_errors in zip(batches, errors) for recipient, error in zip(batch, batch_errors)}
+        errors = await asyncio.gather(*(self._send_one(sender, recipient, content) for recipient in targets))
+        return {recipient.id: error for recipient, error in zip(targets, errors)}
+
+    async def send_chunk(self, recipients: List[DispatchRecipient], contents: List[CampaignContent]):
+        """Send every content to every recipient; returns (row updates, per-recipient channel outcomes)"""
+        if self._pool is None:
+            self._pool = asyncio.Semaphore(self.concurrency)
+
+        results = await asyncio.gather(*(self._send_content(recipients, content) for content in contents))
+        now = datetime.now(timezone.utc)
+        rows, outcomes = [], []
+        for recipient in recipients:
+            channel_errors = {
+                content.channel: errors[recipient.id]
+                for content, errors in zip(contents, results) if recipient.id in errors
+            }
+            sent = any(error is None for error in channel_errors.values())
+            messages = [f"{channel}: {error}" for channel, error in channel_errors.items() if error]
+            if not channel_errors:
+                messages.append("No contact details for the campaign channels")
+            rows.append({
+                "id": recipient.id,
+                "status": "sent" if sent else "failed",
+                "sent_at": now if sent else None,
+                "delivery_status": ",".join(
+                    f"{channel}:{'failed' if error else 'sent'}" for channel, error in channel_errors.items()
+                )[:50] or None,
+                "error_message": "; ".join(messages) or None,
+                "updated_at": now,
+            })
+            outcomes.append({channel: error is None for channel, error in channel_errors.items()})
+        return rows, outcomes
+
+    async def dispatch(self, campaign_id: int, contents: List[CampaignContent]) -> CampaignProgress:
+        """Send the campaign to all due recipients, checkpointing after every chunk"""
+        contents = [content for content in contents if content.channel in self.available_channels()]
+        progress = self.progress[campaign_id] = CampaignProgress(campaign_id)
+        lock_seconds = settings.CAMPAIGN_DISPATCH_LOCK_SECONDS
+        try:
+            async with self.session_factory() as db:
+                progress.total = await db.scalar(
+                    select(func.count(CampaignRecipient.id))
+                    .where(_due_recipients(campaign_id, datetime.now(timezone.utc), lock_seconds))
+                ) or 0
+            while contents:
+                async with self.session_factory() as db:
+                    result = await db.execute(claim_recipients_statement(
+                        campaign_id, datetime.now(timezone.utc), self.chunk_size, lock_seconds
+                    ))
+                    chunk = [
+                        DispatchRecipient(row.id, row.customer_email, row.customer_phone, row.customer_name)
+                        for row in result
+                    ]
+                    await db.commit()
+                if not chunk:
+                    break
+                rows, outcomes = await self.send_chunk(chunk, contents)
+                async with self.session_factory() as db:
+                    # Checkpoint: ORM bulk UPDATE by primary key, one executemany per chunk
+                    await db.execute(update(CampaignRecipient), rows)
+                    await db.commit()
+                progress.record(rows, outcomes)
+                logger.info(
+                    "Campaign %s: %s/%s processed, %.1f/s",
+                    campaign_id, progress.sent + progress.failed, progress.total, progress.per_second
+                )
+        except asyncio.CancelledError:
+            progress.error = "cancelled"
+            raise
+        except Exception as e:
+            progress.error = str(e)
+            logger.error("Campaign %s dispatch stopped: %s", campaign_id, e, exc_info=True)
+        finally:
+            progress.finished_at = time.monotonic()
+        logger.info(
+            "Campaign %s dispatch finished: sent %s, failed %s, %.1f/s",
+            campaign_id, progress.sent, progress.failed, progress.per_second
+        )
+        return progress
+
+    def start(self, campaign_id: int, contents: List[CampaignContent]) -> bool:
+        """Dispatch in the background; False if this campaign is already being sent"""
+        if self.is_running(campaign_id):
+            return False
+        self._tasks[campaign_id] = asyncio.create_task(self.dispatch(campaign_id, contents))
+        return True
+
+    def status(self, campaign_id: int) -> Optional[dict]:
+        progress = self.progress.get(campaign_id)
+        return progress.as_dict() if progress else None
+
+    async def stop(self) -> None:
+        """Cancel running dispatches (their claimed rows are picked up again after the lock expires)"""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        for sender in self.senders.values():
+            await sender.aclose()
+
+
+campaign_dispatcher = CampaignDispatcher()
@@ -0,0 +1,244 @@
+"""
+In-memory campaign applicability index.
+
+Maps place_id -> active campaigns (with start/end parsed once) so public
+endpoints no longer load every active campaign platform-wide and probe
+CampaignPlace once per campaign.
+
+The index is built with three queries (campaigns, campaign places, campaign
+services) and kept current incrementally: owner campaign create/update calls
+refresh_campaign(), delete calls remove_campaign(), and expired campaigns are
+pruned on lookup. Each worker holds its own index, so it is also rebuilt every
+CAMPAIGN_INDEX_REFRESH_SECONDS to pick up changes made by other workers or by
+the campaign scheduler.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from models.campaign import Campaign, CampaignPlace, CampaignService, parse_campaign_datetime
+
+
+@dataclass
+class CampaignEntry:
+    """Snapshot of an active campaign and what it applies to"""
+    id: int
+    name: str
+    type: str
+    status: str
+    config: dict
+    start_datetime: Optional[datetime] = None  # naive UTC
+    end_datetime: Optional[datetime] = None  # naive UTC
+    place_ids: FrozenSet[int] = frozenset()
+    # (service_id, place_service_id) pairs; empty means every service
+    service_targets: Tuple[Tuple[int, Optional[int]], ...] = ()
+
+    @classmethod
+    def from_campaign(cls, campaign: Campaign, place_ids=(), service_targets=()) -> "CampaignEntry":
+        config = campaign.config or {}
+        start = getattr(campaign, 'start_datetime', None)
+        end = getattr(campaign, 'end_datetime', None)
+        if (start is None or end is None) and 'start_datetime' in config and 'end_datetime' in config:
+            # Row written before the window columns existed
+            try:
+                start = parse_campaign_datetime(config['start_datetime'])
+                end = parse_campaign_datetime(config['end_datetime'])
+            except (ValueError, TypeError):
+                start = end = None
+        return cls(
+            id=campaign.id,
+            name=campaign.name,
+            type=campaign.type,
+            status=campaign.status,
+            config=config,
+            start_datetime=start,
+            end_datetime=end,
+            place_ids=frozenset(place_ids),
+            service_targets=tuple(service_targets),
+        )
+
+    def is_active_at(self, at: datetime) -> bool:
+        """Same rule as Campaign.is_currently_active, evaluated at `at`"""
+        if self.status != 'active':
+            return False
+        if self.start_datetime is None or self.end_datetime is None:
+            return True
+        return self.start_datetime <= at <= self.end_datetime
+
+    def is_expired_at(self, at: datetime) -> bool:
+        return self.end_datetime is not None and self.end_datetime < at
+
+    def applies_to_service(self, service_id: int, place_service_id: Optional[int] = None) -> bool:
+        """Same rule as CampaignService.is_service_eligible_for_campaign"""
+        if not self.service_targets:
+            return True
+        for target_service_id, target_place_service_id in self.service_targets:
+            if target_service_id == service_id:
+                if place_service_id and target_place_service_id:
+                    return target_place_service_id == place_service_id
+                return True
+        return False
+
+
+class CampaignApplicabilityIndex:
+    """place_id -> active campaign entries, refreshed incrementally"""
+
+    def __init__(self, refresh_seconds: float = 60):
+        self.refresh_seconds = refresh_seconds
+        self._entries: Dict[int, CampaignEntry] = {}
+        self._by_place: Dict[int, Set[int]] = {}
+        self._built_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def is_stale(self) -> bool:
+        return self._built_at is None or time.monotonic() - self._built_at > self.refresh_seconds
+
+    async def ensure_fresh(self, db: AsyncSession) -> None:
+        if not self.is_stale():
+            return
+        async with self._lock:
+            if self.is_stale():
+                await self.rebuild(db)
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """Reload every active, unexpired campaign with three queries"""
+        now = datetime.utcnow()
+        campaigns_result = await db.execute(
+            select(Campaign).where(
+                Campaign.status == 'active',
+                or_(Campaign.end_datetime.is_(None), Campaign.end_datetime >= now)
+            )
+        )
+        campaigns = campaigns_result.scalars().all()
+
+        places_result = await db.execute(
+            select(CampaignPlace.campaign_id, CampaignPlace.place_id)
+            .join(Campaign, Campaign.id == CampaignPlace.campaign_id)
+            .where(Campaign.status == 'active')
+        )
+        place_ids_by_campaign: Dict[int, List[int]] = {}
+        for campaign_id, place_id in places_result.all():
+            place_ids_by_campaign.setdefault(campaign_id, []).append(place_id)
+
+        services_result = await db.execute(
+            select(CampaignService.campaign_id, CampaignService.service_id, CampaignService.place_service_id)
+            .join(Campaign, Campaign.id == CampaignService.campaign_id)
+            .where(Campaign.status == 'active')
+        )
+        targets_by_campaign: Dict[int, List[Tuple[int, Optional[int]]]] = {}
+        for campaign_id, service_id, place_service_id in services_result.all():
+            targets_by_campaign.setdefault(campaign_id, []).append((service_id, place_service_id))
+
+        entries: Dict[int, CampaignEntry] = {}
+        by_place: Dict[int, Set[int]] = {}
+        for campaign in campaigns:
+            entry = CampaignEntry.from_campaign(
+                campaign, place_ids_by_campaign.get(campaign.id, ()), targets_by_campaign.get(campaign.id, ())
+            )
+            if entry.is_expired_at(now):
+                continue
+            entries[entry.id] = entry
+            for place_id in entry.place_ids:
+                by_place.setdefault(place_id, set()).add(entry.id)
+
+        self._entries = entries
+        self._by_place = by_place
+        self._built_at = time.monotonic()
+
+    async def refresh_campaign(self, db: AsyncSession, campaign_id: int) -> None:
+        """Re-read a single campaign after it was created or updated"""
+        result = await db.execute(select(Campaign).where(Campaign.id == campaign_id))
+        campaign = result.scalar_one_or_none()
+        if campaign is None or campaign.status != 'active':
+            self.remove_campaign(campaign_id)
+            return
+
+        places_result = await db.execute(
+            select(CampaignPlace.place_id).where(CampaignPlace.campaign_id == campaign_id)
+        )
+        services_result = await db.execute(
+            select(CampaignService.service_id, CampaignService.place_service_id)
+            .where(CampaignService.campaign_id == campaign_id)
+        )
+        entry = CampaignEntry.from_campaign(
+            campaign, places_result.scalars().all(), [tuple(row) for row in services_result.all()]
+        )
+        self.put(entry)
+
+    def put(self, entry: CampaignEntry) -> None:
+        self.remove_campaign(entry.id)
+        if entry.is_expired_at(datetime.utcnow()):
+            return
+        self._entries[entry.id] = entry
+        for place_id in entry.place_ids:
+            self._by_place.setdefault(place_id, set()).add(entry.id)
+
+    def remove_campaign(self, campaign_id: int) -> None:
+        entry = self._entries.pop(campaign_id, None)
+        if entry is None:
+            return
+        for place_id in entry.place_ids:
+            campaign_ids = self._by_place.get(place_id)
+            if campaign_ids is not None:
+                campaign_ids.discard(campaign_id)
+                if not campaign_ids:
+                    del self._by_place[place_id]
+
+    def campaigns_for_place(
+        self, place_id: int, at: Optional[datetime] = None, include_scheduled: bool = False
+    ) -> List[CampaignEntry]:
+        """
+        Campaigns applying to a place at `at` (default now), ordered by id.
+
+        With include_scheduled, active campaigns that have not started yet are
+        listed too (every unexpired campaign of the place).
+        """
+        now = datetime.utcnow()
+        at = at or now
+        active = []
+        for campaign_id in sorted(self._by_place.get(place_id, ())):
+            entry = self._entries[campaign_id]
+            if entry.is_expired_at(now):
+                self.remove_campaign(campaign_id)
+            elif include_scheduled or entry.is_active_at(at):
+                active.append(entry)
+        return active
+
+    def campaigns_for_service(
+        self,
+        place_id: int,
+        service_id: int,
+        place_service_id: Optional[int] = None,
+        at: Optional[datetime] = None
+    ) -> List[CampaignEntry]:
+        """Campaigns applying to a place service at `at` (default now)"""
+        return [
+            entry for entry in self.campaigns_for_place(place_id, at)
+            if entry.applies_to_service(service_id, place_service_id)
+        ]
+
+    async def for_place(
+        self, db: AsyncSession, place_id: int, at: Optional[datetime] = None, include_scheduled: bool = False
+    ) -> List[CampaignEntry]:
+        await self.ensure_fresh(db)
+        return self.campaigns_for_place(place_id, at, include_scheduled)
+
+    async def for_service(
+        self,
+        db: AsyncSession,
+        place_id: int,
+        service_id: int,
+        place_service_id: Optional[int] = None,
+        at: Optional[datetime] = None
+    ) -> List[CampaignEntry]:
+        await self.ensure_fresh(db)
+        return self.campaigns_for_service(place_id, service_id, place_service_id, at)
+
+
+campaign_index = CampaignApplicabilityIndex(refresh_seconds=settings.CAMPAIGN_INDEX_REFRESH_SECONDS)
@@ -0,0 +1,143 @@
+"""
+Batch campaign pricing engine.
+
+Prices every service of a place against every applicable campaign in one
+vectorized pass: services form the rows and campaigns the columns of an
+eligibility matrix, candidate prices are computed for all pairs with NumPy,
+and the cheapest valid candidate per service wins. Campaigns are not stacked.
+
+Price campaigns:
+    price_reduction  - config discount_type 'percentage' or 'fixed_amount'
+    free_service     - 'specific_free' makes the service free; 'buy_x_get_y'
+                       does not change the unit price and is not applied here
+Rewards campaigns (rewards_increase) do not change the price; the highest
+eligible multiplier and bonus points are reported per service.
+"""
+from decimal import Decimal
+from typing import List, Sequence
+
+import numpy as np
+
+from schemas.campaign import ServicePriceCalculation
+from services.campaign_index import CampaignEntry
+
+CENTS = Decimal('0.01')
+
+
+def _to_decimal(value: float) -> Decimal:
+    return Decimal(str(round(float(value), 2))).quantize(CENTS)
+
+
+def eligibility_matrix(place_services: Sequence, campaigns: Sequence[CampaignEntry]) -> np.ndarray:
+    """
+    Boolean (services x campaigns) matrix of which campaign applies to which
+    place service. A campaign without service targets applies to every service;
+    a target with a place_service_id only matches that place service.
+    """
+    service_ids = np.array([ps.service_id for ps in place_services], dtype=np.int64)
+    place_service_ids = np.array([ps.id for ps in place_services], dtype=np.int64)
+    eligible = np.zeros((len(place_services), len(campaigns)), dtype=bool)
+
+    for col, campaign in enumerate(campaigns):
+        if not campaign.service_targets:
+            eligible[:, col] = True
+            continue
+        targets = np.array(
+            [(sid, -1 if psid is None else psid) for sid, psid in campaign.service_targets], dtype=np.int64
+        )
+        # (services x targets) match on service, then on place service when the target names one
+        same_service = service_ids[:, None] == targets[None, :, 0]
+        same_place_service = (targets[None, :, 1] == -1) | (place_service_ids[:, None] == targets[None, :, 1])
+        eligible[:, col] = (same_service & same_place_service).any(axis=1)
+
+    return eligible
+
+
+def price_services(place_services: Sequence, campaigns: Sequence[CampaignEntry]) -> List[ServicePriceCalculation]:
+    """
+    Compute the cheapest price per place service across all campaigns.
+
+    Args:
+        place_services: PlaceService rows (id, service_id, price); rows without a price are skipped
+        campaigns: Campaigns active for the place
+
+    Returns:
+        One ServicePriceCalculation per priced place service, in input order
+    """
+    priced = [ps for ps in place_services if ps.price]
+    if not priced:
+        return []
+
+    prices = np.array([float(ps.price) for ps in priced], dtype=np.float64)
+    num_campaigns = len(campaigns)
+
+    percent_off = np.zeros(num_campaigns)
+    amount_off = np.zeros(num_campaigns)
+    makes_free = np.zeros(num_campaigns, dtype=bool)
+    is_price_campaign = np.zeros(num_campaigns, dtype=bool)
+    multipliers = np.ones(num_campaigns)
+    bonus_points = np.zeros(num_campaigns, dtype=np.int64)
+
+    for col, campaign in enumerate(campaigns):
+        config = campaign.config or {}
+        if campaign.type == 'price_reduction':
+            value = float(config.get('discount_value') or 0)
+            if config.get('discount_type') == 'percentage':
+                percent_off[col] = min(value, 100.0)
+                is_price_campaign[col] = True
+            elif config.get('discount_type') == 'fixed_amount':
+                amount_off[col] = value
+                is_price_campaign[col] = True
+        elif campaign.type == 'free_service' and config.get('free_service_type') == 'specific_free':
+            makes_free[col] = True
+            is_price_campaign[col] = True
+        elif campaign.type == 'rewards_increase':
+            multipliers[col] = float(config.get('rewards_multiplier') or 1)
+            bonus_points[col] = int(config.get('rewards_bonus_points') or 0)
+
+    eligible = eligibility_matrix(priced, campaigns)
+
+    # Candidate price for every (service, campaign) pair
+    candidates = prices[:, None] * (1 - percent_off[None, :] / 100) - amount_off[None, :]
+    candidates = np.where(makes_free[None, :], 0.0, np.clip(candidates, 0.0, None))
+    candidates = np.where(eligible & is_price_campaign[None, :], candidates, np.inf)
+
+    if num_campaigns:
+        best_col = candidates.argmin(axis=1)
+        best_price = candidates[np.arange(len(priced)), best_col]
+        discounted = best_price < prices
+        final_prices = np.where(discounted, best_price, prices)
+        reward_multiplier = np.where(eligible, multipliers[None, :], 1.0).max(axis=1)
+        reward_bonus = np.where(eligible, bonus_points[None, :], 0).max(axis=1)
+    else:
+        best_col = np.zeros(len(priced), dtype=np.int64)
+        discounted = np.zeros(len(priced), dtype=bool)
+        final_prices = prices
+        reward_multiplier = np.ones(len(priced))
+        reward_bonus = np.zeros(len(priced), dtype=np.int64)
+
+    results = []
+    for row, place_service in enumerate(priced):
+        original = _to_decimal(prices[row])
+        final = _to_decimal(final_prices[row])
+        applied = []
+        is_free = False
+        if discounted[row]:
+            winner = campaigns[int(best_col[row])]
+            applied.append(winner.id)
+            is_free = bool(makes_free[best_col[row]])
+        discount_amount = original - final
+        results.append(ServicePriceCalculation(
+            service_id=place_service.service_id,
+            place_service_id=place_service.id,
+            original_price=original,
+            discounted_price=final,
+            discount_amount=discount_amount,
+            discount_percentage=(discount_amount / original * 100).quantize(CENTS) if original else None,
+            applied_campaigns=applied,
+            is_free=is_free,
+            free_reason='specific_free' if is_free else None,
+            rewards_multiplier=_to_decimal(reward_multiplier[row]) if reward_multiplier[row] != 1 else None,
+            rewards_bonus_points=int(reward_bonus[row]) or None,
+        ))
+    return results
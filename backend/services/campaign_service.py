@@ -37,30 +37,26 @@ class CampaignService:
             .where(
                 and_(
                     CampaignPlace.place_id == place_id,
-                    Campaign.status == 'active'
+                    Campaign.active_at(now)
                 )
             )
         )
         
         result = await self.db.execute(query)
-        campaigns = result.scalars().all()
-        
-        # Filter by timing using the config field
-        active_campaigns = []
-        for campaign in campaigns:
-            if campaign.is_currently_active:
-                active_campaigns.append(campaign)
-        
-        return active_campaigns
+        return result.scalars().all()
     
     async def get_active_campaigns_for_service(
         self, 
         place_id: int, 
         service_id: int, 
-        place_service_id: Optional[int] = None
+        place_service_id: Optional[int] = None,
+        at: Optional[datetime] = None
     ) -> List[Campaign]:
-        """Get active campaigns that apply to a specific service"""
-        now = datetime.utcnow()
+        """
+        Get campaigns that apply to a specific service and whose window
+        contains `at` (naive UTC, defaults to now)
+        """
+        at = at or datetime.utcnow()
         
         # Base query for campaigns affecting this place
         base_query = (
@@ -69,7 +65,7 @@ class CampaignService:
             .where(
                 and_(
                     CampaignPlace.place_id == place_id,
-                    Campaign.status == 'active'
+                    Campaign.running_at(at)
                 )
             )
         )
@@ -100,39 +96,7 @@ class CampaignService:
             )
         
         result = await self.db.execute(service_query)
-        campaigns = result.scalars().all()
-        
-        # Filter by timing using the config field
-        active_campaigns = []
-        from datetime import timezone
-        now = datetime.now(timezone.utc)
-        
-        print(f"DEBUG: Found {len(campaigns)} campaigns for service {service_id} at place {place_id}")
-        print(f"DEBUG: Current time (UTC): {now}")
-        
-        # Filter by timing using the config field
-        for campaign in campaigns:
-            print(f"DEBUG: Checking campaign {campaign.id} - {campaign.name}")
-            if campaign.config and 'start_datetime' in campaign.config and 'end_datetime' in campaign.config:
-                try:
-                    start = datetime.fromisoformat(campaign.config['start_datetime'].replace('Z', '+00:00'))
-                    end = datetime.fromisoformat(campaign.config['end_datetime'].replace('Z', '+00:00'))
-                    
-                    print(f"DEBUG: Campaign {campaign.id} - Start: {start}, End: {end}")
-                    print(f"DEBUG: Campaign {campaign.id} - Is active: {start <= now <= end}")
-                    
-                    # Check if campaign is currently active
-                    if start <= now <= end:
-                        active_campaigns.append(campaign)
-                        print(f"DEBUG: Campaign {campaign.id} added to active campaigns")
-                except (ValueError, TypeError) as e:
-                    print(f"DEBUG: Error parsing campaign {campaign.id} datetime: {e}")
-                    continue
-            else:
-                print(f"DEBUG: Campaign {campaign.id} missing datetime config")
-        
-        print(f"DEBUG: Returning {len(active_campaigns)} active campaigns")
-        return active_campaigns
+        return result.scalars().all()
     
     def calculate_discounted_price(
         self, 
@@ -193,7 +157,7 @@ class CampaignService:
         total_result = await self.db.execute(total_query)
         total_campaigns = len(total_result.scalars().all())
         
-        # Active campaigns (using status and config)
+        # Active, scheduled and expired counts from the campaign window columns
         active_query = select(Campaign).where(
             and_(
                 Campaign.created_by == owner_id,
@@ -203,7 +167,6 @@ class CampaignService:
         active_result = await self.db.execute(active_query)
         all_active_campaigns = active_result.scalars().all()
         
-        # Filter by timing using the config field
         active_campaigns = 0
         scheduled_campaigns = 0
         expired_campaigns = 0
@@ -211,15 +174,11 @@ class CampaignService:
         for campaign in all_active_campaigns:
             if campaign.is_currently_active:
                 active_campaigns += 1
-            elif campaign.config and 'start_datetime' in campaign.config:
-                try:
-                    start = datetime.fromisoformat(campaign.config['start_datetime'].replace('Z', '+00:00'))
-                    if start > now:
-                        scheduled_campaigns += 1
-                    else:
-                        expired_campaigns += 1
-                except (ValueError, TypeError):
-                    pass
+            elif campaign.start_datetime is not None:
+                if campaign.start_datetime > now:
+                    scheduled_campaigns += 1
+                else:
+                    expired_campaigns += 1
         
         # Places affected
         places_query = (
@@ -0,0 +1,366 @@
+"""
+Email outbox: request handlers render an email and queue it in the
+email_outbox table; a background worker delivers queued rows to the Brevo API
+over one pooled, keep-alive httpx.AsyncClient.
+
+    queue_email(db, "send_booking_request_notification", email_data)
+    await save_booking(db, booking, services)   # the email commits with the booking
+
+Delivery runs with bounded concurrency (EMAIL_OUTBOX_CONCURRENCY). Network
+errors, 429 and 5xx responses are retried with exponential backoff and jitter;
+other 4xx responses, or running out of EMAIL_OUTBOX_MAX_ATTEMPTS, dead-letter
+the row (status "dead", last_error kept). Rows are claimed with
+FOR UPDATE SKIP LOCKED, so every API worker can run the loop; rows left in
+"sending" by a crashed worker are reclaimed after EMAIL_OUTBOX_LOCK_SECONDS.
+
+Point BREVO_API_BASE_URL at scripts/brevo_stub.py to run everything offline.
+With EMAIL_OUTBOX_ENABLED=false, queue_email() sends through EmailService in a
+thread once the caller's transaction commits (no retries).
+"""
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+from sqlalchemy import and_, event, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.database import AsyncSessionLocal
+from models.email_outbox import EmailOutbox, EmailOutboxStatus
+
+logger = logging.getLogger(__name__)
+
+# EmailService/BrevoEmailService method -> outbox kind
+EMAIL_KINDS = {
+    "send_booking_request_notification": "booking_request",
+    "send_booking_status_notification": "booking_status",
+    "send_booking_reminder": "booking_reminder",
+    "send_welcome_email": "welcome",
+    "send_password_reset_email": "password_reset",
+}
+
+
+class EmailSendError(Exception):
+    """Delivery failure; retryable errors are attempted again later"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+_renderer = None
+
+
+def _payload_renderer():
+    """BrevoEmailService whose send_transactional_email records the request body instead of posting it"""
+    global _renderer
+    if _renderer is None:
+        from brevo_email_service import BrevoEmailService
+
+        class PayloadRenderer(BrevoEmailService):
+            def __init__(self):
+                super().__init__()
+                self.rendered: List[Dict[str, Any]] = []
+
+            def send_transactional_email(self, to_email, to_name, subject, html_content, text_content=None,
+                                         template_id=None, template_params=None) -> bool:
+                self.rendered.append(self.build_transactional_payload(
+                    to_email, to_name, subject, html_content, text_content, template_id, template_params
+                ))
+                return True
+
+        _renderer = PayloadRenderer()
+    return _renderer
+
+
+def render_email(method: str, *args, **kwargs) -> List[Dict[str, Any]]:
+    """Brevo request bodies produced by a BrevoEmailService template method"""
+    renderer = _payload_renderer()
+    renderer.rendered = []
+    getattr(renderer, method)(*args, **kwargs)
+    return renderer.rendered
+
+
+def queue_email(db: AsyncSession, method: str, *args, **kwargs) -> int:
+    """
+    Render an email with a BrevoEmailService template method and add it to the
+    outbox in the caller's transaction; returns the number of queued messages.
+
+    Nothing is written here: the rows are inserted by the caller's commit, so
+    the email is queued exactly when the change it announces is saved, and the
+    worker is woken once that commit succeeds.
+    """
+    if not settings.EMAIL_OUTBOX_ENABLED:
+        # No outbox table in use: send after the commit instead
+        db.info.setdefault(_DEFERRED_SENDS, []).append((method, args, kwargs))
+        return 1
+
+    payloads = render_email(method, *args, **kwargs)
+    kind = EMAIL_KINDS.get(method, method)
+    for payload in payloads:
+        db.add(EmailOutbox(
+            kind=kind,
+            to_email=payload["to"][0]["email"],
+            payload=payload,
+            max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        ))
+    if payloads:
+        db.info[_QUEUED] = True
+    return len(payloads)
+
+
+_QUEUED = "email_outbox_queued"
+_DEFERRED_SENDS = "email_outbox_deferred_sends"
+_send_tasks = set()
+
+
+def _send_now(method: str, args: tuple, kwargs: dict) -> None:
+    from email_service import EmailService
+    try:
+        getattr(EmailService(), method)(*args, **kwargs)
+    except Exception as e:
+        logger.error("Failed to send %s email: %s", method, e, exc_info=True)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    if session.info.pop(_QUEUED, False):
+        email_outbox_worker.wake()
+    for method, args, kwargs in session.info.pop(_DEFERRED_SENDS, []):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            _send_now(method, args, kwargs)
+            continue
+        # EmailService is blocking; keep it off the event loop
+        task = loop.create_task(asyncio.to_thread(_send_now, method, args, kwargs))
+        _send_tasks.add(task)
+        task.add_done_callback(_send_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    # The queued rows were discarded with the transaction
+    session.info.pop(_QUEUED, None)
+    session.info.pop(_DEFERRED_SENDS, None)
+
+
+class BrevoAsyncClient:
+    """Pooled async client for Brevo's POST /smtp/email"""
+
+    def __init__(self, base_url: str, api_key: str, max_connections: int, timeout: float,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.base_url = base_url.rstrip("/") + "/"
+        self.api_key = api_key
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"api-key": self.api_key, "Accept": "application/json"},
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=60,
+                ),
+                timeout=self.timeout,
+                transport=self.transport,
+            )
+        return self._client
+
+    async def _post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            response = await self._http().post("smtp/email", json=payload)
+        except httpx.HTTPError as e:
+            raise EmailSendError(f"{type(e).__name__}: {e}")
+        if response.status_code in (200, 201, 202):
+            try:
+                return response.json()
+            except ValueError:
+                return {}
+        retryable = response.status_code == 429 or response.status_code >= 500
+        raise EmailSendError(f"HTTP {response.status_code}: {response.text[:500]}", retryable=retryable)
+
+    async def send(self, payload: Dict[str, Any]) -> Optional[str]:
+        """Send one message; returns the provider message id"""
+        return (await self._post(payload)).get("messageId")
+
+    async def send_batch(self, payload: Dict[str, Any]) -> List[Optional[str]]:
+        """Send a messageVersions request; returns one message id per version"""
+        from brevo_email_service import BrevoEmailService
+        return BrevoEmailService.batch_message_ids(await self._post(payload), len(payload["messageVersions"]))
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+@dataclass
+class ClaimedEmail:
+    id: int
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+
+
+def claim_statement(now: datetime, batch_size: int, lock_seconds: float):
+    """Mark a batch of due rows as sending (one UPDATE ... WHERE id IN (SELECT ... SKIP LOCKED))"""
+    due = (
+        select(EmailOutbox.id)
+        .where(or_(
+            and_(EmailOutbox.status == EmailOutboxStatus.PENDING, EmailOutbox.next_attempt_at <= now),
+            and_(
+                EmailOutbox.status == EmailOutboxStatus.SENDING,
+                EmailOutbox.locked_at < now - timedelta(seconds=lock_seconds),
+            ),
+        ))
+        .order_by(EmailOutbox.next_attempt_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(EmailOutbox)
+        .where(EmailOutbox.id.in_(due.scalar_subquery()))
+        .values(status=EmailOutboxStatus.SENDING, locked_at=now, attempts=EmailOutbox.attempts + 1)
+        .returning(EmailOutbox.id, EmailOutbox.payload, EmailOutbox.attempts, EmailOutbox.max_attempts)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def backoff_seconds(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with jitter: base * 2^(attempt - 1), capped, scaled by 0.5-1.0"""
+    return min(cap, base * 2 ** max(attempt - 1, 0)) * (0.5 + random.random() / 2)
+
+
+class EmailOutboxWorker:
+    """Claims due outbox rows and delivers them concurrently"""
+
+    def __init__(self, session_factory=AsyncSessionLocal, client: Optional[BrevoAsyncClient] = None):
+        self.session_factory = session_factory
+        self.client = client or BrevoAsyncClient(
+            settings.BREVO_API_BASE_URL,
+            settings.BREVO_API_KEY,
+            max_connections=settings.EMAIL_OUTBOX_CONCURRENCY,
+            timeout=settings.BREVO_HTTP_TIMEOUT_SECONDS,
+        )
+        self.batch_size = settings.EMAIL_OUTBOX_BATCH_SIZE
+        self.concurrency = settings.EMAIL_OUTBOX_CONCURRENCY
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.counters = {"sent": 0, "retried": 0, "dead": 0}
+
+    def wake(self) -> None:
+        """Start the next round now instead of after the poll interval"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def deliver(self, emails: List[ClaimedEmail], now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Send claimed emails (at most `concurrency` at once); returns the row updates"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def deliver_one(email: ClaimedEmail) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    message_id = await self.client.send(email.payload)
+                    error = None
+                except EmailSendError as e:
+                    message_id, error = None, e
+                except Exception as e:
+                    # A malformed payload or an unexpected client error must not drop the
+                    # batch's updates (rows already sent would be reclaimed and sent again)
+                    logger.error("Email outbox %s failed unexpectedly", email.id, exc_info=True)
+                    message_id, error = None, EmailSendError(f"{type(e).__name__}: {e}", retryable=False)
+            sent_now = now or datetime.now(timezone.utc)
+            row = {
+                "id": email.id, "status": EmailOutboxStatus.SENT, "locked_at": None, "last_error": None,
+                "provider_message_id": message_id, "sent_at": sent_now, "next_attempt_at": sent_now,
+            }
+            if error is None:
+                self.counters["sent"] += 1
+            elif not error.retryable or email.attempts >= email.max_attempts:
+                self.counters["dead"] += 1
+                logger.error("Email outbox %s dead after %s attempts: %s", email.id, email.attempts, error)
+                row.update(status=EmailOutboxStatus.DEAD, last_error=str(error), sent_at=None)
+            else:
+                self.counters["retried"] += 1
+                delay = backoff_seconds(
+                    email.attempts, settings.EMAIL_OUTBOX_BACKOFF_SECONDS, settings.EMAIL_OUTBOX_BACKOFF_MAX_SECONDS
+                )
+                logger.warning("Email outbox %s attempt %s failed, retrying in %.0fs: %s", email.id, email.attempts, delay, error)
+                row.update(
+                    status=EmailOutboxStatus.PENDING, last_error=str(error), sent_at=None,
+                    next_attempt_at=sent_now + timedelta(seconds=delay),
+                )
+            return row
+
+        return await asyncio.gather(*(deliver_one(email) for email in emails))
+
+    async def run_once(self) -> int:
+        """Claim, deliver and record one batch; returns the number of rows handled"""
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as db:
+            result = await db.execute(claim_statement(now, self.batch_size, settings.EMAIL_OUTBOX_LOCK_SECONDS))
+            emails = [ClaimedEmail(row.id, row.payload, row.attempts, row.max_attempts) for row in result]
+            await db.commit()
+        if not emails:
+            return 0
+
+        updates = await self.deliver(emails)
+        async with self.session_factory() as db:
+            # ORM bulk UPDATE by primary key, one executemany for the batch
+            await db.execute(update(EmailOutbox), updates)
+            await db.commit()
+        return len(emails)
+
+    async def run(self) -> None:
+        if not self.client.api_key:
+            # Queued rows stay pending until a key is configured and the worker restarts
+            logger.warning("Email outbox worker not started: BREVO_API_KEY is not configured")
+            return
+        self._wakeup = asyncio.Event()
+        logger.info("Email outbox worker started (%s, concurrency %s)", settings.BREVO_API_BASE_URL, self.concurrency)
+        while True:
+            try:
+                handled = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Email outbox round failed: %s", e, exc_info=True)
+                handled = 0
+            if handled >= self.batch_size:
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.EMAIL_OUTBOX_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.client.aclose()
+
+    def stats(self) -> dict:
+        return {"running": self._task is not None, **self.counters}
+
+
+email_outbox_worker = EmailOutboxWorker()
@@ -0,0 +1,600 @@
+"""
+Email template sources compiled by services/email_templates.py, keyed by
+language then template name.
+
+Placeholders are ${name}. A template's "variants" map a variant (booking
+status, user type) to constants that are folded into the static text when the
+variant is compiled; the placeholders left over are filled on every send.
+Languages without their own entry fall back to DEFAULT_LANGUAGE.
+"""
+
+DEFAULT_LANGUAGE = "en"
+
+_HEAD = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>${title}</title>
+"""
+
+_CLASSIC_STYLE = """
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 600px;
+            margin: 0 auto;
+            padding: 20px;
+        }
+        .header {
+            background-color: #2a2a2e;
+            color: white;
+            padding: 20px;
+            text-align: center;
+            border-radius: 8px 8px 0 0;
+        }
+        .content {
+            background-color: #f9f9f9;
+            padding: 30px;
+            border-radius: 0 0 8px 8px;
+        }
+        .footer {
+            text-align: center;
+            margin-top: 30px;
+            color: #666;
+            font-size: 12px;
+        }
+"""
+
+_BRAND_STYLE = """
+    <style>
+        body {
+            font-family: 'Open Sans', Arial, sans-serif;
+            line-height: 1.6;
+            color: #333333;
+            max-width: 600px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #F5F5F5;
+        }
+        .container {
+            background-color: #FFFFFF;
+            border-radius: 8px;
+            box-shadow: 0px 2px 8px rgba(0, 0, 0, 0.1);
+            overflow: hidden;
+        }
+        .header {
+            background-color: #1E90FF;
+            color: white;
+            padding: 30px 20px;
+            text-align: center;
+        }
+        .header h1 {
+            margin: 0;
+            font-family: 'Poppins', Arial, sans-serif;
+            font-weight: 600;
+            font-size: ${header_font_size};
+        }
+        .content {
+            padding: 30px;
+        }
+        .button {
+            display: inline-block;
+            background-color: ${button_color};
+            color: white;
+            padding: 14px 28px;
+            text-decoration: none;
+            border-radius: 8px;
+            font-weight: 500;
+            margin: 20px 0;
+            text-align: center;
+        }
+        .button:hover {
+            background-color: ${button_hover_color};
+        }
+        .footer {
+            text-align: center;
+            margin-top: 30px;
+            color: #9E9E9E;
+            font-size: 12px;
+            padding: 20px;
+            background-color: #F5F5F5;
+        }
+"""
+
+_AUTOMATED_FOOTER = """
+    <div class="footer">
+        <p>This is an automated message. Please do not reply to this email.</p>
+    </div>
+"""
+
+_BOOKING_REQUEST_PENDING = {
+    "subject": "Booking Request Received - LinkUup",
+    "heading": "Booking Request Received",
+    "greeting_message": (
+        "Thank you for your booking request! We have received your appointment request "
+        "and will send you a confirmation shortly."
+    ),
+    "follow_up_message": "Our salon team will review your request and send you a confirmation email within 24 hours.",
+}
+
+_BOOKING_REQUEST_CONFIRMED = {
+    "subject": "Booking Confirmed - LinkUup",
+    "heading": "Booking Confirmed",
+    "greeting_message": "Great news! Your booking has been confirmed.",
+    "follow_up_message": "We look forward to seeing you!",
+}
+
+_WELCOME_GENERIC = {
+    "welcome_html": "<p>We're excited to have you join our platform!</p>",
+    "welcome_text": "We're excited to have you join our platform!",
+}
+
+EN = {
+    "booking_request": {
+        "subject": "${subject}",
+        "html": _HEAD + _CLASSIC_STYLE + """
+        .booking-details {
+            background-color: white;
+            padding: 20px;
+            border-radius: 8px;
+            margin: 20px 0;
+            border-left: 4px solid #2a2a2e;
+        }
+        .status-pending {
+            color: #f39c12;
+            font-weight: bold;
+        }
+        .status-confirmed {
+            color: #27ae60;
+            font-weight: bold;
+        }
+        .status-cancelled {
+            color: #e74c3c;
+            font-weight: bold;
+        }
+        .status-completed {
+            color: #3498db;
+            font-weight: bold;
+        }
+        ul {
+            list-style-type: none;
+            padding: 0;
+        }
+        li {
+            padding: 5px 0;
+            border-bottom: 1px solid #eee;
+        }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>${heading}</h1>
+        <p>Thank you for choosing LinkUup!</p>
+    </div>
+
+    <div class="content">
+        <p>Dear ${customer_name},</p>
+
+        <p>${greeting_message}</p>
+
+        <div class="booking-details">
+            <h3>Booking Details</h3>
+            <p><strong>Salon:</strong> ${salon_name}</p>
+            <p><strong>Services:</strong></p>
+            <ul>
+                ${services_html}
+            </ul>
+            <p><strong>Date:</strong> ${booking_date}</p>
+            <p><strong>Time:</strong> ${booking_time}</p>
+            <p><strong>Total Duration:</strong> ${duration} minutes</p>
+            <p><strong>Total Price:</strong> €${total_price}</p>
+            <p><strong>Status:</strong> <span class="${status_class}" style="color: ${status_color};">${status_text}</span></p>
+        </div>
+
+        <p>${follow_up_message}</p>
+
+        <p>If you have any questions, please don't hesitate to contact us.</p>
+
+        <p>Best regards,<br>
+        The LinkUup Team</p>
+    </div>
+""" + _AUTOMATED_FOOTER + """
+</body>
+</html>
+""",
+        "text": """
+${subject}
+
+Dear ${customer_name},
+
+${greeting_message}
+
+Booking Details:
+- Salon: ${salon_name}
+- Services:
+${services_text}
+- Date: ${booking_date}
+- Time: ${booking_time}
+- Total Duration: ${duration} minutes
+- Total Price: €${total_price}
+- Status: ${status_text}
+
+${follow_up_message}
+
+If you have any questions, please don't hesitate to contact us.
+
+Best regards,
+The LinkUup Team
+
+This is an automated message. Please do not reply to this email.
+""",
+        "constants": {"title": "Booking Request Received"},
+        "default_variant": "pending",
+        "variants": {
+            "pending": {
+                **_BOOKING_REQUEST_PENDING,
+                "status_text": "Pending Confirmation", "status_class": "status-pending", "status_color": "#f39c12",
+            },
+            "confirmed": {
+                **_BOOKING_REQUEST_CONFIRMED,
+                "status_text": "Confirmed", "status_class": "status-confirmed", "status_color": "#27ae60",
+            },
+            "cancelled": {
+                **_BOOKING_REQUEST_PENDING,
+                "status_text": "Cancelled", "status_class": "status-cancelled", "status_color": "#e74c3c",
+            },
+            "completed": {
+                **_BOOKING_REQUEST_PENDING,
+                "status_text": "Completed", "status_class": "status-completed", "status_color": "#3498db",
+            },
+        },
+    },
+    "booking_request_service": {
+        "html": """
+<li>
+    <strong>${service_name}</strong> -
+    €${service_price}
+    (${service_duration} minutes)
+</li>
+""",
+        "text": "- ${service_name} - €${service_price} (${service_duration} minutes)",
+    },
+    "booking_status": {
+        "subject": "${subject}",
+        "html": _HEAD + _CLASSIC_STYLE + """
+        .booking-details {
+            background-color: white;
+            padding: 20px;
+            border-radius: 8px;
+            margin: 20px 0;
+            border-left: 4px solid ${status_color};
+        }
+        .status {
+            color: ${status_color};
+            font-weight: bold;
+        }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>${subject}</h1>
+    </div>
+
+    <div class="content">
+        <p>Dear ${customer_name},</p>
+
+        <p>${message}</p>
+
+        <div class="booking-details">
+            <h3>Booking Details</h3>
+            <p><strong>Salon:</strong> ${salon_name}</p>
+            <p><strong>Service:</strong> ${service_name}</p>
+            <p><strong>Date:</strong> ${booking_date}</p>
+            <p><strong>Time:</strong> ${booking_time}</p>
+            <p><strong>Duration:</strong> ${duration} minutes</p>
+            <p><strong>Status:</strong> <span class="status">${status_text}</span></p>
+        </div>
+
+        <p>If you have any questions or need to make changes, please contact us.</p>
+
+        <p>Best regards,<br>
+        The LinkUup Team</p>
+    </div>
+""" + _AUTOMATED_FOOTER + """
+</body>
+</html>
+""",
+        "text": """
+${subject}
+
+Dear ${customer_name},
+
+${message}
+
+Booking Details:
+- Salon: ${salon_name}
+- Service: ${service_name}
+- Date: ${booking_date}
+- Time: ${booking_time}
+- Duration: ${duration} minutes
+- Status: ${status_text}
+
+If you have any questions or need to make changes, please contact us.
+
+Best regards,
+The LinkUup Team
+
+This is an automated message. Please do not reply to this email.
+""",
+        "default_variant": "confirmed",
+        "variants": {
+            "confirmed": {
+                "subject": "Booking Confirmed - LinkUup", "title": "Booking Confirmed - LinkUup",
+                "status_text": "Confirmed", "status_color": "#27ae60",
+                "message": "Great news! Your booking has been confirmed. We look forward to seeing you!",
+            },
+            "cancelled": {
+                "subject": "Booking Cancelled - LinkUup", "title": "Booking Cancelled - LinkUup",
+                "status_text": "Cancelled", "status_color": "#e74c3c",
+                "message": "We regret to inform you that your booking has been cancelled. Please contact us if you have any questions.",
+            },
+            "completed": {
+                "subject": "Service Completed - LinkUup", "title": "Service Completed - LinkUup",
+                "status_text": "Completed", "status_color": "#3498db",
+                "message": "Thank you for choosing our services! We hope you had a great experience.",
+            },
+        },
+    },
+    "booking_reminder": {
+        "subject": "Appointment Reminder - ${subject_service_name} ${when}",
+        "html": _HEAD + _CLASSIC_STYLE + """
+        .reminder-details {
+            background-color: white;
+            padding: 20px;
+            border-radius: 8px;
+            margin: 20px 0;
+            border-left: 4px solid #f39c12;
+        }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>Appointment Reminder</h1>
+    </div>
+
+    <div class="content">
+        <p>Hi ${customer_name},</p>
+
+        <p>This is a reminder that you have an appointment ${when}:</p>
+
+        <div class="reminder-details">
+            <h3>Appointment Details</h3>
+            <p><strong>Service:</strong> ${service_name}</p>
+            <p><strong>Date:</strong> ${booking_date}</p>
+            <p><strong>Time:</strong> ${booking_time}</p>
+            <p><strong>With:</strong> ${employee_name}</p>
+            <p><strong>Location:</strong> ${business_name}</p>
+            <p><strong>Address:</strong> ${business_address}</p>
+        </div>
+
+        <p>If you need to reschedule, please call ${business_phone}.</p>
+
+        <p>Thank you!</p>
+    </div>
+""" + _AUTOMATED_FOOTER + """
+</body>
+</html>
+""",
+        "text": """
+Appointment Reminder
+
+Hi ${customer_name},
+
+This is a reminder that you have an appointment ${when}:
+
+- Service: ${service_name}
+- Date: ${booking_date}
+- Time: ${booking_time}
+- With: ${employee_name}
+- Location: ${business_name}
+- Address: ${business_address}
+
+If you need to reschedule, please call ${business_phone}.
+
+Thank you!
+""",
+        "constants": {"title": "Appointment Reminder"},
+    },
+    "password_reset": {
+        "subject": "Password Reset Request - LinkUup",
+        "html": _HEAD + _BRAND_STYLE + """
+        .warning {
+            background-color: #FFF3CD;
+            border-left: 4px solid #FFC107;
+            padding: 15px;
+            margin: 20px 0;
+            border-radius: 4px;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>Password Reset Request</h1>
+        </div>
+
+        <div class="content">
+            <p>Hello ${to_name},</p>
+
+            <p>We received a request to reset your password for your LinkUup account. Click the button below to reset your password:</p>
+
+            <div style="text-align: center;">
+                <a href="${reset_url}" class="button">Reset Password</a>
+            </div>
+
+            <p>Or copy and paste this link into your browser:</p>
+            <p style="word-break: break-all; color: #1E90FF;">${reset_url}</p>
+
+            <div class="warning">
+                <strong>⚠️ Important:</strong> This link will expire in 1 hour. If you didn't request a password reset, please ignore this email.
+            </div>
+
+            <p>If you have any questions, please don't hesitate to contact us.</p>
+
+            <p>Best regards,<br>
+            The LinkUup Team</p>
+        </div>
+""" + _AUTOMATED_FOOTER + """
+    </div>
+</body>
+</html>
+""",
+        "text": """
+Password Reset Request - LinkUup
+
+Hello ${to_name},
+
+We received a request to reset your password for your LinkUup account.
+Click the link below to reset your password:
+
+${reset_url}
+
+This link will expire in 1 hour. If you didn't request a password reset, please ignore this email.
+
+If you have any questions, please don't hesitate to contact us.
+
+Best regards,
+The LinkUup Team
+
+This is an automated message. Please do not reply to this email.
+""",
+        "constants": {
+            "title": "Password Reset Request",
+            "header_font_size": "24px", "button_color": "#FF5A5F", "button_hover_color": "#E0484D",
+        },
+    },
+    "welcome": {
+        "subject": "Welcome to LinkUup - ${user_type_display}",
+        "html": _HEAD + _BRAND_STYLE + """
+        ul {
+            padding-left: 20px;
+        }
+        li {
+            margin: 10px 0;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>Welcome to LinkUup!</h1>
+        </div>
+
+        <div class="content">
+            <p>Hello ${to_name},</p>
+
+            <p>Thank you for joining LinkUup! We're thrilled to have you as part of our community.</p>
+
+            <p><strong>Account Type:</strong> ${user_type_display}</p>
+
+            ${plan_section}
+
+            ${welcome_html}
+
+            <div style="text-align: center;">
+                <a href="http://linkuup.portugalexpatdirectory.com/login" class="button">Get Started</a>
+            </div>
+
+            <p>If you have any questions or need assistance, please don't hesitate to contact our support team.</p>
+
+            <p>Best regards,<br>
+            The LinkUup Team</p>
+        </div>
+""" + _AUTOMATED_FOOTER + """
+    </div>
+</body>
+</html>
+""",
+        "text": """
+Welcome to LinkUup!
+
+Hello ${to_name},
+
+Thank you for joining LinkUup! We're thrilled to have you as part of our community.
+
+Account Type: ${user_type_display}${plan_section}
+
+${welcome_text}
+
+Get started by visiting: http://linkuup.portugalexpatdirectory.com/login
+
+If you have any questions or need assistance, please don't hesitate to contact our support team.
+
+Best regards,
+The LinkUup Team
+
+This is an automated message. Please do not reply to this email.
+""",
+        "constants": {
+            "title": "Welcome to LinkUup",
+            "header_font_size": "28px", "button_color": "#1E90FF", "button_hover_color": "#1877D2",
+        },
+        "default_variant": "user",
+        "variants": {
+            "customer": {
+                "user_type_display": "Customer",
+                "welcome_html": """
+<p>We're excited to have you join our community! As a customer, you can now:</p>
+<ul>
+    <li>Book appointments at your favorite businesses</li>
+    <li>Manage your bookings and appointments</li>
+    <li>Earn rewards and special offers</li>
+    <li>Leave reviews and share your experiences</li>
+</ul>
+""",
+                "welcome_text": """We're excited to have you join our community! As a customer, you can now:
+- Book appointments at your favorite businesses
+- Manage your bookings and appointments
+- Earn rewards and special offers
+- Leave reviews and share your experiences""",
+            },
+            "business_owner": {
+                "user_type_display": "Business Owner",
+                "welcome_html": """
+<p>Welcome to LinkUup! As a business owner, you can now:</p>
+<ul>
+    <li>Manage your business profile and services</li>
+    <li>Handle bookings and appointments</li>
+    <li>Connect with customers and grow your business</li>
+    <li>Access powerful business management tools</li>
+</ul>
+""",
+                "welcome_text": """Welcome to LinkUup! As a business owner, you can now:
+- Manage your business profile and services
+- Handle bookings and appointments
+- Connect with customers and grow your business
+- Access powerful business management tools""",
+            },
+            "employee": {"user_type_display": "Employee", **_WELCOME_GENERIC},
+            "platform_admin": {"user_type_display": "Platform Administrator", **_WELCOME_GENERIC},
+            "user": {"user_type_display": "User", **_WELCOME_GENERIC},
+        },
+    },
+    "welcome_plan": {
+        "html": """
+<div style="background-color: #E3F2FD; border-left: 4px solid #1E90FF; padding: 15px; margin: 20px 0; border-radius: 4px;">
+    <h3 style="margin-top: 0; color: #1E90FF;">Your Subscription Plan</h3>
+    <p style="margin-bottom: 0;"><strong>Plan:</strong> ${plan_name}</p>
+</div>
+""",
+        "text": "Your Subscription Plan: ${plan_name}",
+    },
+}
+
+TEMPLATES = {
+    "en": EN,
+}
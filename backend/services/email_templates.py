@@ -0,0 +1,155 @@
+"""
+Compiled email templates.
+
+Sources (services/email_template_sources.py) are compiled once per language
+and variant: the variant's constants are folded into the static HTML and text,
+so a send only joins cached fragments with the per-recipient values (escaped in
+HTML unless wrapped in Html). compile_all() runs at startup; anything not yet
+compiled is compiled on first use.
+
+    email = email_templates.render("booking_status", values, variant="cancelled", language="pt")
+    email.subject, email.html, email.text
+
+Unknown languages fall back to English and unknown variants to the template's
+default. Campaign bodies use Brevo's {{params.name}} syntax; campaign_template()
+compiles and caches them so a batch renders every recipient from one template.
+"""
+import html
+import re
+import textwrap
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from services.email_template_sources import DEFAULT_LANGUAGE, TEMPLATES
+
+PLACEHOLDER = re.compile(r"\$\{(?P<name>\w+)\}")
+CAMPAIGN_PLACEHOLDER = re.compile(r"\{\{\s*params\.(?P<name>\w+)\s*\}\}")
+
+
+class Html(str):
+    """A value inserted into HTML as-is (markup built from another template)"""
+
+
+class CompiledTemplate:
+    """Static fragments with the placeholders between them"""
+
+    __slots__ = ("head", "pieces", "names", "escape", "default")
+
+    def __init__(self, source: str, constants: Optional[Mapping[str, Any]] = None, escape: bool = False,
+                 pattern: re.Pattern = PLACEHOLDER, default: Optional[str] = None):
+        constants = constants or {}
+        self.escape = escape
+        self.default = default
+        fragments = [""]
+        names = []
+        position = 0
+        for match in pattern.finditer(source):
+            fragments[-1] += source[position:match.start()]
+            name = match.group("name")
+            if name in constants:
+                # Constants are trusted template text (they may carry markup)
+                fragments[-1] += str(constants[name])
+            else:
+                names.append(name)
+                fragments.append("")
+            position = match.end()
+        fragments[-1] += source[position:]
+        self.head = fragments[0]
+        self.pieces: Tuple[Tuple[str, str], ...] = tuple(zip(names, fragments[1:]))
+        self.names = frozenset(names)
+
+    def _value(self, values: Mapping[str, Any], name: str) -> str:
+        value = values[name] if self.default is None else values.get(name)
+        if value is None:
+            value = self.default or ""
+        if isinstance(value, Html) or not self.escape:
+            return str(value)
+        return html.escape(str(value))
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        parts = [self.head]
+        for name, tail in self.pieces:
+            parts.append(self._value(values, name))
+            parts.append(tail)
+        return "".join(parts)
+
+    def render_many(self, rows: Iterable[Mapping[str, Any]]) -> List[str]:
+        return [self.render(values) for values in rows]
+
+
+class RenderedEmail(NamedTuple):
+    subject: str
+    html: str
+    text: str
+
+
+class EmailTemplate:
+    """Subject, HTML and text of one template variant"""
+
+    __slots__ = ("subject", "html", "text")
+
+    def __init__(self, source: Dict[str, Any], constants: Mapping[str, Any]):
+        self.subject = CompiledTemplate(source.get("subject", ""), constants)
+        self.html = CompiledTemplate(textwrap.dedent(source["html"]).strip(), constants, escape=True)
+        self.text = CompiledTemplate(textwrap.dedent(source["text"]).strip(), constants)
+
+    def render(self, values: Mapping[str, Any]) -> RenderedEmail:
+        return RenderedEmail(self.subject.render(values), self.html.render(values), self.text.render(values))
+
+    def render_many(self, rows: Iterable[Mapping[str, Any]]) -> List[RenderedEmail]:
+        return [self.render(values) for values in rows]
+
+
+class EmailTemplateRegistry:
+    """Compiled templates keyed by (name, variant, language)"""
+
+    def __init__(self, sources: Dict[str, Dict[str, Any]] = TEMPLATES, default_language: str = DEFAULT_LANGUAGE):
+        self.sources = sources
+        self.default_language = default_language
+        self._compiled: Dict[Tuple[str, Optional[str], str], EmailTemplate] = {}
+
+    def _resolve(self, name: str, variant: Optional[str], language: Optional[str]):
+        language = (language or self.default_language).lower()
+        if name not in self.sources.get(language, {}):
+            language = self.default_language
+        source = self.sources[language][name]
+        variants = source.get("variants")
+        if variants is None:
+            return source, None, language
+        if variant not in variants:
+            variant = source["default_variant"]
+        return source, variant, language
+
+    def get(self, name: str, variant: Optional[str] = None, language: Optional[str] = None) -> EmailTemplate:
+        source, variant, language = self._resolve(name, variant, language)
+        key = (name, variant, language)
+        template = self._compiled.get(key)
+        if template is None:
+            constants = {**source.get("constants", {}), **(source.get("variants") or {}).get(variant, {})}
+            template = self._compiled[key] = EmailTemplate(source, constants)
+        return template
+
+    def compile_all(self) -> int:
+        """Compile every language and variant; returns the number of compiled templates"""
+        for language, templates in self.sources.items():
+            for name, source in templates.items():
+                for variant in source.get("variants") or [None]:
+                    self.get(name, variant, language)
+        return len(self._compiled)
+
+    def render(self, name: str, values: Mapping[str, Any], variant: Optional[str] = None,
+               language: Optional[str] = None) -> RenderedEmail:
+        return self.get(name, variant, language).render(values)
+
+    def render_many(self, name: str, rows: Iterable[Mapping[str, Any]], variant: Optional[str] = None,
+                    language: Optional[str] = None) -> List[RenderedEmail]:
+        return self.get(name, variant, language).render_many(rows)
+
+
+@lru_cache(maxsize=256)
+def campaign_template(source: str, escape: bool = False) -> CompiledTemplate:
+    """Compiled campaign subject/body; missing params render empty"""
+    return CompiledTemplate(source, escape=escape, pattern=CAMPAIGN_PLACEHOLDER, default="")
+
+
+email_templates = EmailTemplateRegistry()
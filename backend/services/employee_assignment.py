@@ -0,0 +1,94 @@
+"""
+"Any employee" assignment for new bookings.
+
+Picks, in one pass over preloaded day data, the qualified employee who is
+free for the whole requested interval and carries the lowest load (booked
+minutes that day). Inputs are the day's active bookings, approved time-off
+and the EmployeeService mappings, loaded with one query per table.
+
+Qualification: an employee must be mapped (EmployeeService) to every
+requested service. A service no employee of the place is mapped to yet is
+unrestricted, so assignment keeps working before owners configure employee
+skills.
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.place_existing import EmployeeService
+from services.availability_engine import (
+    DEFAULT_SLOT_MINUTES, MINUTES_PER_DAY, DayInputs, build_day_schedule, load_day_inputs, span_mask
+)
+
+
+@dataclass
+class AssignmentInputs:
+    """Preloaded state needed to assign an employee on a day"""
+    day: DayInputs
+    # employee_id -> Service ids the employee is mapped to (requested services only)
+    qualifications: Dict[int, Set[int]] = field(default_factory=dict)
+
+
+async def load_assignment_inputs(
+    db: AsyncSession,
+    place_id: int,
+    booking_date: date,
+    service_ids: Iterable[int]
+) -> AssignmentInputs:
+    """Load employees, bookings, time-off and EmployeeService mappings for a place-day"""
+    day = await load_day_inputs(db, place_id, booking_date)
+    qualifications: Dict[int, Set[int]] = defaultdict(set)
+    employee_ids = [employee.id for employee in day.employees]
+    if employee_ids:
+        result = await db.execute(
+            select(EmployeeService.employee_id, EmployeeService.service_id).where(
+                EmployeeService.employee_id.in_(employee_ids),
+                EmployeeService.service_id.in_(set(service_ids))
+            )
+        )
+        for employee_id, service_id in result.all():
+            qualifications[employee_id].add(service_id)
+    return AssignmentInputs(day=day, qualifications=dict(qualifications))
+
+
+def pick_employee(
+    inputs: AssignmentInputs,
+    service_ids: Iterable[int],
+    start: int,
+    end: int,
+    slot_minutes: int = DEFAULT_SLOT_MINUTES
+) -> Optional[int]:
+    """
+    Choose the least-loaded qualified employee free for [start, end).
+
+    Args:
+        inputs: Preloaded day state (see load_assignment_inputs)
+        service_ids: Service ids (not PlaceService ids) the booking covers
+        start: Booking start in minutes of the day
+        end: Booking end in minutes of the day
+        slot_minutes: Default length of bookings without a duration
+
+    Returns:
+        The employee id, or None if nobody qualified is free. Ties on load
+        go to the lowest employee id so assignment is deterministic.
+    """
+    mapped_services = set().union(*inputs.qualifications.values())
+    required = set(service_ids) & mapped_services
+    schedule = build_day_schedule(0, MINUTES_PER_DAY, inputs.day, slot_minutes)
+    window = span_mask(start, end)
+
+    best_id = None
+    best_load = None
+    for employee in inputs.day.employees:
+        if not required <= inputs.qualifications.get(employee.id, set()):
+            continue
+        if schedule.busy.get(employee.id, 0) & window:
+            continue
+        load = schedule.booked.get(employee.id, 0).bit_count()
+        if best_load is None or (load, employee.id) < (best_load, best_id):
+            best_id, best_load = employee.id, load
+    return best_id
@@ -0,0 +1,159 @@
+"""
+Entitlement resolver for owners: place ownership, trial state, billing
+subscription and per-place plan features of a user, resolved in one query
+and cached per user.
+
+get_current_business_owner uses it for the owner/billing gate and
+services/feature_access for has_feature/get_limit. Entries live
+ENTITLEMENT_CACHE_TTL_SECONDS (0 disables the cache); Stripe webhook
+handlers, subscription endpoints and trial activation call
+invalidate_entitlements() after committing. The cache is per worker, so other
+workers see such changes once their entry expires.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import and_, exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache import TTLCache
+from core.config import settings
+from models.billing import Subscription as BillingSubscription
+from models.place_existing import Place
+from models.subscription import Feature, PlanFeature, SubscriptionStatusEnum, UserPlaceSubscription
+from models.user import User
+
+ACTIVE_PLACE_SUBSCRIPTION = (SubscriptionStatusEnum.TRIALING, SubscriptionStatusEnum.ACTIVE)
+
+
+@dataclass(frozen=True)
+class Entitlements:
+    """What a user may do as a business owner"""
+    user_id: int
+    owns_place: bool = False
+    trial_status: Optional[str] = None
+    trial_end: Optional[datetime] = None
+    has_billing_subscription: bool = False
+    # place_id -> plan_id of the user's trialing/active place subscription
+    place_plans: Dict[int, int] = field(default_factory=dict)
+    # plan_id -> feature code -> (enabled, limit_value)
+    plan_features: Dict[int, Dict[str, Tuple[bool, Optional[int]]]] = field(default_factory=dict)
+
+    def in_trial(self, now: Optional[datetime] = None) -> bool:
+        if self.trial_status != "active" or not self.trial_end:
+            return False
+        try:
+            return self.trial_end > (now or datetime.now(timezone.utc))
+        except TypeError:
+            # Naive timestamp from a database without timezone support
+            return self.trial_end > (now or datetime.now(timezone.utc)).replace(tzinfo=None)
+
+    def has_owner_access(self, now: Optional[datetime] = None) -> bool:
+        """Billing gate: active trial, active billing subscription or any active place subscription"""
+        return self.in_trial(now) or self.has_billing_subscription or bool(self.place_plans)
+
+    def _place_feature(self, place_id: int, feature_code: str) -> Optional[Tuple[bool, Optional[int]]]:
+        plan_id = self.place_plans.get(place_id)
+        if plan_id is None:
+            return None
+        return self.plan_features.get(plan_id, {}).get(feature_code)
+
+    def has_feature(self, place_id: int, feature_code: str) -> bool:
+        feature = self._place_feature(place_id, feature_code)
+        return bool(feature and feature[0])
+
+    def get_limit(self, place_id: int, feature_code: str) -> Optional[int]:
+        feature = self._place_feature(place_id, feature_code)
+        return feature[1] if feature else None
+
+
+def entitlements_query(user_id: int):
+    """
+    One row per (place subscription, plan feature) of the user, at least one row
+    when the user exists; ownership and billing status ride along as EXISTS columns.
+    """
+    owns_place = exists().where(and_(Place.owner_id == User.id, Place.is_active == True))
+    billing_active = exists().where(and_(BillingSubscription.user_id == User.id, BillingSubscription.active == True))
+    return (
+        select(
+            User.trial_status,
+            User.trial_end,
+            owns_place.label("owns_place"),
+            billing_active.label("billing_active"),
+            UserPlaceSubscription.place_id,
+            UserPlaceSubscription.plan_id,
+            Feature.code,
+            PlanFeature.enabled,
+            PlanFeature.limit_value,
+        )
+        .select_from(User)
+        .outerjoin(UserPlaceSubscription, and_(
+            UserPlaceSubscription.user_id == User.id,
+            UserPlaceSubscription.status.in_(ACTIVE_PLACE_SUBSCRIPTION),
+        ))
+        .outerjoin(PlanFeature, PlanFeature.plan_id == UserPlaceSubscription.plan_id)
+        .outerjoin(Feature, Feature.id == PlanFeature.feature_id)
+        .where(User.id == user_id)
+    )
+
+
+def build_entitlements(user_id: int, rows) -> Entitlements:
+    if not rows:
+        return Entitlements(user_id=user_id)
+    first = rows[0]
+    place_plans: Dict[int, int] = {}
+    plan_features: Dict[int, Dict[str, Tuple[bool, Optional[int]]]] = {}
+    for row in rows:
+        if row.place_id is None:
+            continue
+        place_plans.setdefault(row.place_id, row.plan_id)
+        features = plan_features.setdefault(row.plan_id, {})
+        if row.code is not None:
+            features[row.code] = (bool(row.enabled), row.limit_value)
+    return Entitlements(
+        user_id=user_id,
+        owns_place=bool(first.owns_place),
+        trial_status=first.trial_status,
+        trial_end=first.trial_end,
+        has_billing_subscription=bool(first.billing_active),
+        place_plans=place_plans,
+        plan_features=plan_features,
+    )
+
+
+class EntitlementService:
+    """Per-user entitlement cache"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.enabled = ttl_seconds > 0
+        self._cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    async def get(self, db: AsyncSession, user_id: int) -> Entitlements:
+        entitlements = self._cache.get(user_id) if self.enabled else None
+        if entitlements is None:
+            result = await db.execute(entitlements_query(user_id))
+            entitlements = build_entitlements(user_id, result.all())
+            if self.enabled:
+                self._cache.set(user_id, entitlements)
+        return entitlements
+
+    def invalidate(self, user_id: int) -> None:
+        self._cache.delete(user_id)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+entitlement_service = EntitlementService(
+    max_entries=settings.ENTITLEMENT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.ENTITLEMENT_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_entitlements(user_id: int) -> None:
+    """Drop a user's cached entitlements (call after committing billing/plan changes)"""
+    entitlement_service.invalidate(user_id)
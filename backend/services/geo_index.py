@@ -0,0 +1,219 @@
+"""
+In-memory geo index for nearby place search.
+
+Holds the coordinates of every active place in NumPy arrays sorted by
+latitude. A nearby query bisects the latitude band that can contain matches,
+computes great-circle (haversine) distances for that band in one vectorized
+pass and returns the k nearest matches sorted by distance.
+
+Mobile places (location_type == 'mobile') travel to the customer, so they
+match when the customer is inside their coverage_radius, even if that is
+further than the search radius.
+
+The index is built with one query and kept current by owner/admin place
+endpoints calling sync_place() / remove_place(). Each worker holds its own
+index, so it is also rebuilt every PLACE_GEO_INDEX_REFRESH_SECONDS to pick up
+changes made by other workers.
+"""
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from models.place_existing import Place
+
+EARTH_RADIUS_KM = 6371.0088
+DEFAULT_COVERAGE_RADIUS_KM = 10.0
+
+
+@dataclass
+class PlacePoint:
+    """Location and listing fields of an active place"""
+    id: int
+    latitude: float
+    longitude: float
+    nome: str = ""
+    tipo: Optional[str] = None
+    cidade: Optional[str] = None
+    rua: Optional[str] = None
+    telefone: Optional[str] = None
+    regiao: Optional[str] = None
+    booking_enabled: bool = False
+    is_bio_diamond: bool = False
+    location_type: str = 'fixed'
+    coverage_radius: Optional[float] = None
+
+    @classmethod
+    def from_place(cls, place: Place) -> "PlacePoint":
+        return cls(
+            id=place.id,
+            latitude=float(place.latitude),
+            longitude=float(place.longitude),
+            nome=place.nome,
+            tipo=place.tipo,
+            cidade=place.cidade,
+            rua=place.rua,
+            telefone=place.telefone,
+            regiao=place.regiao,
+            booking_enabled=bool(place.booking_enabled),
+            is_bio_diamond=bool(place.is_bio_diamond),
+            location_type=place.location_type or 'fixed',
+            coverage_radius=place.coverage_radius,
+        )
+
+    @property
+    def is_mobile(self) -> bool:
+        return self.location_type == 'mobile'
+
+    def to_dict(self, distance_km: float) -> dict:
+        return {
+            "id": self.id,
+            "nome": self.nome,
+            "tipo": self.tipo,
+            "cidade": self.cidade,
+            "rua": self.rua,
+            "telefone": self.telefone,
+            "booking_enabled": self.booking_enabled,
+            "is_bio_diamond": self.is_bio_diamond,
+            "regiao": self.regiao,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "location_type": self.location_type,
+            "coverage_radius": self.coverage_radius,
+            "distance_km": round(distance_km, 3),
+        }
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance in km; works on scalars and NumPy arrays (degrees)"""
+    lat1, lng1, lat2, lng2 = (np.radians(value) for value in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _is_indexable(place: Place) -> bool:
+    return bool(place.is_active) and place.latitude is not None and place.longitude is not None
+
+
+class PlaceGeoIndex:
+    """Latitude-sorted coordinate arrays of active places"""
+
+    def __init__(self, refresh_seconds: float = 300):
+        self.refresh_seconds = refresh_seconds
+        self._points: Dict[int, PlacePoint] = {}
+        self._arrays: Optional[dict] = None
+        self._built_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def is_stale(self) -> bool:
+        return self._built_at is None or time.monotonic() - self._built_at > self.refresh_seconds
+
+    async def ensure_fresh(self, db: AsyncSession) -> None:
+        if not self.is_stale():
+            return
+        async with self._lock:
+            if self.is_stale():
+                await self.rebuild(db)
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """Reload every active place with coordinates in one query"""
+        result = await db.execute(
+            select(Place).where(
+                Place.is_active == True,
+                Place.latitude.isnot(None),
+                Place.longitude.isnot(None)
+            )
+        )
+        self.load([PlacePoint.from_place(place) for place in result.scalars().all()])
+
+    def load(self, points: List[PlacePoint]) -> None:
+        """Replace the indexed points"""
+        self._points = {point.id: point for point in points}
+        self._arrays = None
+        self._built_at = time.monotonic()
+
+    def sync_place(self, place: Place) -> None:
+        """Index a place after it was created or updated (drops it if inactive or unlocated)"""
+        if _is_indexable(place):
+            self.put(PlacePoint.from_place(place))
+        else:
+            self.remove_place(place.id)
+
+    def put(self, point: PlacePoint) -> None:
+        self._points[point.id] = point
+        self._arrays = None
+
+    def remove_place(self, place_id: int) -> None:
+        if self._points.pop(place_id, None) is not None:
+            self._arrays = None
+
+    def _compile(self) -> dict:
+        """Sorted arrays, rebuilt lazily after the point set changed"""
+        if self._arrays is None:
+            points = sorted(self._points.values(), key=lambda point: point.latitude)
+            coverage = np.array(
+                [(point.coverage_radius or DEFAULT_COVERAGE_RADIUS_KM) if point.is_mobile else 0.0 for point in points],
+                dtype=np.float64
+            )
+            self._arrays = {
+                "points": points,
+                "lat": np.array([point.latitude for point in points], dtype=np.float64),
+                "lng": np.array([point.longitude for point in points], dtype=np.float64),
+                "tipo": np.array([point.tipo for point in points], dtype=object),
+                "coverage": coverage,
+                "max_coverage": float(coverage.max()) if len(points) else 0.0,
+            }
+        return self._arrays
+
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        radius_km: float,
+        limit: int,
+        tipo: Optional[str] = None
+    ) -> List[Tuple[PlacePoint, float]]:
+        """
+        The `limit` nearest places to (lat, lng), sorted by haversine distance.
+
+        A fixed place matches within radius_km; a mobile place also matches
+        when the point lies inside its coverage radius.
+
+        Returns:
+            (place, distance_km) pairs
+        """
+        arrays = self._compile()
+        if not arrays["points"] or limit <= 0:
+            return []
+
+        # Only the latitude band within reach can match; longitude is not banded
+        # so queries near the antimeridian stay correct
+        reach_km = max(radius_km, arrays["max_coverage"])
+        band = math.degrees(reach_km / EARTH_RADIUS_KM)
+        lo = int(np.searchsorted(arrays["lat"], lat - band, side='left'))
+        hi = int(np.searchsorted(arrays["lat"], lat + band, side='right'))
+        if lo >= hi:
+            return []
+
+        distances = haversine_km(lat, lng, arrays["lat"][lo:hi], arrays["lng"][lo:hi])
+        matches = (distances <= radius_km) | (distances <= arrays["coverage"][lo:hi])
+        if tipo:
+            matches &= arrays["tipo"][lo:hi] == tipo
+        candidates = np.flatnonzero(matches)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(distances[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(distances[candidates], kind='stable')]
+
+        return [(arrays["points"][lo + i], float(distances[i])) for i in candidates]
+
+
+place_geo_index = PlaceGeoIndex(refresh_seconds=settings.PLACE_GEO_INDEX_REFRESH_SECONDS)
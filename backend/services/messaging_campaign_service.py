@@ -11,14 +11,7 @@ from models.campaign import Campaign, CampaignRecipient, CampaignMessage
 from models.place_existing import Booking
 from models.user import User
 from schemas.campaign import MessagingCustomerResponse, MessagingStatsResponse
-# Mock services for now - will be replaced with real implementations
-class MockEmailService:
-    def send_batch_campaign_emails(self, recipients, subject, body, campaign_id, db):
-        return {'sent_count': 0, 'failed_count': 0, 'errors': []}
-
-class MockWhatsAppService:
-    def send_batch_messages(self, recipients, message, campaign_id, db):
-        return {'sent_count': 0, 'failed_count': 0, 'errors': []}
+from services.campaign_dispatch import CampaignContent, campaign_dispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -26,9 +19,8 @@ logger = logging.getLogger(__name__)
 class MessagingCampaignService:
     """Service for managing messaging campaigns"""
     
-    def __init__(self):
-        self.email_service = MockEmailService()
-        self.whatsapp_service = MockWhatsAppService()
+    def __init__(self, dispatcher=campaign_dispatcher):
+        self.dispatcher = dispatcher
     
     async def get_eligible_customers(
         self, 
@@ -106,11 +98,11 @@ class MessagingCampaignService:
                 )
                 customers.append(customer)
             
-            logger.info(f"Found {len(customers)} eligible customers for places {place_ids}")
+            logger.info("Found %s eligible customers for places %s", len(customers), place_ids)
             return customers
             
         except Exception as e:
-            logger.error(f"Error getting eligible customers: {str(e)}")
+            logger.error("Error getting eligible customers: %s", e)
             return []
     
     async def add_recipients(
@@ -186,7 +178,7 @@ class MessagingCampaignService:
             
             await db.commit()
             
-            logger.info(f"Added {added_count} recipients to campaign {campaign_id}, skipped {skipped_count}")
+            logger.info("Added %s recipients to campaign %s, skipped %s", added_count, campaign_id, skipped_count)
             
             return {
                 'success': True,
@@ -196,7 +188,7 @@ class MessagingCampaignService:
             
         except Exception as e:
             await db.rollback()
-            logger.error(f"Error adding recipients: {str(e)}")
+            logger.error("Error adding recipients: %s", e)
             return {'success': False, 'error': str(e)}
     
     async def remove_recipient(
@@ -236,13 +228,13 @@ class MessagingCampaignService:
             await db.delete(recipient)
             await db.commit()
             
-            logger.info(f"Removed recipient {recipient_id} from campaign {campaign_id}")
+            logger.info("Removed recipient %s from campaign %s", recipient_id, campaign_id)
             
             return {'success': True}
             
         except Exception as e:
             await db.rollback()
-            logger.error(f"Error removing recipient: {str(e)}")
+            logger.error("Error removing recipient: %s", e)
             return {'success': False, 'error': str(e)}
     
     async def get_campaign_recipients(
@@ -271,13 +263,14 @@ class MessagingCampaignService:
             return recipients
             
         except Exception as e:
-            logger.error(f"Error getting campaign recipients: {str(e)}")
+            logger.error("Error getting campaign recipients: %s", e)
             return []
     
     async def send_campaign(
         self, 
         db: AsyncSession, 
-        campaign_id: int
+        campaign_id: int,
+        wait: bool = False
     ) -> Dict[str, Any]:
         """
         Send a messaging campaign to all pending recipients
@@ -285,9 +278,10 @@ class MessagingCampaignService:
         Args:
             db: Database session
             campaign_id: Campaign ID
+            wait: Send before returning (scheduler) instead of in the background (API)
         
         Returns:
-            Dict with sending results
+            Dict with sending results (or, in the background, the number of recipients queued)
         """
         try:
             # Get campaign and verify it's messaging type
@@ -301,6 +295,9 @@ class MessagingCampaignService:
             if campaign.type != 'messaging':
                 return {'success': False, 'error': 'Campaign is not a messaging campaign'}
             
+            if self.dispatcher.is_running(campaign_id):
+                return {'success': False, 'error': 'Campaign is already being sent'}
+            
             # Get campaign messages
             messages_query = select(CampaignMessage).where(
                 CampaignMessage.campaign_id == campaign_id
@@ -311,78 +308,61 @@ class MessagingCampaignService:
             if not messages:
                 return {'success': False, 'error': 'No messages configured for campaign'}
             
-            # Get pending recipients
-            recipients_query = select(CampaignRecipient).where(
+            available = self.dispatcher.available_channels()
+            contents = [
+                CampaignContent(campaign_id, message.channel, message.subject or '', message.message_body)
+                for message in messages if message.channel in available
+            ]
+            if not contents:
+                channels = ', '.join(sorted({message.channel for message in messages}))
+                return {'success': False, 'error': f'No provider configured for campaign channels ({channels})'}
+            
+            # Count pending recipients (the dispatcher streams them in chunks)
+            pending_query = select(func.count(CampaignRecipient.id)).where(
                 and_(
                     CampaignRecipient.campaign_id == campaign_id,
-                    CampaignRecipient.status == 'pending'
+                    CampaignRecipient.status.in_(['pending', 'sending'])
                 )
             )
-            recipients_result = await db.execute(recipients_query)
-            recipients = recipients_result.scalars().all()
+            pending_count = (await db.execute(pending_query)).scalar() or 0
             
-            if not recipients:
+            if not pending_count:
                 return {'success': False, 'error': 'No pending recipients found'}
             
-            # Send messages via configured channels
-            results = {
-                'success': True,
-                'sent_count': 0,
-                'failed_count': 0,
-                'channel_results': {}
-            }
-            
-            for message in messages:
-                channel = message.channel
-                channel_results = {'sent': 0, 'failed': 0, 'errors': []}
-                
-                if channel == 'email':
-                    # Send emails
-                    email_recipients = [r for r in recipients if r.customer_email]
-                    if email_recipients:
-                        email_result = self.email_service.send_batch_campaign_emails(
-                            recipients=email_recipients,
-                            subject=message.subject or '',
-                            body=message.message_body,
-                            campaign_id=campaign_id,
-                            db=db
-                        )
-                        channel_results['sent'] = email_result['sent_count']
-                        channel_results['failed'] = email_result['failed_count']
-                        channel_results['errors'] = email_result.get('errors', [])
-                
-                elif channel == 'whatsapp':
-                    # Send WhatsApp messages
-                    whatsapp_recipients = [r for r in recipients if r.customer_phone]
-                    if whatsapp_recipients:
-                        whatsapp_result = self.whatsapp_service.send_batch_messages(
-                            recipients=whatsapp_recipients,
-                            message=message.message_body,
-                            campaign_id=campaign_id,
-                            db=db
-                        )
-                        channel_results['sent'] = whatsapp_result['sent_count']
-                        channel_results['failed'] = whatsapp_result['failed_count']
-                        channel_results['errors'] = whatsapp_result.get('errors', [])
-                
-                results['channel_results'][channel] = channel_results
-                results['sent_count'] += channel_results['sent']
-                results['failed_count'] += channel_results['failed']
-            
-            # Update campaign status
-            if results['sent_count'] > 0:
-                campaign.status = 'active'
-                await db.commit()
+            campaign.status = 'active'
+            await db.commit()
             
-            logger.info(f"Campaign {campaign_id} sending completed. Sent: {results['sent_count']}, Failed: {results['failed_count']}")
+            if not wait:
+                self.dispatcher.start(campaign_id, contents)
+                logger.info("Campaign %s sending started for %s recipients", campaign_id, pending_count)
+                return {
+                    'success': True,
+                    'status': 'sending',
+                    'pending_count': pending_count,
+                    'sent_count': 0,
+                    'failed_count': 0,
+                    'channel_results': {}
+                }
+            
+            progress = await self.dispatcher.dispatch(campaign_id, contents)
+            results = progress.as_dict()
+            results['success'] = progress.error is None
+            if progress.error:
+                results['error'] = progress.error
+            
+            logger.info("Campaign %s sending completed. Sent: %s, Failed: %s", campaign_id, results['sent_count'], results['failed_count'])
             
             return results
             
         except Exception as e:
             await db.rollback()
-            logger.error(f"Error sending campaign: {str(e)}")
+            logger.error("Error sending campaign: %s", e)
             return {'success': False, 'error': str(e)}
     
+    def get_send_progress(self, campaign_id: int) -> Optional[Dict[str, Any]]:
+        """Progress and throughput of this worker's latest dispatch of a campaign"""
+        return self.dispatcher.status(campaign_id)
+    
     async def get_campaign_stats(
         self, 
         db: AsyncSession, 
@@ -422,8 +402,8 @@ class MessagingCampaignService:
                     sent_count = count
                 elif status == 'failed':
                     failed_count = count
-                elif status == 'pending':
-                    pending_count = count
+                elif status in ('pending', 'sending'):
+                    pending_count += count
             
             # Calculate delivery rate
             delivery_rate = 0.0
@@ -471,7 +451,7 @@ class MessagingCampaignService:
             )
             
         except Exception as e:
-            logger.error(f"Error getting campaign stats: {str(e)}")
+            logger.error("Error getting campaign stats: %s", e)
             return MessagingStatsResponse(
                 total_recipients=0,
                 sent_count=0,
@@ -0,0 +1,139 @@
+"""
+Cache for the public place detail payload (GET /places/{slug}).
+
+Entries hold the serialized PlaceResponse keyed by the slug or ID used in the
+request. Owner/admin mutation endpoints call invalidate_place() (or
+invalidate_all() for campaign changes, which can span many places) after
+committing.
+
+The default backend is a per-worker bounded LRU with TTL. Setting
+PLACE_CACHE_BACKEND=redis shares entries between uvicorn workers through
+REDIS_URL; Redis errors degrade to cache misses.
+"""
+import json
+import logging
+from typing import Dict, Iterable, Optional, Set
+
+from core.cache import TTLCache
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+REDIS_PREFIX = "linkuup:place_detail:"
+
+
+class PlaceDetailCache:
+    """Place detail cache with explicit per-place invalidation"""
+
+    def __init__(self, max_entries: int, ttl_seconds: int, backend: str = "memory", redis_url: str = ""):
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self._local = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._keys_by_place: Dict[int, Set[str]] = {}
+        self._redis = None
+        self.redis_errors = 0
+        if backend == "redis":
+            try:
+                import redis.asyncio as aioredis
+                self._redis = aioredis.from_url(redis_url, decode_responses=True)
+            except Exception as e:
+                logger.warning("Place cache: Redis unavailable (%s), using in-process cache", e)
+                self.backend = "memory"
+
+    async def get(self, key: str) -> Optional[dict]:
+        if self._redis is None:
+            return self._local.get(key)
+        try:
+            raw = await self._redis.get(REDIS_PREFIX + key)
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+        if raw is None:
+            self._local.misses += 1
+            return None
+        self._local.hits += 1
+        return json.loads(raw)
+
+    async def set(self, key: str, place_id: int, payload: dict) -> None:
+        if self._redis is None:
+            self._local.set(key, payload)
+            self._keys_by_place.setdefault(place_id, set()).add(key)
+            return
+        try:
+            index_key = f"{REDIS_PREFIX}place:{place_id}"
+            pipe = self._redis.pipeline()
+            pipe.set(REDIS_PREFIX + key, json.dumps(payload), ex=self.ttl_seconds)
+            pipe.sadd(index_key, key)
+            pipe.expire(index_key, self.ttl_seconds)
+            await pipe.execute()
+        except Exception as e:
+            self._redis_failed(e)
+
+    async def invalidate_place(self, place_id: int) -> None:
+        """Drop every cached entry (slug and ID keys) for a place"""
+        for key in self._keys_by_place.pop(place_id, set()):
+            self._local.delete(key)
+        # ID lookups may have been cached before the slug was known
+        self._local.delete(str(place_id))
+        if self._redis is None:
+            return
+        try:
+            index_key = f"{REDIS_PREFIX}place:{place_id}"
+            keys = await self._redis.smembers(index_key)
+            await self._redis.delete(index_key, REDIS_PREFIX + str(place_id), *[REDIS_PREFIX + k for k in keys])
+        except Exception as e:
+            self._redis_failed(e)
+
+    async def invalidate_places(self, place_ids: Iterable[int]) -> None:
+        for place_id in set(place_ids):
+            await self.invalidate_place(place_id)
+
+    async def invalidate_all(self) -> None:
+        self._local.clear()
+        self._keys_by_place.clear()
+        if self._redis is None:
+            return
+        try:
+            keys = [key async for key in self._redis.scan_iter(match=REDIS_PREFIX + "*")]
+            if keys:
+                await self._redis.delete(*keys)
+        except Exception as e:
+            self._redis_failed(e)
+
+    def stats(self) -> dict:
+        stats = self._local.stats()
+        stats["backend"] = self.backend
+        if self._redis is not None:
+            # Entries live in Redis; local size is not meaningful
+            stats.pop("size")
+            stats.pop("evictions")
+            stats["redis_errors"] = self.redis_errors
+        return stats
+
+    def _redis_failed(self, error: Exception) -> None:
+        self.redis_errors += 1
+        self._local.misses += 1
+        logger.warning("Place cache Redis error: %s", error)
+
+
+place_detail_cache = PlaceDetailCache(
+    max_entries=settings.PLACE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PLACE_CACHE_TTL_SECONDS,
+    backend=settings.PLACE_CACHE_BACKEND,
+    redis_url=settings.REDIS_URL,
+)
+
+
+async def invalidate_place(place_id: int) -> None:
+    """Invalidate the cached detail payload of a place"""
+    await place_detail_cache.invalidate_place(place_id)
+
+
+async def invalidate_places(place_ids: Iterable[int]) -> None:
+    """Invalidate the cached detail payload of several places"""
+    await place_detail_cache.invalidate_places(place_ids)
+
+
+async def invalidate_all_places() -> None:
+    """Invalidate every cached place detail payload"""
+    await place_detail_cache.invalidate_all()
@@ -0,0 +1,127 @@
+"""
+Search facets: cities, sectors (tipo) and regions of active places with counts.
+
+All three facets come from one GROUPING SETS query. Results are cached per
+filter combination and carry an ETag (a hash of the payload, so it is the
+same in every worker) for If-None-Match revalidation.
+
+Owner/admin place endpoints call invalidate_facets_if_changed() after
+committing; only changes to the fields that feed the facets (location, type,
+active status and the filter flags) drop the cache. Other workers pick the
+change up when their entries expire (PLACE_FACETS_TTL_SECONDS).
+"""
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache import TTLCache
+from core.config import settings
+from models.place_existing import Place
+
+FACET_FIELDS = ("cidade", "regiao", "tipo", "is_active", "booking_enabled", "is_bio_diamond")
+
+# grouping(cidade, tipo, regiao) bitmask -> facet; a bit is set for each column
+# aggregated away in that grouping set
+_FACET_BY_GROUPING = {0b011: "cities", 0b101: "sectors", 0b110: "regions"}
+
+
+@dataclass
+class PlaceFacets:
+    """Facet payload and its ETag"""
+    data: Dict[str, List[Dict[str, Any]]]
+    etag: str
+
+
+def facet_snapshot(place) -> Tuple:
+    """Values of a place that affect the facets (compare before/after an update)"""
+    return tuple(getattr(place, field, None) for field in FACET_FIELDS)
+
+
+def build_facets(rows) -> PlaceFacets:
+    """PlaceFacets from (cidade, tipo, regiao, grouping, count) rows"""
+    data = {"cities": [], "sectors": [], "regions": []}
+    for cidade, tipo, regiao, grouping, count in rows:
+        facet = _FACET_BY_GROUPING.get(grouping)
+        value = {"cities": cidade, "sectors": tipo, "regions": regiao}.get(facet)
+        if value is None or not str(value).strip():
+            continue
+        data[facet].append({"value": value, "count": count})
+    for values in data.values():
+        values.sort(key=lambda item: item["value"])
+
+    payload = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    etag = '"' + hashlib.sha1(payload.encode()).hexdigest() + '"'
+    return PlaceFacets(data=data, etag=etag)
+
+
+def facets_query(booking_enabled: Optional[bool] = None, is_bio_diamond: Optional[bool] = None):
+    query = select(
+        Place.cidade,
+        Place.tipo,
+        Place.regiao,
+        func.grouping(Place.cidade, Place.tipo, Place.regiao),
+        func.count(),
+    ).where(Place.is_active == True)
+    if booking_enabled is not None:
+        query = query.where(Place.booking_enabled == booking_enabled)
+    if is_bio_diamond is not None:
+        query = query.where(Place.is_bio_diamond == is_bio_diamond)
+    return query.group_by(func.grouping_sets(Place.cidade, Place.tipo, Place.regiao))
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header covers `etag` (weak comparison, "*" allowed)"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def facet_response(if_none_match: Optional[str], facets: PlaceFacets, body: Any) -> Response:
+    """`body` with the facets' ETag, or an empty 304 when the client already has it"""
+    headers = {"ETag": facets.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, facets.etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=body, headers=headers)
+
+
+class PlaceFacetCache:
+    """Facets per (booking_enabled, is_bio_diamond) filter"""
+
+    def __init__(self, ttl_seconds: int):
+        self._cache = TTLCache(max_entries=16, ttl_seconds=ttl_seconds)
+
+    async def get(
+        self,
+        db: AsyncSession,
+        booking_enabled: Optional[bool] = None,
+        is_bio_diamond: Optional[bool] = None
+    ) -> PlaceFacets:
+        key = (booking_enabled, is_bio_diamond)
+        facets = self._cache.get(key)
+        if facets is None:
+            result = await db.execute(facets_query(booking_enabled, is_bio_diamond))
+            facets = build_facets(result.all())
+            self._cache.set(key, facets)
+        return facets
+
+    def invalidate(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+place_facet_cache = PlaceFacetCache(ttl_seconds=settings.PLACE_FACETS_TTL_SECONDS)
+
+
+def invalidate_facets_if_changed(before: Optional[Tuple], place) -> None:
+    """Drop cached facets when a create/update/delete touched a facet field"""
+    if before is None or before != facet_snapshot(place):
+        place_facet_cache.invalidate()
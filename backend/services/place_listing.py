@@ -0,0 +1,105 @@
+"""
+Place listing assembler shared by the public place endpoints.
+Builds PlaceResponse objects through a single code path and batch-loads
+related rows for a whole page instead of querying once per place.
+"""
+from typing import Dict, List, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.place_existing import Place, PlaceImage
+from schemas.place_existing import PlaceResponse, PlaceImageResponse
+from services.review_stats import load_review_stats, review_summary
+
+
+def build_image_responses(images: Sequence[PlaceImage]) -> List[PlaceImageResponse]:
+    """Convert PlaceImage rows to their response schema"""
+    return [
+        PlaceImageResponse(
+            id=img.id,
+            image_url=img.image_url,
+            image_alt=img.alt_text,
+            is_primary=img.is_primary,
+            created_at=img.created_at
+        )
+        for img in images
+    ]
+
+
+def build_place_response(place: Place, images: Sequence[PlaceImage] = (), **extra) -> PlaceResponse:
+    """
+    Build a PlaceResponse from a Place row.
+
+    Args:
+        place: Place row
+        images: Images belonging to the place
+        **extra: Additional response fields (services, employees, working_hours, ...)
+
+    Returns:
+        PlaceResponse
+    """
+    return PlaceResponse(
+        id=place.id,
+        codigo=place.codigo,
+        nome=place.nome,
+        slug=getattr(place, 'slug', None) or None,  # Handle missing slug column
+        tipo=place.tipo,
+        pais=place.pais,
+        telefone=place.telefone,
+        email=place.email,
+        website=place.website,
+        instagram=place.instagram,
+        regiao=place.regiao,
+        cidade=place.cidade,
+        rua=place.rua,
+        porta=place.porta,
+        cod_postal=place.cod_postal,
+        latitude=place.latitude,
+        longitude=place.longitude,
+        location_type=place.location_type,
+        coverage_radius=place.coverage_radius,
+        booking_enabled=place.booking_enabled,
+        is_bio_diamond=place.is_bio_diamond,
+        about=place.about,
+        booking_slot_minutes=getattr(place, 'booking_slot_minutes', None) or 30,
+        created_at=place.created_at,
+        updated_at=place.updated_at,
+        owner_id=place.owner_id,
+        images=build_image_responses(images),
+        **extra
+    )
+
+
+async def load_images_by_place(db: AsyncSession, place_ids: Sequence[int]) -> Dict[int, List[PlaceImage]]:
+    """Fetch images for all given places in one IN query, grouped by place_id"""
+    images_by_place: Dict[int, List[PlaceImage]] = {place_id: [] for place_id in place_ids}
+    if not place_ids:
+        return images_by_place
+
+    result = await db.execute(
+        select(PlaceImage)
+        .where(PlaceImage.place_id.in_(list(place_ids)))
+        .order_by(PlaceImage.place_id, PlaceImage.id)
+    )
+    for image in result.scalars().all():
+        images_by_place.setdefault(image.place_id, []).append(image)
+    return images_by_place
+
+
+async def build_place_responses(db: AsyncSession, places: Sequence[Place]) -> List[PlaceResponse]:
+    """
+    Build PlaceResponse objects for a page of places.
+
+    Issues one query for the images and one for the review aggregates of the
+    whole page regardless of page size, so listing cost stays at (page query + 2).
+    """
+    place_ids = [place.id for place in places]
+    images_by_place = await load_images_by_place(db, place_ids)
+    stats_by_place = await load_review_stats(db, place_ids)
+    return [
+        build_place_response(
+            place, images_by_place.get(place.id, []), reviews=review_summary(stats_by_place.get(place.id))
+        )
+        for place in places
+    ]
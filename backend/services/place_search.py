@@ -0,0 +1,88 @@
+"""
+Indexed place search.
+
+Matches a search term against the generated places.search_vector (weighted
+tsvector of name, city/region and type) and places.search_text (lowercased,
+unaccented concatenation of the same fields), both GIN-indexed - see alembic
+revision 8b1f6d2e4c57. A place matches when:
+
+- every word of the term is a prefix of one of its tokens (tsvector), or
+- the whole term is a substring of its search text (trigram-indexed LIKE), or
+- the term is similar to a word of its search text (trigram word similarity,
+  tolerates typos)
+
+Terms are unaccented the same way as the stored columns, so "cabeleireiro
+sao joao" finds "Cabeleireiro São João". Results are ordered by relevance.
+"""
+import re
+import unicodedata
+from typing import List
+
+from sqlalchemy import Text, func, literal, literal_column, or_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.sql import Select
+
+from core.pagination import SortKey
+from models.place_existing import Place
+
+# Generated columns maintained by Postgres; not mapped on Place so that
+# metadata.create_all() keeps working without the extensions installed
+search_vector = literal_column("places.search_vector", type_=TSVECTOR)
+search_text = literal_column("places.search_text", type_=Text)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_search_term(term: str) -> str:
+    """Lowercase and strip accents (same result as lower(unaccent()) for Portuguese text)"""
+    decomposed = unicodedata.normalize('NFKD', term or '')
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.lower().split())
+
+
+def search_tokens(term: str) -> List[str]:
+    """Alphanumeric words of a normalized term"""
+    return _TOKEN.findall(normalize_search_term(term))
+
+
+def prefix_tsquery(tokens: List[str]) -> str:
+    """to_tsquery() text requiring every token as a prefix ("sao:* & joao:*")"""
+    return ' & '.join(f"{token}:*" for token in tokens)
+
+
+def _search_clauses(term: str):
+    """(match conditions, relevance expression) for a term; None when it is blank"""
+    normalized = normalize_search_term(term)
+    tokens = search_tokens(term)
+    if not normalized:
+        return None
+
+    conditions = [search_text.contains(normalized, autoescape=True)]
+    rank = func.word_similarity(literal(normalized), search_text)
+    if tokens:
+        tsquery = func.to_tsquery('simple', prefix_tsquery(tokens))
+        conditions.append(search_vector.op('@@')(tsquery))
+        rank = rank + func.ts_rank_cd(search_vector, tsquery)
+    conditions.append(literal(normalized).op('<%')(search_text))
+    return conditions, rank
+
+
+def apply_place_search(query: Select, term: str) -> Select:
+    """
+    Restrict a select(Place) query to places matching `term`, most relevant first.
+
+    Ties are broken by place id so pagination is stable.
+    """
+    clauses = _search_clauses(term)
+    if clauses is None:
+        return query
+    conditions, rank = clauses
+    return query.where(or_(*conditions)).order_by(rank.desc(), Place.id)
+
+
+def place_search_sort_keys(term: str) -> List[SortKey]:
+    """Keyset sort keys matching apply_place_search's ordering (by id for a blank term)"""
+    clauses = _search_clauses(term)
+    if clauses is None:
+        return [SortKey(Place.id)]
+    return [SortKey(clauses[1], descending=True), SortKey(Place.id)]
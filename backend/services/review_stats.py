@@ -0,0 +1,104 @@
+"""
+Per-place review aggregates.
+
+place_review_stats holds the review count, rating sum and a 1-5 star
+histogram for every place with reviews. create_place_review calls
+record_review() in the same transaction as the review insert (an atomic
+upsert, so concurrent reviews never lose an increment); detail pages and
+listings read the row instead of aggregating 'reviews'.
+
+rebuild_review_stats() recomputes rows from 'reviews' for backfills or after
+bulk edits (scripts/rebuild_review_stats.py).
+"""
+from typing import Dict, Iterable, Optional, Sequence
+
+from sqlalchemy import Float, cast, delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.place_existing import Place, PlaceReviewStats, Review
+
+RATINGS = (1, 2, 3, 4, 5)
+
+
+def histogram_column(rating: int) -> str:
+    return f"rating_{rating}"
+
+
+async def record_review(db: AsyncSession, place_id: int, rating: int) -> None:
+    """Add one review to a place's aggregates (flushed with the caller's transaction)"""
+    histogram = {histogram_column(value): int(value == rating) for value in RATINGS}
+    stmt = pg_insert(PlaceReviewStats).values(
+        place_id=place_id, review_count=1, rating_sum=rating, **histogram
+    )
+    increments = {
+        column: getattr(PlaceReviewStats, column) + getattr(stmt.excluded, column)
+        for column in ("review_count", "rating_sum", *histogram)
+    }
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[PlaceReviewStats.place_id],
+        set_={**increments, "updated_at": func.current_timestamp()}
+    ))
+
+
+async def rebuild_review_stats(db: AsyncSession, place_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute aggregates from 'reviews' for the given places (all when None).
+
+    Reviews of places that no longer exist are skipped, as in the backfill
+    migration, so they cannot break the place_id foreign key.
+
+    Returns:
+        Number of places with reviews that were written. The caller commits.
+    """
+    aggregate = select(
+        Review.place_id,
+        func.count(),
+        func.coalesce(func.sum(Review.rating), 0),
+        *[func.count().filter(Review.rating == value) for value in RATINGS],
+    ).join(Place, Place.id == Review.place_id).group_by(Review.place_id)
+    clear = delete(PlaceReviewStats)
+    if place_ids is not None:
+        place_ids = list(place_ids)
+        aggregate = aggregate.where(Review.place_id.in_(place_ids))
+        clear = clear.where(PlaceReviewStats.place_id.in_(place_ids))
+
+    await db.execute(clear)
+    result = await db.execute(insert(PlaceReviewStats).from_select(
+        ["place_id", "review_count", "rating_sum", *[histogram_column(value) for value in RATINGS]],
+        aggregate
+    ))
+    return result.rowcount
+
+
+async def load_review_stats(db: AsyncSession, place_ids: Sequence[int]) -> Dict[int, PlaceReviewStats]:
+    """Aggregates for a page of places in one query (places without reviews are absent)"""
+    if not place_ids:
+        return {}
+    result = await db.execute(
+        select(PlaceReviewStats).where(PlaceReviewStats.place_id.in_(list(place_ids)))
+    )
+    return {stats.place_id: stats for stats in result.scalars().all()}
+
+
+def review_summary(stats: Optional[PlaceReviewStats]) -> dict:
+    """Review summary payload (PlaceResponse.reviews) for a place"""
+    if stats is None or not stats.review_count:
+        return {
+            "average_rating": 0.0,
+            "total_reviews": 0,
+            "rating_histogram": {str(value): 0 for value in RATINGS},
+        }
+    return {
+        "average_rating": round(stats.average_rating, 2),
+        "total_reviews": stats.review_count,
+        "rating_histogram": {str(value): getattr(stats, histogram_column(value)) or 0 for value in RATINGS},
+    }
+
+
+def average_rating_expression():
+    """Average rating for listing filters and sorts (0 without reviews; needs an outer join)"""
+    return func.coalesce(
+        cast(PlaceReviewStats.rating_sum, Float) / func.nullif(PlaceReviewStats.review_count, 0),
+        0.0
+    )
@@ -120,6 +120,10 @@ async def create_subscription_and_get_client_secret(
             user.trial_end = now + timedelta(days=trial_days)
             user.trial_status = "active"
             await db.commit()
+            from core.principal import invalidate_principal
+            from services.entitlements import invalidate_entitlements
+            invalidate_principal(user.id)
+            invalidate_entitlements(user.id)
             
             # Sync to UserPlaceSubscription records for immediate feature access
             await sync_subscription_to_places(db, user.id, plan_code, sub, "trialing")
@@ -222,76 +222,6 @@ class WhatsAppService:
         except TwilioException as e:
             logger.error(f"Failed to fetch message status: {str(e)}")
             return None
-    
-    def send_batch_messages(
-        self, 
-        recipients: list, 
-        message: str, 
-        campaign_id: int,
-        db: Session,
-        batch_size: int = 10
-    ) -> Dict[str, Any]:
-        """
-        Send WhatsApp messages to multiple recipients in batches
-        
-        Args:
-            recipients: List of recipient objects with phone numbers
-            message: Message content
-            campaign_id: Campaign ID
-            db: Database session
-            batch_size: Number of messages to send per batch (rate limiting)
-        
-        Returns:
-            Dict with batch sending results
-        """
-        if not self.is_available():
-            return {
-                'success': False,
-                'error': 'WhatsApp service not available',
-                'sent_count': 0,
-                'failed_count': 0
-            }
-        
-        results = {
-            'success': True,
-            'sent_count': 0,
-            'failed_count': 0,
-            'errors': []
-        }
-        
-        # Process recipients in batches to respect rate limits
-        for i in range(0, len(recipients), batch_size):
-            batch = recipients[i:i + batch_size]
-            
-            for recipient in batch:
-                result = self.send_message(
-                    to_phone=recipient.customer_phone,
-                    message=message,
-                    campaign_id=campaign_id,
-                    recipient_id=recipient.id,
-                    db=db
-                )
-                
-                if result['success']:
-                    results['sent_count'] += 1
-                else:
-                    results['failed_count'] += 1
-                    results['errors'].append({
-                        'recipient_id': recipient.id,
-                        'error': result['error']
-                    })
-            
-            # Small delay between batches to respect rate limits
-            if i + batch_size < len(recipients):
-                import time
-                time.sleep(1)
-        
-        if results['failed_count'] > 0:
-            results['success'] = False
-        
-        logger.info(f"Batch WhatsApp sending completed. Sent: {results['sent_count']}, Failed: {results['failed_count']}")
-        
-        return results
 
 
 # Global instance
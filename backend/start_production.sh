@@ -1,2 +1,3 @@
 #!/bin/bash
-uvicorn main:app --host 0.0.0.0 --port 5001 --workers 4 --loop uvloop
\ No newline at end of file
+export DB_PROFILE=${DB_PROFILE:-prod}
+uvicorn main:app --host 0.0.0.0 --port 5001 --workers 4 --loop uvloop
@@ -15,9 +15,8 @@ from main import app
 from core.database import get_db, Base
 from core.config import settings
 from models.user import User
-from models.place_existing import Place, PlaceImage, Service, PlaceService
+from models.place_existing import Place, PlaceImage, Service, PlaceService, Booking
 from models.base import Base
-from ..models.booking import Booking
 # from models.business import Business  # Commented out - using Place model instead
 
 
@@ -34,7 +33,7 @@ TestingSessionLocal = sessionmaker(
 )
 
 
-@pytest_asyncio.fixture(scope="session", autouse=True)
+@pytest_asyncio.fixture(scope="session")
 async def setup_test_db():
     """Set up and tear down the test database schema once per session."""
     async with test_engine.begin() as conn:
@@ -48,7 +47,7 @@ async def setup_test_db():
 
 
 @pytest_asyncio.fixture(scope="function")
-async def db_session():
+async def db_session(setup_test_db):
     """Create a fresh database session for each test."""
     async with TestingSessionLocal() as session:
         yield session
@@ -56,7 +55,7 @@ async def db_session():
 
 
 @pytest.fixture(scope="function")
-def client():
+def client(setup_test_db):
     """Create a test client with database dependency override."""
     async def override_get_db():
         async with TestingSessionLocal() as session:
@@ -74,7 +73,7 @@ def client():
 
 
 @pytest.fixture(scope="function")
-async def async_client():
+async def async_client(setup_test_db):
     """Create an async test client."""
     async def override_get_db():
         async with TestingSessionLocal() as session:
@@ -91,6 +90,112 @@ async def async_client():
     app.dependency_overrides.clear()
 
 
+class FakeResult:
+    """Canned query result: rows are returned as given (already scalars for scalars())"""
+
+    _NO_SCALAR = object()
+
+    def __init__(self, rows=(), scalar=_NO_SCALAR, rowcount=None):
+        self.rows = list(rows)
+        self._scalar = scalar
+        self.rowcount = len(self.rows) if rowcount is None else rowcount
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def all(self):
+        return self.rows
+
+    def scalars(self):
+        return self
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+    def scalar_one_or_none(self):
+        return self.first()
+
+    def scalar(self):
+        return self.first() if self._scalar is self._NO_SCALAR else self._scalar
+
+
+class FakeSession:
+    """
+    Async session stand-in for unit tests that do not need a database.
+
+    execute/scalar/stream return the canned results in order, the last one
+    repeating (lists are wrapped in FakeResult), or whatever
+    respond(statement, params) returns when given. Statements, added objects,
+    flushes, commits and rollbacks are recorded; flush gives added objects
+    without an id the next one, and commit raises commit_error when set.
+    """
+
+    def __init__(self, *results, respond=None, commit_error=None):
+        self.results = list(results)
+        self.respond = respond
+        self.commit_error = commit_error
+        self.statements = []
+        self.added = []
+        self.flushes = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self.info = {}
+        self._next_id = 1
+
+    @property
+    def queries(self):
+        return len(self.statements)
+
+    def _result(self, statement, params=None):
+        self.statements.append(statement)
+        if self.respond is not None:
+            result = self.respond(statement, params)
+        elif self.results:
+            result = self.results[min(len(self.statements), len(self.results)) - 1]
+        else:
+            result = []
+        return FakeResult(result) if isinstance(result, (list, tuple)) else result
+
+    async def execute(self, statement, params=None):
+        return self._result(statement, params)
+
+    async def scalar(self, statement, params=None):
+        return self._result(statement, params).scalar()
+
+    async def stream(self, statement):
+        return self._result(statement)
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    def add_all(self, objs):
+        self.added.extend(objs)
+
+    async def flush(self):
+        self.flushes += 1
+        for obj in self.added:
+            if getattr(obj, "id", False) is None:
+                obj.id = self._next_id
+                self._next_id += 1
+
+    async def commit(self):
+        if self.commit_error is not None:
+            raise self.commit_error
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+    async def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
 @pytest.fixture
 def sample_user_data():
     """Sample user data for testing."""
@@ -0,0 +1,185 @@
+"""
+Test the availability engine slot computation.
+"""
+import asyncio
+from datetime import date, time, timedelta
+from types import SimpleNamespace
+
+from models.place_existing import PlaceClosedPeriod
+from services.availability_engine import (
+    DayInputs, DaySchedule, IntervalIndex, build_day_schedule, compute_day_availability, iter_range_availability,
+    load_range_inputs, span_mask, time_to_minutes
+)
+from tests.conftest import FakeSession
+
+
+WORKING_HOURS = {
+    "monday": {"available": True, "start": "09:00", "end": "12:00"},
+    "sunday": {"available": False},
+}
+MONDAY = date(2025, 1, 6)
+SUNDAY = date(2025, 1, 5)
+
+
+def _place():
+    return SimpleNamespace(id=1, get_working_hours=lambda: WORKING_HOURS)
+
+
+def _employee(emp_id):
+    return SimpleNamespace(id=emp_id)
+
+
+def _booking(emp_id, hhmm, duration=None):
+    hours, minutes = map(int, hhmm.split(":"))
+    return SimpleNamespace(
+        employee_id=emp_id, booking_time=time(hours, minutes), total_duration=duration, duration=duration
+    )
+
+
+def _time_off(emp_id, is_full_day=False, half_day_period=None):
+    return SimpleNamespace(employee_id=emp_id, is_full_day=is_full_day, half_day_period=half_day_period)
+
+
+class TestDaySchedule:
+    """Test bitmap-based day schedules."""
+
+    def test_span_mask_bits(self):
+        """Test that span masks cover exactly [start, end)."""
+        assert span_mask(2, 5) == 0b11100
+        assert span_mask(5, 5) == 0
+
+    def test_booking_blocks_overlapping_slots(self):
+        """Test that a booking blocks every slot its interval overlaps."""
+        schedule = DaySchedule(time_to_minutes("09:00"), time_to_minutes("11:00"), [1])
+        schedule.add_booking(1, time_to_minutes("09:40"), time_to_minutes("10:10"))
+
+        assert schedule.free_slots(1) == ["09:00", "10:30"]
+        assert schedule.booked_slots(1) == ["09:30", "10:00"]
+
+    def test_long_booking_blocks_multiple_slots(self):
+        """Test that a 90-minute booking blocks three 30-minute slots."""
+        inputs = DayInputs(employees=[_employee(1)], bookings=[_booking(1, "09:00", 90)])
+        schedule = build_day_schedule(time_to_minutes("09:00"), time_to_minutes("11:00"), inputs)
+
+        assert schedule.free_slots(1) == ["10:30"]
+
+    def test_service_duration_must_fit(self):
+        """Test that a service needs a free window of its full duration before closing."""
+        inputs = DayInputs(employees=[_employee(1)], bookings=[_booking(1, "10:00", 30)])
+        schedule = build_day_schedule(time_to_minutes("09:00"), time_to_minutes("12:00"), inputs)
+
+        assert schedule.free_slots(1, duration=60) == ["09:00", "10:30", "11:00"]
+
+    def test_slot_granularity(self):
+        """Test that 15-minute granularity produces quarter-hour slots."""
+        inputs = DayInputs(employees=[_employee(1)], bookings=[_booking(1, "09:15", 15)])
+        schedule = build_day_schedule(time_to_minutes("09:00"), time_to_minutes("10:00"), inputs, slot_minutes=15)
+
+        assert schedule.time_slots == ["09:00", "09:15", "09:30", "09:45"]
+        assert schedule.free_slots(1) == ["09:00", "09:30", "09:45"]
+
+    def test_any_employee_slot_free_if_one_is_free(self):
+        """Test that a slot stays available while at least one employee is free."""
+        inputs = DayInputs(
+            employees=[_employee(1), _employee(2)],
+            bookings=[_booking(1, "09:00"), _booking(2, "09:00"), _booking(1, "10:00")],
+        )
+        schedule = build_day_schedule(time_to_minutes("09:00"), time_to_minutes("11:00"), inputs)
+
+        assert schedule.free_slots() == ["09:30", "10:00", "10:30"]
+        assert schedule.booked_slots() == ["09:00", "10:00"]
+
+    def test_half_day_time_off(self):
+        """Test that AM time-off blocks morning slots only."""
+        inputs = DayInputs(employees=[_employee(1)], time_off=[_time_off(1, half_day_period="AM")])
+        schedule = build_day_schedule(time_to_minutes("11:00"), time_to_minutes("13:00"), inputs)
+
+        assert schedule.free_slots(1) == ["12:00", "12:30"]
+
+
+class TestIntervalIndex:
+    """Test booking interval overlap queries."""
+
+    def test_overlap_queries(self):
+        """Test half-open overlap semantics."""
+        index = IntervalIndex([(600, 690), (720, 750)])
+
+        assert index.overlaps(660, 690)
+        assert index.overlaps(540, 601)
+        assert not index.overlaps(690, 720)
+        assert not index.overlaps(540, 600)
+        assert not index.overlaps(750, 800)
+
+    def test_nested_intervals(self):
+        """Test that a long interval is found behind shorter later-starting ones."""
+        index = IntervalIndex([(540, 720), (560, 570), (580, 590)])
+
+        assert index.overlaps(700, 710)
+
+    def test_add_and_empty(self):
+        """Test adding intervals to an empty index."""
+        index = IntervalIndex()
+        assert not index.overlaps(0, 1440)
+
+        index.add(600, 630)
+        assert index.overlaps(615, 616)
+        assert len(index) == 1
+
+
+class TestComputeDayAvailability:
+    """Test the availability payload."""
+
+    def test_closed_weekday(self):
+        """Test that a closed weekday returns no slots."""
+        payload = compute_day_availability(_place(), SUNDAY, DayInputs(employees=[_employee(1)]))
+
+        assert payload["is_available"] is False
+        assert payload["reason"] == "Place is closed on Sunday"
+
+    def test_closure_blocks_day(self):
+        """Test that a closed period blocks the whole day."""
+        payload = compute_day_availability(_place(), MONDAY, DayInputs(closures=[object()]))
+
+        assert payload["available_slots"] == []
+        assert payload["reason"] == "Place is closed"
+
+    def test_specific_employee(self):
+        """Test availability restricted to one employee."""
+        inputs = DayInputs(
+            employees=[_employee(1), _employee(2)],
+            bookings=[_booking(2, "09:00")],
+        )
+        payload = compute_day_availability(_place(), MONDAY, inputs, "2025-01-06", employee_id=2)
+
+        assert payload["date"] == "2025-01-06"
+        assert payload["time_slots"][0] == "09:00"
+        assert "09:00" not in payload["available_slots"]
+        assert payload["booked_slots"] == ["09:00"]
+        assert payload["available_employees"] == [1, 2]
+
+
+class TestRangeAvailability:
+    """Test multi-day availability loading."""
+
+    def test_range_uses_one_query_per_table(self):
+        """Test that a 14-day window is loaded with four queries and rules expanded per day."""
+        start = MONDAY
+        end = MONDAY + timedelta(days=13)
+        # Yearly closure on the second Monday of the window
+        closure = PlaceClosedPeriod(
+            start_date=date(2020, 1, 13), end_date=date(2020, 1, 13), status='active',
+            is_recurring=True, recurrence_pattern={"frequency": "yearly", "month": 1, "day": 13}
+        )
+        booking = _booking(1, "09:00", 30)
+        booking.booking_date = MONDAY
+        session = FakeSession([closure], [_employee(1)], [booking], [])
+
+        inputs_by_day = asyncio.run(load_range_inputs(session, 1, start, end))
+        days = list(iter_range_availability(_place(), inputs_by_day))
+
+        assert session.queries == 4
+        assert len(days) == 14
+        assert days[0]["date"] == "2025-01-06"
+        assert "09:00" not in days[0]["available_slots"]
+        assert days[7]["reason"] == "Place is closed"
+        assert days[1]["reason"] == "Place is closed on Tuesday"
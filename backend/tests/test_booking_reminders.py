@@ -0,0 +1,184 @@
+"""
+Test the booking reminder job: the due query, idempotent marking and concurrent sends.
+"""
+import asyncio
+import importlib.util
+from datetime import date, datetime, time
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+from sqlalchemy.dialects import postgresql
+
+from services.booking_reminders import BookingReminderJob, DueReminder, due_bookings_statement, mark_statement
+from services.campaign_dispatch import CampaignEmailSender, CampaignWhatsAppSender
+from services.email_outbox import BrevoAsyncClient
+from tests.conftest import FakeSession
+
+_spec = importlib.util.spec_from_file_location(
+    "brevo_stub", Path(__file__).resolve().parent.parent / "scripts" / "brevo_stub.py"
+)
+brevo_stub = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(brevo_stub)
+
+NOW = datetime(2030, 1, 15, 10, 0)
+
+
+def _row(booking_id, email="ana@example.com", phone="+351910000001", booking_date=date(2030, 1, 16), **extra):
+    values = dict(
+        id=booking_id, customer_name=f"Customer {booking_id}", customer_email=email, customer_phone=phone,
+        booking_date=booking_date, booking_time=time(9, 30), business_name="Salon Lisboa",
+        business_phone="+351210000000", rua="Rua Augusta", porta="1", cod_postal="1100-048", cidade="Lisboa",
+        service_name="Cut", employee_name="Rita", language="pt",
+    )
+    values.update(extra)
+    return SimpleNamespace(**values)
+
+
+def _senders(twilio_requests, email_key="stub-key"):
+    def handler(request):
+        twilio_requests.append(request)
+        if b"To=whatsapp%3A%2B15550000500" in request.content:
+            return httpx.Response(503, json={"message": "unavailable"})
+        return httpx.Response(201, json={"sid": f"SM{len(twilio_requests)}"})
+
+    email = CampaignEmailSender(
+        BrevoAsyncClient(
+            "http://brevo.test/v3", email_key, max_connections=20, timeout=5,
+            transport=httpx.ASGITransport(app=brevo_stub.app)
+        ),
+        rate=0,
+    )
+    whatsapp = CampaignWhatsAppSender(
+        "http://twilio.test", "AC123", "token", "+15550009999", rate=0, transport=httpx.MockTransport(handler)
+    )
+    return [email, whatsapp]
+
+
+class _Store:
+    """Bookings behind a fake session: the stream yields unmarked rows, updates mark and unmark them"""
+
+    def __init__(self, rows):
+        self.rows = {row.id: row for row in rows}
+        self.marked = set()
+        self.chunks = []
+
+    def session(self):
+        return FakeSession(respond=self.respond)
+
+    async def partitions(self, size):
+        due = [row for i, row in sorted(self.rows.items()) if i not in self.marked]
+        for start in range(0, len(due), size):
+            self.chunks.append(len(due[start:start + size]))
+            yield due[start:start + size]
+
+    def respond(self, statement, params):
+        size = statement.get_execution_options().get("yield_per")
+        if size:
+            # Streamed due-bookings query
+            return SimpleNamespace(partitions=lambda: self.partitions(size))
+        params = statement.compile().params
+        ids = next(value for value in params.values() if isinstance(value, list))
+        if params["reminder_sent_at"] is None:
+            self.marked.difference_update(ids)
+            return None
+        newly = [i for i in ids if i not in self.marked]
+        self.marked.update(newly)
+        return newly
+
+
+def _job(store, senders, chunk_size=2):
+    job = BookingReminderJob(session_factory=store.session, senders=senders, clock=lambda: NOW)
+    job.chunk_size = chunk_size
+    job.channels = ["email", "whatsapp"]
+    return job
+
+
+class TestStatements:
+    """Test the due-bookings query and the mark statement."""
+
+    def test_due_query_joins_and_window(self):
+        """Test one joined query filtered on unreminded bookings starting in the window."""
+        sql = str(due_bookings_statement(NOW, datetime(2030, 1, 16, 10, 0)).compile(dialect=postgresql.dialect()))
+
+        assert "JOIN places ON places.id = bookings.salon_id" in sql
+        assert "LEFT OUTER JOIN services" in sql and "LEFT OUTER JOIN place_employees" in sql
+        assert "bookings.reminder_sent_at IS NULL" in sql
+        assert "bookings.booking_date + bookings.booking_time >" in sql
+        assert "ORDER BY bookings.booking_date, bookings.booking_time, bookings.id" in sql
+
+    def test_mark_only_takes_unmarked_rows(self):
+        """Test that marking is guarded so concurrent rounds cannot both take a booking."""
+        sql = str(mark_statement([1, 2], NOW).compile(dialect=postgresql.dialect()))
+
+        assert "bookings.reminder_sent_at IS NULL" in sql
+        assert "RETURNING bookings.id" in sql
+
+
+class TestDueReminder:
+    """Test turning a joined row into the reminder template's input."""
+
+    def test_address_and_when(self):
+        """Test the place address and the relative day wording."""
+        reminder = DueReminder.from_row(_row(1))
+
+        assert reminder.business_address == "Rua Augusta 1, 1100-048 Lisboa"
+        assert reminder.booking_data(date(2030, 1, 15))["when"] == "tomorrow"
+        assert reminder.booking_data(date(2030, 1, 16))["when"] == "today"
+        assert reminder.booking_data(date(2030, 1, 10))["when"] == "on 2030-01-16"
+
+    def test_missing_place_details_use_template_defaults(self):
+        """Test that missing joined values are left to the template method's defaults."""
+        reminder = DueReminder.from_row(_row(1, rua=None, porta=None, cod_postal=None, cidade=None, service_name=None))
+        data = reminder.booking_data(NOW.date())
+
+        assert reminder.business_address is None
+        assert "business_address" not in data and "service_name" not in data
+
+
+class TestBookingReminderJob:
+    """Test streaming, marking and sending reminders."""
+
+    def test_reminds_every_booking_once(self):
+        """Test that chunks are sent on both channels and a second round sends nothing."""
+        brevo_stub.app.state.messages.clear()
+        twilio = []
+        store = _Store([_row(i, phone=f"+35191000000{i}") for i in range(1, 6)])
+        job = _job(store, _senders(twilio))
+
+        first = asyncio.run(job.run_once())
+        second = asyncio.run(job.run_once())
+
+        assert (first, second) == (5, 0)
+        assert store.chunks == [2, 2, 1]
+        assert store.marked == {1, 2, 3, 4, 5}
+        assert len(brevo_stub.app.state.messages) == 5
+        assert len(twilio) == 5
+        message = brevo_stub.app.state.messages[0]["payload"]
+        assert message["subject"] == "Appointment Reminder - Cut tomorrow"
+        assert "With: Rita" in message["textContent"]
+        assert b"Appointment+Reminder" in twilio[0].content
+
+    def test_retryable_failures_are_unmarked(self):
+        """Test that a booking is retried only when every channel failed retryably."""
+        twilio = []
+        store = _Store([
+            _row(1, email="", phone="+15550000500"),
+            _row(2, phone="+15550000500"),
+        ])
+        job = _job(store, _senders(twilio))
+
+        reminded = asyncio.run(job.run_once())
+
+        assert reminded == 1
+        assert store.marked == {2}
+        assert job.counters["retried"] == 1
+
+    def test_no_provider_marks_nothing(self):
+        """Test that without a configured provider no booking is marked."""
+        store = _Store([_row(1)])
+        job = _job(store, _senders([], email_key=""))
+        job.channels = ["email"]
+
+        assert asyncio.run(job.run_once()) == 0
+        assert store.marked == set()
@@ -0,0 +1,123 @@
+"""
+Test booking persistence helpers.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from models.place_existing import Booking, BookingService
+from services.booking_writer import (
+    BookingConflictError, commit_booking, is_booking_conflict, load_services_by_place_service_id, save_booking
+)
+from tests.conftest import FakeSession
+
+
+def _integrity_error(sqlstate, message):
+    orig = Exception(message)
+    orig.sqlstate = sqlstate
+    return IntegrityError("INSERT INTO bookings ...", {}, orig)
+
+
+def _overlap_error():
+    return _integrity_error(
+        "23P01", 'conflicting key value violates exclusion constraint "ex_bookings_employee_overlap"'
+    )
+
+
+def _services(count):
+    return [
+        {'service_id': i, 'service_name': f"Service {i}", 'service_price': 10, 'service_duration': 30}
+        for i in range(1, count + 1)
+    ]
+
+
+class TestLoadServices:
+    """Test batched service validation."""
+
+    @pytest.mark.parametrize("count", [1, 5])
+    def test_one_query_for_all_services(self, count):
+        """Test that any number of requested services is loaded with one join."""
+        rows = [
+            (SimpleNamespace(id=100 + i, service_id=i), SimpleNamespace(id=i, name=f"Service {i}"))
+            for i in range(count)
+        ]
+        session = FakeSession(rows)
+
+        services = asyncio.run(load_services_by_place_service_id(session, 1, [100 + i for i in range(count)]))
+
+        assert session.queries == 1
+        assert sorted(services) == [100 + i for i in range(count)]
+
+
+class TestSaveBooking:
+    """Test single-transaction booking writes."""
+
+    def test_single_commit(self):
+        """Test that the booking and its services are committed together."""
+        session = FakeSession()
+        booking = Booking(customer_name="Ana")
+
+        asyncio.run(save_booking(session, booking, _services(3)))
+
+        assert session.flushes == 1
+        assert session.commits == 1
+        booking_services = [obj for obj in session.added if isinstance(obj, BookingService)]
+        assert len(booking_services) == 3
+        assert booking.id is not None
+        assert {bs.booking_id for bs in booking_services} == {booking.id}
+
+    def test_missing_duration_uses_slot_minutes(self):
+        """Test that a booking without a duration stores the place's slot size."""
+        booking = Booking(customer_name="Ana", total_duration=0)
+
+        asyncio.run(save_booking(FakeSession(), booking, _services(1), slot_minutes=15))
+
+        assert booking.duration == 15
+
+    def test_duration_kept_when_set(self):
+        """Test that a booking's own duration is not overwritten."""
+        booking = Booking(customer_name="Ana", duration=45, total_duration=45)
+
+        asyncio.run(save_booking(FakeSession(), booking, _services(1), slot_minutes=15))
+
+        assert booking.duration == 45
+
+    def test_rollback_on_failure(self):
+        """Test that a failed commit rolls the transaction back."""
+        session = FakeSession(commit_error=RuntimeError("commit failed"))
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(save_booking(session, Booking(customer_name="Ana"), _services(1)))
+
+        assert session.rollbacks == 1
+        assert session.commits == 0
+
+
+class TestBookingConflicts:
+    """Test translation of overlap constraint violations."""
+
+    def test_is_booking_conflict(self):
+        """Test that only exclusion violations count as booking conflicts."""
+        assert is_booking_conflict(_overlap_error())
+        assert is_booking_conflict(_integrity_error(None, "violates ex_bookings_employee_overlap"))
+        assert not is_booking_conflict(_integrity_error("23503", "violates foreign key constraint"))
+
+    def test_save_booking_raises_conflict(self):
+        """Test that an overlapping insert rolls back and raises BookingConflictError."""
+        session = FakeSession(commit_error=_overlap_error())
+
+        with pytest.raises(BookingConflictError):
+            asyncio.run(save_booking(session, Booking(customer_name="Ana"), _services(1)))
+
+        assert session.rollbacks == 1
+
+    def test_other_integrity_errors_propagate(self):
+        """Test that unrelated integrity errors are re-raised unchanged."""
+        session = FakeSession(commit_error=_integrity_error("23503", "violates foreign key constraint"))
+
+        with pytest.raises(IntegrityError):
+            asyncio.run(commit_booking(session))
+
+        assert session.rollbacks == 1
@@ -0,0 +1,318 @@
+"""
+Test the campaign dispatcher: rate limiting, chunked sending and checkpoints.
+"""
+import asyncio
+import importlib.util
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+from sqlalchemy.dialects import postgresql
+
+from services.campaign_dispatch import (
+    CampaignContent, CampaignDispatcher, CampaignEmailSender, CampaignWhatsAppSender, DispatchRecipient,
+    TokenBucket, claim_recipients_statement, to_e164
+)
+from brevo_email_service import BrevoEmailService
+from services.email_outbox import BrevoAsyncClient
+from tests.conftest import FakeResult, FakeSession
+
+_spec = importlib.util.spec_from_file_location(
+    "brevo_stub", Path(__file__).resolve().parent.parent / "scripts" / "brevo_stub.py"
+)
+brevo_stub = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(brevo_stub)
+
+NOW = datetime(2030, 1, 15, 10, 0, tzinfo=timezone.utc)
+EMAIL = CampaignContent(7, "email", "Spring offer", "<p>10% off</p>")
+WHATSAPP = CampaignContent(7, "whatsapp", "", "10% off this week")
+
+
+def _email_sender(rate=0, batch_size=1):
+    client = BrevoAsyncClient(
+        "http://brevo.test/v3", "stub-key", max_connections=20, timeout=5,
+        transport=httpx.ASGITransport(app=brevo_stub.app)
+    )
+    return CampaignEmailSender(client, rate, batch_size=batch_size)
+
+
+def _twilio_transport(requests):
+    def handler(request):
+        requests.append(request)
+        if b"To=whatsapp%3A%2B15550000500" in request.content:
+            return httpx.Response(503, json={"message": "unavailable"})
+        return httpx.Response(201, json={"sid": f"SM{len(requests)}", "status": "queued"})
+    return httpx.MockTransport(handler)
+
+
+def _dispatcher(senders, concurrency=20, max_attempts=1, chunk_size=200, session_factory=None):
+    dispatcher = CampaignDispatcher(session_factory=session_factory, senders=senders)
+    dispatcher.concurrency = concurrency
+    dispatcher.max_attempts = max_attempts
+    dispatcher.chunk_size = chunk_size
+    return dispatcher
+
+
+class _Store:
+    """Recipient rows behind a fake session: claims hand out pending ids, bulk updates are recorded"""
+
+    def __init__(self, recipients, chunk_size=200):
+        self.chunk_size = chunk_size
+        self.recipients = {r.id: r for r in recipients}
+        self.status = {r.id: "pending" for r in recipients}
+        self.checkpoints = []
+
+    def session(self):
+        return FakeSession(respond=self.respond)
+
+    def respond(self, statement, params):
+        if params is not None:
+            # Checkpoint: bulk UPDATE by primary key
+            self.checkpoints.append(params)
+            for row in params:
+                self.status[row["id"]] = row["status"]
+            return None
+        if statement.is_select:
+            return FakeResult(scalar=sum(1 for status in self.status.values() if status == "pending"))
+        ids = [i for i, status in sorted(self.status.items()) if status == "pending"][:self.chunk_size]
+        for i in ids:
+            self.status[i] = "sending"
+        return [
+            SimpleNamespace(
+                id=i, customer_email=self.recipients[i].email, customer_phone=self.recipients[i].phone,
+                customer_name=self.recipients[i].name,
+            )
+            for i in ids
+        ]
+
+
+class TestTokenBucket:
+    """Test the per-provider rate limiter."""
+
+    def test_burst_then_rate(self):
+        """Test that the burst is free and later tokens arrive at `rate` per second."""
+        clock = SimpleNamespace(now=0.0)
+        bucket = TokenBucket(rate=10, burst=5, clock=lambda: clock.now)
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+            clock.now += seconds
+
+        async def run():
+            real_sleep = asyncio.sleep
+            asyncio.sleep = fake_sleep
+            try:
+                for _ in range(8):
+                    await bucket.acquire()
+            finally:
+                asyncio.sleep = real_sleep
+
+        asyncio.run(run())
+
+        assert len(sleeps) == 3
+        assert abs(clock.now - 0.3) < 1e-9
+
+    def test_zero_rate_is_unlimited(self):
+        """Test that rate 0 disables limiting."""
+        bucket = TokenBucket(rate=0)
+
+        async def run():
+            for _ in range(1000):
+                await bucket.acquire()
+
+        asyncio.run(asyncio.wait_for(run(), timeout=1))
+
+
+class TestClaim:
+    """Test the chunk claim statement."""
+
+    def test_claims_pending_and_stale_rows_with_skip_locked(self):
+        """Test that one UPDATE claims pending (and stale sending) rows of the campaign."""
+        sql = str(claim_recipients_statement(7, NOW, 200, 600).compile(dialect=postgresql.dialect()))
+
+        assert sql.startswith("UPDATE campaign_recipients SET status=")
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "campaign_recipients.updated_at <" in sql
+        assert "RETURNING campaign_recipients.id" in sql
+        assert "(SELECT users.name" in sql
+
+
+class TestSenders:
+    """Test the provider clients."""
+
+    def test_e164(self):
+        """Test phone normalisation."""
+        assert to_e164("+351 912-345-678") == "+351912345678"
+        assert to_e164("351912345678") == "+351912345678"
+        assert to_e164("12") is None
+
+    def test_whatsapp_posts_form_to_twilio(self):
+        """Test the Twilio request shape."""
+        requests = []
+        sender = CampaignWhatsAppSender(
+            "http://twilio.test", "AC123", "token", "+15550000001", rate=0, transport=_twilio_transport(requests)
+        )
+
+        sid = asyncio.run(sender.send("+351 912 345 678", WHATSAPP))
+
+        assert sid == "SM1"
+        assert requests[0].url.path == "/2010-04-01/Accounts/AC123/Messages.json"
+        assert b"From=whatsapp%3A%2B15550000001" in requests[0].content
+        assert b"To=whatsapp%3A%2B351912345678" in requests[0].content
+
+
+    def test_whatsapp_renders_params(self):
+        """Test that the message body is personalised from the compiled campaign template."""
+        requests = []
+        sender = CampaignWhatsAppSender(
+            "http://twilio.test", "AC123", "token", "+15550000001", rate=0, transport=_twilio_transport(requests)
+        )
+        content = CampaignContent(7, "whatsapp", "", "Hi {{params.name}}!")
+
+        asyncio.run(sender.send("+351912345678", content, {"name": "Ana"}))
+
+        assert b"Body=Hi+Ana%21" in requests[0].content
+
+
+class TestDispatch:
+    """Test sending chunks and checkpointing."""
+
+    def setup_method(self):
+        brevo_stub.app.state.messages.clear()
+
+    def test_chunk_rows_have_uniform_keys(self):
+        """Test per-recipient results for the bulk UPDATE, across channels and failures."""
+        requests = []
+        whatsapp = CampaignWhatsAppSender(
+            "http://twilio.test", "AC123", "token", "+15550000001", rate=0, transport=_twilio_transport(requests)
+        )
+        dispatcher = _dispatcher([_email_sender(), whatsapp])
+        recipients = [
+            DispatchRecipient(1, "a@example.com", "+15550000100"),
+            DispatchRecipient(2, "b+fail400@example.com", "+15550000500"),
+            DispatchRecipient(3, "c+fail400@example.com", "+15550000300"),
+            DispatchRecipient(4, None, None),
+        ]
+
+        rows, outcomes = asyncio.run(dispatcher.send_chunk(recipients, [EMAIL, WHATSAPP]))
+
+        assert len({tuple(sorted(row)) for row in rows}) == 1
+        by_id = {row["id"]: row for row in rows}
+        assert by_id[1]["status"] == "sent" and by_id[1]["delivery_status"] == "email:sent,whatsapp:sent"
+        assert by_id[2]["status"] == "failed" and "HTTP 400" in by_id[2]["error_message"]
+        assert by_id[3]["status"] == "sent" and "email: HTTP 400" in by_id[3]["error_message"]
+        assert by_id[4]["status"] == "failed" and outcomes[3] == {}
+
+    def test_retries_retryable_errors(self):
+        """Test that 5xx responses are retried up to max_attempts."""
+        requests = []
+        whatsapp = CampaignWhatsAppSender(
+            "http://twilio.test", "AC123", "token", "+15550000001", rate=0, transport=_twilio_transport(requests)
+        )
+        dispatcher = _dispatcher([whatsapp], max_attempts=2)
+
+        async def run():
+            real_sleep = asyncio.sleep
+
+            async def no_sleep(seconds):
+                await real_sleep(0)
+
+            asyncio.sleep = no_sleep
+            try:
+                return await dispatcher.send_chunk([DispatchRecipient(1, None, "+15550000500")], [WHATSAPP])
+            finally:
+                asyncio.sleep = real_sleep
+
+        rows, _ = asyncio.run(run())
+
+        assert len(requests) == 2 and rows[0]["status"] == "failed"
+
+    def test_dispatch_checkpoints_each_chunk(self):
+        """Test that a campaign is sent in chunks with one bulk update per chunk and a throughput figure."""
+        recipients = [DispatchRecipient(i, f"user{i}@example.com", None) for i in range(1, 2001)]
+        store = _Store(recipients, chunk_size=500)
+        dispatcher = _dispatcher([_email_sender()], chunk_size=500, session_factory=store.session)
+
+        progress = asyncio.run(dispatcher.dispatch(7, [EMAIL]))
+
+        assert progress.error is None and progress.total == 2000
+        assert progress.sent == 2000 and progress.failed == 0
+        assert [len(checkpoint) for checkpoint in store.checkpoints] == [500, 500, 500, 500]
+        assert set(store.status.values()) == {"sent"}
+        assert len(brevo_stub.app.state.messages) == 2000
+        assert progress.as_dict()["per_second"] > 0
+
+    def test_dispatch_resumes_pending_rows_only(self):
+        """Test that recipients checkpointed by an earlier run are not sent again."""
+        recipients = [DispatchRecipient(i, f"user{i}@example.com", None) for i in range(1, 11)]
+        store = _Store(recipients)
+        for i in range(1, 7):
+            store.status[i] = "sent"
+        dispatcher = _dispatcher([_email_sender()], session_factory=store.session)
+
+        progress = asyncio.run(dispatcher.dispatch(7, [EMAIL]))
+
+        assert progress.sent == 4
+        assert {m["payload"]["to"][0]["email"] for m in brevo_stub.app.state.messages} == {
+            f"user{i}@example.com" for i in range(7, 11)
+        }
+
+    def test_unconfigured_channels_are_skipped(self):
+        """Test that messages for providers without credentials are not attempted."""
+        whatsapp = CampaignWhatsAppSender("http://twilio.test", "", "", "", rate=0)
+        dispatcher = _dispatcher([_email_sender(), whatsapp])
+
+        assert dispatcher.available_channels() == ["email"]
+
+
+class TestBrevoBatch:
+    """Test messageVersions batches."""
+
+    def setup_method(self):
+        brevo_stub.app.state.messages.clear()
+        brevo_stub.app.state.requests = 0
+
+    def test_batch_payload(self):
+        """Test that recipients become personalised messageVersions of one request."""
+        brevo = BrevoEmailService()
+        versions = [brevo.campaign_version("a@example.com", "Ana"), brevo.campaign_version("b@example.com")]
+
+        payload = brevo.build_batch_payload("Hi {{params.name}}", "<p>Hi</p>", versions, tags=["campaign-7"])
+
+        assert "to" not in payload and len(payload["messageVersions"]) == 2
+        assert payload["messageVersions"][0] == {
+            "to": [{"email": "a@example.com", "name": "Ana"}], "params": {"name": "Ana", "email": "a@example.com"}
+        }
+        assert payload["messageVersions"][1]["to"] == [{"email": "b@example.com"}]
+
+    def test_message_ids_map_to_versions(self):
+        """Test that the response's messageIds line up with the versions."""
+        assert BrevoEmailService.batch_message_ids({"messageIds": ["<1>", "<2>"]}, 3) == ["<1>", "<2>", None]
+
+    def test_campaign_sent_in_batches(self):
+        """Test that 2,000 recipients take four requests and are all checkpointed."""
+        recipients = [DispatchRecipient(i, f"user{i}@example.com", None, f"User {i}") for i in range(1, 2001)]
+        store = _Store(recipients, chunk_size=1000)
+        dispatcher = _dispatcher([_email_sender(batch_size=500)], chunk_size=1000, session_factory=store.session)
+
+        progress = asyncio.run(dispatcher.dispatch(7, [EMAIL]))
+
+        assert progress.sent == 2000 and set(store.status.values()) == {"sent"}
+        assert brevo_stub.app.state.requests == 4
+        assert [len(checkpoint) for checkpoint in store.checkpoints] == [1000, 1000]
+        message = brevo_stub.app.state.messages[0]["payload"]
+        assert message["to"] == [{"email": "user1@example.com", "name": "User 1"}]
+        assert message["params"]["name"] == "User 1"
+
+    def test_rejected_batch_isolates_bad_address(self):
+        """Test that a 400 for the batch falls back to single sends so only the bad recipient fails."""
+        dispatcher = _dispatcher([_email_sender(batch_size=50)])
+        recipients = [DispatchRecipient(i, f"user{i}@example.com", None) for i in range(1, 6)]
+        recipients[2].email = "bad+fail400@example.com"
+
+        rows, _ = asyncio.run(dispatcher.send_chunk(recipients, [EMAIL]))
+
+        assert [row["status"] for row in rows] == ["sent", "sent", "failed", "sent", "sent"]
+        assert brevo_stub.app.state.requests == 6
@@ -0,0 +1,174 @@
+"""
+Test the campaign applicability index.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from models.campaign import parse_campaign_datetime
+from services.campaign_index import CampaignApplicabilityIndex, CampaignEntry
+from tests.conftest import FakeSession
+
+
+NOW = datetime.utcnow()
+
+
+def _campaign(campaign_id, start=None, end=None, status='active', **config):
+    if start is not None:
+        config['start_datetime'] = start.isoformat() + 'Z'
+    if end is not None:
+        config['end_datetime'] = end.isoformat() + 'Z'
+    return SimpleNamespace(
+        id=campaign_id, name=f"Campaign {campaign_id}", type='price_reduction', status=status, config=config
+    )
+
+
+class TestParseCampaignDatetime:
+    """Test campaign datetime normalization."""
+
+    def test_formats_normalize_to_naive_utc(self):
+        """Test that ISO offsets are converted to naive UTC and UI formats are accepted."""
+        assert parse_campaign_datetime("2025-03-01T10:00:00Z") == datetime(2025, 3, 1, 10, 0)
+        assert parse_campaign_datetime("2025-03-01T12:00:00+02:00") == datetime(2025, 3, 1, 10, 0)
+        assert parse_campaign_datetime("3/1/2025, 5:31:00 PM") == datetime(2025, 3, 1, 17, 31)
+        assert parse_campaign_datetime("03/01/2025 17:31") == datetime(2025, 3, 1, 17, 31)
+
+
+class TestCampaignEntry:
+    """Test campaign entry rules."""
+
+    def test_active_window(self):
+        """Test that timing is evaluated against the parsed window."""
+        entry = CampaignEntry.from_campaign(_campaign(1, NOW - timedelta(days=1), NOW + timedelta(days=1)))
+
+        assert entry.is_active_at(NOW)
+        assert not entry.is_active_at(NOW + timedelta(days=2))
+
+    def test_untimed_campaign_is_active(self):
+        """Test that campaigns without a window are active while their status is active."""
+        entry = CampaignEntry.from_campaign(_campaign(1))
+
+        assert entry.is_active_at(NOW)
+        assert not entry.is_expired_at(NOW)
+
+    def test_service_targets(self):
+        """Test service eligibility including place-service specific targets."""
+        everything = CampaignEntry.from_campaign(_campaign(1))
+        targeted = CampaignEntry.from_campaign(_campaign(2), service_targets=[(10, None), (11, 110)])
+
+        assert everything.applies_to_service(99)
+        assert targeted.applies_to_service(10, 100)
+        assert targeted.applies_to_service(11, 110)
+        assert not targeted.applies_to_service(11, 111)
+        assert not targeted.applies_to_service(12)
+
+
+class TestCampaignApplicabilityIndex:
+    """Test index building and incremental updates."""
+
+    def _build(self):
+        campaigns = [
+            _campaign(1, NOW - timedelta(days=1), NOW + timedelta(days=5)),
+            _campaign(2, NOW + timedelta(days=1), NOW + timedelta(days=5)),
+            _campaign(3, NOW - timedelta(days=5), NOW - timedelta(days=1)),
+        ]
+        session = FakeSession(
+            campaigns,
+            [(1, 100), (2, 100), (3, 100), (1, 200)],
+            [(1, 10, None)],
+        )
+        index = CampaignApplicabilityIndex(refresh_seconds=60)
+        asyncio.run(index.ensure_fresh(session))
+        return index, session
+
+    def test_build_uses_three_queries(self):
+        """Test that the index is built with one query per table and skips expired campaigns."""
+        index, session = self._build()
+
+        assert session.queries == 3
+        assert [c.id for c in index.campaigns_for_place(100)] == [1]
+        assert [c.id for c in index.campaigns_for_place(100, NOW + timedelta(days=2))] == [1, 2]
+        assert [c.id for c in index.campaigns_for_place(200)] == [1]
+        assert index.campaigns_for_place(300) == []
+
+    def test_scheduled_campaigns(self):
+        """Test that scheduled campaigns are listed on request and ended ones never are."""
+        index, _ = self._build()
+
+        assert [c.id for c in index.campaigns_for_place(100, include_scheduled=True)] == [1, 2]
+        assert [c.id for c in asyncio.run(index.for_place(FakeSession(), 100, include_scheduled=True))] == [1, 2]
+
+    def test_fresh_index_is_not_reloaded(self):
+        """Test that lookups within the refresh interval do not query."""
+        index, _ = self._build()
+        session = FakeSession()
+
+        asyncio.run(index.for_place(session, 100))
+        assert session.queries == 0
+
+    def test_service_lookup(self):
+        """Test filtering place campaigns by service."""
+        index, _ = self._build()
+
+        assert [c.id for c in index.campaigns_for_service(100, 10)] == [1]
+        assert index.campaigns_for_service(100, 11) == []
+
+    def test_incremental_put_and_remove(self):
+        """Test that created, retargeted and deleted campaigns update the place map."""
+        index, _ = self._build()
+
+        index.put(CampaignEntry.from_campaign(_campaign(4), place_ids=[300]))
+        assert [c.id for c in index.campaigns_for_place(300)] == [4]
+
+        index.put(CampaignEntry.from_campaign(_campaign(4), place_ids=[100]))
+        assert index.campaigns_for_place(300) == []
+        assert [c.id for c in index.campaigns_for_place(100)] == [1, 4]
+
+        index.remove_campaign(4)
+        assert [c.id for c in index.campaigns_for_place(100)] == [1]
+
+    def test_refresh_deactivated_campaign_removes_it(self):
+        """Test that refreshing a campaign that is no longer active drops it."""
+        index, _ = self._build()
+        session = FakeSession([_campaign(1, status='draft')])
+
+        asyncio.run(index.refresh_campaign(session, 1))
+        assert index.campaigns_for_place(100) == []
+        assert index.campaigns_for_place(200) == []
+
+
+class TestCampaignWindowColumns:
+    """Test normalized campaign window columns."""
+
+    def test_sync_schedule_from_config(self):
+        """Test that config datetimes are copied to naive UTC columns."""
+        from models.campaign import Campaign
+
+        campaign = Campaign(status='active', config={
+            'start_datetime': '2025-03-01T12:00:00+02:00', 'end_datetime': '2025-03-31T23:59:00Z'
+        })
+        campaign.sync_schedule_from_config()
+
+        assert campaign.start_datetime == datetime(2025, 3, 1, 10, 0)
+        assert campaign.end_datetime == datetime(2025, 3, 31, 23, 59)
+
+    def test_unparseable_config_clears_window(self):
+        """Test that an unparseable window leaves both columns empty."""
+        from models.campaign import Campaign
+
+        campaign = Campaign(status='active', config={'start_datetime': 'soon', 'end_datetime': 'later'})
+        campaign.sync_schedule_from_config()
+
+        assert campaign.start_datetime is None
+        assert campaign.end_datetime is None
+        assert campaign.is_currently_active
+
+    def test_entry_prefers_columns(self):
+        """Test that index entries use the stored window over config."""
+        campaign = _campaign(1, NOW - timedelta(days=1), NOW + timedelta(days=1))
+        campaign.start_datetime = datetime(2030, 1, 1)
+        campaign.end_datetime = datetime(2030, 2, 1)
+
+        entry = CampaignEntry.from_campaign(campaign)
+        assert entry.start_datetime == datetime(2030, 1, 1)
+        assert not entry.is_active_at(NOW)
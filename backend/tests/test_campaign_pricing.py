@@ -0,0 +1,97 @@
+"""
+Test the batch campaign pricing engine.
+"""
+from decimal import Decimal
+from types import SimpleNamespace
+
+from services.campaign_index import CampaignEntry
+from services.campaign_pricing import eligibility_matrix, price_services
+
+
+def _place_service(ps_id, service_id, price):
+    return SimpleNamespace(id=ps_id, service_id=service_id, price=price)
+
+
+def _entry(campaign_id, campaign_type, targets=(), **config):
+    return CampaignEntry(
+        id=campaign_id, name=f"Campaign {campaign_id}", type=campaign_type, status='active',
+        config=config, service_targets=tuple(targets)
+    )
+
+
+class TestEligibilityMatrix:
+    """Test service/campaign eligibility."""
+
+    def test_targets(self):
+        """Test untargeted, service-targeted and place-service-targeted campaigns."""
+        services = [_place_service(100, 10, 20), _place_service(101, 11, 30), _place_service(102, 11, 40)]
+        campaigns = [_entry(1, 'price_reduction'), _entry(2, 'price_reduction', [(10, None)]),
+                     _entry(3, 'price_reduction', [(11, 102)])]
+
+        assert eligibility_matrix(services, campaigns).tolist() == [
+            [True, True, False],
+            [True, False, False],
+            [True, False, True],
+        ]
+
+
+class TestPriceServices:
+    """Test cheapest-price selection."""
+
+    def test_cheapest_campaign_wins(self):
+        """Test that the lowest candidate price is chosen per service."""
+        services = [_place_service(100, 10, 50), _place_service(101, 11, 8)]
+        campaigns = [
+            _entry(1, 'price_reduction', discount_type='percentage', discount_value=20),
+            _entry(2, 'price_reduction', discount_type='fixed_amount', discount_value=5),
+        ]
+
+        first, second = price_services(services, campaigns)
+
+        assert first.discounted_price == Decimal('40.00')
+        assert first.applied_campaigns == [1]
+        assert first.discount_percentage == Decimal('20.00')
+        assert second.discounted_price == Decimal('3.00')
+        assert second.applied_campaigns == [2]
+
+    def test_fixed_discount_never_negative(self):
+        """Test that fixed discounts clip at zero."""
+        [result] = price_services(
+            [_place_service(100, 10, 4)],
+            [_entry(1, 'price_reduction', discount_type='fixed_amount', discount_value=10)]
+        )
+
+        assert result.discounted_price == Decimal('0.00')
+        assert result.is_free is False
+
+    def test_specific_free_and_ineligible(self):
+        """Test free service campaigns only apply to targeted services."""
+        services = [_place_service(100, 10, 25), _place_service(101, 11, 25)]
+        campaigns = [_entry(1, 'free_service', [(10, None)], free_service_type='specific_free')]
+
+        free, paid = price_services(services, campaigns)
+
+        assert free.is_free and free.free_reason == 'specific_free'
+        assert free.discounted_price == Decimal('0.00')
+        assert paid.discounted_price == Decimal('25.00')
+        assert paid.applied_campaigns == []
+
+    def test_rewards_do_not_change_price(self):
+        """Test that rewards campaigns report multipliers without discounting."""
+        [result] = price_services(
+            [_place_service(100, 10, 30)],
+            [_entry(1, 'rewards_increase', rewards_multiplier=2, rewards_bonus_points=50),
+             _entry(2, 'rewards_increase', rewards_multiplier=1.5)]
+        )
+
+        assert result.discounted_price == Decimal('30.00')
+        assert result.rewards_multiplier == Decimal('2.00')
+        assert result.rewards_bonus_points == 50
+
+    def test_no_campaigns_and_unpriced_services(self):
+        """Test that unpriced services are skipped and prices pass through without campaigns."""
+        results = price_services([_place_service(100, 10, None), _place_service(101, 11, 12.5)], [])
+
+        assert len(results) == 1
+        assert results[0].discounted_price == Decimal('12.50')
+        assert results[0].discount_amount == Decimal('0.00')
@@ -0,0 +1,74 @@
+"""
+Test database engine profiles and pool monitoring.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.util import greenlet_spawn
+
+from core.config import Settings
+from core.database import MonitoredQueuePool, engine_kwargs
+
+
+class _Connection:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class TestEngineProfiles:
+    """Test profile resolution and overrides."""
+
+    def test_prod_profile(self):
+        """Test that the prod profile turns echo off and sets a timeout."""
+        options = Settings(DB_PROFILE="prod").database_engine_options
+
+        assert options["echo"] is False
+        assert options["statement_timeout_ms"] > 0
+
+    def test_overrides_win(self):
+        """Test that DB_* settings override the profile."""
+        options = Settings(DB_PROFILE="prod", DB_POOL_SIZE=3, DB_ECHO=True).database_engine_options
+
+        assert options["pool_size"] == 3 and options["echo"] is True
+
+    def test_unknown_profile(self):
+        """Test that a typo in DB_PROFILE fails loudly."""
+        with pytest.raises(ValueError):
+            Settings(DB_PROFILE="production").database_engine_options
+
+    def test_asyncpg_connect_args(self):
+        """Test statement cache and timeout reach asyncpg only for asyncpg URLs."""
+        options = Settings(DB_PROFILE="prod", DB_STATEMENT_CACHE_SIZE=0).database_engine_options
+
+        kwargs = engine_kwargs(options, "postgresql+asyncpg://localhost/db")
+
+        assert kwargs["poolclass"] is MonitoredQueuePool
+        assert kwargs["connect_args"]["prepared_statement_cache_size"] == 0
+        assert kwargs["connect_args"]["server_settings"]["statement_timeout"] == str(options["statement_timeout_ms"])
+        assert "connect_args" not in engine_kwargs(options, "sqlite+aiosqlite://")
+
+
+class TestMonitoredQueuePool:
+    """Test checkout wait tracking."""
+
+    def test_saturated_pool_times_out(self):
+        """Test that checkouts beyond capacity wait, time out and are counted."""
+        pool = MonitoredQueuePool(_Connection, pool_size=1, max_overflow=0, timeout=0.05)
+
+        def checkout_twice():
+            held = pool.connect()
+            try:
+                pool.connect()
+            finally:
+                held.close()
+
+        with pytest.raises(PoolTimeoutError):
+            asyncio.run(greenlet_spawn(checkout_twice))
+
+        stats = pool.wait_stats()
+        assert stats["checkouts"] == 2 and stats["timeouts"] == 1
+        assert stats["max_wait_ms"] >= 50
@@ -0,0 +1,167 @@
+"""
+Test the email outbox: rendering, claiming, delivery against the Brevo stub.
+"""
+import asyncio
+import importlib.util
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from models.email_outbox import EmailOutbox, EmailOutboxStatus
+from services import email_outbox
+from services.email_outbox import (
+    BrevoAsyncClient, ClaimedEmail, EmailOutboxWorker, backoff_seconds, claim_statement, queue_email, render_email
+)
+from tests.conftest import FakeSession
+
+_spec = importlib.util.spec_from_file_location(
+    "brevo_stub", Path(__file__).resolve().parent.parent / "scripts" / "brevo_stub.py"
+)
+brevo_stub = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(brevo_stub)
+
+NOW = datetime(2030, 1, 15, 10, 0, tzinfo=timezone.utc)
+
+BOOKING = {
+    'customer_name': 'Ana', 'customer_email': 'ana@example.com', 'salon_name': 'Salon',
+    'booking_date': '2030-01-15', 'booking_time': '10:00', 'duration': 30, 'total_price': 20.0,
+    'services': [{'service_name': 'Cut', 'service_price': 20.0, 'service_duration': 30}],
+}
+
+
+def _client():
+    return BrevoAsyncClient(
+        "http://brevo.test/v3", "stub-key", max_connections=4, timeout=5,
+        transport=httpx.ASGITransport(app=brevo_stub.app)
+    )
+
+
+def _email(email_id, to, attempts=1, max_attempts=3):
+    payload = {"sender": {"email": "noreply@example.com"}, "to": [{"email": to}], "subject": "Hi", "htmlContent": "<p>Hi</p>"}
+    return ClaimedEmail(email_id, payload, attempts, max_attempts)
+
+
+class TestQueueEmail:
+    """Test rendering and enqueueing."""
+
+    def test_render_uses_brevo_templates(self):
+        """Test that the Brevo template method yields the request body without sending."""
+        payloads = render_email("send_booking_request_notification", BOOKING)
+
+        assert len(payloads) == 1
+        assert payloads[0]["to"][0]["email"] == "ana@example.com"
+        assert "Salon" in payloads[0]["htmlContent"]
+
+    def test_queue_adds_rows_without_committing(self):
+        """Test that rows join the caller's transaction instead of committing their own."""
+        session = FakeSession()
+
+        queued = queue_email(session, "send_booking_request_notification", BOOKING)
+
+        assert queued == 1 and session.commits == 0
+        row = session.added[0]
+        assert isinstance(row, EmailOutbox)
+        assert row.kind == "booking_request" and row.to_email == "ana@example.com"
+
+    def test_worker_woken_only_after_commit(self, monkeypatch):
+        """Test that a commit wakes the worker and a rollback drops the queued flag."""
+        wakes = []
+        monkeypatch.setattr(email_outbox.email_outbox_worker, "wake", lambda: wakes.append(1))
+        session = Session()
+
+        session.begin()
+        queue_email(session, "send_booking_request_notification", BOOKING)
+        session.expunge_all()  # no database here: keep the commit from flushing the rows
+        session.rollback()
+        session.begin()
+        session.commit()
+        assert wakes == []
+
+        session.begin()
+        queue_email(session, "send_booking_request_notification", BOOKING)
+        session.expunge_all()
+        session.commit()
+        assert wakes == [1]
+
+
+class TestClaim:
+    """Test the claim statement."""
+
+    def test_skip_locked_update(self):
+        """Test that due and stale rows are claimed in one UPDATE with SKIP LOCKED."""
+        sql = str(claim_statement(NOW, 50, 300).compile(dialect=postgresql.dialect()))
+
+        assert sql.startswith("UPDATE email_outbox SET status=")
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "RETURNING email_outbox.id, email_outbox.payload" in sql
+
+
+class TestDelivery:
+    """Test delivery outcomes against the local Brevo stub."""
+
+    def test_outcomes(self):
+        """Test sent, retried and dead-lettered rows."""
+        brevo_stub.app.state.messages.clear()
+        worker = EmailOutboxWorker(session_factory=None, client=_client())
+        emails = [
+            _email(1, "ok@example.com"),
+            _email(2, "flaky+fail500@example.com"),
+            _email(3, "bad+fail400@example.com"),
+            _email(4, "flaky+fail429@example.com", attempts=3),
+        ]
+
+        async def deliver():
+            try:
+                return await worker.deliver(emails, now=NOW)
+            finally:
+                await worker.client.aclose()
+
+        rows = {row["id"]: row for row in asyncio.run(deliver())}
+
+        assert rows[1]["status"] == EmailOutboxStatus.SENT and rows[1]["provider_message_id"]
+        assert rows[2]["status"] == EmailOutboxStatus.PENDING and rows[2]["next_attempt_at"] > NOW
+        assert rows[3]["status"] == EmailOutboxStatus.DEAD and "HTTP 400" in rows[3]["last_error"]
+        assert rows[4]["status"] == EmailOutboxStatus.DEAD
+        assert len(brevo_stub.app.state.messages) == 1
+        assert worker.stats()["sent"] == 1 and worker.stats()["dead"] == 2
+        assert len({tuple(sorted(row)) for row in rows.values()}) == 1
+
+    def test_unexpected_error_dead_letters_only_its_row(self):
+        """Test that an unexpected exception dead-letters its email and keeps the batch's updates."""
+        class _Client:
+            async def send(self, payload):
+                if "subject" not in payload:
+                    raise KeyError("subject")
+                return "msg-1"
+
+        worker = EmailOutboxWorker(session_factory=None, client=_Client())
+        malformed = _email(2, "b@example.com")
+        del malformed.payload["subject"]
+
+        rows = {row["id"]: row for row in asyncio.run(worker.deliver([_email(1, "a@example.com"), malformed], now=NOW))}
+
+        assert rows[1]["status"] == EmailOutboxStatus.SENT and rows[1]["provider_message_id"] == "msg-1"
+        assert rows[2]["status"] == EmailOutboxStatus.DEAD and rows[2]["last_error"] == "KeyError: 'subject'"
+
+    def test_network_error_is_retryable(self):
+        """Test that transport failures are retried."""
+        def refuse(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        client = BrevoAsyncClient("http://brevo.test/v3", "k", 1, 5, transport=httpx.MockTransport(refuse))
+
+        try:
+            asyncio.run(client.send(_email(1, "a@example.com").payload))
+        except email_outbox.EmailSendError as e:
+            assert e.retryable
+        else:
+            raise AssertionError("expected EmailSendError")
+
+    def test_backoff_grows_and_caps(self):
+        """Test exponential backoff bounds."""
+        assert 15 <= backoff_seconds(1, 30, 3600) <= 30
+        assert 60 <= backoff_seconds(3, 30, 3600) <= 120
+        assert backoff_seconds(20, 30, 3600) <= 3600
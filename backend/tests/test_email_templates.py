@@ -0,0 +1,140 @@
+"""
+Test compiled email templates and the Brevo emails rendered from them.
+"""
+import pytest
+
+from services.email_outbox import render_email
+from services.email_templates import CompiledTemplate, EmailTemplateRegistry, Html, campaign_template, email_templates
+
+BOOKING = {
+    'customer_name': 'Ana <Silva>', 'customer_email': 'ana@example.com', 'salon_name': 'Salon',
+    'booking_date': '2030-01-15', 'booking_time': '10:00', 'duration': 30, 'total_price': 20.0,
+    'services': [{'service_name': 'Cut & Dry', 'service_price': 20.0, 'service_duration': 30}],
+}
+
+SOURCES = {
+    "en": {
+        "greeting": {
+            "subject": "${title} for ${name}",
+            "html": "<h1>${title}</h1><p>${name}</p>${extra}",
+            "text": "${title}: ${name}",
+            "default_variant": "hello",
+            "variants": {"hello": {"title": "Hello"}, "bye": {"title": "Bye"}},
+        },
+    },
+    "pt": {
+        "greeting": {
+            "subject": "${title} ${name}",
+            "html": "<h1>${title}</h1><p>${name}</p>${extra}",
+            "text": "${title}: ${name}",
+            "default_variant": "hello",
+            "variants": {"hello": {"title": "Olá"}, "bye": {"title": "Adeus"}},
+        },
+    },
+}
+
+
+class TestCompiledTemplate:
+    """Test compiling sources into static fragments."""
+
+    def test_constants_are_folded_into_fragments(self):
+        """Test that only the non-constant placeholders are left to render."""
+        template = CompiledTemplate("<b>${title}</b> ${name}!", {"title": "Hi"})
+
+        assert template.head == "<b>Hi</b> "
+        assert template.names == {"name"}
+        assert template.render({"name": "Ana"}) == "<b>Hi</b> Ana!"
+
+    def test_html_values_are_escaped_unless_marked(self):
+        """Test escaping of per-send values in HTML."""
+        template = CompiledTemplate("${name}${extra}", escape=True)
+
+        assert template.render({"name": "<Ana & Co>", "extra": Html("<br>")}) == "&lt;Ana &amp; Co&gt;<br>"
+
+    def test_missing_value_raises(self):
+        """Test that system templates require every value."""
+        with pytest.raises(KeyError):
+            CompiledTemplate("${name}").render({})
+
+    def test_campaign_template_is_cached_and_lenient(self):
+        """Test Brevo-style params with missing values rendering empty."""
+        template = campaign_template("Hi {{ params.name }}{{params.missing}}!")
+
+        assert campaign_template("Hi {{ params.name }}{{params.missing}}!") is template
+        assert template.render_many([{"name": "Ana"}, {"name": None}]) == ["Hi Ana!", "Hi !"]
+
+
+class TestRegistry:
+    """Test variant and language lookup."""
+
+    def setup_method(self):
+        self.registry = EmailTemplateRegistry(SOURCES)
+
+    def test_compile_all_compiles_every_variant(self):
+        """Test precompiling each language and variant."""
+        assert self.registry.compile_all() == 4
+
+    def test_variant_and_language(self):
+        """Test that the variant's constants and the language's source are used."""
+        email = self.registry.render("greeting", {"name": "Ana", "extra": ""}, variant="bye", language="pt")
+
+        assert email.subject == "Adeus Ana"
+        assert email.html == "<h1>Adeus</h1><p>Ana</p>"
+
+    def test_fallbacks(self):
+        """Test unknown variants and languages falling back to the defaults."""
+        assert self.registry.get("greeting", "unknown", "de") is self.registry.get("greeting", "hello", "en")
+
+    def test_render_many(self):
+        """Test rendering several recipients from one compiled variant."""
+        emails = self.registry.render_many("greeting", [{"name": "Ana", "extra": ""}, {"name": "Bo", "extra": ""}])
+
+        assert [email.text for email in emails] == ["Hello: Ana", "Hello: Bo"]
+
+
+class TestBrevoEmails:
+    """Test the Brevo template methods rendered through the registry."""
+
+    def test_every_shipped_template_compiles(self):
+        """Test that the shipped sources compile."""
+        assert email_templates.compile_all() >= 16
+
+    def test_booking_request_variant_by_status(self):
+        """Test subject, status styling and escaping of a confirmed booking request."""
+        payload = render_email("send_booking_request_notification", {**BOOKING, 'status': 'confirmed'})[0]
+
+        assert payload["subject"] == "Booking Confirmed - LinkUup"
+        assert 'style="color: #27ae60;">Confirmed</span>' in payload["htmlContent"]
+        assert "Ana &lt;Silva&gt;" in payload["htmlContent"] and "Cut &amp; Dry" in payload["htmlContent"]
+        assert "- Cut & Dry - €20.0 (30 minutes)" in payload["textContent"]
+
+    def test_booking_status_defaults_to_confirmed(self):
+        """Test that an unknown status uses the confirmed variant."""
+        cancelled = render_email("send_booking_status_notification", {**BOOKING, 'status': 'cancelled'})[0]
+        unknown = render_email("send_booking_status_notification", {**BOOKING, 'status': 'no_show'})[0]
+
+        assert cancelled["subject"] == "Booking Cancelled - LinkUup"
+        assert unknown["subject"] == "Booking Confirmed - LinkUup"
+
+    def test_reminder_and_password_reset(self):
+        """Test the reminder defaults and the reset link."""
+        reminder = render_email("send_booking_reminder", BOOKING)[0]
+        reset = render_email(
+            "send_password_reset_email", "ana@example.com", "Ana", "token", "https://x.test/reset?t=1&l=pt", "pt"
+        )[0]
+
+        assert reminder["subject"] == "Appointment Reminder - Your Service tomorrow"
+        assert "Multiple Services" in reminder["htmlContent"]
+        assert 'href="https://x.test/reset?t=1&amp;l=pt"' in reset["htmlContent"]
+        assert "https://x.test/reset?t=1&l=pt" in reset["textContent"]
+
+    def test_welcome_plan_section(self):
+        """Test the business owner plan section and the user type variants."""
+        owner = render_email("send_welcome_email", "bo@example.com", "Bo", "business_owner", "Pro")[0]
+        customer = render_email("send_welcome_email", "ana@example.com", "Ana", "customer", "Pro")[0]
+
+        assert owner["subject"] == "Welcome to LinkUup - Business Owner"
+        assert "<strong>Plan:</strong> Pro" in owner["htmlContent"]
+        assert "Account Type: Business Owner\nYour Subscription Plan: Pro\n" in owner["textContent"]
+        assert "Your Subscription Plan" not in customer["htmlContent"]
+        assert "Book appointments at your favorite businesses" in customer["textContent"]
@@ -0,0 +1,76 @@
+"""
+Test load-aware "any employee" assignment.
+"""
+from datetime import time
+from types import SimpleNamespace
+
+from services.availability_engine import DayInputs, time_to_minutes
+from services.employee_assignment import AssignmentInputs, pick_employee
+
+
+def _employee(emp_id):
+    return SimpleNamespace(id=emp_id)
+
+
+def _booking(emp_id, hhmm, duration=30):
+    hours, minutes = map(int, hhmm.split(":"))
+    return SimpleNamespace(
+        employee_id=emp_id, booking_time=time(hours, minutes), total_duration=duration, duration=duration
+    )
+
+
+def _time_off(emp_id, is_full_day=False, half_day_period=None):
+    return SimpleNamespace(employee_id=emp_id, is_full_day=is_full_day, half_day_period=half_day_period)
+
+
+def _pick(inputs, service_ids=(10,), start="10:00", end="10:30"):
+    return pick_employee(inputs, service_ids, time_to_minutes(start), time_to_minutes(end))
+
+
+class TestPickEmployee:
+    """Test employee selection over preloaded day state."""
+
+    def test_lowest_load_wins(self):
+        """Test that the free employee with the fewest booked minutes is picked."""
+        day = DayInputs(
+            employees=[_employee(1), _employee(2), _employee(3)],
+            bookings=[_booking(1, "09:00", 60), _booking(2, "14:00", 30), _booking(3, "15:00", 90)]
+        )
+
+        assert _pick(AssignmentInputs(day=day)) == 2
+
+    def test_skips_booked_and_time_off(self):
+        """Test that overlapping bookings and time-off rule employees out."""
+        day = DayInputs(
+            employees=[_employee(1), _employee(2), _employee(3)],
+            bookings=[_booking(1, "10:15", 30), _booking(3, "16:00", 120)],
+            time_off=[_time_off(2, half_day_period="AM")]
+        )
+
+        assert _pick(AssignmentInputs(day=day)) == 3
+        assert _pick(AssignmentInputs(day=day), start="13:00", end="13:30") == 2
+
+    def test_requires_all_mapped_services(self):
+        """Test that employees must be mapped to every requested service."""
+        day = DayInputs(employees=[_employee(1), _employee(2)], bookings=[_booking(2, "09:00", 60)])
+        inputs = AssignmentInputs(day=day, qualifications={1: {10}, 2: {10, 11}})
+
+        assert _pick(inputs, service_ids=[10]) == 1
+        assert _pick(inputs, service_ids=[10, 11]) == 2
+
+    def test_unmapped_services_are_unrestricted(self):
+        """Test that a service nobody is mapped to does not exclude anyone."""
+        day = DayInputs(employees=[_employee(1), _employee(2)], bookings=[_booking(1, "09:00", 60)])
+
+        assert _pick(AssignmentInputs(day=day, qualifications={1: {10}}), service_ids=[10, 99]) == 1
+        assert _pick(AssignmentInputs(day=day), service_ids=[99]) == 2
+
+    def test_nobody_free(self):
+        """Test that None is returned when no qualified employee is free."""
+        day = DayInputs(
+            employees=[_employee(1), _employee(2)],
+            bookings=[_booking(1, "10:00", 30)],
+            time_off=[_time_off(2, is_full_day=True)]
+        )
+
+        assert _pick(AssignmentInputs(day=day)) is None
@@ -0,0 +1,95 @@
+"""
+Test the owner entitlement resolver.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from services.entitlements import EntitlementService, Entitlements, build_entitlements, entitlements_query
+from tests.conftest import FakeSession
+
+
+def _row(place_id=None, plan_id=None, code=None, enabled=None, limit_value=None, **overrides):
+    values = dict(
+        trial_status=None, trial_end=None, owns_place=True, billing_active=False,
+        place_id=place_id, plan_id=plan_id, code=code, enabled=enabled, limit_value=limit_value
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestEntitlementsQuery:
+    """Test the single-query shape."""
+
+    def test_one_statement_with_joins(self):
+        """Test that ownership and billing are EXISTS columns and plans are outer joined."""
+        sql = str(entitlements_query(7).compile(dialect=postgresql.dialect()))
+
+        assert sql.count("EXISTS") == 2
+        assert "LEFT OUTER JOIN user_place_subscriptions" in sql
+        assert "LEFT OUTER JOIN plan_features" in sql
+        assert "LEFT OUTER JOIN features" in sql
+
+
+class TestBuildEntitlements:
+    """Test folding rows into entitlements."""
+
+    def test_features_and_limits_per_place(self):
+        """Test that features resolve through the place's plan."""
+        entitlements = build_entitlements(7, [
+            _row(place_id=1, plan_id=10, code="employees", enabled=True, limit_value=5),
+            _row(place_id=1, plan_id=10, code="campaigns", enabled=False),
+            _row(place_id=2, plan_id=11),
+        ])
+
+        assert entitlements.has_feature(1, "employees")
+        assert not entitlements.has_feature(1, "campaigns")
+        assert entitlements.get_limit(1, "employees") == 5
+        assert entitlements.get_limit(2, "employees") is None
+        assert not entitlements.has_feature(3, "employees")
+
+    def test_owner_access(self):
+        """Test the billing gate for trial, billing and place subscriptions."""
+        now = datetime.now(timezone.utc)
+        no_access = build_entitlements(7, [_row()])
+        trial = build_entitlements(7, [_row(trial_status="active", trial_end=now + timedelta(days=3))])
+        expired = build_entitlements(7, [_row(trial_status="active", trial_end=now - timedelta(days=1))])
+        billing = build_entitlements(7, [_row(billing_active=True)])
+        place_plan = build_entitlements(7, [_row(place_id=1, plan_id=10)])
+
+        assert no_access.owns_place and not no_access.has_owner_access()
+        assert trial.has_owner_access() and not expired.has_owner_access()
+        assert billing.has_owner_access() and place_plan.has_owner_access()
+
+    def test_unknown_user(self):
+        """Test that no rows mean no entitlements."""
+        assert build_entitlements(7, []) == Entitlements(user_id=7)
+
+
+class TestEntitlementService:
+    """Test caching and invalidation."""
+
+    def test_cached_until_invalidated(self):
+        """Test that the query runs once per user until invalidated."""
+        service = EntitlementService(max_entries=10, ttl_seconds=60)
+        session = FakeSession([_row(place_id=1, plan_id=10, code="employees", enabled=True, limit_value=5)])
+
+        asyncio.run(service.get(session, 7))
+        asyncio.run(service.get(session, 7))
+        assert session.queries == 1
+
+        service.invalidate(7)
+        asyncio.run(service.get(session, 7))
+        assert session.queries == 2
+
+    def test_zero_ttl_disables(self):
+        """Test that a TTL of 0 turns caching off."""
+        service = EntitlementService(max_entries=10, ttl_seconds=0)
+        session = FakeSession([_row()])
+
+        asyncio.run(service.get(session, 7))
+        asyncio.run(service.get(session, 7))
+
+        assert session.queries == 2
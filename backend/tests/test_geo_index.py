@@ -0,0 +1,104 @@
+"""
+Test the nearby-search geo index.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from services.geo_index import PlaceGeoIndex, PlacePoint, haversine_km
+
+LISBON = (38.7223, -9.1393)
+PORTO = (41.1579, -8.6291)
+
+
+def _point(place_id, lat, lng, tipo='salon', location_type='fixed', coverage_radius=None):
+    return PlacePoint(
+        id=place_id, latitude=lat, longitude=lng, nome=f"Place {place_id}", tipo=tipo,
+        location_type=location_type, coverage_radius=coverage_radius
+    )
+
+
+def _index(points):
+    index = PlaceGeoIndex()
+    index.load(points)
+    return index
+
+
+class TestHaversine:
+    """Test great-circle distances."""
+
+    def test_lisbon_porto(self):
+        """Test a known city distance (about 274 km)."""
+        assert haversine_km(*LISBON, *PORTO) == pytest.approx(274, abs=2)
+
+    def test_longitude_degrees_shrink_with_latitude(self):
+        """Test that a degree of longitude is shorter away from the equator."""
+        assert haversine_km(60, 0, 60, 1) == pytest.approx(haversine_km(0, 0, 0, 1) / 2, rel=0.01)
+
+
+class TestNearest:
+    """Test k-nearest queries."""
+
+    def test_sorted_by_distance_within_radius(self):
+        """Test that matches are sorted nearest first and far places are excluded."""
+        lat, lng = LISBON
+        index = _index([
+            _point(1, lat + 0.03, lng),   # ~3.3 km
+            _point(2, lat + 0.01, lng),   # ~1.1 km
+            _point(3, lat, lng + 0.02),   # ~1.7 km
+            _point(4, *PORTO),
+        ])
+
+        results = index.nearest(lat, lng, 5, 10)
+
+        assert [point.id for point, _ in results] == [2, 3, 1]
+        assert results[0][1] == pytest.approx(1.11, abs=0.01)
+
+    def test_limit_keeps_nearest(self):
+        """Test that the limit keeps the k nearest matches, not the first k rows."""
+        lat, lng = LISBON
+        index = _index([_point(i, lat + i * 0.001, lng) for i in range(50, 0, -1)])
+
+        assert [point.id for point, _ in index.nearest(lat, lng, 10, 3)] == [1, 2, 3]
+
+    def test_mobile_coverage(self):
+        """Test that mobile places match within their own coverage radius."""
+        lat, lng = LISBON
+        index = _index([
+            _point(1, lat + 0.2, lng, location_type='mobile', coverage_radius=25),  # ~22 km
+            _point(2, lat + 0.2, lng, location_type='mobile', coverage_radius=15),
+            _point(3, lat + 0.2, lng),
+        ])
+
+        assert [point.id for point, _ in index.nearest(lat, lng, 5, 10)] == [1]
+        assert {point.id for point, _ in index.nearest(lat, lng, 30, 10)} == {1, 2, 3}
+
+    def test_tipo_filter(self):
+        """Test that the tipo filter applies before the limit."""
+        lat, lng = LISBON
+        index = _index([_point(1, lat, lng, tipo='barber'), _point(2, lat + 0.01, lng, tipo='spa')])
+
+        assert [point.id for point, _ in index.nearest(lat, lng, 5, 1, tipo='spa')] == [2]
+
+
+class TestIndexUpdates:
+    """Test incremental place updates."""
+
+    def test_sync_and_remove(self):
+        """Test that updated places move and deactivated places disappear."""
+        lat, lng = LISBON
+        index = _index([_point(1, *PORTO)])
+        assert index.nearest(lat, lng, 5, 10) == []
+
+        place = SimpleNamespace(
+            id=1, latitude=lat, longitude=lng, is_active=True, nome="Moved", tipo='salon', cidade=None,
+            rua=None, telefone=None, regiao=None, booking_enabled=True, is_bio_diamond=False,
+            location_type='fixed', coverage_radius=None
+        )
+        index.sync_place(place)
+        assert [point.nome for point, _ in index.nearest(lat, lng, 5, 10)] == ["Moved"]
+
+        place.is_active = False
+        index.sync_place(place)
+        assert index.nearest(lat, lng, 5, 10) == []
+        assert len(index) == 0
@@ -0,0 +1,110 @@
+"""
+Test structured logging, sampling and request-id correlation.
+"""
+import asyncio
+import json
+import logging
+
+from core.logging_config import (
+    JsonFormatter, RequestIdFilter, RequestIdMiddleware, SamplingFilter, _EnqueueHandler, parse_levels,
+    request_id_var
+)
+
+
+def _record(level=logging.INFO, msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord("api.v1.places", level, __file__, 1, msg, args, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+class TestJsonFormatter:
+    """Test the JSON line format."""
+
+    def test_fields_and_extras(self):
+        """Test that message, level, request id and extra fields end up in the object."""
+        record = _record(path="/api/v1/places")
+        token = request_id_var.set("abc123")
+        try:
+            RequestIdFilter().filter(record)
+        finally:
+            request_id_var.reset(token)
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert entry["message"] == "hello world"
+        assert entry["level"] == "INFO" and entry["logger"] == "api.v1.places"
+        assert entry["request_id"] == "abc123"
+        assert entry["path"] == "/api/v1/places"
+
+    def test_traceback_survives_queue(self):
+        """Test that the enqueued copy keeps the traceback as exc_text."""
+        try:
+            raise ValueError("boom")
+        except ValueError as exc:
+            record = logging.LogRecord("x", logging.ERROR, __file__, 1, "failed", None, (type(exc), exc, exc.__traceback__))
+
+        prepared = _EnqueueHandler(None).prepare(record)
+        entry = json.loads(JsonFormatter().format(prepared))
+
+        assert prepared.exc_info is None
+        assert "ValueError: boom" in entry["exc"]
+
+
+class TestSamplingFilter:
+    """Test debug sampling."""
+
+    def test_debug_rate(self):
+        """Test that DEBUG records are sampled and higher levels always pass."""
+        sampler = SamplingFilter(debug_rate=0.0)
+
+        assert not sampler.filter(_record(logging.DEBUG))
+        assert sampler.filter(_record(logging.WARNING))
+
+    def test_per_line_rate(self):
+        """Test that a sample_rate extra overrides the default."""
+        assert not SamplingFilter(1.0).filter(_record(logging.INFO, sample_rate=0.0))
+        assert SamplingFilter(0.0).filter(_record(logging.DEBUG, sample_rate=1.0))
+
+
+class TestParseLevels:
+    """Test per-module level parsing."""
+
+    def test_parse(self):
+        """Test names and levels are trimmed and upper-cased; junk is skipped."""
+        assert parse_levels(" sqlalchemy.engine=warning, api.v1.auth=DEBUG,junk") == {
+            "sqlalchemy.engine": "WARNING", "api.v1.auth": "DEBUG"
+        }
+
+
+class TestRequestIdMiddleware:
+    """Test request id correlation."""
+
+    def _call(self, headers):
+        seen = {}
+        sent = []
+
+        async def app(scope, receive, send):
+            seen["request_id"] = request_id_var.get()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "headers": headers}
+        asyncio.run(RequestIdMiddleware(app)(scope, None, send))
+        return seen["request_id"], dict(sent[0]["headers"]), scope
+
+    def test_generates_id(self):
+        """Test that a new id is bound, echoed and stored on request.state."""
+        request_id, headers, scope = self._call([])
+
+        assert request_id and headers[b"x-request-id"] == request_id.encode()
+        assert scope["state"]["request_id"] == request_id
+        assert request_id_var.get() is None
+
+    def test_reuses_client_id(self):
+        """Test that an incoming X-Request-ID is kept."""
+        request_id, headers, _ = self._call([(b"x-request-id", b"client-42")])
+
+        assert request_id == "client-42" and headers[b"x-request-id"] == b"client-42"
@@ -0,0 +1,148 @@
+"""
+Test keyset pagination helpers.
+"""
+import asyncio
+from datetime import date, datetime, time
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from core.pagination import (
+    KeysetPage, NEXT_CURSOR_HEADER, SortKey, TOTAL_COUNT_HEADER, decode_cursor, encode_cursor,
+    envelope, keyset_condition, paginate, set_cursor_headers
+)
+from api.v1.admin.bookings import router as admin_bookings_router
+from core.database import get_db
+from core.dependencies import get_current_admin
+from models.place_existing import Booking, Place
+from tests.conftest import FakeResult, FakeSession
+
+
+def _sql(clause):
+    return str(clause.compile(dialect=postgresql.dialect()))
+
+
+class TestCursor:
+    """Test opaque cursor encoding."""
+
+    def test_round_trip_keeps_types(self):
+        """Test that dates, times, decimals and ints survive encoding."""
+        values = [date(2025, 11, 3), time(9, 30), datetime(2025, 1, 2, 3, 4, 5), Decimal("1.50"), 42]
+
+        cursor = encode_cursor(values)
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor, len(values)) == values
+
+    def test_malformed_cursor_is_rejected(self):
+        """Test that garbage and cursors for another ordering return 400."""
+        for cursor in ["not-a-cursor!", encode_cursor([1, 2])]:
+            with pytest.raises(HTTPException) as error:
+                decode_cursor(cursor, 3)
+            assert error.value.status_code == 400
+
+
+class TestKeysetCondition:
+    """Test the WHERE clause continuing after a cursor."""
+
+    def test_uniform_direction_uses_row_comparison(self):
+        """Test that same-direction keys compile to one tuple comparison."""
+        keys = [SortKey(Booking.booking_date), SortKey(Booking.id)]
+
+        sql = _sql(keyset_condition(keys, [date(2025, 1, 1), 7]))
+
+        assert "(bookings.booking_date, bookings.id) >" in sql
+
+    def test_mixed_direction_expands(self):
+        """Test that mixed directions expand into equality prefixes."""
+        keys = [SortKey(Place.created_at, descending=True), SortKey(Place.id)]
+
+        sql = _sql(keyset_condition(keys, [datetime(2025, 1, 1), 7]))
+
+        assert "places.created_at <" in sql
+        assert "places.created_at =" in sql and "places.id >" in sql
+
+
+class TestPaginate:
+    """Test page fetching."""
+
+    def test_next_cursor_from_extra_row(self):
+        """Test that one extra row is fetched to detect the next page."""
+        keys = [SortKey(Place.id)]
+        session = FakeSession([("a", 1), ("b", 2), ("c", 3)])
+
+        page = asyncio.run(paginate(session, select(Place), keys, 2))
+
+        assert page.items == ["a", "b"]
+        assert decode_cursor(page.next_cursor, 1) == [2]
+        assert page.total is None
+        assert "LIMIT" in _sql(session.statements[0])
+
+    def test_last_page_and_exact_count(self):
+        """Test that the last page has no cursor and counts the filtered query."""
+        session = FakeSession([("a", 5)], FakeResult(scalar=1))
+        query = select(Place).where(Place.is_active == True)
+
+        page = asyncio.run(paginate(
+            session, query, [SortKey(Place.id)], 2, cursor=encode_cursor([4]), count="exact"
+        ))
+
+        assert page.items == ["a"] and page.next_cursor is None
+        assert page.total == 1 and not page.total_is_estimate
+        assert "places.id >" in _sql(session.statements[0])
+        assert "count(*)" in _sql(session.statements[1])
+
+    def test_estimate_explains_the_filtered_query(self):
+        """Test that the estimate comes from EXPLAIN of the same filters, not a table-wide row count."""
+        session = FakeSession([], FakeResult(scalar=[{"Plan": {"Plan Rows": 321}}]))
+        query = select(Place).where(Place.is_active == True, Place.cidade.in_(["Lisboa", "Porto"]))
+
+        page = asyncio.run(paginate(session, query, [SortKey(Place.id)], 20, count="estimate"))
+
+        assert page.total == 321 and page.total_is_estimate
+        explain = session.statements[1]
+        assert str(explain).startswith("EXPLAIN (FORMAT JSON) SELECT")
+        assert "WHERE places.is_active = true AND places.cidade IN (:cidade_1_1, :cidade_1_2)" in str(explain)
+        assert "ORDER BY" not in str(explain)
+        assert explain.compile().params == {"cidade_1_1": "Lisboa", "cidade_1_2": "Porto"}
+
+
+class TestEnvelope:
+    """Test response shapes."""
+
+    def test_legacy_page_envelope(self):
+        """Test that page-based requests keep total/pages and gain next_cursor."""
+        page = KeysetPage(items=[1, 2], next_cursor="abc", total=45)
+
+        data = envelope(page, [1, 2], 20, page_number=1)
+
+        assert data["pages"] == 3 and data["has_next"] and not data["has_prev"]
+        assert data["next_cursor"] == "abc"
+
+    def test_headers_for_list_endpoints(self):
+        """Test that bare-list endpoints expose cursor and total in headers."""
+        response = Response()
+
+        set_cursor_headers(response, KeysetPage(items=[], next_cursor="abc", total=3))
+
+        assert response.headers[NEXT_CURSOR_HEADER] == "abc"
+        assert response.headers[TOTAL_COUNT_HEADER] == "3"
+
+
+class TestAdminRoutes:
+    """Test cursor errors through an admin list route."""
+
+    def test_bad_cursor_is_400_not_500(self):
+        """Test that a tampered cursor keeps its 400 instead of becoming "Failed to fetch"."""
+        app = FastAPI()
+        app.include_router(admin_bookings_router, prefix="/admin/bookings")
+        app.dependency_overrides[get_current_admin] = lambda: None
+        app.dependency_overrides[get_db] = lambda: FakeSession()
+
+        response = TestClient(app).get("/admin/bookings/", params={"cursor": "not-a-cursor"})
+
+        assert response.status_code == 400
@@ -0,0 +1,80 @@
+"""
+Test the place detail cache.
+"""
+import asyncio
+
+from core import cache as cache_module
+from core.cache import TTLCache
+from services.place_cache import PlaceDetailCache
+
+
+class TestTTLCache:
+    """Test the bounded TTL cache."""
+
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted as hits or misses."""
+        cache = TTLCache(max_entries=4, ttl_seconds=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hit_rate"] == 0.5
+
+    def test_entries_expire(self, monkeypatch):
+        """Test that entries are dropped once their TTL has passed."""
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+        cache = TTLCache(max_entries=4, ttl_seconds=10)
+        cache.set("a", 1)
+
+        now[0] += 9
+        assert cache.get("a") == 1
+        now[0] += 2
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_is_evicted(self):
+        """Test that the least recently used entry is evicted when full."""
+        cache = TTLCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+
+class TestPlaceDetailCache:
+    """Test place detail invalidation."""
+
+    def test_invalidate_place_drops_slug_and_id_keys(self):
+        """Test that invalidating a place drops every key it was cached under."""
+        async def scenario():
+            cache = PlaceDetailCache(max_entries=10, ttl_seconds=60)
+            await cache.set("salon-a", 1, {"id": 1})
+            await cache.set("1", 1, {"id": 1})
+            await cache.set("salon-b", 2, {"id": 2})
+
+            await cache.invalidate_place(1)
+
+            return [await cache.get(key) for key in ("salon-a", "1", "salon-b")]
+
+        assert asyncio.run(scenario()) == [None, None, {"id": 2}]
+
+    def test_invalidate_all(self):
+        """Test that a full invalidation empties the cache."""
+        async def scenario():
+            cache = PlaceDetailCache(max_entries=10, ttl_seconds=60)
+            await cache.set("salon-a", 1, {"id": 1})
+            await cache.invalidate_all()
+            return await cache.get("salon-a"), cache.stats()
+
+        payload, stats = asyncio.run(scenario())
+        assert payload is None
+        assert stats["size"] == 0
+        assert stats["backend"] == "memory"
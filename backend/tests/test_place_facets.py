@@ -0,0 +1,106 @@
+"""
+Test cached search facets.
+"""
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from services import place_facets
+from services.place_facets import (
+    PlaceFacetCache, build_facets, etag_matches, facet_response, facet_snapshot, facets_query,
+    invalidate_facets_if_changed
+)
+from tests.conftest import FakeSession
+
+ROWS = [
+    ("Porto", None, None, 0b011, 2),
+    ("Lisboa", None, None, 0b011, 5),
+    ("", None, None, 0b011, 1),
+    (None, "salon", None, 0b101, 6),
+    (None, None, "Norte", 0b110, 2),
+    (None, None, None, 0b110, 5),
+]
+
+
+class TestBuildFacets:
+    """Test turning grouping-set rows into facets."""
+
+    def test_rows_are_split_by_grouping_set(self):
+        """Test that each grouping set feeds its facet, sorted, without blanks."""
+        facets = build_facets(ROWS)
+
+        assert facets.data["cities"] == [{"value": "Lisboa", "count": 5}, {"value": "Porto", "count": 2}]
+        assert facets.data["sectors"] == [{"value": "salon", "count": 6}]
+        assert facets.data["regions"] == [{"value": "Norte", "count": 2}]
+
+    def test_etag_depends_on_content_only(self):
+        """Test that the ETag is stable across row order and changes with counts."""
+        assert build_facets(ROWS).etag == build_facets(list(reversed(ROWS))).etag
+        assert build_facets(ROWS).etag != build_facets(ROWS[1:]).etag
+
+    def test_single_grouped_query(self):
+        """Test that all facets come from one GROUPING SETS query with the filters."""
+        sql = str(facets_query(booking_enabled=True).compile(dialect=postgresql.dialect()))
+
+        assert "GROUP BY GROUPING SETS(places.cidade, places.tipo, places.regiao)" in sql
+        assert "places.booking_enabled =" in sql
+
+
+class TestRevalidation:
+    """Test ETag handling."""
+
+    def test_etag_matches(self):
+        """Test If-None-Match lists, weak validators and the wildcard."""
+        assert etag_matches('"a", W/"b"', '"b"')
+        assert etag_matches("*", '"b"')
+        assert not etag_matches('"a"', '"b"')
+        assert not etag_matches(None, '"b"')
+
+    def test_not_modified_response(self):
+        """Test that a matching If-None-Match gets an empty 304 with the ETag."""
+        facets = build_facets(ROWS)
+
+        response = facet_response(facets.etag, facets, facets.data)
+        fresh = facet_response('"stale"', facets, facets.data)
+
+        assert response.status_code == 304 and response.body == b""
+        assert response.headers["etag"] == facets.etag
+        assert fresh.status_code == 200 and fresh.headers["etag"] == facets.etag
+
+
+class TestPlaceFacetCache:
+    """Test caching and invalidation."""
+
+    def test_cached_per_filter(self):
+        """Test that repeated requests reuse the grouped query per filter."""
+        cache = PlaceFacetCache(ttl_seconds=60)
+        session = FakeSession(ROWS)
+
+        async def scenario():
+            await cache.get(session)
+            await cache.get(session)
+            await cache.get(session, booking_enabled=True)
+
+        asyncio.run(scenario())
+        assert session.queries == 2
+
+    def test_invalidated_only_by_facet_fields(self, monkeypatch):
+        """Test that only location, type, status and flag changes drop the cache."""
+        cache = PlaceFacetCache(ttl_seconds=60)
+        monkeypatch.setattr(place_facets, "place_facet_cache", cache)
+        place = SimpleNamespace(
+            cidade="Porto", regiao="Norte", tipo="salon", is_active=True, booking_enabled=True,
+            is_bio_diamond=False, about="Old"
+        )
+        asyncio.run(cache.get(FakeSession(ROWS)))
+
+        before = facet_snapshot(place)
+        place.about = "New"
+        invalidate_facets_if_changed(before, place)
+        assert len(cache._cache) == 1
+
+        before = facet_snapshot(place)
+        place.cidade = "Lisboa"
+        invalidate_facets_if_changed(before, place)
+        assert len(cache._cache) == 0
@@ -0,0 +1,87 @@
+"""
+Test the shared place listing assembler.
+"""
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from models.place_existing import PlaceReviewStats
+from services.place_listing import build_place_responses
+from tests.conftest import FakeSession
+
+
+def _listing_session(images, review_stats=()):
+    """Session answering the review stats query with review_stats and the images query with images"""
+    def respond(statement, params):
+        if statement.column_descriptions[0]["entity"] is PlaceReviewStats:
+            return list(review_stats)
+        return images
+    return FakeSession(respond=respond)
+
+
+def _make_place(place_id):
+    return SimpleNamespace(
+        id=place_id, codigo=None, nome=f"Place {place_id}", slug=f"place-{place_id}",
+        tipo="salon", pais="Portugal", telefone=None, email=None, website=None,
+        instagram=None, regiao="Lisboa", cidade="Lisboa", rua=None, porta=None,
+        cod_postal=None, latitude=None, longitude=None, location_type="fixed",
+        coverage_radius=None, booking_enabled=True, is_bio_diamond=False, about=None,
+        created_at=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 1), owner_id=1,
+    )
+
+
+def _make_image(image_id, place_id):
+    return SimpleNamespace(
+        id=image_id, place_id=place_id, image_url=f"/img/{image_id}.jpg",
+        alt_text=None, is_primary=False, created_at=datetime(2025, 1, 1),
+    )
+
+
+class TestPlaceListing:
+    """Test batched place listing assembly."""
+
+    @pytest.mark.parametrize("page_size", [1, 10, 100])
+    def test_query_count_is_constant(self, page_size):
+        """Test that images and review stats take one query each regardless of page size."""
+        places = [_make_place(i) for i in range(1, page_size + 1)]
+        images = [_make_image(i, i) for i in range(1, page_size + 1)]
+        session = _listing_session(images)
+
+        responses = asyncio.run(build_place_responses(session, places))
+
+        assert len(session.statements) == 2
+        assert len(responses) == page_size
+
+    def test_images_grouped_by_place(self):
+        """Test that each place only receives its own images."""
+        places = [_make_place(1), _make_place(2)]
+        images = [_make_image(10, 1), _make_image(11, 1), _make_image(20, 2)]
+        session = _listing_session(images)
+
+        responses = asyncio.run(build_place_responses(session, places))
+
+        assert [img.id for img in responses[0].images] == [10, 11]
+        assert [img.id for img in responses[1].images] == [20]
+
+    def test_review_summary_from_stats(self):
+        """Test that listings carry ratings from the materialized aggregates."""
+        stats = PlaceReviewStats(
+            place_id=2, review_count=2, rating_sum=9, rating_1=0, rating_2=0, rating_3=0, rating_4=1, rating_5=1
+        )
+        session = _listing_session([], [stats])
+
+        responses = asyncio.run(build_place_responses(session, [_make_place(1), _make_place(2)]))
+
+        assert responses[0].reviews["total_reviews"] == 0
+        assert responses[1].reviews["average_rating"] == 4.5
+
+    def test_empty_page_skips_image_query(self):
+        """Test that an empty page does not hit the database."""
+        session = _listing_session([])
+
+        responses = asyncio.run(build_place_responses(session, []))
+
+        assert responses == []
+        assert session.statements == []
@@ -0,0 +1,66 @@
+"""
+Test indexed place search query building.
+"""
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from models.place_existing import Place
+from services.place_search import (
+    apply_place_search, normalize_search_term, place_search_sort_keys, prefix_tsquery, search_tokens
+)
+
+
+def _compile(query):
+    compiled = query.compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+class TestNormalization:
+    """Test accent-insensitive term normalization."""
+
+    def test_strips_portuguese_accents(self):
+        """Test that accents, cedillas and tildes are removed and case folded."""
+        assert normalize_search_term("  Cabeleireiro  São João ") == "cabeleireiro sao joao"
+        assert normalize_search_term("Estética Conceição") == "estetica conceicao"
+
+    def test_tokens_and_prefix_query(self):
+        """Test that tsquery tokens are alphanumeric words requiring prefix matches."""
+        tokens = search_tokens("Spa & Beleza: Óbidos!")
+
+        assert tokens == ["spa", "beleza", "obidos"]
+        assert prefix_tsquery(tokens) == "spa:* & beleza:* & obidos:*"
+
+
+class TestApplyPlaceSearch:
+    """Test the generated search SQL."""
+
+    def test_uses_indexed_columns_and_ranks(self):
+        """Test that search uses the generated columns and orders by relevance."""
+        sql, params = _compile(apply_place_search(select(Place), "Lisbôa"))
+
+        assert "places.search_vector @@ to_tsquery" in sql
+        assert "places.search_text LIKE" in sql
+        assert "<%" in sql
+        assert "ORDER BY word_similarity" in sql and "ts_rank_cd" in sql
+        assert "lisboa:*" in params.values()
+        assert "lower(places.nome)" not in sql
+
+    def test_like_wildcards_are_escaped(self):
+        """Test that % and _ in the term are matched literally."""
+        _, params = _compile(apply_place_search(select(Place), "100%_spa"))
+
+        assert "100/%/_spa" in params.values()
+
+    def test_blank_term_is_ignored(self):
+        """Test that a blank term leaves the query unchanged."""
+        query = select(Place).where(Place.is_active == True)
+
+        assert apply_place_search(query, "   ") is query
+
+    def test_sort_keys_match_search_ordering(self):
+        """Test that keyset keys are relevance then id, or id alone without a term."""
+        keys = place_search_sort_keys("spa")
+
+        assert [key.descending for key in keys] == [True, False]
+        assert "word_similarity" in _compile(select(keys[0].expression))[0]
+        assert [key.expression for key in place_search_sort_keys(" ")] == [Place.id]
@@ -0,0 +1,146 @@
+"""
+Test the authenticated principal cache.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+
+from core import dependencies
+from core.config import settings
+from core.principal import PRINCIPAL_CLAIM, Principal, PrincipalCache, principal_claims
+from core.security import create_access_token
+from tests.conftest import FakeSession
+
+
+def _user(**overrides):
+    values = dict(
+        id=7, email="ana@example.com", name="Ana", user_type="business_owner", is_active=True,
+        is_admin=False, is_owner=True, is_business_owner=True, trial_status="active",
+        trial_start=datetime(2025, 1, 1, tzinfo=timezone.utc), trial_end=datetime(2025, 1, 15, tzinfo=timezone.utc),
+        first_name="Ana", password_hash="secret"
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def _authenticate(token, session, method="GET"):
+    return asyncio.run(dependencies.get_current_principal(
+        SimpleNamespace(method=method),
+        HTTPAuthorizationCredentials(scheme="Bearer", credentials=token),
+        session
+    ))
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = PrincipalCache(max_entries=100, ttl_seconds=60)
+    monkeypatch.setattr(dependencies, "principal_cache", cache)
+    return cache
+
+
+class TestPrincipal:
+    """Test the principal snapshot."""
+
+    def test_snapshot_is_slim_and_immutable(self):
+        """Test that only auth fields are copied and the snapshot cannot change."""
+        principal = Principal.from_user(_user())
+
+        assert principal.is_flagged_owner and not principal.is_platform_admin
+        assert not hasattr(principal, "password_hash")
+        with pytest.raises(AttributeError):
+            principal.is_admin = True
+
+    def test_claims_round_trip(self):
+        """Test that the token claim restores the same principal."""
+        claims = principal_claims(_user())
+
+        assert claims["sub"] == "7"
+        assert Principal.from_claims(7, claims[PRINCIPAL_CLAIM]) == Principal.from_user(_user())
+        assert Principal.from_claims(7, None) is None
+
+
+class TestPrincipalCache:
+    """Test caching and invalidation."""
+
+    def test_keyed_by_user_and_issued_at(self):
+        """Test that a new token (new iat) does not reuse another token's entry."""
+        cache = PrincipalCache(max_entries=10, ttl_seconds=60)
+        cache.set(Principal.from_user(_user()), 1000)
+
+        assert cache.get(7, 1000).email == "ana@example.com"
+        assert cache.get(7, 2000) is None
+
+    def test_invalidate_user(self):
+        """Test that invalidation drops every token's entry."""
+        cache = PrincipalCache(max_entries=10, ttl_seconds=60)
+        cache.set(Principal.from_user(_user()), 1000)
+        cache.set(Principal.from_user(_user()), 2000)
+
+        cache.invalidate_user(7)
+
+        assert cache.get(7, 1000) is None and cache.get(7, 2000) is None
+
+    def test_zero_ttl_disables(self):
+        """Test that a TTL of 0 turns caching off."""
+        cache = PrincipalCache(max_entries=10, ttl_seconds=0)
+        cache.set(Principal.from_user(_user()), 1000)
+
+        assert cache.get(7, 1000) is None
+
+
+class TestGetCurrentPrincipal:
+    """Test the authentication dependency."""
+
+    def test_second_request_skips_database(self, cache):
+        """Test that the user row is loaded once per token."""
+        session = FakeSession([_user()])
+        token = create_access_token({"sub": "7"})
+
+        first = _authenticate(token, session)
+        second = _authenticate(token, session)
+
+        assert first == second
+        assert session.queries == 1
+
+    def test_inactive_user_rejected(self, cache):
+        """Test that unknown or inactive users get 401."""
+        with pytest.raises(HTTPException) as error:
+            _authenticate(create_access_token({"sub": "7"}), FakeSession([]))
+        assert error.value.status_code == 401
+
+    def test_stateless_reads(self, cache, monkeypatch):
+        """Test that GETs trust the token claim when stateless reads are enabled."""
+        monkeypatch.setattr(settings, "AUTH_STATELESS_READS", True)
+        session = FakeSession([_user()])
+        token = create_access_token(principal_claims(_user()))
+
+        assert _authenticate(token, session, "GET").email == "ana@example.com"
+        assert session.queries == 0
+        _authenticate(token, session, "POST")
+        assert session.queries == 1
+
+    def test_tokens_carry_issued_at(self):
+        """Test that access tokens include iat for the cache key."""
+        payload = jwt.decode(
+            create_access_token({"sub": "7"}, timedelta(minutes=5)), settings.SECRET_KEY,
+            algorithms=[settings.ALGORITHM]
+        )
+
+        assert "iat" in payload
+
+
+class TestGetCurrentAdmin:
+    """Test the admin check on principals."""
+
+    def test_platform_admin_user_type(self):
+        """Test that platform_admin users pass without the is_admin flag."""
+        principal = Principal.from_user(_user(user_type="platform_admin"))
+
+        assert asyncio.run(dependencies.get_current_admin(principal)) is principal
+        with pytest.raises(HTTPException):
+            asyncio.run(dependencies.get_current_admin(Principal.from_user(_user())))
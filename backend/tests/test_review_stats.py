@@ -0,0 +1,71 @@
+"""
+Test materialized review aggregates.
+"""
+import asyncio
+
+from sqlalchemy.dialects import postgresql
+
+from models.place_existing import PlaceReviewStats
+from services.review_stats import rebuild_review_stats, record_review, review_summary
+from tests.conftest import FakeResult, FakeSession
+
+
+def _sql(statement):
+    compiled = statement.compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+class TestRecordReview:
+    """Test the transactional aggregate update."""
+
+    def test_atomic_upsert(self):
+        """Test that a review increments counters in SQL rather than read-modify-write."""
+        session = FakeSession(FakeResult(rowcount=3))
+
+        asyncio.run(record_review(session, 7, 4))
+
+        sql, params = _sql(session.statements[0])
+        assert "ON CONFLICT (place_id) DO UPDATE" in sql
+        assert "review_count = (place_review_stats.review_count + excluded.review_count)" in sql
+        assert params["rating_sum"] == 4
+        assert params["rating_4"] == 1 and params["rating_5"] == 0
+
+
+class TestRebuild:
+    """Test backfilling from the reviews table."""
+
+    def test_rebuild_selected_places(self):
+        """Test that only the requested places are cleared and recomputed."""
+        session = FakeSession(FakeResult(rowcount=3))
+
+        written = asyncio.run(rebuild_review_stats(session, [1, 2]))
+
+        delete_sql, _ = _sql(session.statements[0])
+        insert_sql, _ = _sql(session.statements[1])
+        assert written == 3
+        assert delete_sql.startswith("DELETE FROM place_review_stats WHERE place_review_stats.place_id IN")
+        assert "INSERT INTO place_review_stats" in insert_sql
+        assert "count(*) FILTER (WHERE reviews.rating =" in insert_sql
+        assert "JOIN places ON places.id = reviews.place_id" in insert_sql
+        assert "GROUP BY reviews.place_id" in insert_sql
+
+
+class TestReviewSummary:
+    """Test the summary payload."""
+
+    def test_summary_from_stats(self):
+        """Test average, count and histogram."""
+        stats = PlaceReviewStats(
+            place_id=1, review_count=3, rating_sum=13, rating_1=0, rating_2=0, rating_3=0, rating_4=2, rating_5=1
+        )
+
+        summary = review_summary(stats)
+
+        assert summary["average_rating"] == 4.33
+        assert summary["total_reviews"] == 3
+        assert summary["rating_histogram"] == {"1": 0, "2": 0, "3": 0, "4": 2, "5": 1}
+
+    def test_place_without_reviews(self):
+        """Test that places without a stats row report zeros."""
+        assert review_summary(None)["total_reviews"] == 0
+        assert review_summary(None)["average_rating"] == 0.0
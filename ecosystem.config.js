@@ -45,6 +45,7 @@ module.exports = {
     log_date_format: 'YYYY-MM-DD HH:mm:ss Z',
     env: {
       NODE_ENV: 'production',
+      DB_PROFILE: 'prod',
       BASE_URL: 'https://linkuup.com',
       GOOGLE_CLIENT_ID: '445811034196-ebo079aj7teacpam5b87jqmqo6rg1c63.apps.googleusercontent.com',
       GOOGLE_CLIENT_SECRET: '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',